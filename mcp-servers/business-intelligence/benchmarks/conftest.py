@@ -0,0 +1,133 @@
+"""
+Benchmark configuration: shape options, synthetic dataset fixtures and the baseline report.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Measure the tools themselves: no memoized results, no workspace snapshots, no background imports
+os.environ["BI_RESULT_CACHE_MAX_MB"] = "0"
+os.environ["BI_WORKSPACE"] = "0"
+os.environ["BI_PREWARM"] = "0"
+
+from harness import compare, load_baseline, measure, save_results
+from synthetic import parse_rows, sales_frame, shape_id
+
+BENCHMARK_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+RESULTS_KEY = pytest.StashKey[dict]()
+REGRESSIONS_KEY = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-rows", default="10k",
+                    help="Comma-separated dataset row counts, e.g. 10k,1m,10m (default 10k)")
+    group.addoption("--bench-columns", default="10",
+                    help="Comma-separated dataset column counts, e.g. 10,100,1000 (default 10)")
+    group.addoption("--bench-max-cells", type=int, default=100_000_000,
+                    help="Skip shapes with more rows x columns than this (default 100M)")
+    group.addoption("--bench-rounds", type=int, default=3, help="Timed rounds per benchmark (default 3)")
+    group.addoption("--bench-save", default="", help="Write the results to this JSON file")
+    group.addoption("--bench-compare", nargs="?", const=str(DEFAULT_BASELINE), default="",
+                    help=f"Fail on regressions against a baseline JSON (default {DEFAULT_BASELINE.name})")
+    group.addoption("--bench-tolerance", type=float, default=0.5,
+                    help="Allowed slowdown or memory growth over the baseline (default 0.5 = 50%%)")
+
+
+def pytest_configure(config):
+    config.stash[RESULTS_KEY] = {}
+    config.stash[REGRESSIONS_KEY] = []
+
+
+def pytest_generate_tests(metafunc):
+    if "shape" not in metafunc.fixturenames:
+        return
+    config = metafunc.config
+    rows = [parse_rows(value) for value in config.getoption("--bench-rows").split(",")]
+    columns = [int(value) for value in config.getoption("--bench-columns").split(",")]
+    shapes = [pytest.param((r, c), id=shape_id(r, c),
+                           marks=pytest.mark.skip(reason="over --bench-max-cells")
+                           if r * c > config.getoption("--bench-max-cells") else ())
+              for r in rows for c in columns]
+    metafunc.parametrize("shape", shapes, scope="module")
+
+
+@pytest.fixture(scope="session")
+def synthetic(tmp_path_factory):
+    """Build the synthetic frame and its CSV file for a shape, keeping only the current shape's frame in memory."""
+
+    frames, files = {}, {}
+    data_dir = tmp_path_factory.mktemp("bench_data")
+
+    class Synthetic:
+        @staticmethod
+        def frame(shape):
+            if shape not in frames:
+                frames.clear()
+                frames[shape] = sales_frame(*shape)
+            return frames[shape]
+
+        @staticmethod
+        def csv(shape):
+            if shape not in files:
+                files[shape] = data_dir / f"sales_{shape_id(*shape)}.csv"
+                Synthetic.frame(shape).to_csv(files[shape], index=False)
+            return files[shape]
+
+    return Synthetic
+
+
+@pytest.fixture
+def bench(request):
+    """Measure a zero-argument callable (or coroutine function) and record it under the test's id."""
+
+    def run(fn, rounds=None):
+        shape = request.node.callspec.params.get("shape") if hasattr(request.node, "callspec") else None
+        rounds = rounds or request.config.getoption("--bench-rounds")
+        stats = measure(fn, rounds)
+        if shape:
+            stats.update({"rows": shape[0], "columns": shape[1]})
+        request.config.stash[RESULTS_KEY][request.node.name] = stats
+        return stats
+
+    return run
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config.stash[RESULTS_KEY]
+    if not results:
+        return
+    if config.getoption("--bench-save"):
+        save_results(results, config.getoption("--bench-save"))
+    baseline_path = config.getoption("--bench-compare")
+    if baseline_path:
+        regressions = compare(results, load_baseline(baseline_path), config.getoption("--bench-tolerance"))
+        config.stash[REGRESSIONS_KEY].extend(regressions)
+        if regressions and session.exitstatus == 0:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash[RESULTS_KEY]
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'benchmark':<48} {'wall s':>9} {'median s':>9} {'peak MB':>9} "
+                                f"{'+RSS MB':>9} {'output':>10}")
+    for name, stats in sorted(results.items()):
+        delta = "-" if stats["rss_delta_mb"] is None else f"{stats['rss_delta_mb']:.1f}"
+        terminalreporter.write_line(f"{name:<48} {stats['wall_s']:>9.4f} {stats['wall_s_median']:>9.4f} "
+                                    f"{stats['peak_rss_mb']:>9.1f} {delta:>9} {stats['output_bytes']:>10}")
+    for regression in config.stash[REGRESSIONS_KEY]:
+        terminalreporter.write_line(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+                                    f"{regression['baseline']} -> {regression['current']} "
+                                    f"(x{regression['ratio']})", red=True)
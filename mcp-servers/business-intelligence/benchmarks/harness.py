@@ -0,0 +1,160 @@
+"""
+Benchmark Harness
+Wall time, peak RSS and output size per benchmark, with a JSON baseline to compare runs against.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import inspect
+import platform
+import resource
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINE_VERSION = 1
+MIN_WALL_DELTA_S = 0.02  # smaller slowdowns are timer noise, whatever the ratio
+MIN_RSS_DELTA_MB = 16.0
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size in MB (Linux), else None."""
+    return _proc_status_mb("VmRSS")
+
+
+def reset_peak_rss() -> bool:
+    """Reset the process's peak RSS so the next reading covers only what follows (Linux 4.0+)."""
+
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size in MB since the last reset (or since start when it cannot be reset)."""
+
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 1024 / 1024 if sys.platform == "darwin" else maxrss / 1024
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def output_size(result: Any) -> int:
+    """Bytes of the result as the server would send it (JSON), plus any files it reports writing."""
+
+    files = sum(os.path.getsize(path) for path in _output_files(result))
+    return len(json.dumps(result, default=str).encode()) + files
+
+
+def _output_files(result: Any) -> set:
+    files = set()
+    if isinstance(result, dict):
+        for key, value in result.items():
+            if key == "output_path" and isinstance(value, str) and os.path.isfile(value):
+                files.add(value)
+            else:
+                files |= _output_files(value)
+    return files
+
+
+def measure(fn: Callable[[], Any], rounds: int = 3) -> Dict[str, Any]:
+    """
+    Run fn (sync, or returning a coroutine) rounds times.
+
+    Reports the fastest and median wall time, the peak RSS over all rounds and how far
+    it rose above the RSS before each round, and the size of the last result.
+    """
+
+    walls, deltas, peaks = [], [], []
+    result = None
+    for _ in range(max(rounds, 1)):
+        can_reset = reset_peak_rss()
+        before = rss_mb() or 0.0
+        started = time.perf_counter()
+        result = fn()
+        if inspect.isawaitable(result):
+            result = asyncio.run(_await(result))
+        walls.append(time.perf_counter() - started)
+        peak = peak_rss_mb()
+        peaks.append(peak)
+        deltas.append(max(peak - before, 0.0) if can_reset else None)
+
+    if isinstance(result, dict) and "error" in result:
+        raise AssertionError(f"Benchmarked call failed: {result['error']}")
+    return {
+        "wall_s": round(min(walls), 6),
+        "wall_s_median": round(median(walls), 6),
+        "rounds": len(walls),
+        "peak_rss_mb": round(max(peaks), 2),
+        "rss_delta_mb": round(max(deltas), 2) if None not in deltas else None,
+        "output_bytes": output_size(result)
+    }
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count()
+    }
+
+
+def save_results(results: Dict[str, Dict[str, Any]], path: str) -> None:
+    payload = {
+        "version": BASELINE_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "results": dict(sorted(results.items()))
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    return json.loads(Path(path).read_text(encoding="utf-8")).get("results", {})
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Benchmarks slower, or using more memory, than the baseline by more than tolerance
+    (0.5 = 50%). Differences under MIN_WALL_DELTA_S or MIN_RSS_DELTA_MB are ignored.
+    """
+
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        checks = [("wall_s", MIN_WALL_DELTA_S), ("rss_delta_mb", MIN_RSS_DELTA_MB)]
+        for metric, min_delta in checks:
+            now, before = current.get(metric), previous.get(metric)
+            if now is None or before is None:
+                continue
+            if now > before * (1 + tolerance) and now - before > min_delta:
+                regressions.append({"benchmark": name, "metric": metric, "baseline": before, "current": now,
+                                    "ratio": round(now / before, 2) if before else None})
+    return regressions
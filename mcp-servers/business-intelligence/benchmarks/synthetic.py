@@ -0,0 +1,69 @@
+"""
+Synthetic Data
+Seeded generators for benchmark datasets shaped like the sample sales and customer data.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Same segment mix, regions, categories and channel split as info/data.py and data1.py
+SEGMENTS = {"budget": (0.5, 50, 10), "standard": (0.3, 120, 20), "premium": (0.2, 250, 50)}
+REGIONS = ["NE", "SW", "MW", "SE"]
+CATEGORIES = ["Electronics", "Apparel", "Home", "Sports", "Toys"]
+CHANNELS = {"Online": 0.6, "Retail": 0.3, "Partner": 0.1}
+BASE_COLUMNS = ["sale_id", "customer_id", "sale_date", "category", "region", "channel", "segment", "age",
+                "monthly_spend", "sale_amount"]
+DAYS = 730
+
+
+def sales_frame(rows: int, columns: int = len(BASE_COLUMNS), seed: int = 123) -> pd.DataFrame:
+    """
+    A sales table of rows x columns.
+
+    The first ten columns mirror the sample sales and customer generators (ids, sale
+    date, category, region, channel, spend segment, age and amounts); wider tables add
+    numeric metric_NNNN columns, every other one following sale_amount so correlation
+    scans have real pairs to find. The same arguments always give the same frame.
+    """
+
+    rng = np.random.default_rng(seed)
+    weights, means, sigmas = (np.array(values) for values in zip(*SEGMENTS.values()))
+    segment = rng.choice(len(SEGMENTS), rows, p=weights)
+    sale_amount = rng.uniform(20, 1000, rows).round(2)
+
+    data = {
+        "sale_id": np.char.mod("%016x", rng.integers(0, 2 ** 62, rows)).astype(object),
+        "customer_id": rng.integers(1, max(rows // 5, 1) + 1, rows),
+        "sale_date": np.datetime64("2023-01-01") + rng.integers(0, DAYS, rows).astype("timedelta64[D]"),
+        "category": pd.Categorical.from_codes(rng.integers(0, len(CATEGORIES), rows), CATEGORIES),
+        "region": pd.Categorical.from_codes(rng.integers(0, len(REGIONS), rows), REGIONS),
+        "channel": pd.Categorical.from_codes(rng.choice(len(CHANNELS), rows, p=list(CHANNELS.values())),
+                                             list(CHANNELS)),
+        "segment": pd.Categorical.from_codes(segment, list(SEGMENTS)),
+        "age": rng.integers(18, 81, rows),
+        "monthly_spend": np.maximum(0, rng.normal(means[segment], sigmas[segment])).round(2),
+        "sale_amount": sale_amount
+    }
+    for index in range(max(columns - len(BASE_COLUMNS), 0)):
+        noise = rng.normal(0, 1, rows)
+        data[f"metric_{index:04d}"] = (sale_amount / 100 + noise if index % 2 == 0 else noise * 10).round(4)
+
+    frame = pd.DataFrame(data)
+    return frame.iloc[:, :columns] if columns < len(BASE_COLUMNS) else frame
+
+
+def parse_rows(value: str) -> int:
+    """Row count from "10k", "1m" or "10000"."""
+
+    value = value.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+
+def shape_id(rows: int, columns: int) -> str:
+    """Short label for a shape, e.g. "1m-x100"."""
+
+    for suffix, scale in (("m", 1_000_000), ("k", 1_000)):
+        if rows >= scale and rows % scale == 0:
+            return f"{rows // scale}{suffix}-x{columns}"
+    return f"{rows}-x{columns}"
@@ -0,0 +1,70 @@
+"""
+Benchmarks for the business-intelligence tools on synthetic datasets.
+
+Run with `pytest benchmarks` (see benchmarks/README.md for shapes and baselines).
+"""
+
+import asyncio
+
+import pytest
+
+from src.tools.create_visualization import create_visualization_tool
+from src.tools.export_report import export_report_tool
+from src.tools.profile_dataset import profile_dataset_tool
+from src.tools.run_correlation import run_correlation_tool
+from server_fastmcp import (execute_sql_query, load_business_dataset, segment_business_data, store_dataset,
+                            unload_dataset)
+
+DATASET = "bench_sales"
+EXPORT_ROWS = 100_000  # rows of the dataset written into the exported report
+
+
+@pytest.fixture(scope="module")
+def sales(shape, synthetic):
+    """The synthetic dataset for this shape, registered with the store and the SQL engine."""
+
+    frame = synthetic.frame(shape)
+    store_dataset(DATASET, frame)
+    return frame
+
+
+def test_load_business_dataset(bench, shape, synthetic):
+    path = synthetic.csv(shape)
+    stats = bench(lambda: load_business_dataset(str(path), "bench_loaded"))
+    asyncio.run(unload_dataset("bench_loaded"))
+    assert stats["output_bytes"] > 0
+
+
+def test_execute_sql_query(bench, sales):
+    query = (f"SELECT region, category, channel, COUNT(*) AS orders, SUM(sale_amount) AS revenue, "
+             f"AVG(monthly_spend) AS avg_spend FROM {DATASET} GROUP BY region, category, channel")
+    bench(lambda: execute_sql_query(DATASET, query))
+
+
+def test_profile_dataset_tool(bench, sales):
+    bench(lambda: profile_dataset_tool(DATASET))
+
+
+def test_run_correlation_tool(bench, sales):
+    bench(lambda: run_correlation_tool(DATASET, "pearson", threshold=0.3))
+
+
+def test_segment_business_data(bench, sales):
+    bench(lambda: segment_business_data(DATASET, ["region", "segment"], ["sale_amount", "monthly_spend"]))
+
+
+def test_create_visualization_tool(bench, sales, tmp_path):
+    bench(lambda: create_visualization_tool(DATASET, "bar", "category", "sale_amount",
+                                            output_path=str(tmp_path / "chart.png")))
+
+
+def test_export_report_tool(bench, sales, tmp_path):
+    segments = sales.groupby(["region", "segment"], observed=True)["sale_amount"].agg(["count", "sum", "mean"])
+    content = {"sections": [
+        {"title": "Key Findings", "type": "findings",
+         "content": [f"{len(sales)} sales across {sales['region'].nunique()} regions"]},
+        {"title": "Segments", "type": "generic", "content": segments.reset_index()},
+        {"title": "Sales", "type": "generic", "content": sales.head(EXPORT_ROWS)}
+    ]}
+    stats = bench(lambda: export_report_tool(content, "html", "standard", str(tmp_path / "report.html")))
+    assert stats["output_bytes"] > len(content["sections"][2]["content"])
@@ -1,14 +1,20 @@
 import pandas as pd
 import numpy as np
 import yfinance as yf
-import ta  # pip install ta
 import requests
 import os
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add the business-intelligence project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import indicators
+
 # Alpaca API configuration
 ALPACA_API_KEY = os.getenv('ALPACA_API_KEY', '')
 ALPACA_SECRET_KEY = os.getenv('ALPACA_SECRET_KEY', '')
@@ -174,6 +180,11 @@ def fetch_market_data(ticker: str, start_date: str, end_date: str = None, source
 def add_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Add comprehensive technical analysis features to OHLCV DataFrame.
+
+    Indicators come from the columnar engine in src/core/indicators.py: shared
+    rolling windows and EMAs are computed once and all columns are added in a
+    single concat. Use indicators.compute_features / append_features to extend
+    an existing feature set with new bars instead of recomputing it.
     """
     if df.empty:
         return df
@@ -185,133 +196,16 @@ def add_features(df: pd.DataFrame) -> pd.DataFrame:
         print(f"❌ Missing required columns: {missing_cols}")
         return df
     
-    # Use Close if Adj Close is missing
-    if 'Adj Close' not in df.columns:
-        df['Adj Close'] = df['Close']
-    
     print("🔧 Adding technical indicators...")
-    
-    # 1. Returns and Log Returns
-    df['return'] = df['Adj Close'].pct_change()
-    df['log_return'] = np.log(df['Adj Close'] / df['Adj Close'].shift(1))
-    
-    # 2. Rolling Statistics (multiple windows)
-    for window in [7, 14, 30]:
-        df[f'rolling_mean_{window}'] = df['Adj Close'].rolling(window).mean()
-        df[f'rolling_std_{window}'] = df['Adj Close'].rolling(window).std()
-        df[f'rolling_skew_{window}'] = df['Adj Close'].rolling(window).skew()
-        df[f'rolling_kurt_{window}'] = df['Adj Close'].rolling(window).kurt()
-    
-    # 3. Volatility Indicators
-    df['ATR'] = ta.volatility.AverageTrueRange(df['High'], df['Low'], df['Close']).average_true_range()
-    df['ATR_pct'] = df['ATR'] / df['Close'] * 100
-    
-    # Bollinger Bands (multiple periods)
-    for period in [20, 50]:
-        bb = ta.volatility.BollingerBands(df['Adj Close'], window=period, window_dev=2)
-        df[f'BB_high_{period}'] = bb.bollinger_hband()
-        df[f'BB_low_{period}'] = bb.bollinger_lband()
-        df[f'BB_pct_{period}'] = bb.bollinger_pband()
-        df[f'BB_width_{period}'] = (bb.bollinger_hband() - bb.bollinger_lband()) / df['Adj Close']
-    
-    # 4. Momentum Indicators
-    df['RSI'] = ta.momentum.RSIIndicator(df['Adj Close']).rsi()
-    df['RSI_14'] = ta.momentum.RSIIndicator(df['Adj Close'], window=14).rsi()
-    df['RSI_30'] = ta.momentum.RSIIndicator(df['Adj Close'], window=30).rsi()
-    
-    # Stochastic Oscillator
-    stoch = ta.momentum.StochasticOscillator(df['High'], df['Low'], df['Close'])
-    df['Stoch_K'] = stoch.stoch()
-    df['Stoch_D'] = stoch.stoch_signal()
-    
-    # Williams %R
-    df['Williams_R'] = ta.momentum.WilliamsRIndicator(df['High'], df['Low'], df['Close']).williams_r()
-    
-    # 5. Trend Indicators
-    # MACD
-    macd = ta.trend.MACD(df['Adj Close'])
-    df['MACD'] = macd.macd()
-    df['MACD_signal'] = macd.macd_signal()
-    df['MACD_diff'] = macd.macd_diff()
-    
-    # Moving Averages
-    for period in [5, 10, 20, 50, 100, 200]:
-        df[f'MA_{period}'] = df['Adj Close'].rolling(period).mean()
-        df[f'EMA_{period}'] = df['Adj Close'].ewm(span=period).mean()
-    
-    # Moving Average Convergence/Divergence signals
-    df['MA_20_50_signal'] = np.where(df['MA_20'] > df['MA_50'], 1, -1)
-    df['MA_50_200_signal'] = np.where(df['MA_50'] > df['MA_200'], 1, -1)
-    
-    # Parabolic SAR
-    df['PSAR'] = ta.trend.PSARIndicator(df['High'], df['Low'], df['Close']).psar()
-    
-    # 6. Volume Indicators
-    if 'Volume' in df.columns and df['Volume'].sum() > 0:
-        # On-Balance Volume
-        df['OBV'] = ta.volume.OnBalanceVolumeIndicator(df['Adj Close'], df['Volume']).on_balance_volume()
-        
-        # Volume Weighted Average Price
-        if 'VWAP' not in df.columns:
-            df['VWAP'] = (df['Close'] * df['Volume']).cumsum() / df['Volume'].cumsum()
-        
-        # Volume features
-        df['vol_change'] = df['Volume'].pct_change()
-        df['vol_rolling_mean_14'] = df['Volume'].rolling(14).mean()
-        df['vol_rolling_std_14'] = df['Volume'].rolling(14).std()
-        df['vol_ratio'] = df['Volume'] / df['vol_rolling_mean_14']
-        
-        # Accumulation/Distribution Line
-        df['ADL'] = ta.volume.AccDistIndexIndicator(df['High'], df['Low'], df['Close'], df['Volume']).acc_dist_index()
-        
-        # Chaikin Money Flow
-        df['CMF'] = ta.volume.ChaikinMoneyFlowIndicator(df['High'], df['Low'], df['Close'], df['Volume']).chaikin_money_flow()
-        
-        # Volume Price Trend
-        df['VPT'] = ta.volume.VolumePriceTrendIndicator(df['Close'], df['Volume']).volume_price_trend()
-    
-    # 7. Crypto-specific features
-    # Price position within daily range
-    df['price_position'] = (df['Close'] - df['Low']) / (df['High'] - df['Low'])
-    
-    # Gap analysis
-    df['gap'] = (df['Open'] - df['Close'].shift(1)) / df['Close'].shift(1)
-    df['gap_filled'] = np.where(
-        (df['gap'] > 0) & (df['Low'] <= df['Close'].shift(1)), 1,
-        np.where((df['gap'] < 0) & (df['High'] >= df['Close'].shift(1)), 1, 0)
-    )
-    
-    # Intraday returns
-    df['intraday_return'] = (df['Close'] - df['Open']) / df['Open']
-    df['overnight_return'] = (df['Open'] - df['Close'].shift(1)) / df['Close'].shift(1)
-    
-    # 8. Market structure features
-    # Higher highs, lower lows
-    df['higher_high'] = df['High'] > df['High'].shift(1)
-    df['lower_low'] = df['Low'] < df['Low'].shift(1)
-    df['higher_low'] = df['Low'] > df['Low'].shift(1)
-    df['lower_high'] = df['High'] < df['High'].shift(1)
-    
-    # Support and resistance levels (simplified)
-    df['resistance_20'] = df['High'].rolling(20).max()
-    df['support_20'] = df['Low'].rolling(20).min()
-    df['near_resistance'] = (df['Close'] / df['resistance_20']) > 0.98
-    df['near_support'] = (df['Close'] / df['support_20']) < 1.02
-    
-    # 9. Volatility regime detection
-    df['volatility_regime'] = np.where(df['rolling_std_30'] > df['rolling_std_30'].rolling(60).mean(), 'high', 'low')
-    
-    # 10. Trend strength
-    df['trend_strength'] = abs(df['Close'] - df['MA_20']) / df['ATR']
-    
-    print(f"✅ Added {len([col for col in df.columns if col not in ['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close']])} technical features")
+    enhanced = indicators.add_features(df, dropna=False)
+    print(f"✅ Added {len([col for col in enhanced.columns if col not in ['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close']])} technical features")
     
     # Drop initial rows with NaNs from indicators
-    initial_length = len(df)
-    df.dropna(inplace=True)
-    print(f"📊 Final dataset: {len(df)} rows (removed {initial_length - len(df)} rows with NaN values)")
+    initial_length = len(enhanced)
+    enhanced = enhanced.dropna()
+    print(f"📊 Final dataset: {len(enhanced)} rows (removed {initial_length - len(enhanced)} rows with NaN values)")
     
-    return df
+    return enhanced
 
 def get_all_crypto_data(start_date: str = "2020-01-01", end_date: str = None) -> Dict[str, pd.DataFrame]:
     """
@@ -343,9 +237,7 @@ def get_all_crypto_data(start_date: str = "2020-01-01", end_date: str = None) ->
     
     print(f"🚀 Attempting to fetch data for {len(all_symbols)} cryptocurrencies...")
     
-    crypto_data = {}
-    successful_fetches = 0
-    
+    raw_data = {}
     for symbol in all_symbols:
         print(f"\n📈 Fetching data for {symbol}...")
         
@@ -353,17 +245,21 @@ def get_all_crypto_data(start_date: str = "2020-01-01", end_date: str = None) ->
         data = fetch_market_data(symbol, start_date, end_date, source='auto')
         
         if not data.empty:
-            # Add features
-            enhanced_data = add_features(data)
-            if not enhanced_data.empty:
-                crypto_data[symbol] = enhanced_data
-                successful_fetches += 1
-                print(f"✅ Successfully processed {symbol}: {len(enhanced_data)} rows, {len(enhanced_data.columns)} features")
-            else:
-                print(f"❌ Failed to add features for {symbol}")
+            raw_data[symbol] = data
         else:
             print(f"❌ No data found for {symbol}")
     
+    # Add features for every symbol in parallel worker processes
+    print(f"\n🔧 Adding technical indicators for {len(raw_data)} cryptocurrencies...")
+    crypto_data = {}
+    for symbol, enhanced_data in indicators.add_features_many(raw_data).items():
+        if not enhanced_data.empty:
+            crypto_data[symbol] = enhanced_data
+            print(f"✅ Successfully processed {symbol}: {len(enhanced_data)} rows, {len(enhanced_data.columns)} features")
+        else:
+            print(f"❌ Failed to add features for {symbol}")
+    successful_fetches = len(crypto_data)
+    
     print(f"\n🎉 Successfully fetched and processed data for {successful_fetches}/{len(all_symbols)} cryptocurrencies")
     return crypto_data
 
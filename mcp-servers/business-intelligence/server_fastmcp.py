@@ -5,12 +5,10 @@ A sophisticated data analysis platform with guided business insights discovery.
 """
 
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 import pandas as pd
-import sqlite3
-import tempfile
-import os
 import logging
 
 # Setup logging to capture tool and prompt usage and save to file
@@ -25,87 +23,99 @@ if not logger.handlers:
 
 from mcp.server.fastmcp import FastMCP
 
-# Global dataset storage for persistence across tool calls
-_DATASET_STORAGE = {}
-_SQL_DB_PATH = None
-_SQL_CONNECTION = None
-
-def get_sql_database():
-    """Get or create SQLite database for SQL queries with proper connection management."""
-    global _SQL_DB_PATH
-    logger.info("get_sql_database called")
-    if _SQL_DB_PATH is None:
-        # Create a unique database file for this session
-        import uuid
-        temp_dir = tempfile.gettempdir()
-        session_id = str(uuid.uuid4())[:8]
-        _SQL_DB_PATH = os.path.join(temp_dir, f"mcp_bi_database_{session_id}.db")
-        logger.info(f"Creating new SQL database at {_SQL_DB_PATH}")
-    
-    # Always create a new connection with WAL mode for better concurrency
-    conn = sqlite3.connect(_SQL_DB_PATH, timeout=30.0, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    logger.info("SQLite connection created with WAL mode")
-    return conn
-
-def store_dataset(name: str, data: pd.DataFrame):
-    """Store dataset in both memory and SQL database with proper error handling."""
-    global _DATASET_STORAGE
-    _DATASET_STORAGE[name] = data
-    logger.info(f"Storing dataset '{name}' in memory")
+from src.core import dataset_store as _dataset_store
+
+from src.core.sql_engine import get_sql_engine, run_query_batches, table_name_for
+from src.core.query_results import get_cursor_registry, open_query, encode_frame, RESULT_FORMATS, DEFAULT_PAGE_SIZE
+from src.core.table_export import EXPORT_FORMATS, export_chunk_rows, export_frame, normalize_format, write_table
+from src.core.csv_ingest import read_csv_file
+from src.core.json_ingest import read_json_file, read_jsonl_file
+from src.core.excel_ingest import list_sheets, load_excel
+from src.core.result_cache import cached_tool_call, get_result_cache
+from src.core.workspace import get_workspace
+from src.core.views import JoinSpec, define_view, drop_view, view_sql_for
+from src.core.kpi_engine import KpiSpec, bucket_totals, build_rollups, format_kpis, kpi_totals
+from src.core.executor import get_executor
+from src.core.scheduler import get_scheduler
+from src.core.api_source import close_http_client
+from src.core.lazy_imports import lazy_function, prewarm
+
+# Datasets live in the shared store (src/core/dataset_store.py); the SQL engine
+# (src/core/sql_engine.py) exposes them as tables for the whole session.
+
+def store_dataset(name: str, data: pd.DataFrame, source_path: str = ""):
+    """Store dataset in the shared dataset store and register it with the SQL engine."""
+    logger.info(f"Storing dataset '{name}' in dataset store")
+    _dataset_store.store_dataset(name, data, source_path=source_path)
     
-    # Store in SQL database for queries with retry logic
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            conn = get_sql_database()
-            # Sanitize table name for SQL
-            table_name = name.replace('-', '_').replace(' ', '_')
-            # Store without method='multi' for better compatibility
-            data.to_sql(table_name, conn, if_exists='replace', index=False)
-            conn.commit()
-            conn.close()
-            logger.info(f"Successfully stored dataset '{name}' as table '{table_name}' in SQL database")
-            break
-        except Exception as e:
-            if attempt == max_retries - 1:
-                logger.error(f"Failed to store dataset in SQL after {max_retries} attempts: {e}")
-            else:
-                logger.warning(f"Attempt {attempt+1} to store dataset '{name}' failed: {e}. Retrying.")
-                import time
-                time.sleep(0.1 * (attempt + 1))  # Progressive backoff
+    try:
+        engine = get_sql_engine()
+        table_name = engine.ensure_registered(name)
+        logger.info(f"Registered dataset '{name}' as table '{table_name}' with {engine.name} backend")
+    except Exception as e:
+        # Registration is retried lazily on the next query
+        logger.error(f"Failed to register dataset '{name}' with SQL engine: {e}")
+
+def _log_ingest_progress(progress: Dict):
+    """Log CSV ingest progress snapshots."""
+    logger.info(f"Ingest {progress['stage']}: {progress['rows']} rows, {progress['percent']}% "
+                f"({progress['rows_per_second']} rows/s, {progress['mb_per_second']} MB/s)")
 
 def get_dataset(name: str) -> Optional[pd.DataFrame]:
     """Retrieve dataset from storage."""
     logger.info(f"Retrieving dataset '{name}' from storage")
-    return _DATASET_STORAGE.get(name)
+    return _dataset_store.get_dataset(name)
 
 def list_datasets() -> list:
     """List all available datasets."""
     logger.info("Listing all available datasets")
-    return list(_DATASET_STORAGE.keys())
+    return _dataset_store.list_datasets()
 
 # Add src directory to path for imports
 sys.path.append(str(Path(__file__).parent / "src"))
 logger.info("Added 'src' directory to sys.path")
 
-from src.prompts.bi_discovery import bi_discovery_prompt
-from src.prompts.insight_investigation import insight_investigation_prompt
-from src.prompts.correlation_deep_dive import correlation_deep_dive_prompt
-from src.prompts.trend_analysis import trend_analysis_prompt
-from src.prompts.executive_summary import executive_summary_prompt
-from src.prompts.action_recommendations import action_recommendations_prompt
+# Tool and prompt modules are imported on first call (and pre-warmed in the background
+# once the server is up), so spawning the server does not pay for matplotlib, seaborn,
+# scipy or croniter before the client's handshake
+bi_discovery_prompt = lazy_function("src.prompts.bi_discovery", "bi_discovery_prompt")
+insight_investigation_prompt = lazy_function("src.prompts.insight_investigation", "insight_investigation_prompt")
+correlation_deep_dive_prompt = lazy_function("src.prompts.correlation_deep_dive", "correlation_deep_dive_prompt")
+trend_analysis_prompt = lazy_function("src.prompts.trend_analysis", "trend_analysis_prompt")
+executive_summary_prompt = lazy_function("src.prompts.executive_summary", "executive_summary_prompt")
+action_recommendations_prompt = lazy_function("src.prompts.action_recommendations", "action_recommendations_prompt")
 
-from src.tools.load_datasource import load_datasource_tool
-from src.tools.profile_dataset import profile_dataset_tool
-from src.tools.create_visualization import create_visualization_tool
-from src.tools.run_correlation import run_correlation_tool
-from src.tools.export_report import export_report_tool
-from src.tools.schedule_analysis import schedule_analysis_tool
+load_datasource_tool = lazy_function("src.tools.load_datasource", "load_datasource_tool")
+profile_dataset_tool = lazy_function("src.tools.profile_dataset", "profile_dataset_tool")
+create_visualization_tool = lazy_function("src.tools.create_visualization", "create_visualization_tool")
+run_correlation_tool = lazy_function("src.tools.run_correlation", "run_correlation_tool")
+export_report_tool = lazy_function("src.tools.export_report", "export_report_tool")
+schedule_analysis_tool = lazy_function("src.tools.schedule_analysis", "schedule_analysis_tool")
+list_schedules = lazy_function("src.tools.schedule_analysis", "list_schedules")
+get_schedule_history = lazy_function("src.tools.schedule_analysis", "get_schedule_history")
+run_schedule_now = lazy_function("src.tools.schedule_analysis", "run_schedule_now")
+segment_data_tool = lazy_function("src.tools.segment_data", "segment_data_tool")
+analyze_time_series = lazy_function("src.core.timeseries", "analyze_time_series")
+
+@asynccontextmanager
+async def _server_lifespan(server):
+    """Re-attach the persisted workspace, run the analysis scheduler for as long as the server is up, pre-warm deferred modules, then close shared HTTP connections."""
+    workspace = get_workspace()
+    if workspace is not None:
+        workspace.restore()
+    scheduler = get_scheduler()
+    _register_schedule_runners(scheduler)
+    await scheduler.start()
+    prewarm()
+    try:
+        yield {}
+    finally:
+        await scheduler.stop()
+        await close_http_client()
+        logger.info("Analysis scheduler stopped")
 
 # Create FastMCP server instance
-mcp = FastMCP("business-intelligence")
+mcp = FastMCP("business-intelligence", lifespan=_server_lifespan)
 logger.info("FastMCP server instance created for 'business-intelligence'")
 
 # =============================================================================
@@ -115,14 +125,18 @@ logger.info("FastMCP server instance created for 'business-intelligence'")
 @mcp.tool()
 async def load_business_dataset(
     file_path: str, 
-    dataset_name: Optional[str] = None
+    dataset_name: Optional[str] = None,
+    json_path: str = "",
+    sheets: str = ""
 ) -> Dict:
     """
-    Load dataset from various formats (CSV, Excel, JSON, Parquet).
+    Load dataset from various formats (CSV, Excel, JSON, JSON Lines, Parquet).
     
     Args:
         file_path: Path to data file
         dataset_name: Name for the dataset (optional)
+        json_path: JSONPath of the record array in a JSON document, e.g. "$.data.events[*]" (optional)
+        sheets: Comma-separated Excel sheet names to load and stack with a "sheet" column (optional, default first sheet)
     """
     logger.info(f"Tool load_business_dataset called with file_path='{file_path}' and dataset_name='{dataset_name}'")
     try:
@@ -140,34 +154,33 @@ async def load_business_dataset(
             
         # Load based on file extension
         if file_path.suffix.lower() == '.csv':
-            # Try different encodings for CSV files
-            encodings_to_try = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            data = None
-            encoding_used = None
-            
-            for encoding in encodings_to_try:
-                try:
-                    data = pd.read_csv(file_path, encoding=encoding)
-                    encoding_used = encoding
-                    logger.info(f"CSV file read successfully with encoding '{encoding}'")
-                    break
-                except UnicodeDecodeError:
-                    logger.warning(f"UnicodeDecodeError with encoding '{encoding}' for file '{file_path}'")
-                    continue
-                except Exception as e:
-                    if encoding == encodings_to_try[-1]:  # Last encoding attempt
-                        logger.error(f"Failed to read CSV with encoding '{encoding}': {e}")
-                        return {"error": f"Failed to read CSV: {str(e)}"}
-            
-            if data is None:
-                logger.error("Could not decode CSV file with any supported encoding")
-                return {"error": "Could not decode CSV file with any supported encoding"}
+            # Sniff encoding/delimiter once and parse in a single pass
+            try:
+                csv_result = read_csv_file(str(file_path), progress_callback=_log_ingest_progress)
+            except Exception as e:
+                logger.error(f"Failed to read CSV: {e}")
+                return {"error": f"Failed to read CSV: {str(e)}"}
+            data = csv_result["data"]
+            encoding_used = csv_result["encoding_used"]
+            ingest_stats = csv_result["ingest"]
+            logger.info(f"CSV file read successfully with encoding '{encoding_used}'")
                 
-        elif file_path.suffix.lower() in ['.xlsx', '.xls']:
-            data = pd.read_excel(file_path)
-            logger.info("Excel file read successfully")
-        elif file_path.suffix.lower() == '.json':
-            data = pd.read_json(file_path)
+        elif file_path.suffix.lower() in ['.xlsx', '.xlsm', '.xls']:
+            # Fast engine, selected sheets parsed in parallel, Parquet cache keyed on mtime
+            excel_result = await load_excel(str(file_path), {"sheets": sheets.split(",") if sheets else None,
+                                                             "combine_sheets": "concat" if sheets else "largest"})
+            data = excel_result["data"]
+            ingest_stats = excel_result["ingest"]
+            logger.info(f"Excel file read successfully ({excel_result['sheet_info']})")
+        elif file_path.suffix.lower() in ['.json', '.jsonl', '.ndjson']:
+            # Stream records into flattened columnar batches
+            reader = read_json_file if file_path.suffix.lower() == '.json' else read_jsonl_file
+            json_result = reader(str(file_path), {"json_path": json_path}, progress_callback=_log_ingest_progress)
+            if "error" in json_result:
+                logger.error(f"Failed to read JSON: {json_result['error']}")
+                return json_result
+            data = json_result["data"]
+            ingest_stats = json_result["ingest"]
             logger.info("JSON file read successfully")
         elif file_path.suffix.lower() == '.parquet':
             data = pd.read_parquet(file_path)
@@ -177,18 +190,17 @@ async def load_business_dataset(
             logger.error(err)
             return {"error": err}
         
-        # Store dataset in both memory and SQL database
-        store_dataset(dataset_name, data)
+        # Store dataset in both memory and SQL database, then report on the compacted frame
+        store_dataset(dataset_name, data, source_path=str(file_path))
+        data = get_dataset(dataset_name)
+        await _save_to_workspace("load_business_dataset", dataset_name, file_path,
+                                 {"json_path": json_path, "sheets": sheets})
         
-        # Verify SQL storage worked
+        # Verify SQL registration worked
         try:
-            conn = get_sql_database()
-            table_name = dataset_name.replace('-', '_').replace(' ', '_')
-            test_query = f"SELECT COUNT(*) as count FROM {table_name}"
-            test_result = pd.read_sql_query(test_query, conn)
-            conn.close()
-            sql_stored = True
-            logger.info(f"SQL storage verification succeeded for table '{table_name}'")
+            engine = get_sql_engine()
+            sql_stored = table_name_for(dataset_name) in engine.registered_tables()
+            logger.info(f"SQL registration verification for '{dataset_name}': {sql_stored}")
         except Exception as e:
             logger.error(f"SQL verification failed: {e}")
             sql_stored = False
@@ -202,16 +214,21 @@ async def load_business_dataset(
             "dtypes": {col: str(dtype) for col, dtype in data.dtypes.items()},
             "missing_values": {col: int(data[col].isnull().sum()) for col in data.columns},
             "memory_usage": f"{data.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB",
+            "memory_compaction": _dataset_store.get_store().entry(dataset_name).compaction(),
             "sample_data": data.head(3).to_dict('records'),
             "loaded_at": pd.Timestamp.now().isoformat()
         }
         
-        # Add encoding info for CSV files
-        if file_path.suffix.lower() == '.csv' and 'encoding_used' in locals():
+        # Add encoding and throughput info for CSV files
+        if file_path.suffix.lower() == '.csv':
             result["encoding_used"] = encoding_used
+            result["ingest"] = ingest_stats
+        elif file_path.suffix.lower() in ['.json', '.jsonl', '.ndjson', '.xlsx', '.xlsm', '.xls']:
+            result["ingest"] = ingest_stats
         
         # Add SQL storage status
         result["sql_database_stored"] = sql_stored
+        result["sql_backend"] = get_sql_engine().name
         logger.info(f"Dataset '{dataset_name}' loaded successfully with shape {data.shape}")
             
         return result
@@ -220,10 +237,56 @@ async def load_business_dataset(
         logger.exception(f"Failed to load dataset: {e}")
         return {"error": f"Failed to load dataset: {str(e)}"}
 
+async def _save_to_workspace(tool_name: str, dataset_name: str, file_path: Path, load_options: Dict):
+    """Snapshot a freshly loaded file dataset into the persistent workspace so it survives a restart."""
+    workspace = get_workspace()
+    if workspace is None:
+        return
+    suffix = file_path.suffix.lower()
+    if suffix == '.csv':
+        source_type, options = "csv", {}
+    elif suffix in ['.xlsx', '.xlsm', '.xls']:
+        sheets = load_options.get("sheets")
+        source_type, options = "excel", {"sheets": sheets.split(",") if sheets else None,
+                                         "combine_sheets": "concat" if sheets else "largest"}
+    elif suffix == '.json':
+        source_type, options = "json", {"json_path": load_options.get("json_path", "")}
+    elif suffix in ['.jsonl', '.ndjson']:
+        source_type, options = "jsonl", {"json_path": load_options.get("json_path", "")}
+    else:
+        source_type, options = "parquet", {}
+    try:
+        await get_executor().run_in_thread(tool_name, workspace.save, dataset_name, str(file_path),
+                                           source_type, options)
+    except Exception as e:
+        # The dataset is loaded either way; it just will not be restored on restart
+        logger.warning(f"Failed to save dataset '{dataset_name}' to the workspace: {e}")
+
+@mcp.tool()
+async def list_workbook_sheets(file_path: str) -> Dict:
+    """
+    List the sheets of an Excel workbook with their dimensions, without parsing any cells.
+    
+    Args:
+        file_path: Path to an .xlsx, .xlsm or .xls workbook
+    """
+    logger.info(f"Tool list_workbook_sheets called with file_path='{file_path}'")
+    if not Path(file_path).exists():
+        return {"error": f"File not found: {file_path}"}
+    try:
+        return {"file_path": file_path, "sheets": list_sheets(file_path)}
+    except Exception as e:
+        logger.error(f"Failed to list sheets of {file_path}: {e}")
+        return {"error": f"Failed to list sheets: {str(e)}"}
+
 @mcp.tool()
 async def execute_sql_query(
     dataset_name: str,
-    sql_query: str
+    sql_query: str,
+    params: Optional[Union[list, Dict]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_rows: int = 0,
+    result_format: str = "records"
 ) -> Dict:
     """
     Execute SQL query on loaded dataset.
@@ -231,11 +294,18 @@ async def execute_sql_query(
     Args:
         dataset_name: Name of loaded dataset
         sql_query: SQL query to execute
+        params: Query parameters bound to ? placeholders (list) or named placeholders (dict)
+        page_size: Rows per page; remaining rows are fetched with fetch_query_results (0 = no paging)
+        max_rows: Maximum rows to fetch (0 = no cap); total_rows always reports the exact count
+        result_format: "records" (row dicts), "columns" (value arrays per column) or "arrow" (base64 Arrow IPC)
     """
     logger.info(f"Tool execute_sql_query called with dataset_name='{dataset_name}' and sql_query='{sql_query}'")
     try:
+        if result_format not in RESULT_FORMATS:
+            return {"error": f"Unsupported result format: {result_format}. Supported: {', '.join(RESULT_FORMATS)}"}
+        
         # Check if dataset exists
-        if dataset_name not in _DATASET_STORAGE:
+        if dataset_name not in _dataset_store.get_store():
             available = list_datasets()
             err = f"Dataset '{dataset_name}' not found"
             logger.error(err)
@@ -245,37 +315,91 @@ async def execute_sql_query(
                 "suggestion": "Load dataset first using load_business_dataset tool"
             }
         
-        # Execute SQL query with table name substitution
-        conn = get_sql_database()
+        table_name = table_name_for(dataset_name)
         try:
-            table_name = dataset_name.replace('-', '_').replace(' ', '_')
-            modified_query = sql_query.replace(dataset_name, table_name)
-            result = pd.read_sql_query(modified_query, conn)
-            conn.close()
-            logger.info(f"SQL query executed successfully on table '{table_name}'")
-            return {
-                "dataset_name": dataset_name,
-                "sql_query": sql_query,
-                "modified_query": modified_query,
-                "table_name": table_name,
-                "result_shape": list(result.shape),
-                "result_columns": list(result.columns),
-                "result_data": result.to_dict('records'),
-                "executed_at": pd.Timestamp.now().isoformat()
-            }
+            query_result = await get_executor().run_in_thread(
+                "execute_sql_query", open_query, dataset_name, sql_query, params, page_size, max_rows
+            )
         except Exception as sql_error:
-            conn.close()
             logger.error(f"SQL execution failed: {sql_error}")
             return {
                 "error": f"SQL execution failed: {str(sql_error)}",
                 "sql_query": sql_query,
-                "table_name": dataset_name.replace('-', '_').replace(' ', '_'),
-                "suggestion": "Check SQL syntax and ensure table/column names are correct. Use table name: " + dataset_name.replace('-', '_').replace(' ', '_')
+                "table_name": table_name,
+                "suggestion": "Check SQL syntax and ensure table/column names are correct. Use table name: " + table_name
             }
+        
+        # The first page is served now; the rest was streamed server-side behind a cursor
+        page = query_result["page"]
+        cursor = query_result["cursor"]
+        next_cursor = cursor.token if cursor is not None else None
+        logger.info(f"SQL query executed successfully on table '{table_name}' with {query_result['backend']} backend")
+        
+        response = {
+            "dataset_name": dataset_name,
+            "sql_query": sql_query,
+            "modified_query": query_result["modified_query"],
+            "table_name": table_name,
+            "sql_backend": query_result["backend"],
+            "result_shape": list(page.shape),
+            "result_columns": list(page.columns),
+            "total_rows": query_result["total_rows"],
+            "truncated": query_result["truncated"],
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
+            "result_format": result_format,
+            "executed_at": pd.Timestamp.now().isoformat()
+        }
+        response.update(encode_frame(page, result_format))
+        return response
     except Exception as e:
         logger.exception(f"Query execution failed: {e}")
         return {"error": f"Query execution failed: {str(e)}"}
 
+@mcp.tool()
+async def fetch_query_results(
+    cursor: str,
+    result_format: str = "records"
+) -> Dict:
+    """
+    Fetch the next page of a paginated SQL query result.
+    
+    Args:
+        cursor: Continuation token returned as next_cursor by execute_sql_query
+        result_format: "records" (row dicts), "columns" (value arrays per column) or "arrow" (base64 Arrow IPC)
+    """
+    logger.info("Tool fetch_query_results called")
+    try:
+        if result_format not in RESULT_FORMATS:
+            return {"error": f"Unsupported result format: {result_format}. Supported: {', '.join(RESULT_FORMATS)}"}
+        
+        registry = get_cursor_registry()
+        page_result = registry.take_page(cursor)
+        if page_result is None:
+            return {
+                "error": "Query cursor not found or expired",
+                "suggestion": f"Re-run execute_sql_query; cursors expire after {int(registry.ttl_seconds)} seconds of inactivity"
+            }
+        
+        query_cursor = page_result["cursor"]
+        page = page_result["page"]
+        response = {
+            "dataset_name": query_cursor.dataset_name,
+            "sql_query": query_cursor.sql_query,
+            "result_shape": list(page.shape),
+            "result_columns": list(page.columns),
+            "total_rows": query_cursor.total_rows,
+            "rows_served": query_cursor.offset,
+            "has_more": page_result["has_more"],
+            "next_cursor": query_cursor.token if page_result["has_more"] else None,
+            "result_format": result_format
+        }
+        response.update(encode_frame(page, result_format))
+        return response
+    except Exception as e:
+        logger.exception(f"Fetching query results failed: {e}")
+        return {"error": f"Fetching query results failed: {str(e)}"}
+
 @mcp.tool()
 async def profile_dataset(
     dataset_name: str
@@ -287,14 +411,17 @@ async def profile_dataset(
         dataset_name: Name of loaded dataset
     """
     logger.info(f"Tool profile_dataset called for dataset '{dataset_name}'")
-    result = await profile_dataset_tool(dataset_name)
+    result = await cached_tool_call("profile_dataset", dataset_name, {}, lambda: profile_dataset_tool(dataset_name))
     logger.info(f"Dataset profiling completed for '{dataset_name}'")
     return result
 
 @mcp.tool()
 async def find_business_correlations(
     dataset_name: str,
-    min_correlation: float = 0.5
+    min_correlation: float = 0.5,
+    top_k: int = 0,
+    incremental: bool = False,
+    watermark_column: str = ""
 ) -> Dict:
     """
     Find correlations between numerical variables.
@@ -302,102 +429,56 @@ async def find_business_correlations(
     Args:
         dataset_name: Name of loaded dataset
         min_correlation: Minimum correlation threshold (0-1)
+        top_k: Return only the k strongest pairs at or above min_correlation (0 = all pairs)
+        incremental: Keep co-moment sums between calls and fold in only appended rows
+        watermark_column: Detect appended rows as those above this column's last value (default: by row count)
     """
     logger.info(f"Tool find_business_correlations called with dataset '{dataset_name}' and min_correlation={min_correlation}")
-    result = await run_correlation_tool(dataset_name, "pearson", "", [], min_correlation)
+    result = await cached_tool_call(
+        "run_correlation", dataset_name,
+        {"method": "pearson", "target_column": "", "columns": [], "threshold": min_correlation, "top_k": top_k,
+         "incremental": incremental, "watermark_column": watermark_column},
+        lambda: run_correlation_tool(dataset_name, "pearson", "", [], min_correlation, top_k, incremental, watermark_column)
+    )
     logger.info(f"Business correlations analysis completed for '{dataset_name}'")
     return result
 
 @mcp.tool()
 async def segment_business_data(
     dataset_name: str,
-    segment_column: str,
-    metric_columns: list
+    segment_column: Union[str, list],
+    metric_columns: list,
+    top_n: int = 0,
+    quantiles: Optional[List[float]] = None,
+    incremental: bool = False,
+    watermark_column: str = ""
 ) -> Dict:
     """
     Perform business segmentation analysis.
     
     Args:
         dataset_name: Name of loaded dataset
-        segment_column: Column to segment by
+        segment_column: Column (or list of columns) to segment by
         metric_columns: Metrics to analyze per segment
+        top_n: Keep only the N largest segments and merge the rest into other_segments (0 = all)
+        quantiles: Quantiles to report for numeric metrics, e.g. [0.25, 0.5, 0.75]
+        incremental: Keep per-segment totals between calls and aggregate only appended rows
+        watermark_column: Detect appended rows as those above this column's last value (default: by row count)
     """
     logger.info(f"Tool segment_business_data called with dataset '{dataset_name}', segment_column='{segment_column}', metric_columns={metric_columns}")
-    try:
-        data = get_dataset(dataset_name)
-        if data is None:
-            msg = f"Dataset '{dataset_name}' not found"
-            logger.error(msg)
-            return {"error": msg}
-        
-        if segment_column not in data.columns:
-            msg = f"Segment column '{segment_column}' not found in dataset"
-            logger.error(msg)
-            return {"error": msg}
-        
-        # Filter to only numeric metric columns that exist
-        available_metrics = []
-        for col in metric_columns:
-            if col in data.columns:
-                available_metrics.append(col)
-        
-        if not available_metrics:
-            msg = f"No valid metric columns found. Available columns: {list(data.columns)}"
-            logger.error(msg)
-            return {"error": msg}
-        
-        # Perform segmentation
-        segments = {}
-        for segment_value in data[segment_column].unique():
-            if pd.isna(segment_value):
-                continue
-            segment_data = data[data[segment_column] == segment_value]
-            segment_metrics = {}
-            for metric in available_metrics:
-                if pd.api.types.is_numeric_dtype(data[metric]):
-                    segment_metrics[metric] = {
-                        "count": int(segment_data[metric].count()),
-                        "mean": float(segment_data[metric].mean()) if segment_data[metric].count() > 0 else 0,
-                        "sum": float(segment_data[metric].sum()) if segment_data[metric].count() > 0 else 0,
-                        "min": float(segment_data[metric].min()) if segment_data[metric].count() > 0 else 0,
-                        "max": float(segment_data[metric].max()) if segment_data[metric].count() > 0 else 0
-                    }
-                else:
-                    segment_metrics[metric] = {
-                        "count": int(segment_data[metric].count()),
-                        "unique_values": int(segment_data[metric].nunique()),
-                        "most_common": str(segment_data[metric].mode().iloc[0]) if len(segment_data[metric].mode()) > 0 else "N/A"
-                    }
-            segments[str(segment_value)] = {
-                "size": len(segment_data),
-                "percentage": round((len(segment_data) / len(data)) * 100, 2),
-                "metrics": segment_metrics
-            }
-        
-        # Generate insights
-        insights = []
-        if segments:
-            largest_segment = max(segments.items(), key=lambda x: x[1]["size"])
-            insights.append(f"Largest segment: {largest_segment[0]} ({largest_segment[1]['percentage']}% of data)")
-            for metric in available_metrics:
-                if pd.api.types.is_numeric_dtype(data[metric]):
-                    highest_segment = max(segments.items(), key=lambda x: x[1]["metrics"].get(metric, {}).get("mean", 0))
-                    insights.append(f"Highest {metric}: {highest_segment[0]} (avg: {highest_segment[1]['metrics'][metric]['mean']:.2f})")
-        
-        result = {
-            "dataset_name": dataset_name,
-            "segment_column": segment_column,
-            "metric_columns": available_metrics,
-            "total_segments": len(segments),
-            "segments": segments,
-            "insights": insights
-        }
+    quantiles = list(quantiles or [])
+    result = await cached_tool_call(
+        "segment_business_data", dataset_name,
+        {"segment_column": segment_column, "metric_columns": metric_columns, "top_n": top_n, "quantiles": quantiles,
+         "incremental": incremental, "watermark_column": watermark_column},
+        lambda: segment_data_tool(dataset_name, segment_column, metric_columns, top_n, quantiles,
+                                  incremental, watermark_column)
+    )
+    if "error" in result:
+        logger.error(f"Segmentation failed for dataset '{dataset_name}': {result['error']}")
+    else:
         logger.info(f"Business segmentation analysis completed for dataset '{dataset_name}'")
-        return result
-        
-    except Exception as e:
-        logger.exception(f"Segmentation failed for dataset '{dataset_name}': {e}")
-        return {"error": f"Segmentation failed: {str(e)}"}
+    return result
 
 @mcp.tool()
 async def create_kpi_dashboard(
@@ -409,9 +490,23 @@ async def create_kpi_dashboard(
     
     Args:
         dataset_name: Name of loaded dataset
-        kpi_config: KPI configuration (optional)
+        kpi_config: KPI configuration (optional):
+            "metrics": numeric columns to report (default: all),
+            "aggregations": subset of sum, mean, max, min, count (default: all),
+            "time_column": datetime column for rollups (default: the first datetime column),
+            "grain": "hour", "day", "week", "month", "quarter", "year" or a list (default: day, week, month),
+            "rolling_window": periods in the trailing window deltas compare against (default 3),
+            "delta_aggregation": aggregation the deltas are computed on (default "sum"),
+            "max_periods": most recent periods returned per grain (default 30, 0 = all),
+            "incremental": keep running totals and time buckets between calls and aggregate only
+            appended rows, detected by row count or by "watermark_column"
     """
     logger.info(f"Tool create_kpi_dashboard called for dataset '{dataset_name}' with kpi_config: {kpi_config}")
+    return await cached_tool_call("create_kpi_dashboard", dataset_name, {"kpi_config": kpi_config},
+                                  lambda: _build_kpi_dashboard(dataset_name, kpi_config))
+
+async def _build_kpi_dashboard(dataset_name: str, kpi_config: Dict) -> Dict:
+    """Compute the KPI dashboard for a dataset."""
     try:
         data = get_dataset(dataset_name)
         if data is None:
@@ -419,29 +514,42 @@ async def create_kpi_dashboard(
             logger.error(msg)
             return {"error": msg}
         
-        # Generate KPIs for all numeric columns
-        kpis = {}
-        for column in data.columns:
-            if pd.api.types.is_numeric_dtype(data[column]):
-                kpis[column.replace('_', ' ').title()] = {
-                    "total": float(data[column].sum()) if not data[column].isnull().all() else 0,
-                    "average": float(data[column].mean()) if not data[column].isnull().all() else 0,
-                    "max": float(data[column].max()) if not data[column].isnull().all() else 0,
-                    "min": float(data[column].min()) if not data[column].isnull().all() else 0,
-                    "count": str(data[column].count())
-                }
+        try:
+            spec = KpiSpec.from_config(data, kpi_config)
+        except ValueError as e:
+            return {"error": str(e), "available_columns": list(data.columns)}
+        
+        # Totals and time buckets on a worker thread; both are reused between calls
+        incremental = bool(kpi_config.get("incremental"))
+        watermark_column = kpi_config.get("watermark_column", "")
+        executor = get_executor()
+        totals, update = await executor.run_in_thread(
+            "create_kpi_dashboard", kpi_totals, dataset_name, data, incremental, watermark_column)
+        rollups, buckets, rollup_cache = {}, None, None
+        if spec.grains:
+            buckets, rollup_cache = await executor.run_in_thread(
+                "create_kpi_dashboard", bucket_totals, dataset_name, data, spec, incremental, watermark_column)
+            rollups = await executor.run_in_thread("create_kpi_dashboard", build_rollups, buckets, spec)
         
+        kpis = format_kpis(totals, spec)
+        time_range = buckets.time_range() if buckets is not None else None
         result = {
             "dataset_name": dataset_name,
             "generated_at": pd.Timestamp.now().isoformat(),
             "kpis": kpis,
             "summary": {
-                "total_records": len(data),
-                "data_completeness": f"{(1 - data.isnull().sum().sum() / (len(data) * len(data.columns))) * 100:.1f}%",
+                "total_records": totals.rows,
+                "data_completeness": f"{totals.completeness() * 100:.1f}%",
                 "key_metrics": len(kpis),
-                "date_range": "N/A"
-            }
+                "date_range": f"{time_range[0].date()} to {time_range[1].date()}" if time_range else "N/A"
+            },
+            "config": spec.as_dict()
         }
+        if spec.grains:
+            result["rollups"] = rollups
+            result["rollup_cache"] = rollup_cache
+        if update is not None:
+            result["incremental"] = update
         logger.info(f"KPI dashboard generated for dataset '{dataset_name}'")
         return result
         
@@ -453,25 +561,103 @@ async def create_kpi_dashboard(
 async def export_analysis(
     dataset_name: str,
     export_format: str = "json",
-    include_visualizations: bool = False
+    include_visualizations: bool = False,
+    output_path: str = ""
 ) -> Dict:
     """
-    Export analysis results to various formats.
+    Export a dataset's rows or an analysis report to a file.
     
     Args:
         dataset_name: Name of loaded dataset
-        export_format: Export format: json, csv, excel, pdf
+        export_format: csv, parquet or excel (xlsx) write the rows in chunks; json, html, markdown or pdf write a report
         include_visualizations: Include visualizations
+        output_path: Output file (default: export_<dataset>_<timestamp>.<format> in the working directory)
     """
     logger.info(f"Tool export_analysis called for dataset '{dataset_name}' with format='{export_format}' and include_visualizations={include_visualizations}")
-    result = await export_report_tool({
-        "dataset_name": dataset_name,
-        "analysis_type": "export",
-        "include_visualizations": include_visualizations
-    }, export_format, "business", f"export_{dataset_name}_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.{export_format}")
+    if dataset_name not in _dataset_store.get_store():
+        return {
+            "error": f"Dataset '{dataset_name}' not found",
+            "available_datasets": list_datasets(),
+            "suggestion": "Load dataset first using load_business_dataset tool"
+        }
+    
+    table_format = normalize_format(export_format)
+    extension = table_format or export_format
+    output_path = output_path or f"export_{dataset_name}_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    try:
+        df = get_dataset(dataset_name)
+        if table_format:
+            result = await get_executor().run_in_thread("export_analysis", export_frame, df, output_path, table_format)
+            result["dataset_name"] = dataset_name
+        else:
+            result = await export_report_tool({
+                "dataset_name": dataset_name,
+                "analysis_type": "export",
+                "data_summary": {"rows": len(df), "columns": len(df.columns),
+                                 "column_names": ", ".join(str(col) for col in df.columns)},
+                "include_visualizations": include_visualizations
+            }, export_format, "standard", output_path)
+    except Exception as e:
+        logger.exception(f"Export of dataset '{dataset_name}' failed: {e}")
+        return {"error": f"Export failed: {str(e)}"}
     logger.info(f"Analysis export completed for dataset '{dataset_name}'")
     return result
 
+def _export_query(dataset_name: str, sql_query: str, params, output_path: str, export_format: str) -> Dict:
+    """Run a query and write its result batch by batch, so the full result is never materialized."""
+    query = run_query_batches(dataset_name, sql_query, params, export_chunk_rows())
+    try:
+        result = write_table(query["batches"], output_path, export_format)
+    finally:
+        query["batches"].close()
+    result.update({"sql_backend": query["backend"], "modified_query": query["modified_query"]})
+    return result
+
+@mcp.tool()
+async def export_query_results(
+    dataset_name: str,
+    sql_query: str,
+    export_format: str = "csv",
+    output_path: str = "",
+    params: Optional[Union[list, Dict]] = None
+) -> Dict:
+    """
+    Run a SQL query and stream its full result to a CSV, Parquet or Excel file.
+    
+    Args:
+        dataset_name: Name of loaded dataset
+        sql_query: SQL query to execute
+        export_format: csv, parquet or excel (xlsx)
+        output_path: Output file (default: query_<dataset>_<timestamp>.<format> in the working directory)
+        params: Query parameters bound to ? placeholders (list) or named placeholders (dict)
+    """
+    logger.info(f"Tool export_query_results called with dataset_name='{dataset_name}', format='{export_format}' and sql_query='{sql_query}'")
+    table_format = normalize_format(export_format)
+    if table_format is None:
+        return {"error": f"Unsupported export format: {export_format}. Supported: {', '.join(EXPORT_FORMATS)}"}
+    if dataset_name not in _dataset_store.get_store():
+        return {
+            "error": f"Dataset '{dataset_name}' not found",
+            "available_datasets": list_datasets(),
+            "suggestion": "Load dataset first using load_business_dataset tool"
+        }
+    
+    output_path = output_path or f"query_{dataset_name}_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.{table_format}"
+    try:
+        result = await get_executor().run_in_thread(
+            "export_query_results", _export_query, dataset_name, sql_query, params, output_path, table_format
+        )
+    except Exception as e:
+        logger.exception(f"Query export failed: {e}")
+        return {
+            "error": f"Query export failed: {str(e)}",
+            "sql_query": sql_query,
+            "suggestion": "Check SQL syntax and ensure table/column names are correct. Use table name: " + table_name_for(dataset_name)
+        }
+    result.update({"dataset_name": dataset_name, "sql_query": sql_query})
+    logger.info(f"Query result of '{dataset_name}' exported to {result.get('output_path')}")
+    return result
+
 # Original tools for backward compatibility
 @mcp.tool()
 async def load_datasource(
@@ -480,12 +666,121 @@ async def load_datasource(
     source_type: str = "auto",
     options: Dict = None
 ) -> Dict:
-    """ETL from various sources (CSV, Excel, JSON, databases)."""
+    """ETL from various sources (CSV, Excel, JSON, databases).
+
+    Options "columns", "filters" ([[column, op, value], ...]) and "limit" are pushed down
+    into SQLite and Parquet sources; "lazy": true registers them without reading rows.
+    """
     logger.info(f"Tool load_datasource called with source_path='{source_path}', dataset_name='{dataset_name}', source_type='{source_type}'")
     result = await load_datasource_tool(source_path, source_type, dataset_name, options or {})
     logger.info(f"Datasource loaded for dataset '{dataset_name}'")
     return result
 
+@mcp.tool()
+async def join_datasets(
+    view_name: str,
+    datasets: List[str],
+    on: Union[str, List[str], Dict[str, Union[str, List[str]]]],
+    how: str = "inner",
+    columns: Optional[Dict[str, List[str]]] = None,
+    direction: str = "backward",
+    tolerance: str = "",
+    strategy: str = "auto",
+    materialize: bool = False
+) -> Dict:
+    """
+    Define a named view joining two or more loaded datasets; every tool accepts the view name as a dataset.
+
+    The view is built only when a tool needs its rows (or now, with materialize), and rebuilt
+    after any of its datasets is reloaded. SQL queries on it run as a join inside the SQL engine.
+
+    Args:
+        view_name: Name of the view
+        datasets: Datasets to join, left to right (files in the data directory are loaded on demand)
+        on: Key column(s) shared by all datasets, or a dict of key columns per dataset
+        how: "inner", "left", "right", "outer" or "asof" (align on the last key, e.g. a timestamp)
+        columns: Columns to keep per dataset (optional, default all); clashing names get a dataset suffix
+        direction: As-of match direction: "backward", "forward" or "nearest"
+        tolerance: Largest as-of gap, e.g. "2h" for timestamps or a number (optional)
+        strategy: "auto", "hash" or "sort_merge" (single numeric or datetime key)
+        materialize: Build the view now instead of on first use
+    """
+    logger.info(f"Tool join_datasets called for view '{view_name}' over {datasets} ({how} join on {on})")
+    store = _dataset_store.get_store()
+    if view_name in store and not store.entry(view_name).depends_on:
+        return {"error": f"'{view_name}' is already a loaded dataset; choose another view name"}
+
+    executor = get_executor()
+    for dataset in datasets or []:
+        if dataset not in store:
+            await executor.run_in_thread("join_datasets", _dataset_store.resolve_dataset, dataset)
+    missing = [dataset for dataset in datasets or [] if dataset not in store]
+    if missing:
+        return {"error": f"Datasets not found: {missing}", "available_datasets": list_datasets()}
+
+    available = {dataset: store.entry(dataset).columns for dataset in datasets}
+    try:
+        spec = JoinSpec.from_request(view_name, datasets, on, available, how=how, columns=columns,
+                                     strategy=strategy, direction=direction, tolerance=tolerance)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    entry = define_view(spec)
+    result = {
+        **spec.describe(),
+        "columns": entry.columns,
+        "sql_pushdown": get_sql_engine().name == "duckdb" and view_sql_for(view_name, table_name_for) is not None,
+        "materialized": False,
+        "estimated_rows": entry.rows
+    }
+    if materialize:
+        try:
+            data = await executor.run_in_thread("join_datasets", get_dataset, view_name)
+        except Exception as e:
+            logger.error(f"Building view '{view_name}' failed: {e}")
+            return {"error": f"Failed to build view: {str(e)}", "view_name": view_name}
+        result.update({"materialized": True, "rows": len(data), "columns": list(data.columns),
+                       "memory_usage": f"{data.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB"})
+        result.pop("estimated_rows")
+    logger.info(f"View '{view_name}' defined over {datasets}")
+    return result
+
+@mcp.tool()
+async def workspace_status() -> Dict:
+    """Show the persisted workspace: saved datasets, their snapshots and whether their sources changed."""
+    logger.info("Tool workspace_status called")
+    workspace = get_workspace()
+    if workspace is None:
+        return {"enabled": False, "dataset_store": _dataset_store.get_store().stats()}
+    return {"enabled": True, **workspace.describe(), "dataset_store": _dataset_store.get_store().stats(),
+            "result_cache": get_result_cache().stats()}
+
+@mcp.tool()
+async def unload_dataset(dataset_name: str) -> Dict:
+    """
+    Drop a dataset from memory, the SQL engine, the result cache and the persisted workspace.
+
+    Args:
+        dataset_name: Name of the dataset to unload
+    """
+    logger.info(f"Tool unload_dataset called for dataset '{dataset_name}'")
+    workspace = get_workspace()
+    in_workspace = workspace is not None and workspace.entry(dataset_name) is not None
+    if dataset_name not in _dataset_store.get_store() and not in_workspace:
+        return {"error": f"Dataset '{dataset_name}' not found. Load it first using load_business_dataset."}
+    get_sql_engine().unregister(dataset_name)
+    removed = _dataset_store.get_store().remove(dataset_name)
+    drop_view(dataset_name)
+    cached = get_result_cache().invalidate(dataset_name)
+    if in_workspace:
+        workspace.remove(dataset_name)
+    return {
+        "dataset_name": dataset_name,
+        "unloaded": removed,
+        "removed_from_workspace": in_workspace,
+        "cached_results_dropped": cached
+    }
+
 @mcp.tool()
 async def create_visualization(
     dataset_name: str,
@@ -494,7 +789,9 @@ async def create_visualization(
     y_column: str = "",
     group_by: str = "",
     title: str = "",
-    output_path: str = ""
+    output_path: str = "",
+    output_format: str = "png",
+    dpi: int = 0
 ) -> Dict:
     """
     Generate charts, dashboards, and interactive visualizations.
@@ -507,9 +804,12 @@ async def create_visualization(
         group_by: Column to group/color by
         title: Chart title
         output_path: Where to save visualization
+        output_format: png, webp or svg image, or vega-lite for a JSON chart spec
+        dpi: Image resolution (default: BI_CHART_DPI, screen resolution)
     """
-    logger.info(f"Tool create_visualization called for dataset '{dataset_name}', chart_type='{chart_type}'")
-    result = await create_visualization_tool(dataset_name, chart_type, x_column, y_column, group_by, title, output_path)
+    logger.info(f"Tool create_visualization called for dataset '{dataset_name}', chart_type='{chart_type}', output_format='{output_format}'")
+    result = await create_visualization_tool(dataset_name, chart_type, x_column, y_column, group_by, title, output_path,
+                                             output_format, dpi)
     logger.info(f"Visualization generated for dataset '{dataset_name}'")
     return result
 
@@ -519,7 +819,8 @@ async def run_correlation(
     method: str = "pearson",
     target_column: str = "",
     columns: list = None,
-    threshold: float = 0.3
+    threshold: float = 0.3,
+    top_k: int = 0
 ) -> Dict:
     """
     Statistical correlation analysis with business interpretation.
@@ -530,9 +831,14 @@ async def run_correlation(
         target_column: Target variable for correlation
         columns: Specific columns to analyze
         threshold: Correlation significance threshold
+        top_k: Return only the k strongest pairs at or above the threshold (0 = all pairs)
     """
     logger.info(f"Tool run_correlation called for dataset '{dataset_name}' with method='{method}', target_column='{target_column}', threshold={threshold}")
-    result = await run_correlation_tool(dataset_name, method, target_column, columns or [], threshold)
+    result = await cached_tool_call(
+        "run_correlation", dataset_name,
+        {"method": method, "target_column": target_column, "columns": columns or [], "threshold": threshold, "top_k": top_k},
+        lambda: run_correlation_tool(dataset_name, method, target_column, columns or [], threshold, top_k)
+    )
     logger.info(f"Correlation analysis completed for dataset '{dataset_name}'")
     return result
 
@@ -578,6 +884,64 @@ async def schedule_analysis(
     logger.info("Analysis schedule set successfully")
     return result
 
+@mcp.tool()
+async def list_scheduled_analyses() -> Dict:
+    """List scheduled analyses with their status and next/last run times."""
+    logger.info("Tool list_scheduled_analyses called")
+    schedules = await list_schedules()
+    return {"schedules": schedules, "count": len(schedules), "scheduler_running": get_scheduler().running}
+
+@mcp.tool()
+async def scheduled_analysis_history(
+    schedule_id: str = "",
+    limit: int = 20,
+    run_now: bool = False
+) -> Dict:
+    """
+    Show the run history of scheduled analyses, optionally running one immediately.
+    
+    Args:
+        schedule_id: Schedule to inspect (empty = all schedules)
+        limit: Maximum number of runs to return, newest first
+        run_now: Execute the schedule now before returning its history
+    """
+    logger.info(f"Tool scheduled_analysis_history called for schedule '{schedule_id}' (run_now={run_now})")
+    if run_now:
+        if not schedule_id:
+            return {"error": "run_now requires a schedule_id"}
+        run = await run_schedule_now(schedule_id)
+        if "status" not in run:
+            return run
+    return await get_schedule_history(schedule_id, limit)
+
+def _register_schedule_runners(scheduler) -> None:
+    """Map schedulable analysis types to the tools that execute them."""
+    scheduler.register_runner("profiling", lambda cfg: profile_dataset(cfg["dataset_name"]))
+    # Scheduled runs over growing datasets update saved state from the appended rows unless configured otherwise
+    scheduler.register_runner("correlation", lambda cfg: find_business_correlations(
+        cfg["dataset_name"], cfg.get("min_correlation", 0.5), cfg.get("top_k", 0),
+        cfg.get("incremental", True), cfg.get("watermark_column", "")))
+    scheduler.register_runner("kpi", lambda cfg: create_kpi_dashboard(
+        cfg["dataset_name"], {"incremental": cfg.get("incremental", True), "watermark_column": cfg.get("watermark_column", ""),
+                              **cfg.get("kpi_config", {})}))
+    scheduler.register_runner("segmentation", lambda cfg: segment_business_data(
+        cfg["dataset_name"], cfg["segment_column"], cfg.get("metric_columns", []), cfg.get("top_n", 0),
+        cfg.get("quantiles", []), cfg.get("incremental", True), cfg.get("watermark_column", "")))
+    scheduler.register_runner("visualization", lambda cfg: create_visualization(
+        cfg["dataset_name"], cfg.get("chart_type", "dashboard"), cfg.get("x_column", ""), cfg.get("y_column", ""),
+        cfg.get("group_by", ""), cfg.get("title", ""), cfg.get("output_path", ""), cfg.get("output_format", "png")))
+    scheduler.register_runner("trend", _run_scheduled_trend)
+
+async def _run_scheduled_trend(cfg: Dict) -> Dict:
+    """Time-series analysis (trend, seasonality, anomalies, forecast) of a stored dataset."""
+    df = await get_executor().run_in_thread("trend_analysis", _dataset_store.resolve_dataset, cfg["dataset_name"])
+    if df is None:
+        return {"error": f"Dataset '{cfg['dataset_name']}' not found"}
+    try:
+        return await analyze_time_series(df, cfg.get("time_column", ""), cfg.get("metrics") or None, cfg.get("options"))
+    except ValueError as e:
+        return {"error": str(e)}
+
 # =============================================================================
 # PROMPTS (User-controlled agentic workflows)
 # =============================================================================
@@ -0,0 +1,458 @@
+"""
+API Source
+Paginated HTTP data source with a shared connection pool and a conditional disk cache.
+"""
+
+import io
+import os
+import json
+import math
+import time
+import asyncio
+import hashlib
+import logging
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+import pandas as pd
+
+from src.core.json_ingest import _batch_frame, _select_records, parse_json_path
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "state" / "http_cache"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_TIMEOUT_SECONDS = 30.0
+MAX_PAGES = 1000
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+PAGINATION_STYLES = ["none", "offset", "page", "cursor", "link"]
+
+
+@dataclass
+class ApiPage:
+    """One HTTP response body with what pagination needs from its headers."""
+    url: str
+    body: bytes
+    content_type: str
+    links: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body and the validators used to revalidate it."""
+    url: str
+    content_type: str
+    etag: str = ""
+    last_modified: str = ""
+    links: Dict[str, str] = field(default_factory=dict)
+    expires_at: float = 0.0
+    body: bytes = b""
+
+
+class HttpCache:
+    """
+    Response bodies on disk keyed by URL, query parameters, request headers and credentials.
+
+    Responses with an ETag or Last-Modified validator are revalidated with a
+    conditional request; a Cache-Control max-age serves them without a request
+    until it runs out.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or os.getenv("BI_HTTP_CACHE_DIR", "") or DEFAULT_CACHE_DIR)
+
+    def key(self, url: str, params: Dict[str, Any], headers: Dict[str, str], auth: Any = None) -> str:
+        # Credentials only ever enter the hash, so different users never share a response
+        credentials = [str(part) for part in auth] if isinstance(auth, (list, tuple)) else (None if auth is None else str(auth))
+        normalized = json.dumps([url, sorted((str(k), str(v)) for k, v in params.items()),
+                                 sorted((k.lower(), str(v)) for k, v in headers.items()), credentials])
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(key)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            meta = json.loads(meta_path.read_text())
+            return CachedResponse(body=body_path.read_bytes(), **meta)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Discarding unreadable HTTP cache entry {key[:12]}: {e}")
+            return None
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        meta_path, body_path = self._paths(key)
+        meta = {name: getattr(response, name)
+                for name in ("url", "content_type", "etag", "last_modified", "links", "expires_at")}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for path, data in ((body_path, response.body), (meta_path, json.dumps(meta).encode())):
+                tmp_path = path.with_suffix(path.suffix + ".tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache response for {response.url}: {e}")
+
+    def clear(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+        removed = 0
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+            path.with_suffix(".body").unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+
+class ApiFetcher:
+    """Issues GET requests through the shared client with bounded concurrency, retries and the disk cache."""
+
+    def __init__(self, options: Dict[str, Any], cache: Optional[HttpCache] = None):
+        self.headers = dict(options.get("headers") or {})
+        auth = options.get("auth")
+        self.auth = tuple(auth) if isinstance(auth, (list, tuple)) else auth
+        self.timeout = float(options.get("timeout", DEFAULT_TIMEOUT_SECONDS))
+        self.max_retries = int(options.get("max_retries", MAX_RETRIES))
+        self.use_cache = options.get("cache", True)
+        self.cache = cache or HttpCache()
+        concurrency = int(options.get("concurrency") or os.getenv("BI_HTTP_CONCURRENCY", DEFAULT_CONCURRENCY))
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.concurrency = max(1, concurrency)
+        self.stats = {"requests": 0, "not_modified": 0, "fresh_cache_hits": 0, "retries": 0, "bytes_downloaded": 0}
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> ApiPage:
+        params = dict(params or {})
+        key = self.cache.key(url, params, self.headers, self.auth)
+        cached = self.cache.get(key) if self.use_cache else None
+        if cached is not None and cached.expires_at > time.time():
+            self.stats["fresh_cache_hits"] += 1
+            return ApiPage(cached.url, cached.body, cached.content_type, cached.links, from_cache=True)
+
+        headers = dict(self.headers)
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self._request(url, params, headers)
+        expires_at = time.time() + _max_age(response.headers.get("cache-control", ""))
+        if response.status_code == 304 and cached is not None:
+            self.stats["not_modified"] += 1
+            cached.expires_at = expires_at
+            self.cache.put(key, cached)
+            return ApiPage(cached.url, cached.body, cached.content_type, cached.links, from_cache=True)
+        response.raise_for_status()
+
+        body = response.content
+        self.stats["bytes_downloaded"] += len(body)
+        page = ApiPage(
+            url=str(response.url),
+            body=body,
+            content_type=response.headers.get("content-type", "").lower(),
+            links={rel: urljoin(str(response.url), link["url"]) for rel, link in response.links.items()}
+        )
+        etag, last_modified = response.headers.get("etag", ""), response.headers.get("last-modified", "")
+        if self.use_cache and (etag or last_modified or expires_at > time.time()):
+            self.cache.put(key, CachedResponse(page.url, page.content_type, etag, last_modified,
+                                               page.links, expires_at, body))
+        return page
+
+    async def _request(self, url: str, params: Dict[str, Any], headers: Dict[str, str]):
+        import httpx
+
+        client = get_http_client()
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.stats["requests"] += 1
+                    response = await client.get(url, params=params or None, headers=headers,
+                                                auth=self.auth, timeout=self.timeout)
+                except httpx.TransportError:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = RETRY_BACKOFF_SECONDS * 2 ** attempt
+                else:
+                    if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                        return response
+                    delay = _retry_after(response.headers.get("retry-after"), RETRY_BACKOFF_SECONDS * 2 ** attempt)
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+
+
+async def fetch_api(url: str, options: Optional[Dict[str, Any]] = None,
+                    cache: Optional[HttpCache] = None) -> Dict[str, Any]:
+    """
+    Fetch every page of an API endpoint and decode it into one frame.
+
+    options["pagination"] selects the style: "offset" and "page" (numbered pages,
+    fetched concurrently), "cursor" (a next cursor in the body) or "link" (Link
+    headers, fetched concurrently when a rel="last" link gives the page count);
+    "none" fetches a single response. Each page is decoded into a columnar batch as
+    soon as it arrives.
+    """
+
+    options = dict(options or {})
+    pagination = options.get("pagination", "none")
+    if pagination not in PAGINATION_STYLES:
+        raise ValueError(f"Unsupported pagination '{pagination}'. Supported: {PAGINATION_STYLES}")
+
+    started = time.perf_counter()
+    fetcher = ApiFetcher(options, cache)
+    decoder = _PageDecoder(options)
+    params = dict(options.get("params") or {})
+
+    if pagination in ("offset", "page"):
+        batches = await _fetch_numbered(url, params, options, fetcher, decoder, pagination)
+    elif pagination == "cursor":
+        batches = await _fetch_cursor(url, params, options, fetcher, decoder)
+    elif pagination == "link":
+        batches = await _fetch_links(url, params, options, fetcher, decoder)
+    else:
+        batches = [decoder.decode(await fetcher.get(url, params))]
+
+    df = _concat_batches(batches)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    ingest = {
+        "engine": "httpx",
+        "pages": len(batches),
+        "rows": len(df),
+        "columns": len(df.columns),
+        **fetcher.stats,
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(len(df) / elapsed, 1)
+    }
+    logger.info(f"Fetched {url}: {len(batches)} pages, {len(df)} rows in {ingest['seconds']}s "
+                f"({fetcher.stats['requests']} requests, {fetcher.stats['not_modified']} not modified)")
+    return {
+        "data": df,
+        "api_info": f"{len(batches)} pages ({pagination} pagination), {fetcher.stats['requests']} requests, "
+                    f"Content-Type: {decoder.content_type}",
+        "load_method": "httpx.AsyncClient",
+        "ingest": ingest
+    }
+
+
+async def _fetch_numbered(url: str, params: Dict[str, Any], options: Dict[str, Any], fetcher: ApiFetcher,
+                          decoder: "_PageDecoder", style: str) -> List[pd.DataFrame]:
+    """
+    Offset or page-number pagination.
+
+    With options["total_path"] the first page gives the record count and the rest
+    are fetched at once; otherwise pages are fetched in waves of the concurrency
+    limit until one comes back short.
+    """
+
+    page_size = int(options.get("page_size", DEFAULT_PAGE_SIZE))
+    max_pages = int(options.get("max_pages", MAX_PAGES))
+    if style == "offset":
+        position_param, size_param = options.get("offset_param", "offset"), options.get("limit_param", "limit")
+        first, step = int(options.get("start_offset", 0)), page_size
+    else:
+        position_param, size_param = options.get("page_param", "page"), options.get("size_param", "per_page")
+        first, step = int(options.get("start_page", 1)), 1
+
+    def page_params(index: int) -> Dict[str, Any]:
+        return {**params, position_param: first + index * step, size_param: page_size}
+
+    async def fetch(index: int) -> Tuple[pd.DataFrame, Any]:
+        page = await fetcher.get(url, page_params(index))
+        return decoder.decode(page), decoder.last_document
+
+    batch, document = await fetch(0)
+    batches = [batch]
+    total = _lookup(document, options.get("total_path", ""))
+    if total is not None:
+        pages = min(max_pages, math.ceil(int(total) / page_size))
+        results = await asyncio.gather(*(fetch(index) for index in range(1, pages)))
+        return batches + [batch for batch, _ in results]
+
+    index = 1
+    while len(batches[-1]) >= page_size and index < max_pages:
+        wave = range(index, min(index + fetcher.concurrency, max_pages))
+        results = await asyncio.gather(*(fetch(i) for i in wave))
+        for batch, _ in results:
+            batches.append(batch)
+            if len(batch) < page_size:
+                break
+        index = wave.stop
+    return [batch for batch in batches if len(batch)] or batches[:1]
+
+
+async def _fetch_cursor(url: str, params: Dict[str, Any], options: Dict[str, Any], fetcher: ApiFetcher,
+                        decoder: "_PageDecoder") -> List[pd.DataFrame]:
+    """Cursor pagination: each page names the next one, so pages are fetched in sequence."""
+
+    cursor_path = options.get("cursor_path", "next_cursor")
+    cursor_param = options.get("cursor_param", "cursor")
+    max_pages = int(options.get("max_pages", MAX_PAGES))
+
+    batches = [decoder.decode(await fetcher.get(url, params))]
+    cursor = _lookup(decoder.last_document, cursor_path)
+    while cursor not in (None, "") and len(batches) < max_pages:
+        batches.append(decoder.decode(await fetcher.get(url, {**params, cursor_param: cursor})))
+        cursor = _lookup(decoder.last_document, cursor_path)
+    return batches
+
+
+async def _fetch_links(url: str, params: Dict[str, Any], options: Dict[str, Any], fetcher: ApiFetcher,
+                       decoder: "_PageDecoder") -> List[pd.DataFrame]:
+    """Link-header pagination, concurrent when the next and last links differ only in a page number."""
+
+    max_pages = int(options.get("max_pages", MAX_PAGES))
+    page = await fetcher.get(url, params)
+    batches = [decoder.decode(page)]
+
+    urls = _numbered_links(page.links.get("next"), page.links.get("last"), max_pages - 1)
+    if urls:
+        pages = await asyncio.gather(*(fetcher.get(link) for link in urls))
+        return batches + [decoder.decode(page) for page in pages]
+
+    seen = {page.url}
+    while page.links.get("next") and page.links["next"] not in seen and len(batches) < max_pages:
+        page = await fetcher.get(page.links["next"])
+        seen.add(page.url)
+        batches.append(decoder.decode(page))
+    return batches
+
+
+class _PageDecoder:
+    """Decodes JSON or CSV response bodies into flattened columnar batches."""
+
+    def __init__(self, options: Dict[str, Any]):
+        records_path = options.get("records_path", "")
+        self.keys = parse_json_path(records_path) if records_path else None
+        self.format = options.get("format", "auto")
+        self.content_type = ""
+        self.last_document: Any = None
+
+    def decode(self, page: ApiPage) -> pd.DataFrame:
+        self.content_type = page.content_type or self.content_type
+        if self.format == "csv" or (self.format == "auto" and _is_csv(page)):
+            self.last_document = None
+            return _csv_batch(page.body)
+        self.last_document = json.loads(page.body) if page.body.strip() else []
+        records, _ = _select_records(self.last_document, self.keys)
+        return _batch_frame(records)
+
+
+def _is_csv(page: ApiPage) -> bool:
+    if "csv" in page.content_type or "text/plain" in page.content_type:
+        return True
+    return "json" not in page.content_type and page.body.lstrip()[:1] not in (b"{", b"[")
+
+
+def _csv_batch(body: bytes) -> pd.DataFrame:
+    try:
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return pd.read_csv(io.BytesIO(body))
+    reader = pa_csv.open_csv(io.BytesIO(body))
+    return reader.read_all().to_pandas(split_blocks=True)
+
+
+def _concat_batches(batches: List[pd.DataFrame]) -> pd.DataFrame:
+    batches = [batch for batch in batches if len(batch.columns)] or [pd.DataFrame()]
+    if len(batches) == 1:
+        return batches[0]
+    columns: List[str] = []
+    for batch in batches:
+        columns += [name for name in batch.columns if name not in columns]
+    return pd.concat(batches, ignore_index=True, copy=False)[columns]
+
+
+def _lookup(document: Any, path: str) -> Any:
+    """Value at a dotted path in a decoded body, or None."""
+
+    if not path or document is None:
+        return None
+    node = document
+    for key in parse_json_path(path):
+        if not isinstance(node, dict) or key not in node:
+            return None
+        node = node[key]
+    return node
+
+
+def _numbered_links(next_url: Optional[str], last_url: Optional[str], limit: int) -> List[str]:
+    """URLs from next through last when they differ only in one integer query parameter."""
+
+    if not next_url or not last_url or limit <= 0:
+        return []
+    next_parts, last_parts = urlsplit(next_url), urlsplit(last_url)
+    if next_parts[:3] != last_parts[:3]:
+        return []
+    next_query, last_query = parse_qsl(next_parts.query), parse_qsl(last_parts.query)
+    if [k for k, _ in next_query] != [k for k, _ in last_query]:
+        return []
+    differing = [i for i, (a, b) in enumerate(zip(next_query, last_query)) if a != b]
+    if len(differing) != 1:
+        return []
+    position = differing[0]
+    try:
+        start, stop = int(next_query[position][1]), int(last_query[position][1])
+    except ValueError:
+        return []
+    urls = []
+    for number in range(start, min(stop, start + limit - 1) + 1):
+        query = list(next_query)
+        query[position] = (query[position][0], str(number))
+        urls.append(urlunsplit(next_parts._replace(query=urlencode(query))))
+    return urls
+
+
+def _max_age(cache_control: str) -> float:
+    for directive in cache_control.lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "no-cache" or name == "no-store":
+            return 0.0
+        if name == "max-age" and value.strip().isdigit():
+            return float(value.strip())
+    return 0.0
+
+
+def _retry_after(value: Optional[str], default: float) -> float:
+    try:
+        return min(float(value), 60.0) if value else default
+    except ValueError:
+        return default
+
+
+# One connection pool per event loop, shared by every API load on it
+
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client():
+    """Return the shared httpx client of the running event loop."""
+
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        connections = int(os.getenv("BI_HTTP_MAX_CONNECTIONS", DEFAULT_CONCURRENCY * 2))
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+            timeout=DEFAULT_TIMEOUT_SECONDS,
+            follow_redirects=True
+        )
+        _CLIENTS[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running event loop's shared client, if one was opened."""
+
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
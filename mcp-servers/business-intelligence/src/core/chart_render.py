@@ -0,0 +1,216 @@
+"""
+Chart Rendering
+Pooled Agg figures, point-budget reduction and output encoding for BI charts.
+"""
+
+import os
+import json
+import base64
+import logging
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from matplotlib import cbook
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_DPI = 100                 # screen resolution; 300 dpi quadruples pixels for no on-screen gain
+DEFAULT_POINT_BUDGET = 2_000      # points drawn per line chart, shared across its series
+MIN_SERIES_POINTS = 200
+HEXBIN_THRESHOLD = 50_000         # scatters above this many points are drawn as hexagonal bins
+SCATTER_SAMPLE_SIZE = 5_000       # points kept for grouped scatters and scatter specs of large data
+KDE_SAMPLE_SIZE = 20_000          # rows kept for kernel density (violin) estimates
+MAX_FLIERS = 200                  # outlier markers drawn per box, split between both tails
+FIGURES_PER_SIZE = 2
+
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+OUTPUT_FORMATS = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "svg": "image/svg+xml",
+    "vega-lite": "application/vnd.vegalite.v5+json"
+}
+RASTER_QUALITY = {"webp": {"quality": 80, "method": 4}}
+
+
+def chart_dpi(dpi: int = 0) -> int:
+    """Requested DPI, else BI_CHART_DPI, else screen resolution."""
+    return dpi if dpi > 0 else int(os.getenv("BI_CHART_DPI", DEFAULT_DPI))
+
+
+def point_budget() -> int:
+    return max(MIN_SERIES_POINTS, int(os.getenv("BI_CHART_MAX_POINTS", DEFAULT_POINT_BUDGET)))
+
+
+class FigurePool:
+    """
+    Reusable Agg figures keyed by size.
+
+    Figures are created without pyplot, so they never enter its global figure
+    registry, and are cleared and kept on release so later charts of the same
+    size skip figure and canvas construction.
+    """
+
+    def __init__(self, per_size: int = FIGURES_PER_SIZE):
+        self.per_size = per_size
+        self._free: Dict[Tuple[float, float], List[Figure]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @contextmanager
+    def figure(self, figsize: Tuple[float, float], nrows: int = 1, ncols: int = 1) -> Iterator[Tuple[Figure, Any]]:
+        """Yield a cleared figure and its axes (an array of axes for a grid)."""
+
+        key = (float(figsize[0]), float(figsize[1]))
+        with self._lock:
+            free = self._free.get(key)
+            fig = free.pop() if free else None
+            if fig is None:
+                self.created += 1
+            else:
+                self.reused += 1
+        if fig is None:
+            fig = Figure(figsize=key)
+            FigureCanvasAgg(fig)
+        try:
+            yield fig, fig.subplots(nrows, ncols)
+        finally:
+            fig.clf()
+            with self._lock:
+                free = self._free.setdefault(key, [])
+                if len(free) < self.per_size:
+                    free.append(fig)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"created": self.created, "reused": self.reused,
+                    "pooled": sum(len(figs) for figs in self._free.values())}
+
+
+def encode_figure(fig: Figure, output_format: str = "png", dpi: int = 0) -> Dict[str, Any]:
+    """Render a figure to PNG, WebP or SVG and base64-encode it."""
+
+    dpi = chart_dpi(dpi)
+    buffer = BytesIO()
+    options = {"pil_kwargs": RASTER_QUALITY[output_format]} if output_format in RASTER_QUALITY else {}
+    fig.savefig(buffer, format=output_format, dpi=dpi, bbox_inches="tight", **options)
+    payload = buffer.getvalue()
+    return {
+        "chart_image": base64.b64encode(payload).decode(),
+        "image_format": output_format,
+        "mime_type": OUTPUT_FORMATS[output_format],
+        "dpi": dpi,
+        "payload_bytes": len(payload)
+    }
+
+
+def vega_lite_spec(mark: Any, data: pd.DataFrame, encoding: Dict[str, Any], title: str,
+                   **extra: Any) -> Dict[str, Any]:
+    """A self-contained Vega-Lite spec with inline data records."""
+
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "title": title,
+        "data": {"values": json.loads(data.to_json(orient="records", date_format="iso"))},
+        "mark": mark,
+        "encoding": encoding,
+        **extra
+    }
+
+
+def axis_values(series: pd.Series) -> np.ndarray:
+    """Numeric positions for an x axis: numbers as-is, datetimes as ns, anything else by position."""
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype="datetime64[ns]").view(np.int64).astype(np.float64)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=np.float64)
+    return np.arange(len(series), dtype=np.float64)
+
+
+def minmax_indices(y: np.ndarray, n_bins: int) -> np.ndarray:
+    """Positions of each bin's minimum and maximum, keeping every peak and trough visible."""
+
+    n = len(y)
+    if n <= 2 * n_bins:
+        return np.arange(n)
+    width = -(-n // n_bins)
+    padded = np.full(width * -(-n // width), np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(-1, width)
+    offsets = np.arange(blocks.shape[0]) * width
+    keep = np.concatenate([offsets + np.nanargmin(blocks, axis=1), offsets + np.nanargmax(blocks, axis=1), [0, n - 1]])
+    return np.unique(keep)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: the n_out points that best preserve the line's shape."""
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        next_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        area = np.abs((x[prev] - next_x) * (y[start:stop] - y[prev]) - (x[prev] - x[start:stop]) * (next_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def downsample_line(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """
+    Indices of at most budget points that keep the shape of the line (x sorted).
+
+    Very long series are first cut to each bin's extremes (min-max), which is fully
+    vectorized, and LTTB then picks the final points from those candidates.
+    """
+
+    if len(y) <= budget:
+        return np.arange(len(y))
+    candidates = minmax_indices(y, 2 * budget) if len(y) > 4 * budget else np.arange(len(y))
+    return candidates[lttb_indices(x[candidates], y[candidates], budget)]
+
+
+def box_stats(values: np.ndarray, label: str) -> Dict[str, Any]:
+    """Box-and-whisker statistics for Axes.bxp, keeping only the most extreme fliers."""
+
+    stats = cbook.boxplot_stats(values, labels=[label])[0]
+    fliers = np.sort(stats["fliers"])
+    if len(fliers) > MAX_FLIERS:
+        half = MAX_FLIERS // 2
+        stats["fliers"] = np.concatenate([fliers[:half], fliers[-half:]])
+    return stats
+
+
+def sample_rows(df: pd.DataFrame, n: int, seed: int = 0) -> pd.DataFrame:
+    """A reproducible random sample of at most n rows."""
+    return df if len(df) <= n else df.sample(n=n, random_state=seed)
+
+
+_POOL: Optional[FigurePool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_figure_pool() -> FigurePool:
+    """Return the process-wide figure pool."""
+
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = FigurePool()
+    return _POOL
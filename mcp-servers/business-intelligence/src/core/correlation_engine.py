@@ -0,0 +1,312 @@
+"""
+Correlation Engine
+Vectorized correlation and p-value matrices with pairwise-complete observations.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from src.core.executor import get_executor
+
+SUPPORTED_METHODS = ["pearson", "spearman", "kendall"]
+KENDALL_PARALLEL_MIN_WORK = 2_000_000  # pairs x rows below which a process pool costs more than it saves
+
+
+@dataclass
+class CorrelationMatrices:
+    """Correlation coefficients, two-sided p-values and pairwise sample sizes (column x column)."""
+    r: pd.DataFrame
+    p: pd.DataFrame
+    n: pd.DataFrame
+
+
+class PearsonMoments:
+    """
+    Mergeable pairwise-complete Pearson state: co-moment sums for every column pair.
+
+    Sums are taken about a fixed per-column shift (the means of the first rows seen),
+    which keeps the sum-of-products formulas stable without re-centering, so appended
+    rows are folded in with update() at a cost proportional to their number.
+    """
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.shift: Optional[np.ndarray] = None
+        self.n = np.zeros((size, size))
+        self.sum_x = np.zeros((size, size))
+        self.sum_xx = np.zeros((size, size))
+        self.sum_xy = np.zeros((size, size))
+
+    def update(self, df: pd.DataFrame) -> None:
+        values = _column_values(df[self.columns])
+        mask = ~np.isnan(values)
+        if self.shift is None:
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if values.size else np.zeros(len(self.columns))
+        n, sum_x, sum_xx, sum_xy = _masked_sums(values, mask, self.shift)
+        self.n += n
+        self.sum_x += sum_x
+        self.sum_xx += sum_xx
+        self.sum_xy += sum_xy
+
+    def matrices(self) -> CorrelationMatrices:
+        r = _pearson_from_sums(self.n, self.sum_x, self.sum_xx, self.sum_xy)
+        return CorrelationMatrices(
+            r=pd.DataFrame(r, index=self.columns, columns=self.columns),
+            p=pd.DataFrame(_t_test_p_values(r, self.n), index=self.columns, columns=self.columns),
+            n=pd.DataFrame(self.n.astype(np.int64), index=self.columns, columns=self.columns)
+        )
+
+
+def correlation_matrices(
+    df: pd.DataFrame,
+    method: str = "pearson",
+    pairs: Optional[List[Tuple[str, str]]] = None,
+    exact_spearman: bool = False
+) -> CorrelationMatrices:
+    """
+    Compute correlations between all columns of df, using each pair's complete rows.
+
+    Pearson and Spearman are computed for the full matrix with a handful of matrix
+    products over masked arrays; p-values come from the t statistic with n - 2
+    degrees of freedom (as scipy's pearsonr/spearmanr). Spearman ranks each column
+    once over its present values; exact_spearman re-ranks the shared rows of pairs
+    whose missing-value patterns differ, as scipy does, at one rankdata call per
+    pair. Kendall's tau has no matrix form, so only the requested pairs (default:
+    all) are computed; entries that were not requested are NaN. Use
+    kendall_matrices() from async code to spread large Kendall inputs over the
+    executor's process pool.
+    """
+
+    if method not in SUPPORTED_METHODS:
+        raise ValueError(f"Unsupported correlation method: {method}")
+
+    columns = list(df.columns)
+    values = _column_values(df)
+    mask = ~np.isnan(values)
+    n = mask.T.astype(np.float64) @ mask.astype(np.float64)
+
+    if method == "kendall":
+        index_pairs = _kendall_index_pairs(columns, pairs)
+        r, p = _kendall_from_results(len(columns), _kendall_pairs(values, index_pairs))
+    else:
+        if method == "spearman":
+            r = _spearman_matrix(values, mask, n, exact_spearman)
+        else:
+            r = _pearson_matrix(values, mask, n)
+        p = _t_test_p_values(r, n)
+
+    return _as_matrices(columns, r, p, n)
+
+
+async def kendall_matrices(df: pd.DataFrame, pairs: Optional[List[Tuple[str, str]]] = None) -> CorrelationMatrices:
+    """
+    Kendall correlations like correlation_matrices(df, "kendall"), with large inputs split
+    into one chunk of pairs per worker of the executor's process pool.
+    """
+
+    columns = list(df.columns)
+    values = _column_values(df)
+    mask = ~np.isnan(values)
+    n = mask.T.astype(np.float64) @ mask.astype(np.float64)
+    index_pairs = _kendall_index_pairs(columns, pairs)
+
+    executor = get_executor()
+    workers = max(1, executor.process_workers)
+    if workers > 1 and len(index_pairs) * len(values) >= KENDALL_PARALLEL_MIN_WORK:
+        chunks = [index_pairs[i::workers] for i in range(workers)]
+        parts = await asyncio.gather(*[
+            executor.run_in_process("kendall_correlation", _kendall_pairs, values, chunk) for chunk in chunks if chunk
+        ])
+        results = [item for part in parts for item in part]
+    else:
+        results = await executor.run_in_thread("kendall_correlation", _kendall_pairs, values, index_pairs)
+
+    r, p = _kendall_from_results(len(columns), results)
+    return _as_matrices(columns, r, p, n)
+
+
+def top_pairs(
+    matrices: CorrelationMatrices,
+    threshold: float = 0.0,
+    k: int = 0,
+    target_column: str = ""
+) -> pd.DataFrame:
+    """
+    Flatten the upper triangle (or the target column's row) into a pair table.
+
+    Pairs are sorted by absolute correlation; with threshold and k only the k
+    strongest pairs at or above the threshold are kept.
+    """
+
+    columns = list(matrices.r.columns)
+    r = matrices.r.to_numpy()
+    if target_column:
+        t = columns.index(target_column)
+        j = np.array([c for c in range(len(columns)) if c != t], dtype=int)
+        i = np.full(len(j), t, dtype=int)
+    else:
+        i, j = np.triu_indices(len(columns), k=1)
+
+    pair_r = r[i, j]
+    keep = ~np.isnan(pair_r) & (np.abs(pair_r) >= threshold) if threshold > 0 else np.ones(len(i), dtype=bool)
+    i, j, pair_r = i[keep], j[keep], pair_r[keep]
+
+    order = np.argsort(-np.abs(np.nan_to_num(pair_r, nan=0.0)), kind="stable")
+    if k > 0:
+        order = order[:k]
+    i, j = i[order], j[order]
+
+    return pd.DataFrame({
+        "variable1": [columns[a] for a in i],
+        "variable2": [columns[b] for b in j],
+        "correlation": r[i, j],
+        "p_value": matrices.p.to_numpy()[i, j],
+        "sample_size": matrices.n.to_numpy()[i, j]
+    })
+
+
+def significance_labels(p_values: np.ndarray, sample_sizes: np.ndarray) -> np.ndarray:
+    """Map p-values to the significance labels used in correlation results."""
+
+    labels = np.select(
+        [sample_sizes < 3, np.isnan(p_values), p_values < 0.001, p_values < 0.01, p_values < 0.05],
+        ["insufficient_data", "constant_input", "highly_significant", "very_significant", "significant"],
+        default="not_significant"
+    )
+    return labels
+
+
+def _column_values(df: pd.DataFrame) -> np.ndarray:
+    """Columns of df as a float matrix with NaN for missing values."""
+
+    if not len(df.columns):
+        return np.empty((len(df), 0))
+    return np.column_stack([df[col].to_numpy(dtype=float, na_value=np.nan) for col in df.columns])
+
+
+def _masked_sums(values: np.ndarray, mask: np.ndarray,
+                 shift: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pairwise counts, sums, sums of squares and cross products of values - shift over complete rows."""
+
+    x = np.where(mask, values - shift, 0.0)
+    m = mask.astype(np.float64)
+    n = m.T @ m
+    sum_x = x.T @ m            # sum of column i over rows where j is also present
+    sum_xx = (x * x).T @ m
+    sum_xy = x.T @ x
+    return n, sum_x, sum_xx, sum_xy
+
+
+def _pearson_from_sums(n: np.ndarray, sum_x: np.ndarray, sum_xx: np.ndarray, sum_xy: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_i = sum_xx - sum_x ** 2 / n
+        var_j = var_i.T
+        r = cov / np.sqrt(var_i * var_j)
+
+    r[(n < 2) | (var_i <= 0) | (var_j <= 0)] = np.nan
+    np.fill_diagonal(r, np.where((np.diag(n) >= 2) & (np.diag(var_i) > 0), 1.0, np.nan))
+    return np.clip(r, -1.0, 1.0)
+
+
+def _pearson_matrix(values: np.ndarray, mask: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Pairwise-complete Pearson correlation from masked sums."""
+
+    # Centering by the column mean first keeps the sum-of-products formulas numerically stable
+    with np.errstate(invalid="ignore"):
+        shift = np.nan_to_num(np.nanmean(values, axis=0)) if values.size else np.zeros(values.shape[1])
+    _, sum_x, sum_xx, sum_xy = _masked_sums(values, mask, shift)
+    return _pearson_from_sums(n, sum_x, sum_xx, sum_xy)
+
+
+def _spearman_matrix(values: np.ndarray, mask: np.ndarray, n: np.ndarray, exact: bool = False) -> np.ndarray:
+    """
+    Spearman correlation: rank each column once, then pairwise-complete Pearson on the ranks.
+
+    Ranking once is exact wherever a pair's complete rows equal both columns' non-missing
+    rows, and a close approximation elsewhere; with exact, pairs whose missing-value
+    patterns differ are re-ranked on their shared rows.
+    """
+
+    ranks = np.column_stack([_rank_with_nan(values[:, c]) for c in range(values.shape[1])]) \
+        if values.shape[1] else values
+    r = _pearson_matrix(ranks, mask, n)
+    if not exact:
+        return r
+
+    counts = np.diag(n)
+    mismatched = np.argwhere(np.triu((n != counts[:, None]) | (n != counts[None, :]), k=1))
+    for a, b in mismatched:
+        shared = mask[:, a] & mask[:, b]
+        if shared.sum() < 2:
+            continue
+        with np.errstate(invalid="ignore"):
+            rho = np.corrcoef(stats.rankdata(values[shared, a]), stats.rankdata(values[shared, b]))[0, 1]
+        r[a, b] = r[b, a] = rho
+    return r
+
+
+def _rank_with_nan(column: np.ndarray) -> np.ndarray:
+    ranked = np.full(column.shape, np.nan)
+    present = ~np.isnan(column)
+    ranked[present] = stats.rankdata(column[present])
+    return ranked
+
+
+def _t_test_p_values(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-values for correlation coefficients via t = r * sqrt((n - 2) / (1 - r^2))."""
+
+    dof = n - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt(dof / (1.0 - r * r))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    p = np.where(np.abs(r) >= 1.0, 0.0, p)
+    p[(dof <= 0) | np.isnan(r)] = np.nan
+    return p
+
+
+def _as_matrices(columns: List[str], r: np.ndarray, p: np.ndarray, n: np.ndarray) -> CorrelationMatrices:
+    return CorrelationMatrices(
+        r=pd.DataFrame(r, index=columns, columns=columns),
+        p=pd.DataFrame(p, index=columns, columns=columns),
+        n=pd.DataFrame(n.astype(np.int64), index=columns, columns=columns)
+    )
+
+
+def _kendall_index_pairs(columns: List[str], pairs: Optional[List[Tuple[str, str]]]) -> List[Tuple[int, int]]:
+    if pairs is None:
+        return [(a, b) for a in range(len(columns)) for b in range(a + 1, len(columns))]
+    position = {col: i for i, col in enumerate(columns)}
+    return [(position[a], position[b]) for a, b in pairs if a != b]
+
+
+def _kendall_from_results(size: int, results: List[Tuple[int, int, float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    r = np.full((size, size), np.nan)
+    p = np.full((size, size), np.nan)
+    np.fill_diagonal(r, 1.0)
+    np.fill_diagonal(p, 0.0)
+    for a, b, tau, p_value in results:
+        r[a, b] = r[b, a] = tau
+        p[a, b] = p[b, a] = p_value
+    return r, p
+
+
+def _kendall_pairs(values: np.ndarray, index_pairs: List[Tuple[int, int]]) -> List[Tuple[int, int, float, float]]:
+    """Kendall's tau for a batch of column pairs (runs in worker processes)."""
+
+    results = []
+    for a, b in index_pairs:
+        shared = ~np.isnan(values[:, a]) & ~np.isnan(values[:, b])
+        if shared.sum() < 3:
+            results.append((a, b, np.nan, np.nan))
+            continue
+        tau, p_value = stats.kendalltau(values[shared, a], values[shared, b])
+        results.append((a, b, float(tau), float(p_value)))
+    return results
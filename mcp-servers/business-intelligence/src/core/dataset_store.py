@@ -0,0 +1,687 @@
+"""
+Dataset Store
+Shared registry of loaded datasets with compact in-memory storage and disk spill.
+"""
+
+import os
+import difflib
+import hashlib
+import logging
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from src.core.csv_ingest import read_csv_file
+from src.core.excel_ingest import read_excel_file
+
+logger = logging.getLogger("business-intelligence")
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+DEFAULT_MEMORY_BUDGET_MB = 2048
+CATEGORY_MAX_RATIO = 0.5  # object columns with fewer unique values than this share become categoricals
+DATE_SAMPLE_VALUES = 1000  # leading values a date format must parse before the whole column is tried
+FUZZY_MATCH_CUTOFF = 0.8
+FINGERPRINT_CHUNK_ROWS = 1_000_000  # rows hashed at a time, bounding the per-row hash arrays
+
+
+@dataclass
+class DatasetEntry:
+    """Bookkeeping for a single registered dataset."""
+    name: str
+    frame: Optional[pd.DataFrame]
+    nbytes: int
+    rows: Optional[int]  # None while a virtual dataset's source cannot tell its row count cheaply
+    columns: List[str]
+    version: int = 1
+    source_path: str = ""
+    spill_path: Optional[Path] = None
+    snapshot_path: Optional[Path] = None  # durable workspace copy; owned by the workspace, not the store
+    fingerprint: Optional[str] = None
+    raw_nbytes: int = 0  # size of the frame as loaded, before compaction
+    loader: Optional[Callable[[], pd.DataFrame]] = None
+    # Views: input dataset -> (version, registered_at) the view was built from, and the loader that rebuilds it
+    depends_on: Dict[str, Any] = field(default_factory=dict)
+    definition: Optional[Callable[[], pd.DataFrame]] = None
+    loading: Optional[Future] = None  # set while a build or reload runs outside the store lock
+    registered_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def resident(self) -> bool:
+        return self.frame is not None
+
+    def compaction(self) -> Dict[str, Any]:
+        """Bytes before and after compaction and the reduction factor."""
+        return {
+            "bytes_before": self.raw_nbytes,
+            "bytes_after": self.nbytes,
+            "reduction": round(self.raw_nbytes / self.nbytes, 2) if self.nbytes else None
+        }
+
+    @property
+    def virtual(self) -> bool:
+        """Registered but not yet read from its source."""
+        return self.frame is None and self.loader is not None
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "rows": self.rows,
+            "columns": len(self.columns),
+            "memory_bytes": self.nbytes,
+            "memory_bytes_before_compaction": self.raw_nbytes,
+            "resident": self.resident,
+            "virtual": self.virtual,
+            "spill_path": str(self.spill_path) if self.spill_path else None,
+            "snapshot_path": str(self.snapshot_path) if self.snapshot_path else None,
+            "version": self.version,
+            "source_path": self.source_path,
+            "depends_on": list(self.depends_on) or None,
+            "registered_at": self.registered_at
+        }
+
+
+class DatasetStore:
+    """
+    In-memory dataset registry with LRU eviction by byte budget.
+
+    Datasets are compacted on registration. When resident bytes exceed the budget,
+    the least recently used datasets are spilled to uncompressed Arrow IPC files in
+    the cache directory and memory-mapped back in on the next access. Release
+    listeners hear about every frame the store lets go of, so holders of extra
+    references (such as SQL engine tables) can drop theirs and the memory is freed.
+    """
+
+    def __init__(self, memory_budget_bytes: Optional[int] = None, cache_dir: Optional[str] = None):
+        if memory_budget_bytes is None:
+            budget_mb = float(os.getenv("BI_DATASET_MEMORY_BUDGET_MB", DEFAULT_MEMORY_BUDGET_MB))
+            memory_budget_bytes = int(budget_mb * 1024 * 1024)
+        self.memory_budget_bytes = memory_budget_bytes
+        self.cache_dir = Path(cache_dir or os.getenv("BI_DATASET_CACHE_DIR", "") or
+                              Path(tempfile.gettempdir()) / "mcp_bi_dataset_cache")
+        self._entries: "OrderedDict[str, DatasetEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._release_listeners: List[Callable[[], Optional[Callable[[str], None]]]] = []
+
+    def add_release_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Call listener(name) whenever a dataset's frame is spilled, released to its snapshot, replaced or removed.
+
+        Listeners run with the store locked, so they must not block on the store. Bound
+        methods are held weakly and dropped once their object is gone.
+        """
+
+        ref = weakref.WeakMethod(listener) if hasattr(listener, "__self__") else (lambda: listener)
+        with self._lock:
+            self._release_listeners.append(ref)
+
+    def put(self, name: str, df: pd.DataFrame, source_path: str = "", compact: bool = True) -> DatasetEntry:
+        """Register (or replace) a dataset and return its entry."""
+
+        raw_nbytes = int(df.memory_usage(deep=True).sum())
+        frame = compact_frame(df) if compact else df
+        nbytes = int(frame.memory_usage(deep=True).sum()) if frame is not df else raw_nbytes
+
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                _remove_file(previous.spill_path)
+                self._notify_released(name)
+
+            entry = DatasetEntry(
+                name=name,
+                frame=frame,
+                nbytes=nbytes,
+                rows=len(frame),
+                columns=[str(col) for col in frame.columns],
+                version=previous.version + 1 if previous else 1,
+                source_path=source_path,
+                raw_nbytes=raw_nbytes
+            )
+            self._entries[name] = entry
+            self._evict_to_budget(keep=name)
+
+        logger.info(f"Registered dataset '{name}' ({entry.rows} rows, {nbytes / 1024 / 1024:.2f} MB "
+                    f"from {raw_nbytes / 1024 / 1024:.2f} MB, v{entry.version})")
+        return entry
+
+    def put_virtual(self, name: str, loader: Callable[[], pd.DataFrame], columns: List[str],
+                    rows: Optional[int] = 0, source_path: str = "") -> DatasetEntry:
+        """
+        Register a dataset that is read from its source on first access.
+
+        rows is an estimate (None if unknown) until the loader runs; the entry holds
+        no memory until then.
+        """
+
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                _remove_file(previous.spill_path)
+                self._notify_released(name)
+
+            entry = DatasetEntry(
+                name=name,
+                frame=None,
+                nbytes=0,
+                rows=rows,
+                columns=[str(col) for col in columns],
+                version=previous.version + 1 if previous else 1,
+                source_path=source_path,
+                loader=loader
+            )
+            self._entries[name] = entry
+
+        logger.info(f"Registered virtual dataset '{name}' ({len(entry.columns)} columns, v{entry.version})")
+        return entry
+
+    def put_view(self, name: str, loader: Callable[[], pd.DataFrame], columns: List[str],
+                 depends_on: List[str], rows: Optional[int] = 0) -> DatasetEntry:
+        """
+        Register a dataset derived from other registered datasets, built on first access.
+
+        The view remembers which version of each input it was built from and is
+        rebuilt by its loader on the next access after any input is replaced.
+        """
+
+        with self._lock:
+            entry = self.put_virtual(name, loader, columns, rows=rows)
+            entry.definition = loader
+            entry.depends_on = {dependency: self._version_token(dependency) for dependency in depends_on}
+        return entry
+
+    def attach(self, name: str, snapshot_path: Path, rows: int, columns: List[str], nbytes: int = 0,
+               raw_nbytes: int = 0, source_path: str = "", fingerprint: Optional[str] = None) -> DatasetEntry:
+        """
+        Register a dataset from an Arrow IPC snapshot without reading it.
+
+        The snapshot is memory-mapped on first access, and evicting the dataset later
+        simply drops the frame since the snapshot already holds it.
+        """
+
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                _remove_file(previous.spill_path)
+                self._notify_released(name)
+
+            entry = DatasetEntry(
+                name=name,
+                frame=None,
+                nbytes=nbytes,
+                rows=rows,
+                columns=[str(col) for col in columns],
+                version=previous.version + 1 if previous else 1,
+                source_path=source_path,
+                snapshot_path=Path(snapshot_path),
+                fingerprint=fingerprint,
+                raw_nbytes=raw_nbytes
+            )
+            self._entries[name] = entry
+
+        logger.info(f"Attached dataset '{name}' from snapshot {snapshot_path} ({rows} rows, v{entry.version})")
+        return entry
+
+    def set_snapshot(self, name: str, snapshot_path: Optional[Path], version: int) -> bool:
+        """Record a snapshot of one dataset version; ignored if the dataset was replaced since."""
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.version != version:
+                return False
+            entry.snapshot_path = snapshot_path
+            return True
+
+    def get(self, name: str) -> Optional[pd.DataFrame]:
+        """
+        Return the dataset frame, building a virtual dataset or reloading a spilled one if needed.
+
+        Loaders and reloads run outside the store lock, so other datasets stay available
+        meanwhile; concurrent callers for the same dataset wait for the one build in progress.
+        """
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(name)
+            if entry.depends_on:
+                self._rebuild_if_outdated(entry)
+            if entry.frame is not None:
+                return entry.frame
+            if entry.loading is not None:
+                pending, owner = entry.loading, False
+            else:
+                pending, owner = Future(), True
+                entry.loading = pending
+                version, loader = entry.version, entry.loader
+                path = entry.spill_path or entry.snapshot_path
+
+        if not owner:
+            return pending.result()
+
+        try:
+            if loader is not None:
+                loaded = loader()
+                frame = compact_frame(loaded)
+            else:
+                loaded, frame = None, self._reload(name, path)
+        except BaseException as e:
+            with self._lock:
+                if entry.loading is pending:
+                    entry.loading = None
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            if entry.loading is pending:
+                entry.loading = None
+            if self._entries.get(name) is entry and entry.version == version:
+                if loaded is not None:
+                    self._materialize(entry, loaded, frame)
+                else:
+                    entry.frame = frame
+                self._evict_to_budget(keep=name)
+        pending.set_result(frame)
+        return frame
+
+    def fingerprint(self, name: str) -> Optional[str]:
+        """
+        Content fingerprint of a dataset, computed once per registered version.
+
+        Hashing reads every row, so call this off the event loop. The result is kept
+        on the entry only if the dataset was not replaced while it was hashed.
+        """
+
+        entry = self.resolve(name)
+        if entry is None:
+            return None
+        fingerprint, version = entry.fingerprint, entry.version
+        if fingerprint is None:
+            fingerprint = dataset_fingerprint(self.get(name))
+            with self._lock:
+                if self._entries.get(name) is entry and entry.version == version:
+                    entry.fingerprint = fingerprint
+        return fingerprint
+
+    def arrow_file(self, name: str) -> Optional[Path]:
+        """The Arrow IPC file (spill or snapshot) holding a dataset's current version, if any."""
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.virtual:
+                return None
+            for path in (entry.spill_path, entry.snapshot_path):
+                if path is not None and path.exists():
+                    return path
+            return None
+
+    def entry(self, name: str) -> Optional[DatasetEntry]:
+        with self._lock:
+            return self._entries.get(name)
+
+    def resolve(self, name: str) -> Optional[DatasetEntry]:
+        """Like entry(), but first resets a view whose inputs changed so its new version is visible."""
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.depends_on:
+                self._rebuild_if_outdated(entry)
+            return entry
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def remove(self, name: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._notify_released(name)
+        if entry is None:
+            return False
+        _remove_file(entry.spill_path)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "datasets": len(entries),
+            "resident": sum(1 for e in entries if e.resident),
+            "spilled": sum(1 for e in entries if not e.resident and e.spill_path is not None),
+            "virtual": sum(1 for e in entries if e.virtual),
+            "attached": sum(1 for e in entries if not e.resident and not e.virtual and e.spill_path is None),
+            "resident_bytes": sum(e.nbytes for e in entries if e.resident),
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "cache_dir": str(self.cache_dir)
+        }
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def _version_token(self, name: str) -> Optional[tuple]:
+        # registered_at tells a re-registered dataset from the removed one its version number restarts from
+        entry = self._entries.get(name)
+        return (entry.version, entry.registered_at) if entry is not None else None
+
+    def _rebuild_if_outdated(self, entry: DatasetEntry) -> None:
+        """Drop a view's frame and bump its version when any input (or an input view) changed."""
+
+        for dependency in entry.depends_on:
+            upstream = self._entries.get(dependency)
+            if upstream is not None and upstream.depends_on:
+                self._rebuild_if_outdated(upstream)
+        current = {dependency: self._version_token(dependency) for dependency in entry.depends_on}
+        if current == entry.depends_on:
+            return
+
+        _remove_file(entry.spill_path)
+        entry.spill_path = None
+        entry.frame = None
+        entry.loading = None  # a build still running is for the old inputs
+        entry.loader = entry.definition
+        entry.fingerprint = None
+        entry.nbytes = 0
+        entry.version += 1
+        entry.depends_on = current
+        self._notify_released(entry.name)
+        logger.info(f"Inputs of view '{entry.name}' changed; it will be rebuilt on next access (v{entry.version})")
+
+    def _notify_released(self, name: str) -> None:
+        for ref in list(self._release_listeners):
+            listener = ref()
+            if listener is None:
+                self._release_listeners.remove(ref)
+                continue
+            try:
+                listener(name)
+            except Exception as e:
+                logger.warning(f"Release listener failed for dataset '{name}': {e}")
+
+    def _resident_bytes(self) -> int:
+        return sum(e.nbytes for e in self._entries.values() if e.resident)
+
+    def _evict_to_budget(self, keep: str) -> None:
+        """Spill least recently used datasets until resident bytes fit the budget."""
+
+        for name, entry in list(self._entries.items()):
+            if self._resident_bytes() <= self.memory_budget_bytes:
+                break
+            if name == keep or not entry.resident:
+                continue
+            self._spill(entry)
+
+    def _spill(self, entry: DatasetEntry) -> None:
+        if entry.snapshot_path is not None and entry.snapshot_path.exists():
+            entry.frame = None
+            self._notify_released(entry.name)
+            logger.info(f"Released dataset '{entry.name}' (kept in snapshot {entry.snapshot_path})")
+            return
+
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+        except ImportError:
+            logger.warning("pyarrow not available - dataset spill disabled, keeping datasets in memory")
+            return
+
+        try:
+            if entry.spill_path is None or not entry.spill_path.exists():
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                path = self.cache_dir / f"{_safe_name(entry.name)}_v{entry.version}.arrow"
+                table = pa.Table.from_pandas(entry.frame)
+                feather.write_feather(table, str(path), compression="uncompressed")
+                entry.spill_path = path
+            entry.frame = None
+            self._notify_released(entry.name)
+            logger.info(f"Spilled dataset '{entry.name}' to {entry.spill_path}")
+        except Exception as e:
+            logger.warning(f"Failed to spill dataset '{entry.name}': {e}")
+
+    def _materialize(self, entry: DatasetEntry, loaded: pd.DataFrame, frame: pd.DataFrame) -> None:
+        """Keep a virtual dataset's loaded and compacted frame like any registered dataset."""
+
+        entry.frame = frame
+        entry.loader = None
+        entry.raw_nbytes = int(loaded.memory_usage(deep=True).sum())
+        entry.nbytes = int(frame.memory_usage(deep=True).sum())
+        entry.rows = len(frame)
+        entry.columns = [str(col) for col in frame.columns]
+        logger.info(f"Materialized virtual dataset '{entry.name}' ({entry.rows} rows, "
+                    f"{entry.nbytes / 1024 / 1024:.2f} MB)")
+
+    def _reload(self, name: str, path: Path) -> pd.DataFrame:
+        import pyarrow.feather as feather
+
+        table = feather.read_table(str(path), memory_map=True)
+        logger.info(f"Reloaded dataset '{name}' from {path}")
+        string_dtype = arrow_string_dtype()
+        if string_dtype is None:
+            return table.to_pandas()
+        import pyarrow as pa
+        return table.to_pandas(types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get)
+
+
+def compact_frame(df: pd.DataFrame, category_max_ratio: float = CATEGORY_MAX_RATIO) -> pd.DataFrame:
+    """
+    Return a memory-compact copy of a DataFrame.
+
+    Integers are downcast to the smallest type that holds their range, string
+    columns whose every value parses with one date format become datetime64,
+    low-cardinality string columns become categoricals and the remaining string
+    columns use Arrow-backed storage (NaN for missing values, as with object
+    columns). Floats stay float64: pandas reduces float32 in float32, so sums and
+    means would drift even when every stored value is exact.
+    """
+
+    converted = {}
+    row_count = len(df)
+    string_dtype = arrow_string_dtype()
+
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            downcast = pd.to_numeric(series, downcast="integer")
+            if downcast.dtype != series.dtype:
+                converted[col] = downcast
+        elif series.dtype == object and row_count > 0:
+            if pd.api.types.infer_dtype(series, skipna=True) != "string":
+                continue
+            dates = _parse_dates(series)
+            if dates is not None:
+                converted[col] = dates
+            elif series.nunique(dropna=True) <= row_count * category_max_ratio:
+                converted[col] = series.astype("category")
+            elif string_dtype is not None:
+                converted[col] = series.astype(string_dtype)
+
+    if not converted:
+        return df
+
+    compacted = df.copy(deep=False)
+    for col, series in converted.items():
+        compacted[col] = series
+    return compacted
+
+
+def arrow_string_dtype() -> Optional[pd.StringDtype]:
+    """Arrow-backed string dtype with NaN for missing values, or None without pyarrow."""
+
+    try:
+        import pyarrow  # noqa: F401
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except (ImportError, TypeError):
+        return None
+
+
+def _parse_dates(series: pd.Series) -> Optional[pd.Series]:
+    """The column as datetime64 when every value parses with the format of its first value, else None."""
+
+    values = series.dropna()
+    first = str(values.iloc[0]) if len(values) else ""
+    # Digits-only values are identifiers or years far more often than compact dates
+    if not first or first.isdigit():
+        return None
+    fmt = guess_datetime_format(first)
+    if fmt is None or not any(directive in fmt for directive in ("%d", "%H")):
+        return None
+
+    sample = values.iloc[:DATE_SAMPLE_VALUES]
+    if pd.to_datetime(sample, format=fmt, errors="coerce").isna().any():
+        return None
+    parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+    if parsed.isna().sum() != series.isna().sum():
+        return None
+    return parsed
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Hash of a frame's schema and every row, so any content change gives a new fingerprint.
+
+    Rows are hashed FINGERPRINT_CHUNK_ROWS at a time to keep memory flat on large frames.
+    """
+
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(repr(df.shape).encode())
+
+    for start in range(0, len(df), FINGERPRINT_CHUNK_ROWS):
+        block = df.iloc[start:start + FINGERPRINT_CHUNK_ROWS]
+        try:
+            hashes = pd.util.hash_pandas_object(block, index=False)
+        except TypeError:  # unhashable cells such as nested lists from JSON sources
+            hashes = pd.util.hash_pandas_object(block.astype(str), index=False)
+        digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _safe_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+
+
+def _remove_file(path: Optional[Path]) -> None:
+    if path is not None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+# Module-level store shared by the server and every tool
+
+_STORE: Optional[DatasetStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> DatasetStore:
+    """Return the process-wide dataset store."""
+
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = DatasetStore()
+    return _STORE
+
+
+def store_dataset(name: str, df: pd.DataFrame, source_path: str = "") -> DatasetEntry:
+    """Register a dataset in the shared store."""
+    return get_store().put(name, df, source_path=source_path)
+
+
+def store_virtual_dataset(name: str, loader: Callable[[], pd.DataFrame], columns: List[str],
+                          rows: Optional[int] = 0, source_path: str = "") -> DatasetEntry:
+    """Register a dataset in the shared store that is loaded on first access."""
+    return get_store().put_virtual(name, loader, columns, rows=rows, source_path=source_path)
+
+
+def get_dataset(name: str) -> Optional[pd.DataFrame]:
+    """Return a registered dataset, or None."""
+    return get_store().get(name)
+
+
+def list_datasets() -> List[str]:
+    """List registered dataset names."""
+    return get_store().names()
+
+
+def resolve_dataset(dataset_name: str) -> Optional[pd.DataFrame]:
+    """
+    Resolve a dataset name to a DataFrame.
+
+    Registered datasets are returned directly. Otherwise files in the data directory
+    are tried (and registered so later calls hit memory), then a fuzzy match against
+    both registered and on-disk names.
+    """
+
+    df = get_dataset(dataset_name)
+    if df is not None:
+        return df
+
+    df = _load_from_data_dir(dataset_name)
+    if df is not None:
+        return df
+
+    matches = difflib.get_close_matches(dataset_name, list_available_datasets(), n=1, cutoff=FUZZY_MATCH_CUTOFF)
+    if matches:
+        logger.info(f"Resolved dataset '{dataset_name}' to closest match '{matches[0]}'")
+        return get_dataset(matches[0]) if matches[0] in get_store() else _load_from_data_dir(matches[0])
+
+    return None
+
+
+def list_available_datasets() -> List[str]:
+    """List registered datasets plus loadable files in the data directory."""
+
+    names = list_datasets()
+    for stem in _list_data_files():
+        if stem not in names:
+            names.append(stem)
+    return names
+
+
+def _list_data_files() -> List[str]:
+    if not DATA_DIR.exists():
+        return []
+    return [p.stem for p in DATA_DIR.glob("*") if p.suffix.lower() in [".csv", ".xlsx", ".xls"]]
+
+
+def _load_from_data_dir(dataset_name: str) -> Optional[pd.DataFrame]:
+    """Load a dataset file from the data directory and register it."""
+
+    possible_files = [
+        DATA_DIR / f"{dataset_name}.csv",
+        DATA_DIR / f"{dataset_name}.xlsx",
+        DATA_DIR / f"sample_{dataset_name}.csv",
+        DATA_DIR / f"sample_{dataset_name}.xlsx"
+    ]
+
+    for file_path in possible_files:
+        if not file_path.exists():
+            continue
+        try:
+            if file_path.suffix.lower() == ".csv":
+                df = read_csv_file(str(file_path))["data"]
+            else:
+                df = read_excel_file(str(file_path))["data"]
+        except Exception:
+            continue
+        store_dataset(dataset_name, df, source_path=str(file_path))
+        return get_dataset(dataset_name)
+
+    return None
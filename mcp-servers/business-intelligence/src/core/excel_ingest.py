@@ -0,0 +1,357 @@
+"""
+Excel Ingest
+Workbook ingestion with sheet listing, parallel sheet parsing and a Parquet cache.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger("business-intelligence")
+
+CACHE_SUFFIX = ".cache"
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "mcp_bi_excel_cache"
+STREAMING_SUFFIXES = [".xlsx", ".xlsm"]
+NA_VALUES = ['', 'NULL', 'null', 'N/A', 'n/a', '#N/A']
+# pandas' default missing-value strings, which read_excel applies on top of NA_VALUES
+DEFAULT_NA_VALUES = ['#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                     '<NA>', 'NA', 'NaN', 'None', 'nan']
+
+SheetSelector = Union[int, str]
+
+
+def excel_engine(source_path: str) -> str:
+    """Fastest available engine: calamine when installed, else a read-only openpyxl stream for .xlsx."""
+
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        pass
+    return "openpyxl-stream" if Path(source_path).suffix.lower() in STREAMING_SUFFIXES else "pandas"
+
+
+def list_sheets(source_path: str) -> List[Dict[str, Any]]:
+    """
+    Sheet names with their declared dimensions, without parsing any cells.
+
+    rows includes the header row and is None when the workbook does not record it.
+    """
+
+    suffix = Path(source_path).suffix.lower()
+    if suffix in STREAMING_SUFFIXES:
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(source_path, read_only=True, data_only=True)
+        try:
+            return [{"name": ws.title, "rows": ws.max_row, "columns": ws.max_column} for ws in workbook.worksheets]
+        finally:
+            workbook.close()
+    if suffix == ".xls":
+        import xlrd
+
+        workbook = xlrd.open_workbook(source_path, on_demand=True)
+        try:
+            sheets = []
+            for index, name in enumerate(workbook.sheet_names()):
+                sheet = workbook.sheet_by_index(index)
+                sheets.append({"name": name, "rows": sheet.nrows, "columns": sheet.ncols})
+                workbook.unload_sheet(index)
+            return sheets
+        finally:
+            workbook.release_resources()
+    return [{"name": name, "rows": None, "columns": None} for name in pd.ExcelFile(source_path).sheet_names]
+
+
+def read_sheet(source_path: str, sheet: str, usecols: Any = None, nrows: Optional[int] = None,
+               header: Optional[int] = 0, engine: str = "") -> pd.DataFrame:
+    """Parse one sheet, honoring usecols and nrows (the stream stops reading after nrows rows)."""
+
+    engine = engine or excel_engine(source_path)
+    if engine == "openpyxl-stream":
+        return _read_sheet_stream(source_path, sheet, usecols, nrows, header)
+    return pd.read_excel(source_path, sheet_name=sheet, usecols=usecols, nrows=nrows, header=header,
+                         engine="calamine" if engine == "calamine" else None,
+                         na_values=NA_VALUES, keep_default_na=True)
+
+
+def read_excel_file(source_path: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Load the selected sheets one after another (for synchronous callers); see load_excel."""
+
+    started = time.perf_counter()
+    plan = _plan(source_path, options or {})
+    frames = {sheet: _cached_sheet(plan, sheet) for sheet in plan["sheets"]}
+    misses = [sheet for sheet, frame in frames.items() if frame is None]
+    for sheet in misses:
+        frames[sheet] = _parse_and_cache(plan, sheet)
+    return _result(plan, frames, len(frames) - len(misses), started)
+
+
+async def load_excel(source_path: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Load the selected sheets of a workbook.
+
+    options: "sheet_name" (name or index, default the first sheet), "sheets" (a list,
+    or "all"), "combine_sheets" ("largest" keeps the sheet with the most rows, chosen
+    from the declared dimensions where possible; "concat" stacks them with a "sheet"
+    column), "usecols", "nrows", "header" and "cache" (default True). Sheets missing
+    from the Parquet cache are parsed in worker processes, in parallel when there
+    are several.
+    """
+
+    from src.core.executor import get_executor
+
+    started = time.perf_counter()
+    plan = _plan(source_path, options or {})
+    frames = {sheet: _cached_sheet(plan, sheet) for sheet in plan["sheets"]}
+    misses = [sheet for sheet, frame in frames.items() if frame is None]
+
+    executor = get_executor()
+    if len(misses) > 1:
+        parsed = await asyncio.gather(*(executor.run_in_process("load_excel", _parse_and_cache, plan, sheet)
+                                        for sheet in misses))
+    else:
+        parsed = [await executor.run_in_thread("load_excel", _parse_and_cache, plan, sheet) for sheet in misses]
+    frames.update(zip(misses, parsed))
+    return _result(plan, frames, len(frames) - len(misses), started)
+
+
+def _plan(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve sheet selection, reader options and cache location before any cell is parsed."""
+
+    sheets = list_sheets(source_path)
+    names = [sheet["name"] for sheet in sheets]
+    combine = options.get("combine_sheets", "largest")
+    if combine not in ("largest", "concat"):
+        raise ValueError(f"Unsupported combine_sheets '{combine}'. Supported: ['largest', 'concat']")
+
+    selector = options.get("sheets")
+    if options.get("all_sheets", False) and not selector:
+        selector = "all"
+    if selector == "all":
+        selected = list(names)
+    elif selector:
+        selected = [_sheet_name(names, item) for item in (selector if isinstance(selector, list) else [selector])]
+    else:
+        selected = [_sheet_name(names, options.get("sheet_name", 0))]
+
+    # The largest sheet can be picked from declared dimensions instead of parsing every candidate
+    dimensions = {sheet["name"]: sheet["rows"] for sheet in sheets}
+    candidates = len(selected)
+    if combine == "largest" and candidates > 1 and all(dimensions[name] is not None for name in selected):
+        selected = [max(selected, key=lambda name: dimensions[name])]
+
+    stat = os.stat(source_path)
+    return {
+        "source_path": source_path,
+        "sheets": selected,
+        "available_sheets": sheets,
+        "combine": combine,
+        "candidates": candidates,
+        "usecols": options.get("usecols"),
+        "nrows": options.get("nrows"),
+        "header": options.get("header", 0),
+        "engine": excel_engine(source_path),
+        "cache": options.get("cache", True),
+        "source_key": [stat.st_mtime_ns, stat.st_size]
+    }
+
+
+def _parse_and_cache(plan: Dict[str, Any], sheet: str) -> pd.DataFrame:
+    frame = read_sheet(plan["source_path"], sheet, plan["usecols"], plan["nrows"], plan["header"], plan["engine"])
+    if plan["cache"]:
+        _write_cache(plan, sheet, frame)
+    return frame
+
+
+def _cached_sheet(plan: Dict[str, Any], sheet: str) -> Optional[pd.DataFrame]:
+    if not plan["cache"]:
+        return None
+    for directory in _cache_dirs(plan["source_path"]):
+        path = directory / _cache_name(plan, sheet)
+        if path.exists():
+            try:
+                return pd.read_parquet(path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable Excel cache {path}: {e}")
+    return None
+
+
+def _write_cache(plan: Dict[str, Any], sheet: str, frame: pd.DataFrame) -> None:
+    """Store a parsed sheet as Parquet, replacing entries for older versions of the workbook."""
+
+    name = _cache_name(plan, sheet)
+    sheet_prefix, version, _ = name.rsplit("-", 2)
+    for directory in _cache_dirs(plan["source_path"]):
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            for stale in directory.glob(f"{sheet_prefix}-*.parquet"):
+                if stale.name.rsplit("-", 2)[1] != version:
+                    stale.unlink(missing_ok=True)
+            tmp_path = directory / f"{name}.tmp"
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, directory / name)
+            return
+        except OSError:
+            continue  # source directory not writable; try the shared cache directory
+        except Exception as e:
+            # Mixed-type object columns have no Parquet representation
+            (directory / f"{name}.tmp").unlink(missing_ok=True)
+            logger.info(f"Sheet '{sheet}' of {Path(plan['source_path']).name} not cached: {e}")
+            return
+
+
+def _cache_dirs(source_path: str) -> List[Path]:
+    """The cache directory next to the workbook, then the shared fallback."""
+
+    source = Path(source_path).resolve()
+    shared = Path(os.getenv("BI_EXCEL_CACHE_DIR", "") or DEFAULT_CACHE_DIR)
+    digest = hashlib.sha256(str(source).encode()).hexdigest()[:16]
+    return [source.parent / f".{source.name}{CACHE_SUFFIX}", shared / digest]
+
+
+def _cache_name(plan: Dict[str, Any], sheet: str) -> str:
+    """{sheet}-{workbook version}-{reader options}.parquet; the version is the workbook's mtime and size."""
+
+    safe_sheet = "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in sheet)
+    sheet_id = _short_hash(sheet)
+    version = _short_hash(json.dumps(plan["source_key"]))
+    reader = _short_hash(json.dumps([plan["usecols"], plan["nrows"], plan["header"], plan["engine"], NA_VALUES],
+                                    default=str))
+    return f"{safe_sheet}_{sheet_id}-{version}-{reader}.parquet"
+
+
+def _short_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+
+def _result(plan: Dict[str, Any], frames: Dict[str, pd.DataFrame], from_cache: int,
+            started: float) -> Dict[str, Any]:
+    if len(frames) == 1:
+        sheet, df = next(iter(frames.items()))
+        if plan["candidates"] > 1:
+            sheet_info = f"Largest sheet selected: {sheet} (from {plan['candidates']} sheets)"
+        else:
+            sheet_info = f"Sheet: {sheet}"
+    elif plan["combine"] == "concat":
+        df = pd.concat([frame.assign(sheet=sheet) for sheet, frame in frames.items()], ignore_index=True)
+        df = df[["sheet"] + [col for col in df.columns if col != "sheet"]]
+        sheet_info = f"Concatenated sheets: {', '.join(frames)}"
+    else:
+        sheet, df = max(frames.items(), key=lambda item: len(item[1]))
+        sheet_info = f"Largest sheet selected: {sheet} (from {plan['candidates']} sheets)"
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    ingest = {
+        "engine": plan["engine"],
+        "sheets_loaded": len(frames),
+        "sheets_from_cache": from_cache,
+        "rows": len(df),
+        "columns": len(df.columns),
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(len(df) / elapsed, 1)
+    }
+    logger.info(f"Ingested {Path(plan['source_path']).name}: {len(df)} rows from {len(frames)} sheet(s) "
+                f"in {ingest['seconds']}s ({from_cache} from cache, {plan['engine']})")
+    return {
+        "data": df,
+        "sheet_info": sheet_info,
+        "sheets": plan["available_sheets"],
+        "load_method": f"excel_ingest.{plan['engine']}",
+        "ingest": ingest
+    }
+
+
+def _sheet_name(names: List[str], selector: SheetSelector) -> str:
+    if isinstance(selector, int) and not isinstance(selector, bool):
+        if not -len(names) <= selector < len(names):
+            raise ValueError(f"Sheet index {selector} out of range ({len(names)} sheets)")
+        return names[selector]
+    if str(selector) not in names:
+        raise ValueError(f"Sheet '{selector}' not found. Available sheets: {names}")
+    return str(selector)
+
+
+def _read_sheet_stream(source_path: str, sheet: str, usecols: Any, nrows: Optional[int],
+                       header: Optional[int]) -> pd.DataFrame:
+    """Read a sheet row by row from a read-only openpyxl workbook into columns, with read_excel's missing-value strings."""
+
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(source_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet].iter_rows(values_only=True)
+        names: Optional[List[Any]] = None
+        if header is not None:
+            for _ in range(header):
+                next(rows, None)
+            names = list(next(rows, ()) or ())
+        data = []
+        for row in rows:
+            if nrows is not None and len(data) >= nrows:
+                break
+            data.append(row)
+    finally:
+        workbook.close()
+
+    while data and all(value is None for value in data[-1]):
+        data.pop()
+    width = max([len(names or ())] + [len(row) for row in data])
+    names = _column_names((names or []) + [None] * (width - len(names or [])), header is None)
+
+    indices = _usecols_indices(usecols, names)
+    na_strings = set(NA_VALUES) | set(DEFAULT_NA_VALUES)
+    columns = {}
+    for index in indices:
+        values = [row[index] if index < len(row) else None for row in data]
+        values = [None if isinstance(value, str) and value in na_strings else value for value in values]
+        columns[names[index]] = pd.Series(values, dtype=object if not values else None)
+    return pd.DataFrame(columns)
+
+
+def _column_names(names: List[Any], positional: bool) -> List[Any]:
+    """Header values as column names, with pandas' defaults for blank and duplicate names."""
+
+    if positional:
+        return list(range(len(names)))
+    result, seen = [], {}
+    for index, name in enumerate(names):
+        name = f"Unnamed: {index}" if name is None else name
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        result.append(name)
+    return result
+
+
+def _usecols_indices(usecols: Any, names: List[Any]) -> List[int]:
+    """Column positions for a pandas-style usecols: None, "A:C,E", positions or header names."""
+
+    if usecols is None:
+        return list(range(len(names)))
+    if isinstance(usecols, str):
+        from openpyxl.utils import column_index_from_string
+
+        indices = []
+        for part in usecols.split(","):
+            first, _, last = part.strip().partition(":")
+            start = column_index_from_string(first.strip()) - 1
+            stop = column_index_from_string(last.strip()) - 1 if last else start
+            indices.extend(range(start, stop + 1))
+        return [index for index in indices if index < len(names)]
+    if all(isinstance(item, int) for item in usecols):
+        return sorted(index for index in usecols if index < len(names))
+    missing = [item for item in usecols if item not in names]
+    if missing:
+        raise ValueError(f"usecols do not match columns: {missing}")
+    return [index for index, name in enumerate(names) if name in usecols]
@@ -0,0 +1,268 @@
+"""
+Tool Executor
+Thread and process pools that keep CPU-bound tool work off the event loop.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import contextvars
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_TIMEOUT_SECONDS = 300.0
+DEFAULT_TOOL_CONCURRENCY = {
+    "run_correlation": 2,
+    "profile_dataset": 2,
+    "create_visualization": 2,
+    "export_report": 2
+}
+
+_cancel_token: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar("bi_cancel_token", default=None)
+
+
+class ToolCancelled(Exception):
+    """Raised inside worker code once its tool call was cancelled or timed out."""
+
+
+class ToolTimeoutError(TimeoutError):
+    """A tool call exceeded its time limit; its worker task was cancelled."""
+
+
+def check_cancelled() -> None:
+    """
+    Cooperative cancellation point for long-running loops in worker threads.
+
+    Raises ToolCancelled once the tool call that dispatched the current work has
+    been cancelled or has timed out; a no-op outside executor-dispatched work.
+    """
+
+    token = _cancel_token.get()
+    if token is not None and token.is_set():
+        raise ToolCancelled("Tool call was cancelled")
+
+
+def run_coroutine(coro_fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    """Run one of the tools' async helpers to completion in a worker (thread or process)."""
+    return asyncio.run(coro_fn(*args, **kwargs))
+
+
+def parse_concurrency(spec: str) -> Dict[str, int]:
+    """Parse "tool=n,tool=n" per-tool concurrency overrides."""
+
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        try:
+            limits[name.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning(f"Ignoring invalid concurrency limit '{item.strip()}'")
+    return limits
+
+
+class ToolExecutor:
+    """
+    Dispatches tool work to a thread pool or a process pool.
+
+    Threads suit numpy/pandas/scipy kernels, which release the GIL; the process
+    pool takes pure-Python loops and matplotlib rendering, whose global state is
+    not thread-safe. Each tool has a concurrency limit so one expensive tool
+    cannot occupy every worker, and each call has a time limit. When a call times
+    out or its client cancels it, queued work is dropped, thread work is asked to
+    stop at its next check_cancelled(), and a process running the work is
+    terminated if it is the pool's only in-flight task.
+    """
+
+    def __init__(
+        self,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        limits: Optional[Dict[str, int]] = None,
+        timeout: Optional[float] = None
+    ):
+        cpus = os.cpu_count() or 1
+        self.thread_workers = thread_workers if thread_workers is not None else int(os.getenv("BI_THREAD_WORKERS", min(32, cpus + 4)))
+        self.process_workers = process_workers if process_workers is not None else int(os.getenv("BI_PROCESS_WORKERS", min(4, cpus)))
+        self.limits = {**DEFAULT_TOOL_CONCURRENCY, **parse_concurrency(os.getenv("BI_TOOL_CONCURRENCY", "")), **(limits or {})}
+        if timeout is None:
+            timeout = float(os.getenv("BI_TOOL_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS))
+        self.timeout = timeout if timeout > 0 else None
+
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._process_inflight = 0
+        self._fallback_lock = threading.Lock()  # serializes process-kind work when it has to run on threads
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+        self._counters = {"completed": 0, "failed": 0, "timed_out": 0, "cancelled": 0}
+        self._active: Dict[str, int] = {}
+
+    def limit_for(self, tool_name: str) -> int:
+        return self.limits.get(tool_name, max(1, self.thread_workers))
+
+    async def run_in_thread(self, tool_name: str, fn: Callable[..., Any], *args: Any,
+                            timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Run fn(*args, **kwargs) on the thread pool under the tool's limits."""
+        return await self._dispatch(tool_name, "thread", fn, args, kwargs, timeout)
+
+    async def run_in_process(self, tool_name: str, fn: Callable[..., Any], *args: Any,
+                             timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Run fn(*args, **kwargs) in the process pool under the tool's limits.
+
+        fn and its arguments must be picklable. With BI_PROCESS_WORKERS=0 the work
+        runs on the thread pool instead, one call at a time.
+        """
+        kind = "process" if self.process_workers > 0 else "serial_thread"
+        return await self._dispatch(tool_name, kind, fn, args, kwargs, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "thread_workers": self.thread_workers,
+                "process_workers": self.process_workers,
+                "timeout_seconds": self.timeout,
+                "limits": dict(self.limits),
+                "active": {name: n for name, n in self._active.items() if n},
+                **self._counters
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            threads, processes = self._threads, self._processes
+            self._threads = self._processes = None
+        if threads is not None:
+            threads.shutdown(wait=wait, cancel_futures=True)
+        if processes is not None:
+            processes.shutdown(wait=wait, cancel_futures=True)
+
+    async def _dispatch(self, tool_name: str, kind: str, fn: Callable[..., Any], args: tuple,
+                        kwargs: Dict[str, Any], timeout: Optional[float]) -> Any:
+        timeout = self.timeout if timeout is None else (timeout if timeout > 0 else None)
+        token = threading.Event()
+        submitted: Dict[str, Future] = {}
+
+        async def limited() -> Any:
+            async with self._semaphore(tool_name):
+                with self._lock:
+                    self._active[tool_name] = self._active.get(tool_name, 0) + 1
+                try:
+                    submitted["future"] = self._submit(kind, fn, args, kwargs, token)
+                    return await asyncio.wrap_future(submitted["future"])
+                finally:
+                    with self._lock:
+                        self._active[tool_name] -= 1
+
+        try:
+            result = await asyncio.wait_for(limited(), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(kind, submitted.get("future"), token)
+            self._count("timed_out")
+            logger.warning(f"{tool_name} exceeded its {timeout:g}s time limit and was cancelled")
+            raise ToolTimeoutError(f"{tool_name} exceeded its {timeout:g}s time limit") from None
+        except asyncio.CancelledError:
+            self._abandon(kind, submitted.get("future"), token)
+            self._count("cancelled")
+            logger.info(f"{tool_name} was cancelled by the client")
+            raise
+        except BaseException:
+            self._count("failed")
+            raise
+        self._count("completed")
+        return result
+
+    def _submit(self, kind: str, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any],
+                token: threading.Event) -> Future:
+        if kind == "process":
+            pool = self._process_pool()
+            future = pool.submit(fn, *args, **kwargs)
+            with self._lock:
+                self._process_inflight += 1
+            future.add_done_callback(self._process_done)
+            return future
+
+        ctx = contextvars.copy_context()
+        ctx.run(_cancel_token.set, token)
+        if kind == "serial_thread":
+            return self._thread_pool().submit(ctx.run, self._serialized, fn, args, kwargs)
+        return self._thread_pool().submit(ctx.run, fn, *args, **kwargs)
+
+    def _serialized(self, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+        with self._fallback_lock:
+            check_cancelled()
+            return fn(*args, **kwargs)
+
+    def _abandon(self, kind: str, future: Optional[Future], token: threading.Event) -> None:
+        """Stop work whose caller has gone away."""
+
+        token.set()
+        if future is None or future.cancel() or future.done():
+            return
+        if kind == "process":
+            with self._lock:
+                sole_task = self._process_inflight <= 1
+            if sole_task:
+                self._recycle_process_pool()
+
+    def _recycle_process_pool(self) -> None:
+        """Terminate the process pool's workers; a fresh pool is created on next use."""
+
+        with self._lock:
+            pool, self._processes = self._processes, None
+        if pool is None:
+            return
+        # ProcessPoolExecutor cannot cancel running work, so its workers are terminated directly
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("Process pool recycled after a cancelled task")
+
+    def _process_done(self, _future: Future) -> None:
+        with self._lock:
+            self._process_inflight -= 1
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=max(1, self.thread_workers), thread_name_prefix="bi-worker")
+            return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+            return self._processes
+
+    def _semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they are first used on, so keep one set per event loop
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._semaphores.setdefault(loop, {})
+            if tool_name not in per_loop:
+                per_loop[tool_name] = asyncio.Semaphore(self.limit_for(tool_name))
+            return per_loop[tool_name]
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+
+_EXECUTOR: Optional[ToolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> ToolExecutor:
+    """Return the process-wide tool executor."""
+
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ToolExecutor()
+    return _EXECUTOR
@@ -0,0 +1,340 @@
+"""
+Incremental State
+Persisted, mergeable analysis state that is updated from appended rows only.
+"""
+
+import os
+import json
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_STATE_DIR = Path(__file__).parent.parent.parent / "state" / "incremental"
+BOUNDARY_ROWS = 256  # trailing consumed rows re-hashed on every update to detect rewritten history
+
+
+@dataclass
+class IncrementalRecord:
+    """Analysis state for one dataset and the rows it has consumed so far."""
+    dataset_name: str
+    analysis: str
+    params_key: str
+    schema: Dict[str, str]
+    rows: int
+    boundary_hash: str
+    state: Any
+    watermark_column: str = ""
+    watermark: Any = None
+    updated_at: float = field(default_factory=time.time)
+
+
+class IncrementalStateStore:
+    """
+    Incremental analysis state keyed by dataset, analysis and parameters.
+
+    Records are kept in memory and pickled to the state directory after every update,
+    so a scheduled analysis resumes from its last position after a server restart.
+    """
+
+    def __init__(self, state_dir: Optional[str] = None):
+        self.state_dir = Path(state_dir or os.getenv("BI_INCREMENTAL_DIR", "") or DEFAULT_STATE_DIR)
+        self._records: Dict[Tuple[str, str, str], IncrementalRecord] = {}
+        self._lock = threading.Lock()
+
+    def get(self, dataset_name: str, analysis: str, params_key: str) -> Optional[IncrementalRecord]:
+        key = (dataset_name, analysis, params_key)
+        with self._lock:
+            record = self._records.get(key)
+        if record is None:
+            record = self._read_disk(key)
+            if record is not None:
+                with self._lock:
+                    self._records[key] = record
+        return record
+
+    def put(self, record: IncrementalRecord) -> None:
+        with self._lock:
+            self._records[(record.dataset_name, record.analysis, record.params_key)] = record
+        self._write_disk(record)
+
+    def invalidate(self, dataset_name: Optional[str] = None) -> int:
+        """Drop the state of one dataset (or all datasets) from memory and disk; returns the number removed."""
+
+        with self._lock:
+            keys = [key for key in self._records if dataset_name is None or key[0] == dataset_name]
+            for key in keys:
+                del self._records[key]
+        if self.state_dir.exists():
+            pattern = f"{_safe_name(dataset_name)}--*.pkl" if dataset_name is not None else "*.pkl"
+            for path in self.state_dir.glob(pattern):
+                path.unlink(missing_ok=True)
+        return len(keys)
+
+    def _disk_path(self, key: Tuple[str, str, str]) -> Path:
+        dataset_name, analysis, params_key = key
+        return self.state_dir / f"{_safe_name(dataset_name)}--{analysis}--{params_key[:16]}.pkl"
+
+    def _write_disk(self, record: IncrementalRecord) -> None:
+        path = self._disk_path((record.dataset_name, record.analysis, record.params_key))
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to persist incremental state for '{record.dataset_name}' ({record.analysis}): {e}")
+
+    def _read_disk(self, key: Tuple[str, str, str]) -> Optional[IncrementalRecord]:
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                record = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable incremental state {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        return record if (record.dataset_name, record.analysis, record.params_key) == key else None
+
+
+class ColumnTotals:
+    """Mergeable per-column totals: rows, missing cells, and count/sum/min/max of numeric columns."""
+
+    def __init__(self):
+        self.rows = 0
+        self.missing: Dict[str, int] = {}
+        self.numeric: Dict[str, Dict[str, float]] = {}
+
+    def update(self, df: pd.DataFrame) -> None:
+        self.rows += len(df)
+        for column, missing in df.isna().sum().items():
+            self.missing[column] = self.missing.get(column, 0) + int(missing)
+        numeric = [column for column in df.columns if pd.api.types.is_numeric_dtype(df[column])]
+        if not numeric:
+            return
+        # One aggregation pass over every numeric column
+        part = df[numeric].agg(["count", "sum", "min", "max"])
+        for column in numeric:
+            totals = self.numeric.setdefault(column, {"count": 0, "sum": 0.0, "min": np.nan, "max": np.nan})
+            count = int(part.at["count", column])
+            if count == 0:
+                continue
+            totals["count"] += count
+            totals["sum"] += float(part.at["sum", column])
+            totals["min"] = float(np.fmin(totals["min"], float(part.at["min", column])))
+            totals["max"] = float(np.fmax(totals["max"], float(part.at["max", column])))
+
+    def completeness(self) -> float:
+        """Share of non-missing cells across all columns."""
+
+        cells = self.rows * len(self.missing)
+        return 1 - sum(self.missing.values()) / cells if cells else 0.0
+
+
+class SegmentTotals:
+    """
+    Mergeable per-segment state: group sizes, count/sum/min/max of numeric metrics and
+    per-segment value counts of other metrics.
+
+    Each update aggregates only the given rows and folds the partial results into the
+    running totals, keeping segments in order of first appearance.
+    """
+
+    def __init__(self, keys: List[str], numeric_metrics: List[str], other_metrics: List[str]):
+        self.keys = list(keys)
+        self.numeric_metrics = list(numeric_metrics)
+        self.other_metrics = list(other_metrics)
+        self.sizes: Optional[pd.Series] = None
+        self.numeric: Optional[pd.DataFrame] = None
+        self.value_counts: Dict[str, pd.Series] = {}
+
+    def update(self, df: pd.DataFrame) -> None:
+        grouped = df.groupby(self.keys, observed=True, sort=False, dropna=True)
+        self.sizes = merge_partials(self.sizes, grouped.size(), "sum")
+        if self.numeric_metrics:
+            part = grouped[self.numeric_metrics].agg(["count", "sum", "min", "max"])
+            rules = {(metric, stat): "sum" if stat in ("count", "sum") else stat
+                     for metric in self.numeric_metrics for stat in ("count", "sum", "min", "max")}
+            self.numeric = merge_partials(self.numeric, part, rules)
+        for metric in self.other_metrics:
+            counts = df.groupby(self.keys + [metric], observed=True, sort=False).size()
+            self.value_counts[metric] = merge_partials(self.value_counts.get(metric), counts, "sum")
+
+
+def incremental_update(
+    dataset_name: str,
+    analysis: str,
+    params: Dict[str, Any],
+    df: pd.DataFrame,
+    initial: Callable[[], Any],
+    watermark_column: str = "",
+    store: Optional[IncrementalStateStore] = None
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Bring an analysis state up to date with df and return it with a summary of the update.
+
+    The state (created by initial(), updated in place with state.update(rows)) is reused
+    when df only appends to the rows it has already consumed: by row count, when the
+    last consumed rows are unchanged, or by watermark_column, when exactly the consumed
+    number of rows lies at or below the saved watermark. Anything else (no saved state,
+    a changed schema, rewritten or deleted rows) rebuilds the state from every row.
+    """
+
+    if watermark_column and watermark_column not in df.columns:
+        raise ValueError(f"Watermark column '{watermark_column}' not found in dataset")
+
+    store = store or get_incremental_store()
+    params_key = _params_key({"params": params, "watermark_column": watermark_column})
+    schema = _schema(df)
+    record = store.get(dataset_name, analysis, params_key)
+
+    appended, reason = None, "no saved state"
+    if record is not None:
+        appended, reason = _appended_rows(df, record, schema)
+
+    if appended is None:
+        state = initial()
+        state.update(df)
+        mode, processed, watermark = "full", len(df), _max_value(df, watermark_column)
+    else:
+        state = record.state
+        if len(appended):
+            state.update(appended)
+        mode, processed = "incremental", len(appended)
+        watermark = record.watermark
+        if watermark_column and len(appended):
+            watermark = _max_value(appended, watermark_column) if watermark is None else \
+                max(watermark, _max_value(appended, watermark_column))
+
+    store.put(IncrementalRecord(
+        dataset_name=dataset_name,
+        analysis=analysis,
+        params_key=params_key,
+        schema=schema,
+        rows=len(df),
+        boundary_hash=_rows_hash(df.iloc[max(0, len(df) - BOUNDARY_ROWS):]),
+        state=state,
+        watermark_column=watermark_column,
+        watermark=watermark
+    ))
+
+    info = {"mode": mode, "rows_processed": processed, "rows_total": len(df)}
+    if mode == "full":
+        info["reason"] = reason
+    if watermark_column:
+        info["watermark_column"] = watermark_column
+        info["watermark"] = None if watermark is None else str(watermark)
+    return state, info
+
+
+def _appended_rows(df: pd.DataFrame, record: IncrementalRecord,
+                   schema: Dict[str, str]) -> Tuple[Optional[pd.DataFrame], str]:
+    """Rows of df not yet consumed by the record, or None (with a reason) when it cannot be reused."""
+
+    if schema != record.schema:
+        return None, "schema changed"
+
+    if record.watermark_column:
+        if record.watermark is None:
+            return None, "no watermark recorded"
+        column = df[record.watermark_column]
+        try:
+            is_new = (column > record.watermark).to_numpy(dtype=bool, na_value=False)
+        except TypeError:
+            return None, "watermark column is not comparable"
+        if len(df) - int(is_new.sum()) != record.rows:
+            return None, "rows at or below the watermark changed"
+        return df[is_new], ""
+
+    if len(df) < record.rows:
+        return None, "rows were removed"
+    boundary = df.iloc[max(0, record.rows - BOUNDARY_ROWS):record.rows]
+    if _rows_hash(boundary) != record.boundary_hash:
+        return None, "previously consumed rows changed"
+    return df.iloc[record.rows:], ""
+
+
+def _schema(df: pd.DataFrame) -> Dict[str, str]:
+    """Column kinds that survive compaction (int8 vs int64, category vs object) as data grows."""
+
+    schema = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_bool_dtype(series):
+            kind = "boolean"
+        elif pd.api.types.is_numeric_dtype(series):
+            kind = "numeric"
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            kind = "datetime"
+        else:
+            kind = "other"
+        schema[str(column)] = kind
+    return schema
+
+
+def _rows_hash(block: pd.DataFrame) -> str:
+    """Hash of a block of rows that is independent of numeric width and categorical encoding."""
+
+    digest = hashlib.sha256()
+    for column in block.columns:
+        series = block[column]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = series.astype(str).to_numpy(dtype=object)
+        digest.update(pd.util.hash_array(values).tobytes())
+    return digest.hexdigest()
+
+
+def _max_value(df: pd.DataFrame, column: str) -> Any:
+    if not column:
+        return None
+    value = df[column].max()
+    return None if pd.isna(value) else value
+
+
+def _params_key(params: Dict[str, Any]) -> str:
+    normalized = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def merge_partials(total: Any, part: Any, rules: Any) -> Any:
+    """Combine grouped partial results (None for no total yet), keeping groups in order of first appearance."""
+
+    if total is None:
+        return part
+    combined = pd.concat([total, part])
+    return combined.groupby(level=list(range(combined.index.nlevels)), observed=True, sort=False).agg(rules)
+
+
+def _safe_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+
+
+# Module-level store shared by every incremental analysis
+
+_STORE: Optional[IncrementalStateStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_incremental_store() -> IncrementalStateStore:
+    """Return the process-wide incremental state store."""
+
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = IncrementalStateStore()
+    return _STORE
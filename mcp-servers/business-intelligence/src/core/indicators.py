@@ -0,0 +1,561 @@
+"""
+Technical Indicators
+Columnar OHLCV feature engine with shared rolling primitives and incremental append.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+logger = logging.getLogger("business-intelligence")
+
+PRICE = "Adj Close"
+RAW_COLUMNS = ("Open", "High", "Low", "Close", "Volume", PRICE)
+# Features that need traded volume; they are left out when the Volume column is all zero
+VOLUME_FEATURES = ("OBV", "VWAP", "vol_change", "vol_rolling_mean_14", "vol_rolling_std_14", "vol_ratio",
+                   "ADL", "CMF", "VPT")
+# Rows per block when a rolling statistic materializes its windows
+WINDOW_CHUNK = 1 << 16
+PSAR_STEP = 0.02
+PSAR_MAX_STEP = 0.2
+
+_GRAPH: Optional["FeatureGraph"] = None
+_GRAPH_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Node:
+    """One named array in the feature graph and how it is computed from its inputs."""
+    key: str
+    inputs: Tuple[str, ...]
+    compute: Callable[..., Any]
+    window: int = 0          # rows before the current one the node reads from its inputs
+    recursive: bool = False  # carries kernel state across appends instead of re-reading history
+
+
+class FeatureGraph:
+    """
+    DAG of indicator nodes. Primitives (shifts, rolling means, window moments, EMAs)
+    are keyed by their parameters, so every feature asking for the same rolling
+    mean or EMA shares one node and it is computed once per evaluation.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Node] = {}
+        self.outputs: Dict[str, str] = {}
+
+    def add(self, key: str, inputs: Sequence[str], compute: Callable[..., Any],
+            window: int = 0, recursive: bool = False) -> str:
+        if key not in self.nodes:
+            self.nodes[key] = Node(key, tuple(inputs), compute, window, recursive)
+        return key
+
+    def output(self, name: str, key: str) -> None:
+        self.outputs[name] = key
+
+    def derive(self, name: str, inputs: Sequence[str], compute: Callable[..., Any], window: int = 0) -> str:
+        """Add a pointwise (or short-window) node and publish it as feature `name`."""
+        self.output(name, self.add(name, inputs, compute, window))
+        return name
+
+    # Shared primitives
+
+    def shift(self, column: str, periods: int = 1) -> str:
+        return self.add(f"shift({column},{periods})", [column], lambda x: _shift(x, periods), window=periods)
+
+    def mean(self, column: str, window: int) -> str:
+        return self.add(f"mean({column},{window})", [column], lambda x: _rolling_mean(x, window), window=window - 1)
+
+    def moments(self, column: str, window: int, order: int) -> str:
+        """Central moments m2..m`order` of each full window (columns of a 2-D array)."""
+        for higher in range(order + 1, 5):
+            if f"moments({column},{window},{higher})" in self.nodes:
+                return f"moments({column},{window},{higher})"
+        return self.add(f"moments({column},{window},{order})", [column, self.mean(column, window)],
+                        lambda x, mean: _window_moments(x, mean, window, order), window=window - 1)
+
+    def rolling_max(self, column: str, window: int) -> str:
+        return self.add(f"max({column},{window})", [column], lambda x: _rolling_extreme(x, window, np.max),
+                        window=window - 1)
+
+    def rolling_min(self, column: str, window: int) -> str:
+        return self.add(f"min({column},{window})", [column], lambda x: _rolling_extreme(x, window, np.min),
+                        window=window - 1)
+
+    def ema(self, column: str, alpha: float, min_periods: int = 0, adjust: bool = False) -> str:
+        kernel = _ema_adjusted if adjust else _ema
+        return self.add(f"ema({column},{alpha:.10g},{min_periods},{adjust})", [column],
+                        lambda x, state: kernel(x, alpha, min_periods, state), recursive=True)
+
+    def cumsum(self, column: str) -> str:
+        return self.add(f"cumsum({column})", [column], _cumsum, recursive=True)
+
+    # Evaluation
+
+    def history(self, names: Sequence[str]) -> int:
+        """Rows of raw history needed to recompute the non-recursive nodes behind `names` exactly."""
+
+        memo: Dict[str, int] = {}
+
+        def depth(key: str) -> int:
+            if key not in self.nodes:
+                return 0
+            if key not in memo:
+                node = self.nodes[key]
+                memo[key] = node.window + max((depth(i) for i in node.inputs), default=0)
+            return memo[key]
+
+        return max((depth(self.outputs[name]) for name in names), default=0)
+
+    def evaluate(self, columns: Dict[str, np.ndarray], names: Sequence[str], start: int = 0,
+                 kernels: Optional[Dict[str, Tuple[np.ndarray, Any]]] = None
+                 ) -> Tuple[Dict[str, np.ndarray], Dict[str, Tuple[np.ndarray, Any]]]:
+        """
+        Compute the features in `names` over `columns`. Rows before `start` are
+        history from an earlier call: recursive nodes only run on the rows from
+        `start` on, resuming from their saved kernel state and reusing their saved
+        output for the history rows.
+        """
+
+        kernels = kernels or {}
+        values: Dict[str, np.ndarray] = dict(columns)
+        updated: Dict[str, Tuple[np.ndarray, Any]] = {}
+
+        def resolve(key: str) -> np.ndarray:
+            if key in values:
+                return values[key]
+            node = self.nodes[key]
+            args = [resolve(i) for i in node.inputs]
+            if node.recursive:
+                previous, state = kernels.get(key, (np.empty(0), None))
+                fresh, state = node.compute(*[arg[start:] for arg in args], state=state)
+                result = np.concatenate((previous[len(previous) - start:], fresh)) if start else fresh
+                updated[key] = (result, state)
+            else:
+                result = node.compute(*args)
+            values[key] = result
+            return result
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            features = {name: resolve(self.outputs[name]) for name in names}
+        return features, updated
+
+
+@dataclass
+class FeatureState:
+    """Everything needed to extend features with new bars: raw and recursive-node tails plus kernel state."""
+    features: List[str]
+    history: int
+    rows: int = 0
+    last_index: Any = None
+    tail: Dict[str, np.ndarray] = field(default_factory=dict)
+    kernels: Dict[str, Tuple[np.ndarray, Any]] = field(default_factory=dict)
+
+
+def build_feature_graph() -> FeatureGraph:
+    """The crypto feature set (same columns and definitions as the `ta`-based pipeline)."""
+
+    g = FeatureGraph()
+    price, high, low, close, open_, volume = PRICE, "High", "Low", "Close", "Open", "Volume"
+    prev_price, prev_close = g.shift(price), g.shift(close)
+
+    # 1. Returns
+    g.derive("return", [price, prev_price], lambda p, q: p / q - 1)
+    g.derive("log_return", [price, prev_price], lambda p, q: np.log(p / q))
+
+    # 2. Rolling statistics: one moments node per window serves mean, std, skew and kurt
+    for window in (7, 14, 30):
+        moments = g.moments(price, window, 4)
+        g.output(f"rolling_mean_{window}", g.mean(price, window))
+        g.derive(f"rolling_std_{window}", [moments], lambda m, w=window: np.sqrt(m[:, 0] * w / (w - 1)))
+        g.derive(f"rolling_skew_{window}", [moments], lambda m, w=window: _skew(m, w))
+        g.derive(f"rolling_kurt_{window}", [moments], lambda m, w=window: _kurt(m, w))
+
+    # 3. Volatility: Wilder ATR and Bollinger Bands (population std, as in `ta`)
+    true_range = g.add("true_range", [high, low, prev_close],
+                       lambda h, lo, c: np.fmax(h - lo, np.fmax(np.abs(h - c), np.abs(lo - c))))
+    atr = g.add("atr(14)", [true_range], lambda tr, state: _wilder_atr(tr, 14, state), recursive=True)
+    g.output("ATR", atr)
+    g.derive("ATR_pct", [atr, close], lambda a, c: a / c * 100)
+    for window in (20, 50):
+        mean, moments = g.mean(price, window), g.moments(price, window, 2)
+        band = g.add(f"band({window})", [moments], lambda m: 2 * np.sqrt(m[:, 0]))
+        g.derive(f"BB_high_{window}", [mean, band], np.add)
+        g.derive(f"BB_low_{window}", [mean, band], np.subtract)
+        g.derive(f"BB_pct_{window}", [price, mean, band], lambda p, m, b: (p - (m - b)) / (2 * b))
+        g.derive(f"BB_width_{window}", [band, price], lambda b, p: 2 * b / p)
+
+    # 4. Momentum: RSI on Wilder averages of gains and losses
+    change = g.add(f"diff({price})", [price, prev_price], np.subtract)
+    gains = g.add("gains", [change], lambda d: np.where(d > 0, d, 0.0))
+    losses = g.add("losses", [change], lambda d: np.where(d < 0, -d, 0.0))
+    for name, window in (("RSI", 14), ("RSI_14", 14), ("RSI_30", 30)):
+        key = g.add(f"rsi({window})", [g.ema(gains, 1 / window, window), g.ema(losses, 1 / window, window)],
+                    lambda up, down: np.where(down == 0, 100.0, 100 - 100 / (1 + up / down)))
+        g.output(name, key)
+    high_14, low_14 = g.rolling_max(high, 14), g.rolling_min(low, 14)
+    stoch_k = g.derive("Stoch_K", [close, high_14, low_14], lambda c, h, lo: 100 * (c - lo) / (h - lo))
+    g.output("Stoch_D", g.mean(stoch_k, 3))
+    g.derive("Williams_R", [close, high_14, low_14], lambda c, h, lo: -100 * (h - c) / (h - lo))
+
+    # 5. Trend: MACD, moving averages, Parabolic SAR
+    macd = g.derive("MACD", [g.ema(price, 2 / 13, 12), g.ema(price, 2 / 27, 26)], np.subtract)
+    signal = g.ema(macd, 2 / 10, 9)
+    g.output("MACD_signal", signal)
+    g.derive("MACD_diff", [macd, signal], np.subtract)
+    for period in (5, 10, 20, 50, 100, 200):
+        g.output(f"MA_{period}", g.mean(price, period))
+        g.output(f"EMA_{period}", g.ema(price, 2 / (period + 1), adjust=True))
+    g.derive("MA_20_50_signal", [g.mean(price, 20), g.mean(price, 50)], lambda a, b: np.where(a > b, 1, -1))
+    g.derive("MA_50_200_signal", [g.mean(price, 50), g.mean(price, 200)], lambda a, b: np.where(a > b, 1, -1))
+    g.output("PSAR", g.add("psar", [high, low, close], _psar, recursive=True))
+
+    # 6. Volume
+    signed_volume = g.add("signed_volume", [price, prev_price, volume], lambda p, q, v: np.where(p < q, -v, v))
+    g.output("OBV", g.cumsum(signed_volume))
+    traded = g.add("traded_value", [close, volume], np.multiply)
+    g.derive("VWAP", [g.cumsum(traded), g.cumsum(volume)], np.divide)
+    prev_volume = g.shift(volume)
+    g.derive("vol_change", [volume, prev_volume], lambda v, q: v / q - 1)
+    volume_mean = g.mean(volume, 14)
+    g.output("vol_rolling_mean_14", volume_mean)
+    g.derive("vol_rolling_std_14", [g.moments(volume, 14, 2)], lambda m: np.sqrt(m[:, 0] * 14 / 13))
+    g.derive("vol_ratio", [volume, volume_mean], np.divide)
+    money_flow = g.add("money_flow", [high, low, close, volume],
+                       lambda h, lo, c, v: np.nan_to_num(((c - lo) - (h - c)) / (h - lo), nan=0.0) * v)
+    g.output("ADL", g.cumsum(money_flow))
+    g.derive("CMF", [g.mean(money_flow, 20), g.mean(volume, 20)], np.divide)
+    g.output("VPT", g.cumsum(g.add("price_volume", [price, prev_price, volume], lambda p, q, v: (p / q - 1) * v)))
+
+    # 7. Bar shape
+    g.derive("price_position", [close, low, high], lambda c, lo, h: (c - lo) / (h - lo))
+    gap = g.derive("gap", [open_, prev_close], lambda o, c: (o - c) / c)
+    g.derive("gap_filled", [gap, low, high, prev_close],
+             lambda gp, lo, h, c: np.where((gp > 0) & (lo <= c), 1, np.where((gp < 0) & (h >= c), 1, 0)))
+    g.derive("intraday_return", [close, open_], lambda c, o: (c - o) / o)
+    g.derive("overnight_return", [open_, prev_close], lambda o, c: (o - c) / c)
+
+    # 8. Market structure
+    prev_high, prev_low = g.shift(high), g.shift(low)
+    g.derive("higher_high", [high, prev_high], np.greater)
+    g.derive("lower_low", [low, prev_low], np.less)
+    g.derive("higher_low", [low, prev_low], np.greater)
+    g.derive("lower_high", [high, prev_high], np.less)
+    resistance, support = g.rolling_max(high, 20), g.rolling_min(low, 20)
+    g.output("resistance_20", resistance)
+    g.output("support_20", support)
+    g.derive("near_resistance", [close, resistance], lambda c, r: c / r > 0.98)
+    g.derive("near_support", [close, support], lambda c, s: c / s < 1.02)
+
+    # 9-10. Volatility regime and trend strength
+    std_30 = g.outputs["rolling_std_30"]
+    g.derive("volatility_regime", [std_30, g.mean(std_30, 60)], lambda s, m: np.where(s > m, "high", "low"))
+    g.derive("trend_strength", [close, g.mean(price, 20), atr], lambda c, m, a: np.abs(c - m) / a)
+    return g
+
+
+def get_feature_graph() -> FeatureGraph:
+    """Return the process-wide feature graph."""
+
+    global _GRAPH
+    if _GRAPH is None:
+        with _GRAPH_LOCK:
+            if _GRAPH is None:
+                _GRAPH = build_feature_graph()
+    return _GRAPH
+
+
+def select_features(df: pd.DataFrame) -> List[str]:
+    """Features for this frame: volume features need traded volume, and a VWAP column from the source is kept."""
+
+    has_volume = "Volume" in df.columns and df["Volume"].sum() > 0
+    return [name for name in get_feature_graph().outputs
+            if (has_volume or name not in VOLUME_FEATURES) and not (name == "VWAP" and name in df.columns)]
+
+
+def compute_features(df: pd.DataFrame, features: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, FeatureState]:
+    """
+    Indicator columns for an OHLCV frame (features only, same index) and the
+    state that `append_features` needs to extend them with later bars.
+    """
+
+    names = list(features) if features is not None else select_features(df)
+    columns = _raw_columns(df)
+    values, kernels = get_feature_graph().evaluate(columns, names)
+    state = FeatureState(features=names, history=get_feature_graph().history(names))
+    _advance(state, columns, kernels, len(df), df.index[-1] if len(df) else None)
+    return pd.DataFrame(values, index=df.index), state
+
+
+def append_features(state: FeatureState, bars: pd.DataFrame) -> Tuple[pd.DataFrame, FeatureState]:
+    """
+    Indicator columns for newly appended bars only. Windowed features re-read the
+    saved raw tail; EMAs, Wilder averages, cumulative sums and the SAR resume
+    from their saved kernel state, so results match a full recompute.
+    """
+
+    if state.last_index is not None and len(bars):
+        bars = bars[bars.index > state.last_index]
+    if bars.empty:
+        return pd.DataFrame(columns=state.features, index=bars.index), state
+
+    fresh = _raw_columns(bars)
+    start = len(next(iter(state.tail.values()))) if state.tail else 0
+    columns = {key: np.concatenate((state.tail[key], fresh[key])) if start else fresh[key] for key in fresh}
+    values, kernels = get_feature_graph().evaluate(columns, state.features, start=start, kernels=state.kernels)
+    _advance(state, columns, kernels, state.rows + len(bars), bars.index[-1])
+    return pd.DataFrame({name: column[start:] for name, column in values.items()}, index=bars.index), state
+
+
+def add_features(df: pd.DataFrame, dropna: bool = True) -> pd.DataFrame:
+    """OHLCV frame with every indicator column appended in one concat; warm-up rows are dropped by default."""
+
+    if PRICE not in df.columns:
+        df = df.assign(**{PRICE: df["Close"]})
+    features, _ = compute_features(df)
+    combined = pd.concat([df, features], axis=1)
+    return combined.dropna() if dropna else combined
+
+
+def add_features_many(frames: Dict[str, pd.DataFrame], max_workers: Optional[int] = None,
+                      dropna: bool = True) -> Dict[str, pd.DataFrame]:
+    """`add_features` for many symbols, one worker process per symbol."""
+
+    workers = min(max_workers or os.cpu_count() or 1, len(frames))
+    if workers <= 1:
+        return {symbol: add_features(frame, dropna) for symbol, frame in frames.items()}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(add_features, frames.values(), [dropna] * len(frames))
+        return dict(zip(frames, results))
+
+
+def featurize_files(paths: Sequence[str], output_dir: Optional[str] = None,
+                    max_workers: Optional[int] = None, dropna: bool = True) -> Dict[str, int]:
+    """
+    Regenerate the indicator columns of OHLCV CSV files (e.g. `crypto_data_*.csv`)
+    in parallel. Only the raw price and volume columns are read back; files are
+    written to `output_dir` (default: next to the input). Returns rows written per file.
+    """
+
+    jobs = [(str(path), str(Path(output_dir or Path(path).parent) / Path(path).name), dropna) for path in paths]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        results = [_featurize_file(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_featurize_file, *zip(*jobs)))
+    return dict(zip((job[1] for job in jobs), results))
+
+
+def _featurize_file(source: str, target: str, dropna: bool) -> int:
+    header = pd.read_csv(source, nrows=0)
+    index_column = header.columns[0]
+    raw = [column for column in (*RAW_COLUMNS, "VWAP") if column in header.columns]
+    df = pd.read_csv(source, usecols=[index_column, *raw], index_col=0, parse_dates=True)
+    result = add_features(df, dropna)
+    Path(target).parent.mkdir(parents=True, exist_ok=True)
+    result.to_csv(target)
+    logger.info(f"Features regenerated for {source}: {len(result)} rows, {len(result.columns)} columns")
+    return len(result)
+
+
+def _raw_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    price = df[PRICE] if PRICE in df.columns else df["Close"]
+    columns = {name: df[name].to_numpy(dtype=np.float64) for name in RAW_COLUMNS[:-1]}
+    columns[PRICE] = price.to_numpy(dtype=np.float64)
+    return columns
+
+
+def _advance(state: FeatureState, columns: Dict[str, np.ndarray], kernels: Dict[str, Tuple[np.ndarray, Any]],
+             rows: int, last_index: Any) -> None:
+    """Keep the last `history` raw rows and recursive-node outputs, plus the new kernel state."""
+
+    keep = state.history
+    state.tail = {key: column[-keep:].copy() if keep else column[:0].copy() for key, column in columns.items()}
+    state.kernels = {key: (output[-keep:].copy() if keep else output[:0].copy(), kernel)
+                     for key, (output, kernel) in kernels.items()}
+    state.rows = rows
+    state.last_index = last_index
+
+
+# Kernels
+
+def _shift(x: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if periods < len(x):
+        out[periods:] = x[:len(x) - periods]
+    return out
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Mean over full windows from cumulative sums (NaN wherever the window holds a NaN)."""
+
+    valid = np.isfinite(x)
+    offset = x[valid][0] if valid.any() else 0.0
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, x - offset, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        full = counts[window:] - counts[:-window] == window
+        out[window - 1:] = np.where(full, (sums[window:] - sums[:-window]) / window + offset, np.nan)
+    return out
+
+
+def _window_moments(x: np.ndarray, mean: np.ndarray, window: int, order: int) -> np.ndarray:
+    """Central moments m2..m`order` per full window, materializing WINDOW_CHUNK windows at a time."""
+
+    out = np.full((len(x), order - 1), np.nan)
+    if len(x) < window:
+        return out
+    windows = sliding_window_view(x, window)
+    for begin in range(0, len(windows), WINDOW_CHUNK):
+        block = windows[begin:begin + WINDOW_CHUNK]
+        deviations = block - mean[begin + window - 1:begin + window - 1 + len(block), None]
+        power = deviations * deviations
+        for column in range(order - 1):
+            out[begin + window - 1:begin + window - 1 + len(block), column] = power.mean(axis=1)
+            power = power * deviations
+    return out
+
+
+def _skew(moments: np.ndarray, n: int) -> np.ndarray:
+    m2, m3 = moments[:, 0], moments[:, 1]
+    return np.where(m2 > 1e-14, np.sqrt(n * (n - 1)) * m3 / ((n - 2) * m2 ** 1.5), np.nan)
+
+
+def _kurt(moments: np.ndarray, n: int) -> np.ndarray:
+    m2, m4 = moments[:, 0], moments[:, 2]
+    excess = (n * n - 1) * m4 / (m2 * m2) - 3 * (n - 1) ** 2
+    return np.where(m2 > 1e-14, excess / ((n - 2) * (n - 3)), np.nan)
+
+
+def _rolling_extreme(x: np.ndarray, window: int, reduce: Callable[..., np.ndarray]) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = reduce(sliding_window_view(x, window), axis=1)
+    return out
+
+
+def _ema(x: np.ndarray, alpha: float, min_periods: int, state: Optional[Tuple[float, int]]
+         ) -> Tuple[np.ndarray, Tuple[float, int]]:
+    """Recursive EMA (pandas `adjust=False`), starting at the first finite value."""
+
+    out = np.full(len(x), np.nan)
+    if state is None:
+        finite = np.flatnonzero(np.isfinite(x))
+        if not len(finite):
+            return out, None
+        begin, previous, seen = finite[0], x[finite[0]], 0
+    else:
+        begin, (previous, seen) = 0, state
+    if begin < len(x):
+        out[begin:], _ = lfilter([alpha], [1.0, alpha - 1.0], x[begin:], zi=[(1 - alpha) * previous])
+        observed = seen + np.arange(1, len(x) - begin + 1)
+        out[begin:][observed < min_periods] = np.nan
+        seen, previous = int(observed[-1]), out[-1]
+    return out, (previous, seen)
+
+
+def _ema_adjusted(x: np.ndarray, alpha: float, min_periods: int, state: Optional[Tuple[float, float]]
+                  ) -> Tuple[np.ndarray, Tuple[float, float]]:
+    """Bias-adjusted EMA (pandas `ewm(span).mean()`): weighted sum over the running sum of weights."""
+
+    decay = 1.0 - alpha
+    total, weight = state if state is not None else (0.0, 0.0)
+    sums, _ = lfilter([1.0], [1.0, -decay], x, zi=[decay * total])
+    weights, _ = lfilter([1.0], [1.0, -decay], np.ones(len(x)), zi=[decay * weight])
+    if len(x):
+        total, weight = sums[-1], weights[-1]
+    return sums / weights, (total, weight)
+
+
+def _cumsum(x: np.ndarray, state: Optional[float]) -> Tuple[np.ndarray, float]:
+    """Running total that skips NaN (and reports NaN there), like `Series.cumsum`."""
+
+    total = state or 0.0
+    out = np.nancumsum(x) + total
+    out[np.isnan(x)] = np.nan
+    return out, (float(out[np.isfinite(out)][-1]) if np.isfinite(out).any() else total)
+
+
+def _wilder_atr(true_range: np.ndarray, window: int, state: Optional[Tuple[int, float, float]]
+                ) -> Tuple[np.ndarray, Tuple[int, float, float]]:
+    """Wilder's average true range: zeros while warming up, the plain mean at row `window`, then smoothing."""
+
+    count, seed, previous = state or (0, 0.0, 0.0)
+    out = np.zeros(len(true_range))
+    i = 0
+    while count < window and i < len(true_range):
+        seed += true_range[i]
+        count += 1
+        if count == window:
+            previous = out[i] = seed / window
+        i += 1
+    if i < len(true_range):
+        alpha = 1.0 / window
+        out[i:], _ = lfilter([alpha], [1.0, alpha - 1.0], true_range[i:], zi=[(1 - alpha) * previous])
+        count += len(true_range) - i
+        previous = out[-1]
+    return out, (count, seed, previous)
+
+
+def _psar(high: np.ndarray, low: np.ndarray, close: np.ndarray, state: Optional[Dict[str, Any]]
+          ) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Parabolic SAR (step 0.02, max 0.2); inherently sequential, so a tight loop over Python floats."""
+
+    highs, lows, out = high.tolist(), low.tolist(), close.tolist()
+    if state is None:
+        if not highs:
+            return np.empty(0), None
+        state = {"up": True, "af": PSAR_STEP, "up_high": highs[0], "down_low": lows[0],
+                 "sar": None, "highs": [], "lows": [], "seen": 0}
+    up, af, up_high, down_low = state["up"], state["af"], state["up_high"], state["down_low"]
+    highs, lows = state["highs"] + highs, state["lows"] + lows
+    offset = len(state["highs"])
+    sar = state["sar"]
+
+    for j in range(len(out)):
+        i = j + offset
+        if state["seen"] + j < 2:
+            sar = out[j]
+            continue
+        max_high, min_low = highs[i], lows[i]
+        if up:
+            sar = sar + af * (up_high - sar)
+            if min_low < sar:
+                reversal, sar, down_low, af = True, up_high, min_low, PSAR_STEP
+            else:
+                reversal = False
+                if max_high > up_high:
+                    up_high, af = max_high, min(af + PSAR_STEP, PSAR_MAX_STEP)
+                if lows[i - 2] < sar:
+                    sar = lows[i - 2]
+                elif lows[i - 1] < sar:
+                    sar = lows[i - 1]
+        else:
+            sar = sar - af * (sar - down_low)
+            if max_high > sar:
+                reversal, sar, up_high, af = True, down_low, max_high, PSAR_STEP
+            else:
+                reversal = False
+                if min_low < down_low:
+                    down_low, af = min_low, min(af + PSAR_STEP, PSAR_MAX_STEP)
+                if highs[i - 2] > sar:
+                    sar = highs[i - 2]
+                elif highs[i - 1] > sar:
+                    sar = highs[i - 1]
+        up = up != reversal
+        out[j] = sar
+
+    state = {"up": up, "af": af, "up_high": up_high, "down_low": down_low, "sar": sar,
+             "highs": highs[-2:], "lows": lows[-2:], "seen": state["seen"] + len(out)}
+    return np.asarray(out, dtype=np.float64), state
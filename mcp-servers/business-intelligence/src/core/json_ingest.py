@@ -0,0 +1,439 @@
+"""
+JSON Ingest
+Streaming JSON and JSON Lines ingestion into flattened columnar batches.
+"""
+
+import io
+import re
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.core.csv_ingest import ProgressCallback, _report
+
+logger = logging.getLogger("business-intelligence")
+
+SCHEMA_SAMPLE_RECORDS = 1_000     # leading records that fix column order and the Arrow schema
+BATCH_ROWS = 100_000
+ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+SEPARATOR = "."
+VALUES_COLUMN = "values"          # column for arrays of scalars
+
+_PATH_TOKEN = re.compile(r"""\[\s*'([^']*)'\s*\]|\[\s*"([^"]*)"\s*\]|\[\s*\*\s*\]|\.?([^.\[\]]+)""")
+
+
+def parse_json_path(selector: str) -> List[str]:
+    """
+    Keys leading to the record array from a JSONPath selector.
+
+    Supports dotted and bracket-quoted member names with an optional trailing [*]
+    ("$.data.events[*]", "data.events", "$['data']['events']"); "$" alone selects
+    the document root.
+    """
+
+    text = selector.strip()
+    if text.startswith("$"):
+        text = text[1:]
+    keys = []
+    position = 0
+    while position < len(text):
+        match = _PATH_TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unsupported JSONPath selector: {selector}")
+        key = next((group for group in match.groups() if group is not None), None)
+        if key is None and match.end() < len(text):
+            raise ValueError(f"Wildcards are only supported at the end of a JSONPath selector: {selector}")
+        if key is not None:
+            if key.isdigit() and not match.group(0).startswith("["):
+                raise ValueError(f"Array indices are not supported in JSONPath selectors: {selector}")
+            keys.append(key)
+        position = match.end()
+    return keys
+
+
+class ColumnBatchBuilder:
+    """
+    Accumulates records as flattened columns.
+
+    Nested objects become dotted columns ("user.address.city"); arrays are kept as
+    values. Each column stores only the rows it occurs in, so sparse fields cost
+    nothing for the records that lack them.
+    """
+
+    def __init__(self, separator: str = SEPARATOR):
+        self.separator = separator
+        self.rows = 0
+        self._values: Dict[str, List[Any]] = {}
+        self._positions: Dict[str, List[int]] = {}
+
+    def add(self, record: Any) -> None:
+        if isinstance(record, dict):
+            self._add_fields(record, "")
+        else:
+            self._add_value(VALUES_COLUMN, record)
+        self.rows += 1
+
+    def flush(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Return the accumulated rows as a frame (columns in the given order first) and reset."""
+
+        names = list(columns or []) + [name for name in self._values if name not in (columns or [])]
+        data = {}
+        for name in names:
+            values = self._values.get(name)
+            if values is None:
+                continue
+            if len(values) < self.rows:
+                dense = [None] * self.rows
+                for position, value in zip(self._positions[name], values):
+                    dense[position] = value
+                values = dense
+            data[name] = values
+        frame = pd.DataFrame(data, index=pd.RangeIndex(self.rows))
+        self.rows = 0
+        self._values, self._positions = {}, {}
+        return frame
+
+    def _add_fields(self, record: Dict[str, Any], prefix: str) -> None:
+        for key, value in record.items():
+            name = f"{prefix}{key}"
+            if isinstance(value, dict) and value:
+                self._add_fields(value, name + self.separator)
+            else:
+                self._add_value(name, value)
+
+    def _add_value(self, name: str, value: Any) -> None:
+        values = self._values.get(name)
+        if values is None:
+            values = self._values[name] = []
+            self._positions[name] = []
+        values.append(value)
+        self._positions[name].append(self.rows)
+
+
+def read_jsonl_file(
+    source_path: str,
+    options: Optional[Dict[str, Any]] = None,
+    progress_callback: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Read a JSON Lines file in a single streaming pass.
+
+    With pyarrow, blocks are parsed natively into record batches against a schema
+    inferred from the first SCHEMA_SAMPLE_RECORDS records and nested objects are
+    flattened to dotted columns. Files Arrow cannot stream (types changing after the
+    sample, invalid lines in non-strict mode) are parsed line by line into columnar
+    batches instead.
+    """
+
+    options = options or {}
+    started = time.perf_counter()
+    file_size = Path(source_path).stat().st_size
+
+    df, engine = _read_jsonl_with_pyarrow(source_path, options.get("strict", True), file_size,
+                                          progress_callback, started)
+    skipped = 0
+    if df is None:
+        df, skipped, error = _read_jsonl_lines(source_path, options.get("strict", True), file_size,
+                                               progress_callback, started)
+        if error:
+            return {"error": error}
+        engine = f"lines.{_loads_backend()}"
+    if df.empty:
+        return {"error": "No valid JSON records found"}
+
+    result = _result(df, engine, source_path, file_size, started, progress_callback)
+    result["records_loaded"] = len(df)
+    if skipped:
+        result["ingest"]["invalid_lines_skipped"] = skipped
+    return result
+
+
+def read_json_file(
+    source_path: str,
+    options: Optional[Dict[str, Any]] = None,
+    progress_callback: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Read the record array of a JSON document.
+
+    options["json_path"] selects the array ("$.data.events[*]"); without it the
+    document's top-level array, or the first member holding an array of objects, is
+    used. With ijson the array is streamed item by item into columnar batches, so
+    the document is never held in memory whole; without it the document is parsed
+    with json.load.
+    """
+
+    options = options or {}
+    started = time.perf_counter()
+    file_size = Path(source_path).stat().st_size
+    keys = parse_json_path(options["json_path"]) if options.get("json_path") else None
+    ijson = _import_ijson()
+
+    if ijson is None:
+        with open(source_path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        records, structure_info = _select_records(document, keys)
+        df = _frame_from_records(records, file_size, progress_callback, started, None)
+        engine = "json.load"
+    else:
+        with open(source_path, "rb") as f:
+            if keys is not None:
+                prefix = ".".join(keys + ["item"])
+                structure_info = f"Records at '{options['json_path']}'"
+            else:
+                prefix, structure_info = _detect_record_prefix(ijson, f)
+
+        if prefix is None:
+            # No record array: the document is a single object (or scalar) and becomes one row
+            with open(source_path, "r", encoding="utf-8") as f:
+                records, structure_info = _select_records(json.load(f), None)
+            df = _frame_from_records(records, file_size, progress_callback, started, None)
+        else:
+            with open(source_path, "rb") as f:
+                df = _frame_from_records(ijson.items(f, prefix, use_float=True), file_size, progress_callback,
+                                         started, f)
+            if df.empty and keys is not None:
+                return {"error": f"No records found at JSONPath '{options['json_path']}'"}
+        engine = f"ijson.{ijson.backend}"
+
+    result = _result(df, engine, source_path, file_size, started, progress_callback)
+    result["structure_info"] = structure_info
+    return result
+
+
+def _read_jsonl_with_pyarrow(source_path: str, strict: bool, file_size: int,
+                             progress_callback: Optional[ProgressCallback], started: float):
+    """Stream with pyarrow.json; returns (None, None) when pyarrow is missing or cannot stream the file."""
+
+    pa = _import_pyarrow()
+    if pa is None:
+        return None, None
+    import pyarrow.json as pa_json
+
+    try:
+        schema = _sample_schema(source_path, pa, pa_json)
+        if schema is None:
+            return None, None
+        reader = pa_json.open_json(
+            source_path,
+            read_options=pa_json.ReadOptions(block_size=ARROW_BLOCK_SIZE),
+            parse_options=pa_json.ParseOptions(explicit_schema=schema, unexpected_field_behavior="infer")
+        )
+        batches = []
+        rows = 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            # Each batch is one parsed block, which bounds the bytes read so far
+            _report(progress_callback, "parsing", rows, min(len(batches) * ARROW_BLOCK_SIZE, file_size),
+                    file_size, started)
+        table = pa.Table.from_batches(batches) if batches else reader.schema.empty_table()
+        return _flatten_table(table, pa).to_pandas(split_blocks=True, self_destruct=True), "pyarrow"
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        logger.info(f"pyarrow could not stream {source_path}, parsing line by line: {e}")
+        return None, None
+
+
+def _sample_schema(source_path: str, pa, pa_json):
+    """Arrow schema of the first SCHEMA_SAMPLE_RECORDS lines, with all-null fields typed as strings."""
+
+    with open(source_path, "rb") as f:
+        sample = b"".join(line for _, line in zip(range(SCHEMA_SAMPLE_RECORDS), f) if line.strip())
+    if not sample:
+        return None
+    inferred = pa_json.read_json(io.BytesIO(sample)).schema
+    return pa.schema([_nullable_field(field, pa) for field in inferred])
+
+
+def _nullable_field(field, pa):
+    if pa.types.is_null(field.type):
+        return field.with_type(pa.string())
+    if pa.types.is_struct(field.type):
+        return field.with_type(pa.struct([_nullable_field(child, pa) for child in field.type]))
+    return field
+
+
+def _flatten_table(table, pa):
+    """Flatten struct columns recursively into dotted columns."""
+
+    while any(pa.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
+    return table
+
+
+def _read_jsonl_lines(source_path: str, strict: bool, file_size: int,
+                      progress_callback: Optional[ProgressCallback],
+                      started: float) -> Tuple[pd.DataFrame, int, str]:
+    """Parse line by line with the fastest available JSON backend into columnar batches."""
+
+    loads = _loads()
+    skipped = 0
+    error = ""
+
+    def records(handle) -> Iterator[Any]:
+        nonlocal skipped, error
+        for line_num, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                if strict:
+                    error = f"Invalid JSON on line {line_num}: {str(e)}"
+                    return
+                skipped += 1
+
+    with open(source_path, "rb") as f:
+        df = _frame_from_records(records(f), file_size, progress_callback, started, f)
+    return df, skipped, error
+
+
+def _frame_from_records(records: Iterable[Any], file_size: int, progress_callback: Optional[ProgressCallback],
+                        started: float, handle) -> pd.DataFrame:
+    """
+    Build a frame from records in columnar batches.
+
+    The first batch holds SCHEMA_SAMPLE_RECORDS records and fixes the column order;
+    later batches of BATCH_ROWS rows keep it, appending columns first seen later.
+    """
+
+    batches: List[pd.DataFrame] = []
+    columns: List[str] = []
+    pending: List[Any] = []
+    rows = 0
+    for record in records:
+        pending.append(record)
+        if len(pending) >= (BATCH_ROWS if batches else SCHEMA_SAMPLE_RECORDS):
+            rows += len(pending)
+            batch = _batch_frame(pending)
+            columns += [name for name in batch.columns if name not in columns]
+            batches.append(batch)
+            pending = []
+            bytes_read = min(handle.tell(), file_size) if handle is not None else file_size
+            _report(progress_callback, "parsing", rows, bytes_read, file_size, started)
+    if pending or not batches:
+        batches.append(_batch_frame(pending))
+
+    if len(batches) == 1:
+        return batches[0]
+    frame = pd.concat(_without_null_columns(batches), ignore_index=True, copy=False)
+    return frame[columns + [name for name in frame.columns if name not in columns]]
+
+
+def _without_null_columns(batches: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """
+    Drop each batch's all-null columns where another batch holds values for them.
+
+    The column's dtype then comes from the batches with values, and concat fills the
+    dropped rows with nulls; columns null in every batch are kept as they are.
+    """
+
+    nulls = [set(batch.columns[~batch.notna().any().to_numpy()]) for batch in batches]
+    filled = {name for batch, empty in zip(batches, nulls) for name in batch.columns if name not in empty}
+    return [batch.drop(columns=[name for name in empty if name in filled]) if empty & filled else batch
+            for batch, empty in zip(batches, nulls)]
+
+
+def _batch_frame(records: List[Any]) -> pd.DataFrame:
+    """One batch of records as a flattened frame: converted by Arrow when the types allow, else column by column."""
+
+    pa = _import_pyarrow()
+    if pa is not None and records and all(isinstance(record, dict) for record in records):
+        try:
+            # Struct inference takes the union of every record's fields
+            table = pa.Table.from_struct_array(pa.array(records))
+            return _flatten_table(table, pa).to_pandas(split_blocks=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass  # mixed types within a field
+    builder = ColumnBatchBuilder()
+    for record in records:
+        builder.add(record)
+    return builder.flush()
+
+
+def _detect_record_prefix(ijson, handle) -> Tuple[Optional[str], str]:
+    """ijson prefix of the record array: the top-level array, else the first member holding objects."""
+
+    pending = None
+    for prefix, event, _ in ijson.parse(handle):
+        if prefix == "" and event == "start_array":
+            return "item", "Top-level array"
+        if pending is not None:
+            if prefix == f"{pending}.item" and event == "start_map":
+                return f"{pending}.item", f"Object with main data in '{pending}' key"
+            pending = None
+        if event == "start_array" and prefix and "." not in prefix:
+            pending = prefix
+    return None, ""
+
+
+def _select_records(document: Any, keys: Optional[List[str]]) -> Tuple[List[Any], str]:
+    """Records of an in-memory document, by selector keys or by the same detection as the streaming path."""
+
+    if keys is not None:
+        node = document
+        for key in keys:
+            if not isinstance(node, dict) or key not in node:
+                raise ValueError(f"JSONPath member '{key}' not found")
+            node = node[key]
+        records = node if isinstance(node, list) else [node]
+        return records, f"Records at '$.{'.'.join(keys)}'"
+
+    if isinstance(document, list):
+        return document, "Top-level array"
+    if isinstance(document, dict):
+        for key, value in document.items():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                return value, f"Object with main data in '{key}' key"
+        return [document], "Single object flattened to row"
+    return [document], "Single value"
+
+
+def _result(df: pd.DataFrame, engine: str, source_path: str, file_size: int, started: float,
+            progress_callback: Optional[ProgressCallback]) -> Dict[str, Any]:
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    ingest = {
+        "engine": engine,
+        "rows": len(df),
+        "columns": len(df.columns),
+        "bytes": file_size,
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(len(df) / elapsed, 1),
+        "mb_per_second": round(file_size / 1024 / 1024 / elapsed, 2)
+    }
+    _report(progress_callback, "complete", len(df), file_size, file_size, started)
+    logger.info(f"Ingested {Path(source_path).name}: {ingest['rows']} rows in {ingest['seconds']}s "
+                f"({ingest['rows_per_second']} rows/s, {ingest['mb_per_second']} MB/s, {engine})")
+    return {"data": df, "load_method": f"json_ingest.{engine}", "ingest": ingest}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _import_ijson():
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
+
+
+def _loads():
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        return json.loads
+
+
+def _loads_backend() -> str:
+    return "orjson" if _loads() is not json.loads else "json"
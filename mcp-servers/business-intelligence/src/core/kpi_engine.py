@@ -0,0 +1,278 @@
+"""
+KPI Engine
+Single-pass KPI totals, time-bucketed rollups and period-over-period deltas.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.dataset_store import get_store
+from src.core.incremental import ColumnTotals, incremental_update, merge_partials
+from src.core.result_cache import get_result_cache, make_cache_key
+
+logger = logging.getLogger("business-intelligence")
+
+# Resample rules per grain; periods are labelled by their first timestamp (weeks start on Monday)
+GRAIN_RULES = {"hour": "h", "day": "D", "week": "W-MON", "month": "MS", "quarter": "QS", "year": "YS"}
+GRAIN_OFFSETS = {"hour": pd.offsets.Hour(), "day": pd.offsets.Day(), "week": pd.offsets.Week(weekday=0),
+                 "month": pd.offsets.MonthBegin(), "quarter": pd.offsets.QuarterBegin(startingMonth=1),
+                 "year": pd.offsets.YearBegin()}
+AGGREGATIONS = ("sum", "mean", "max", "min", "count")
+AGGREGATION_LABELS = {"sum": "total", "mean": "average", "max": "max", "min": "min", "count": "count"}
+DEFAULT_GRAINS = ("day", "week", "month")
+DEFAULT_ROLLING_WINDOW = 3
+DEFAULT_MAX_PERIODS = 30
+BUCKET_STATS = ("count", "sum", "min", "max")
+
+
+@dataclass
+class KpiSpec:
+    """Normalized kpi_config: metrics, aggregations, time column, grains and delta settings."""
+    metrics: List[str]
+    aggregations: List[str] = field(default_factory=lambda: list(AGGREGATIONS))
+    time_column: str = ""
+    grains: List[str] = field(default_factory=list)
+    rolling_window: int = DEFAULT_ROLLING_WINDOW
+    delta_aggregation: str = "sum"
+    max_periods: int = DEFAULT_MAX_PERIODS
+
+    @classmethod
+    def from_config(cls, df: pd.DataFrame, config: Dict[str, Any]) -> "KpiSpec":
+        """Validate a kpi_config against a dataset; raises ValueError on unknown columns or options."""
+
+        time_column = config.get("time_column") or _default_time_column(df)
+        if time_column and time_column not in df.columns:
+            raise ValueError(f"Time column '{time_column}' not found in dataset")
+
+        metrics = config.get("metrics") or [column for column in df.columns
+                                            if column != time_column and _is_metric(df[column])]
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        missing = [column for column in metrics if column not in df.columns]
+        if missing:
+            raise ValueError(f"Metric columns not found: {missing}")
+        not_numeric = [column for column in metrics if not _is_metric(df[column])]
+        if not_numeric:
+            raise ValueError(f"Metric columns are not numeric: {not_numeric}")
+
+        aggregations = config.get("aggregations") or list(AGGREGATIONS)
+        aggregations = [aggregations] if isinstance(aggregations, str) else list(aggregations)
+        unknown = [agg for agg in aggregations + [config.get("delta_aggregation", "sum")] if agg not in AGGREGATIONS]
+        if unknown:
+            raise ValueError(f"Unsupported aggregations {unknown}; use {list(AGGREGATIONS)}")
+
+        grains = config.get("grain", config.get("grains", list(DEFAULT_GRAINS) if time_column else []))
+        grains = [grains] if isinstance(grains, str) else list(grains or [])
+        unknown = [grain for grain in grains if grain not in GRAIN_RULES]
+        if unknown:
+            raise ValueError(f"Unsupported grains {unknown}; use {list(GRAIN_RULES)}")
+        if grains and not time_column:
+            raise ValueError("Rollups need a time_column (no datetime column found in dataset)")
+
+        rolling_window = int(config.get("rolling_window", DEFAULT_ROLLING_WINDOW))
+        if rolling_window < 1:
+            raise ValueError("rolling_window must be at least 1")
+
+        return cls(metrics=metrics, aggregations=aggregations, time_column=time_column or "", grains=grains,
+                   rolling_window=rolling_window, delta_aggregation=config.get("delta_aggregation", "sum"),
+                   max_periods=int(config.get("max_periods", DEFAULT_MAX_PERIODS)))
+
+    @property
+    def base_grain(self) -> str:
+        """Bucket size the rollups are built from: hourly when requested, else daily."""
+        return "hour" if "hour" in self.grains else "day"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "metrics": self.metrics,
+            "aggregations": self.aggregations,
+            "time_column": self.time_column or None,
+            "grains": self.grains,
+            "rolling_window": self.rolling_window,
+            "delta_aggregation": self.delta_aggregation,
+            "max_periods": self.max_periods
+        }
+
+
+class BucketTotals:
+    """
+    Mergeable count/sum/min/max of every numeric column per time bucket.
+
+    Each update groups only the given rows by their floored timestamp and folds the
+    partial aggregates into the running buckets; rows without a timestamp are skipped.
+    Coarser rollups are derived from the buckets without touching the rows again.
+    """
+
+    def __init__(self, time_column: str, base_grain: str = "day"):
+        self.time_column = time_column
+        self.base_grain = base_grain
+        self.columns: Optional[List[str]] = None
+        self.buckets: Optional[pd.DataFrame] = None
+
+    def update(self, df: pd.DataFrame) -> None:
+        if self.columns is None:
+            self.columns = [column for column in df.columns
+                            if column != self.time_column and _is_metric(df[column])]
+        if not len(df) or not self.columns:
+            return
+        times = df[self.time_column]
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            times = pd.to_datetime(times, errors="coerce")
+        keys = times.dt.floor(GRAIN_RULES[self.base_grain]).rename(None)
+        part = df[self.columns].groupby(keys, sort=True).agg(list(BUCKET_STATS))
+        rules = {(column, stat): "sum" if stat in ("count", "sum") else stat
+                 for column in self.columns for stat in BUCKET_STATS}
+        self.buckets = merge_partials(self.buckets, part, rules).sort_index()
+
+    def time_range(self) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """First and last bucket holding at least one timestamp."""
+
+        if self.buckets is None or self.buckets.empty:
+            return None
+        return self.buckets.index.min(), self.buckets.index.max()
+
+    def rollup(self, grain: str, metrics: List[str]) -> pd.DataFrame:
+        """Periods of the grain (gaps included) by (metric, count/sum/min/max/mean)."""
+
+        columns = pd.MultiIndex.from_product([metrics, BUCKET_STATS])
+        rules = {(metric, stat): "sum" if stat in ("count", "sum") else stat for metric, stat in columns}
+        rolled = self.buckets[columns].resample(GRAIN_RULES[grain], label="left", closed="left").agg(rules)
+        for metric in metrics:
+            count = rolled[(metric, "count")]
+            rolled[(metric, "mean")] = rolled[(metric, "sum")].where(count > 0) / count.where(count > 0)
+        return rolled
+
+
+def kpi_totals(dataset_name: str, df: pd.DataFrame, incremental: bool = False,
+               watermark_column: str = "") -> Tuple[ColumnTotals, Optional[Dict[str, Any]]]:
+    """Column totals from one aggregation pass, or from appended rows only when incremental."""
+
+    if incremental:
+        return incremental_update(dataset_name, "kpi", {}, df, ColumnTotals, watermark_column)
+    totals = ColumnTotals()
+    totals.update(df)
+    return totals, None
+
+
+def bucket_totals(dataset_name: str, df: pd.DataFrame, spec: KpiSpec, incremental: bool = False,
+                  watermark_column: str = "") -> Tuple[BucketTotals, Dict[str, Any]]:
+    """
+    Time buckets for a dataset, reused across calls.
+
+    Incremental calls fold appended rows into the saved buckets. Otherwise buckets are
+    kept in the result cache keyed on the dataset fingerprint, time column and bucket
+    size, so dashboards with other metrics, grains or windows skip the pass over rows.
+    """
+
+    params = {"time_column": spec.time_column, "base_grain": spec.base_grain}
+    initial = lambda: BucketTotals(spec.time_column, spec.base_grain)
+    if incremental:
+        buckets, info = incremental_update(dataset_name, "kpi_rollup", params, df, initial, watermark_column)
+        return buckets, {"status": "incremental", **info}
+
+    cache = get_result_cache()
+    fingerprint = get_store().fingerprint(dataset_name) if cache.enabled else None
+    key = make_cache_key("kpi_rollup", dataset_name, fingerprint, params) if fingerprint else None
+    cached = cache.get(key) if key else None
+    if cached is not None:
+        return cached["result"]["buckets"], {"status": "hit", "age_seconds": cached["age_seconds"]}
+
+    buckets = initial()
+    buckets.update(df)
+    stored = bool(key) and cache.put(key, "kpi_rollup", dataset_name, {"buckets": buckets})
+    return buckets, {"status": "miss" if key else "bypass", "stored": stored}
+
+
+def build_rollups(buckets: BucketTotals, spec: KpiSpec) -> Dict[str, Any]:
+    """Rollups per grain with period-over-period and trailing rolling-window deltas."""
+
+    if buckets.time_range() is None:
+        return {}
+    metrics = [metric for metric in spec.metrics if metric in buckets.columns]
+    last_bucket = buckets.time_range()[1]
+    rollups = {}
+    for grain in spec.grains:
+        rolled = buckets.rollup(grain, metrics)
+        values = pd.DataFrame({metric: rolled[(metric, spec.delta_aggregation)] for metric in metrics},
+                              index=rolled.index).astype(np.float64)
+        previous = values.shift(1)
+        trailing = values.rolling(spec.rolling_window, min_periods=spec.rolling_window).mean().shift(1)
+        change_pct = (values - previous) / previous.abs() * 100
+        rolling_pct = (values - trailing) / trailing.abs() * 100
+
+        shown = rolled.index[-spec.max_periods:] if spec.max_periods > 0 else rolled.index
+        periods = []
+        for period in shown:
+            record = {"period": _period_label(period, grain)}
+            for metric in metrics:
+                for agg in spec.aggregations:
+                    record[f"{metric}_{agg}"] = _number(rolled.at[period, (metric, agg)])
+                record[f"{metric}_change_pct"] = _number(change_pct.at[period, metric])
+            periods.append(record)
+
+        latest = rolled.index[-1]
+        rollups[grain] = {
+            "periods_total": len(rolled),
+            "periods": periods,
+            "latest_period": _period_label(latest, grain),
+            # The last period is partial when the data stops before its final bucket
+            "latest_period_complete": bool(last_bucket + GRAIN_OFFSETS[buckets.base_grain] >= latest + GRAIN_OFFSETS[grain]),
+            "deltas": {
+                metric: {
+                    "aggregation": spec.delta_aggregation,
+                    "current": _number(values.at[latest, metric]),
+                    "previous": _number(previous.at[latest, metric]),
+                    "change": _number(values.at[latest, metric] - previous.at[latest, metric]),
+                    "change_pct": _number(change_pct.at[latest, metric]),
+                    "rolling_window": spec.rolling_window,
+                    "rolling_mean": _number(trailing.at[latest, metric]),
+                    "vs_rolling_pct": _number(rolling_pct.at[latest, metric])
+                }
+                for metric in metrics
+            }
+        }
+    return rollups
+
+
+def format_kpis(totals: ColumnTotals, spec: KpiSpec) -> Dict[str, Dict[str, Any]]:
+    """KPI cards keyed by title-cased metric name with the configured aggregations."""
+
+    kpis = {}
+    for metric in spec.metrics:
+        stats = totals.numeric.get(metric, {"count": 0})
+        observed = stats["count"] > 0
+        values = {
+            "sum": stats["sum"] if observed else 0,
+            "mean": stats["sum"] / stats["count"] if observed else 0,
+            "max": stats["max"] if observed else 0,
+            "min": stats["min"] if observed else 0,
+            "count": str(stats["count"])
+        }
+        kpis[metric.replace('_', ' ').title()] = {AGGREGATION_LABELS[agg]: values[agg] for agg in spec.aggregations}
+    return kpis
+
+
+def _default_time_column(df: pd.DataFrame) -> str:
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            return column
+    return ""
+
+
+def _is_metric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_datetime64_any_dtype(series)
+
+
+def _period_label(period: pd.Timestamp, grain: str) -> str:
+    return period.isoformat() if grain == "hour" else period.date().isoformat()
+
+
+def _number(value: Any) -> Optional[float]:
+    """JSON-safe number: NaN and infinities (e.g. change from zero) become None."""
+
+    if value is None or pd.isna(value) or not np.isfinite(float(value)):
+        return None
+    return int(value) if isinstance(value, (int, np.integer)) else float(value)
@@ -0,0 +1,95 @@
+"""
+Lazy Imports
+Tool and prompt modules imported on first call, with optional background pre-warming.
+"""
+
+import os
+import sys
+import time
+import logging
+import importlib
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_PREWARM_DELAY_SECONDS = 1.0
+
+# Deferred modules in registration order; pre-warming imports them in this order
+_MODULES: Dict[str, None] = {}
+
+
+class LazyFunction:
+    """
+    Stand-in for `module.attr` that imports the module the first time it is called.
+
+    Registering tools through these stubs keeps matplotlib, seaborn, scipy and the
+    other heavy dependencies of the tool modules out of server start-up; calling
+    the stub returns whatever the real function returns (a coroutine for async tools).
+    """
+
+    def __init__(self, module: str, attr: str):
+        self.module = module
+        self.attr = attr
+        self.__name__ = self.__qualname__ = attr
+        self._target: Optional[Any] = None
+
+    def resolve(self) -> Any:
+        if self._target is None:
+            started = time.perf_counter()
+            target = getattr(importlib.import_module(self.module), self.attr)
+            if self._target is None:
+                logger.info(f"Imported {self.module} for {self.attr} in {time.perf_counter() - started:.3f}s")
+            self._target = target
+        return self._target
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._target is not None else "deferred"
+        return f"<LazyFunction {self.module}.{self.attr} ({state})>"
+
+
+def lazy_function(module: str, attr: str) -> LazyFunction:
+    """Defer `from module import attr` until the function is first called."""
+
+    _MODULES.setdefault(module, None)
+    return LazyFunction(module, attr)
+
+
+def deferred_modules() -> List[str]:
+    """Registered modules that have not been imported yet."""
+
+    return [module for module in _MODULES if module not in sys.modules]
+
+
+def prewarm(modules: Optional[Sequence[str]] = None, delay: Optional[float] = None) -> Optional[threading.Thread]:
+    """
+    Import deferred modules in a daemon thread so the first tool call does not pay
+    for them. The delay lets the server answer the client's initialize handshake
+    first. Disabled with `BI_PREWARM=0`; the delay comes from `BI_PREWARM_DELAY_SECONDS`.
+    """
+
+    if os.getenv("BI_PREWARM", "1").lower() in ("0", "false", "no", "off"):
+        return None
+    if delay is None:
+        delay = float(os.getenv("BI_PREWARM_DELAY_SECONDS", DEFAULT_PREWARM_DELAY_SECONDS))
+    pending = list(modules) if modules is not None else deferred_modules()
+    if not pending:
+        return None
+
+    def run():
+        time.sleep(delay)
+        started = time.perf_counter()
+        for module in pending:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                # The tool call that needs the module will surface the error
+                logger.warning(f"Pre-warming {module} failed: {e}")
+        logger.info(f"Pre-warmed {len(pending)} modules in {time.perf_counter() - started:.2f}s")
+
+    thread = threading.Thread(target=run, name="bi-prewarm", daemon=True)
+    thread.start()
+    return thread
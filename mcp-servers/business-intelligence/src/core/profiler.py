@@ -0,0 +1,313 @@
+"""
+Dataset Profiler
+Chunk-streaming column statistics built from mergeable sketches.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core.executor import check_cancelled
+from src.core.sketches import DistinctSketch, FrequencySketch, MomentSketch, QuantileSketch, hash_values
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_CHUNK_ROWS = 100_000
+EXACT_ROW_HASH_LIMIT = 5_000_000  # row hashes kept verbatim for duplicate detection before HyperLogLog takes over
+HEAD_SAMPLE_SIZE = 100            # leading non-null values kept per text column for pattern sniffing
+IQR_MULTIPLIER = 1.5
+# pandas' text-to-float parser crashes the process on exponents that overflow a C int ("04e89467803028e7")
+OVERFLOWING_EXPONENT = r"[eE][-+]?\d{9,}"
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def column_kind(series: pd.Series) -> str:
+    """Classify a column as numeric, text, datetime, boolean or other."""
+
+    if pd.api.types.is_bool_dtype(series):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(series):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "datetime"
+    if (pd.api.types.is_object_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype)
+            or pd.api.types.is_string_dtype(series)):
+        return "text"
+    return "other"
+
+
+@dataclass
+class ColumnStats:
+    """Mergeable statistics for one column; sketches that do not apply to its kind stay None."""
+    name: str
+    kind: str
+    dtype: str
+    rows: int = 0
+    missing: int = 0
+    distinct: DistinctSketch = field(default_factory=DistinctSketch)
+    moments: Optional[MomentSketch] = None
+    quantiles: Optional[QuantileSketch] = None
+    frequencies: Optional[FrequencySketch] = None
+    text_lengths: Optional[MomentSketch] = None
+    contains_digits: int = 0
+    contains_special: int = 0
+    numeric_like: int = 0
+    true_count: int = 0
+    earliest: Optional[pd.Timestamp] = None
+    latest: Optional[pd.Timestamp] = None
+    calendar: Dict[str, pd.Series] = field(default_factory=dict)
+    head: List[Any] = field(default_factory=list)
+    outliers: Optional[Dict[str, float]] = None   # filled in by count_outliers
+    intervals: Optional[Dict[str, Any]] = None    # filled in by profile_frame for datetime columns
+
+    @property
+    def count(self) -> int:
+        return self.rows - self.missing
+
+    @property
+    def unique_count(self) -> int:
+        return self.distinct.count()
+
+    @property
+    def approximate(self) -> bool:
+        """True once any of the column's sketches has left its exact mode."""
+        return (not self.distinct.exact
+                or (self.quantiles is not None and not self.quantiles.exact)
+                or (self.frequencies is not None and not self.frequencies.exact))
+
+    def looks_unique(self, rows: int) -> bool:
+        """Whether every row holds a distinct non-null value (within sketch error once approximate)."""
+
+        if self.missing or rows < 2:
+            return False
+        if self.distinct.exact:
+            return self.unique_count == rows
+        return self.unique_count >= rows * (1 - 3 * self.distinct.relative_error)
+
+    def quartiles(self) -> np.ndarray:
+        """Q1, median and Q3."""
+        return self.quantiles.quantiles([0.25, 0.5, 0.75])
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        self.rows += other.rows
+        self.missing += other.missing
+        self.distinct.merge(other.distinct)
+        for name in ("moments", "quantiles", "frequencies", "text_lengths"):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            if theirs is not None:
+                setattr(self, name, theirs if mine is None else mine.merge(theirs))
+        self.contains_digits += other.contains_digits
+        self.contains_special += other.contains_special
+        self.numeric_like += other.numeric_like
+        self.true_count += other.true_count
+        if other.earliest is not None:
+            self.earliest = other.earliest if self.earliest is None else min(self.earliest, other.earliest)
+            self.latest = other.latest if self.latest is None else max(self.latest, other.latest)
+        for part, counts in other.calendar.items():
+            mine = self.calendar.get(part)
+            self.calendar[part] = counts if mine is None else mine.add(counts, fill_value=0).astype(np.int64)
+        if len(self.head) < HEAD_SAMPLE_SIZE:
+            self.head.extend(other.head[:HEAD_SAMPLE_SIZE - len(self.head)])
+        return self
+
+
+@dataclass
+class DatasetStats:
+    """Column statistics for a whole dataset, merged across chunks."""
+    rows: int = 0
+    columns: Dict[str, ColumnStats] = field(default_factory=dict)
+    row_hashes: DistinctSketch = field(default_factory=lambda: DistinctSketch(exact_limit=EXACT_ROW_HASH_LIMIT))
+    chunks: int = 0
+    outlier_rows: Optional[int] = None
+
+    @property
+    def duplicate_rows(self) -> int:
+        return max(0, self.rows - self.row_hashes.count())
+
+    @property
+    def missing_cells(self) -> int:
+        return sum(col.missing for col in self.columns.values())
+
+    def of_kind(self, kind: str) -> List[ColumnStats]:
+        return [col for col in self.columns.values() if col.kind == kind]
+
+    def merge(self, other: "DatasetStats") -> "DatasetStats":
+        self.rows += other.rows
+        self.chunks += other.chunks
+        self.row_hashes.merge(other.row_hashes)
+        for name, col in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(col)
+            else:
+                self.columns[name] = col
+        return self
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "engine": "streaming_sketches",
+            "rows_profiled": self.rows,
+            "chunks": self.chunks,
+            "approximate_columns": [col.name for col in self.columns.values() if col.approximate],
+            "duplicate_rows_exact": self.row_hashes.exact
+        }
+
+
+def profile_frame(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS, detailed: bool = True) -> DatasetStats:
+    """
+    Profile every row of df in chunks of chunk_rows.
+
+    One pass feeds the per-column sketches; with detailed, a second comparison-only
+    pass counts IQR outliers once the quartile bounds are known, and datetime
+    columns get their sampling-interval statistics.
+    """
+
+    stats = profile_chunks(iter_chunks(df, chunk_rows))
+    if detailed:
+        count_outliers(iter_chunks(df, chunk_rows), stats)
+        for col in stats.of_kind("datetime"):
+            col.intervals = _interval_stats(df[col.name])
+    return stats
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Row slices of df (a single empty slice for an empty frame)."""
+
+    chunk_rows = max(1, chunk_rows)
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def profile_chunks(chunks: Iterable[pd.DataFrame]) -> DatasetStats:
+    """Profile a stream of frames sharing one schema; column kinds come from the first chunk."""
+
+    stats: Optional[DatasetStats] = None
+    kinds: Dict[str, str] = {}
+    for chunk in chunks:
+        check_cancelled()
+        if not kinds:
+            kinds = {col: column_kind(chunk[col]) for col in chunk.columns}
+        part = profile_chunk(chunk, kinds)
+        stats = part if stats is None else stats.merge(part)
+    return stats if stats is not None else DatasetStats()
+
+
+def profile_chunk(chunk: pd.DataFrame, kinds: Optional[Dict[str, str]] = None) -> DatasetStats:
+    """Statistics for a single chunk, ready to be merged with other chunks'."""
+
+    kinds = kinds or {col: column_kind(chunk[col]) for col in chunk.columns}
+    stats = DatasetStats(rows=len(chunk), chunks=1)
+    if len(chunk.columns):
+        stats.row_hashes.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+    for col in chunk.columns:
+        stats.columns[col] = _column_chunk_stats(chunk[col], kinds[col])
+    return stats
+
+
+def count_outliers(chunks: Iterable[pd.DataFrame], stats: DatasetStats) -> None:
+    """Count values outside the 1.5 * IQR fences per numeric column, and rows with any such value."""
+
+    bounds = {}
+    for col in stats.of_kind("numeric"):
+        if col.count == 0:
+            continue
+        q1, _, q3 = col.quartiles()
+        iqr = q3 - q1
+        bounds[col.name] = (q1 - IQR_MULTIPLIER * iqr, q3 + IQR_MULTIPLIER * iqr)
+
+    counts = dict.fromkeys(bounds, 0)
+    outlier_rows = 0
+    for chunk in chunks:
+        check_cancelled()
+        row_flags = np.zeros(len(chunk), dtype=bool)
+        for name, (lower, upper) in bounds.items():
+            values = chunk[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            flags = (values < lower) | (values > upper)
+            counts[name] += int(np.count_nonzero(flags))
+            row_flags |= flags
+        outlier_rows += int(np.count_nonzero(row_flags))
+
+    for name, (lower, upper) in bounds.items():
+        stats.columns[name].outliers = {"lower": float(lower), "upper": float(upper), "count": counts[name]}
+    stats.outlier_rows = outlier_rows
+
+
+def _column_chunk_stats(series: pd.Series, kind: str) -> ColumnStats:
+    col = ColumnStats(name=series.name, kind=kind, dtype=str(series.dtype), rows=len(series))
+    present = series.dropna()
+    col.missing = len(series) - len(present)
+
+    if kind == "numeric":
+        values = present.to_numpy(dtype=np.float64)
+        col.moments = MomentSketch()
+        col.moments.update(values)
+        col.quantiles = QuantileSketch()
+        col.quantiles.update(values)
+        col.distinct.update(hash_values(values))
+
+    elif kind == "text":
+        value_counts = present.value_counts(sort=False)
+        value_counts = value_counts[value_counts > 0]  # categoricals report unused categories with zero counts
+        labels = value_counts.index.to_numpy(dtype=object)
+        counts = value_counts.to_numpy()
+        hashes = hash_values(labels)
+        col.distinct.update(hashes)
+        col.frequencies = FrequencySketch()
+        col.frequencies.update(hashes, counts, labels)
+
+        # String statistics are evaluated once per distinct value and weighted by its count
+        text = pd.Series(labels, dtype=object).astype(str)
+        col.text_lengths = MomentSketch()
+        col.text_lengths.update(np.repeat(text.str.len().to_numpy(dtype=np.float64), counts))
+        col.contains_digits = int(counts[text.str.contains(r'\d').to_numpy(dtype=bool)].sum())
+        col.contains_special = int(counts[text.str.contains(r'[^a-zA-Z0-9\s]').to_numpy(dtype=bool)].sum())
+        numeric = text_to_numeric(pd.Series(labels, dtype=object))
+        col.numeric_like = int(counts[numeric.notna().to_numpy()].sum())
+        col.head = present.head(HEAD_SAMPLE_SIZE).tolist()
+
+    elif kind == "datetime":
+        col.distinct.update(hash_values(present.to_numpy()))
+        if len(present):
+            col.earliest, col.latest = present.min(), present.max()
+            col.calendar = {
+                "year": present.dt.year.value_counts(),
+                "month": present.dt.month.value_counts(),
+                "weekday": present.dt.dayofweek.value_counts(),
+                "hour": present.dt.hour.value_counts()
+            }
+
+    elif kind == "boolean":
+        values = present.to_numpy(dtype=bool)
+        col.true_count = int(values.sum())
+        col.distinct.update(hash_values(values))
+
+    else:
+        col.distinct.update(hash_values(present.to_numpy()))
+
+    return col
+
+
+def _interval_stats(series: pd.Series) -> Dict[str, Any]:
+    """Median and most common spacing between consecutive timestamps."""
+
+    stamps = series.dropna().to_numpy(dtype="datetime64[ns]").view(np.int64)
+    if stamps.size < 2:
+        return {"median_interval_hours": None, "most_common_interval": None}
+    diffs = np.diff(np.sort(stamps))
+    return {
+        "median_interval_hours": float(np.median(diffs) / 3.6e12),
+        "most_common_interval": str(pd.Timedelta(int(pd.Series(diffs).mode().iloc[0]), unit="ns"))
+    }
+
+
+def text_to_numeric(values: pd.Series) -> pd.Series:
+    """pd.to_numeric(errors="coerce"), with text holding overflowing exponents treated as non-numeric."""
+
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return pd.to_numeric(values, errors="coerce")
+    overflowing = values.astype(str).str.contains(OVERFLOWING_EXPONENT, regex=True).to_numpy(dtype=bool)
+    if overflowing.any():
+        values = values.where(~overflowing)
+    return pd.to_numeric(values, errors="coerce")
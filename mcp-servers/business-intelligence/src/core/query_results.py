@@ -0,0 +1,324 @@
+"""
+Query Results
+Server-side result cursors with TTL, pagination and compact result encodings.
+"""
+
+import os
+import time
+import base64
+import secrets
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from src.core.sql_engine import QueryParams, run_query_batches
+
+logger = logging.getLogger("business-intelligence")
+
+RESULT_FORMATS = ["records", "columns", "arrow"]
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_CURSOR_TTL_SECONDS = 300
+MAX_OPEN_CURSORS = 32
+
+
+@dataclass
+class QueryCursor:
+    """
+    A query result being paged through by a client.
+
+    The rows not yet served live in Arrow IPC files read page by page through a
+    memory map (a new file starts wherever a batch's schema could not be cast to
+    the previous one's); result holds them in memory only when pyarrow is unavailable.
+    """
+    token: str
+    dataset_name: str
+    sql_query: str
+    result: Optional[pd.DataFrame]
+    total_rows: int
+    page_size: int
+    offset: int = 0
+    rows: int = 0  # rows in the result, served or not
+    spill_files: List[Path] = field(default_factory=list)
+    spill_starts: List[int] = field(default_factory=list)  # result row each spill file starts at
+    spill_offset: int = 0  # result row the spill files start at
+    expires_at: float = 0.0
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.rows - self.offset)
+
+
+class CursorRegistry:
+    """Holds open query cursors keyed by opaque tokens, expiring them after a TTL."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_cursors: int = MAX_OPEN_CURSORS,
+                 spill_dir: Optional[str] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("BI_QUERY_CURSOR_TTL_SECONDS", DEFAULT_CURSOR_TTL_SECONDS))
+        self.ttl_seconds = ttl_seconds
+        self.max_cursors = max_cursors
+        self.spill_dir = Path(spill_dir or os.getenv("BI_QUERY_CURSOR_DIR", "") or
+                              Path(tempfile.gettempdir()) / "mcp_bi_query_cursors")
+        self._cursors: "OrderedDict[str, QueryCursor]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, dataset_name: str, sql_query: str, result: pd.DataFrame, total_rows: int,
+             page_size: int, offset: int) -> QueryCursor:
+        """Keep the rows of result from offset on behind a new cursor, spilled to disk when possible."""
+
+        cursor = self._new_cursor(dataset_name, sql_query, total_rows, page_size, offset)
+        cursor.rows = len(result)
+        self._spill(cursor, [result.iloc[offset:]])
+        self._add(cursor)
+        return cursor
+
+    def open_stream(self, dataset_name: str, sql_query: str, batches: Iterable[pd.DataFrame],
+                    page_size: int, max_rows: int = 0) -> Dict[str, Any]:
+        """
+        Page a streamed query result: the first page is kept from the leading batches and
+        every later row is written to the cursor's spill file as its batch arrives.
+
+        Only one batch (plus the first page) is in memory at a time. Rows past max_rows
+        are counted for total_rows but not kept. Returns the first page, the cursor
+        (None when everything fit on the first page), total_rows and kept rows.
+        """
+
+        cursor = self._new_cursor(dataset_name, sql_query, 0, page_size, page_size)
+        first_parts: List[pd.DataFrame] = []
+        state = {"empty": None, "first_rows": 0, "kept": 0, "total": 0}
+
+        def unserved() -> Iterator[pd.DataFrame]:
+            for batch in batches:
+                if state["empty"] is None:
+                    state["empty"] = batch.iloc[:0]
+                state["total"] += len(batch)
+                if max_rows > 0:
+                    batch = batch.iloc[:max(0, max_rows - state["kept"])]
+                state["kept"] += len(batch)
+                take = len(batch) if page_size <= 0 else min(len(batch), page_size - state["first_rows"])
+                if take > 0:
+                    first_parts.append(batch.iloc[:take])
+                    state["first_rows"] += take
+                if take < len(batch):
+                    yield batch.iloc[take:]
+
+        try:
+            self._spill(cursor, unserved())
+        finally:
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+
+        page = pd.concat(first_parts, ignore_index=True) if first_parts else state["empty"]
+        if page is None:
+            page = pd.DataFrame()
+        cursor.rows = state["kept"]
+        cursor.total_rows = state["total"]
+        if cursor.remaining > 0:
+            self._add(cursor)
+        else:
+            _discard(cursor)
+            cursor = None
+        return {"page": page, "cursor": cursor, "total_rows": state["total"], "rows": state["kept"]}
+
+    def take_page(self, token: str) -> Optional[Dict[str, Any]]:
+        """Advance a cursor by one page; returns None if the token is unknown or expired."""
+
+        with self._lock:
+            self._purge_expired()
+            cursor = self._cursors.get(token)
+            if cursor is None:
+                return None
+
+            page = _read_page(cursor)
+            cursor.offset += len(page)
+            if cursor.remaining == 0:
+                del self._cursors[token]
+                _discard(cursor)
+            else:
+                cursor.expires_at = time.time() + self.ttl_seconds
+            return {"cursor": cursor, "page": page, "has_more": cursor.remaining > 0}
+
+    def close(self, token: str) -> bool:
+        with self._lock:
+            cursor = self._cursors.pop(token, None)
+        _discard(cursor)
+        return cursor is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge_expired()
+            return len(self._cursors)
+
+    def _new_cursor(self, dataset_name: str, sql_query: str, total_rows: int, page_size: int,
+                    offset: int) -> QueryCursor:
+        return QueryCursor(
+            token=secrets.token_urlsafe(16),
+            dataset_name=dataset_name,
+            sql_query=sql_query,
+            result=None,
+            total_rows=total_rows,
+            page_size=page_size,
+            offset=offset,
+            spill_offset=offset,
+            expires_at=time.time() + self.ttl_seconds
+        )
+
+    def _add(self, cursor: QueryCursor) -> None:
+        with self._lock:
+            self._purge_expired()
+            while len(self._cursors) >= self.max_cursors:
+                evicted_token, evicted = self._cursors.popitem(last=False)
+                _discard(evicted)
+                logger.info(f"Evicted oldest query cursor {evicted_token[:8]}")
+            self._cursors[cursor.token] = cursor
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        for token in [t for t, c in self._cursors.items() if c.expires_at <= now]:
+            _discard(self._cursors.pop(token))
+
+    def _spill(self, cursor: QueryCursor, frames: Iterable[pd.DataFrame]) -> None:
+        """Append the unserved rows to uncompressed Arrow IPC files; without pyarrow they stay in memory."""
+
+        try:
+            import pyarrow as pa
+        except ImportError:
+            kept = list(frames)
+            cursor.result = pd.concat(kept, ignore_index=True) if kept else None
+            return
+
+        writer, schema, written = None, None, 0
+        try:
+            for frame in frames:
+                if not len(frame):
+                    continue
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is not None and not table.schema.equals(schema):
+                    try:
+                        table = table.cast(schema)
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError):
+                        writer.close()
+                        writer = None
+                if writer is None:
+                    self.spill_dir.mkdir(parents=True, exist_ok=True)
+                    path = self.spill_dir / f"cursor_{cursor.token}_{len(cursor.spill_files)}.arrow"
+                    writer = pa.ipc.new_file(str(path), table.schema)
+                    schema = table.schema
+                    cursor.spill_files.append(path)
+                    cursor.spill_starts.append(cursor.spill_offset + written)
+                writer.write_table(table)
+                written += len(table)
+        except BaseException:
+            _discard(cursor)
+            raise
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+def _read_page(cursor: QueryCursor) -> pd.DataFrame:
+    if not cursor.spill_files:
+        if cursor.result is None:
+            return pd.DataFrame()
+        start = cursor.offset - cursor.spill_offset
+        return cursor.result.iloc[start:start + cursor.page_size]
+
+    import pyarrow as pa
+
+    stop = cursor.offset + cursor.page_size
+    ends = cursor.spill_starts[1:] + [cursor.rows]
+    pieces = []
+    for path, file_start, file_end in zip(cursor.spill_files, cursor.spill_starts, ends):
+        if file_end <= cursor.offset or file_start >= stop:
+            continue
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+        first = max(cursor.offset, file_start) - file_start
+        pieces.append(table.slice(first, min(stop, file_end) - file_start - first).to_pandas())
+    return pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0]
+
+
+def _discard(cursor: Optional[QueryCursor]) -> None:
+    if cursor is None:
+        return
+    for path in cursor.spill_files:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def open_query(dataset_name: str, sql_query: str, params: QueryParams = None, page_size: int = DEFAULT_PAGE_SIZE,
+               max_rows: int = 0) -> Dict[str, Any]:
+    """
+    Run a query and page its result: the first page is returned and the remaining rows
+    are streamed batch by batch into a cursor, so the full result is never built in memory.
+
+    Blocks on the SQL engine; call it off the event loop.
+    """
+
+    batch_rows = page_size if page_size > 0 else DEFAULT_PAGE_SIZE
+    query = run_query_batches(dataset_name, sql_query, params, batch_rows=batch_rows)
+    opened = get_cursor_registry().open_stream(dataset_name, sql_query, query["batches"], page_size,
+                                               max_rows=max_rows)
+    opened.update({
+        "backend": query["backend"],
+        "table_name": query["table_name"],
+        "modified_query": query["modified_query"],
+        "truncated": opened["rows"] < opened["total_rows"]
+    })
+    return opened
+
+
+def encode_frame(df: pd.DataFrame, result_format: str = "records") -> Dict[str, Any]:
+    """
+    Encode a result frame for an MCP response.
+
+    "records" returns a list of row dicts, "columns" returns one value array per column,
+    and "arrow" returns a base64-encoded Arrow IPC stream.
+    """
+
+    if result_format == "records":
+        return {"result_data": df.to_dict('records')}
+
+    if result_format == "columns":
+        return {"result_columns_data": {str(col): df[col].tolist() for col in df.columns}}
+
+    if result_format == "arrow":
+        try:
+            import pyarrow as pa
+        except ImportError:
+            return {"error": "pyarrow required for Arrow result encoding. Install with: pip install pyarrow"}
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return {
+            "result_arrow_ipc": base64.b64encode(sink.getvalue().to_pybytes()).decode('ascii'),
+            "encoding": "base64 Arrow IPC stream"
+        }
+
+    return {"error": f"Unsupported result format: {result_format}. Supported: {', '.join(RESULT_FORMATS)}"}
+
+
+_REGISTRY: Optional[CursorRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_cursor_registry() -> CursorRegistry:
+    """Return the process-wide cursor registry."""
+
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = CursorRegistry()
+    return _REGISTRY
@@ -0,0 +1,689 @@
+"""
+Report Writer
+Streaming HTML, Markdown and PDF report writers with charts written to asset files.
+"""
+
+import io
+import os
+import json
+import html
+import base64
+import logging
+import tempfile
+import textwrap
+import importlib.util
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger("business-intelligence")
+
+PDF_RENDERERS = ["weasyprint", "xhtml2pdf", "basic"]
+REPORT_FOOTER = "Report generated by BI MCP Server"
+
+HTML_STYLES = {
+    "executive": """
+        body { font-family: 'Segoe UI', Arial, sans-serif; line-height: 1.6; margin: 40px; background: #f8f9fa; }
+        .container { max-width: 1000px; margin: 0 auto; background: white; padding: 40px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }
+        h2 { color: #34495e; margin-top: 30px; }
+        .exec-summary { background: #ecf0f1; padding: 20px; border-left: 4px solid #3498db; margin: 20px 0; }
+        .metric { display: inline-block; margin: 10px 20px 10px 0; padding: 10px; background: #3498db; color: white; border-radius: 4px; }
+        ul { margin: 10px 0; }
+        li { margin: 5px 0; }
+        table { border-collapse: collapse; margin: 10px 0; font-size: 0.9em; }
+        th, td { border: 1px solid #dfe6e9; padding: 4px 8px; text-align: left; }
+        th { background: #ecf0f1; }
+        img { max-width: 100%; }
+""",
+    "default": """
+        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; }
+        .container { max-width: 800px; }
+        h1 { color: #333; border-bottom: 2px solid #007acc; }
+        h2 { color: #444; margin-top: 25px; }
+        .section { margin: 20px 0; }
+        ul { margin: 10px 0; }
+        li { margin: 3px 0; }
+        table { border-collapse: collapse; margin: 10px 0; font-size: 0.9em; }
+        th, td { border: 1px solid #ddd; padding: 4px 8px; text-align: left; }
+        th { background: #f4f4f4; }
+        img { max-width: 100%; }
+"""
+}
+
+
+def chart_payload(value: Any) -> Optional[Dict[str, Any]]:
+    """The rendered chart in a create_visualization result (or the result's visualization), if any."""
+
+    if isinstance(value, dict):
+        if "chart_image" in value or "chart_spec" in value:
+            return value
+        nested = value.get("visualization")
+        if isinstance(nested, dict) and ("chart_image" in nested or "chart_spec" in nested):
+            return nested
+    return None
+
+
+def table_rows(value: Any) -> Optional[Tuple[List[str], Iterator[Sequence[Any]]]]:
+    """Columns and a lazy row iterator for DataFrames and lists of records; None for anything else."""
+
+    if isinstance(value, pd.DataFrame):
+        return [str(col) for col in value.columns], value.itertuples(index=False, name=None)
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value) \
+            and not any(chart_payload(item) for item in value[:1]):
+        columns = list(dict.fromkeys(key for item in value for key in item))
+        return [str(col) for col in columns], (tuple(item.get(col) for col in columns) for item in value)
+    return None
+
+
+def _label(key: Any) -> str:
+    return str(key).replace("_", " ").title()
+
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (list, dict, tuple, pd.DataFrame, pd.Series))
+
+
+def _generated_label(report_data: Dict[str, Any]) -> str:
+    return datetime.fromisoformat(report_data["generated_at"]).strftime("%B %d, %Y at %I:%M %p")
+
+
+class ReportAssets:
+    """
+    Writes the charts found in report sections to files next to the report.
+
+    Images are decoded from base64 straight to `<report>_assets/chart_N.<format>` and
+    Vega-Lite specs become `chart_N.vl.json`, so the report only carries links. Without
+    a directory (no output path) charts are counted as omitted.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = directory
+        self.written: List[str] = []
+        self.omitted = 0
+
+    def write_chart(self, chart: Dict[str, Any]) -> Optional[str]:
+        """Write one chart and return its link relative to the report, or None if omitted."""
+
+        if self.directory is None:
+            self.omitted += 1
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index = len(self.written) + 1
+        if "chart_spec" in chart:
+            path = self.directory / f"chart_{index}.vl.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(chart["chart_spec"], f, default=str)
+        else:
+            path = self.directory / f"chart_{index}.{chart.get('image_format', 'png')}"
+            with open(path, "wb") as f:
+                f.write(base64.b64decode(chart["chart_image"]))
+        self.written.append(str(path))
+        return f"{self.directory.name}/{path.name}"
+
+
+class ReportWriter(ABC):
+    """
+    Writes a report section by section to an open text handle.
+
+    Nothing is accumulated: each section is rendered and written as it is reached,
+    table rows are written one at a time and charts go to asset files. Subclasses
+    provide the markup for the primitives (headings, bullets, fields, tables, charts).
+    """
+
+    format = "text"
+
+    def __init__(self, handle: Any, assets: ReportAssets):
+        self.handle = handle
+        self.assets = assets
+        self.charts = 0
+        self.tables = 0
+        self.table_rows = 0
+
+    def write_report(self, report_data: Dict[str, Any], template: str) -> None:
+        self.begin(report_data, template)
+        for section in report_data.get("sections", []):
+            self.write_section(section)
+        self.end()
+
+    def write_section(self, section: Dict[str, Any]) -> None:
+        content = section.get("content")
+        kind = section.get("type", "")
+        self.begin_section(str(section.get("title", "")), kind)
+        if kind == "executive_summary" and isinstance(content, dict):
+            self.bullets(content.get("summary_points", []), emphasis=True)
+        elif kind in ("findings", "recommendations") and isinstance(content, list):
+            self.bullets(content)
+        elif kind == "data_summary" and isinstance(content, dict):
+            self.fields([(key, value) for key, value in content.items()], metrics=True)
+        else:
+            self.content(content)
+        self.end_section()
+
+    def content(self, value: Any, nested: bool = False) -> None:
+        chart = chart_payload(value)
+        if chart is not None:
+            self.chart(chart)
+            return
+        rows = table_rows(value)
+        if rows is not None:
+            self.table(*rows)
+            return
+        if isinstance(value, dict):
+            scalars = [(key, item) for key, item in value.items() if _is_scalar(item)]
+            if scalars:
+                self.fields(scalars)
+            if not nested:
+                # Charts and tables one level down get their own sub-heading; other nesting is skipped
+                for key, item in value.items():
+                    if chart_payload(item) is not None or table_rows(item) is not None:
+                        self.subheading(_label(key))
+                        self.content(item, nested=True)
+        elif isinstance(value, list):
+            if value and all(chart_payload(item) is not None for item in value):
+                for item in value:
+                    self.chart(chart_payload(item))
+            else:
+                self.bullets(value)
+        elif value is not None:
+            self.paragraph(str(value))
+
+    def chart(self, chart: Dict[str, Any]) -> None:
+        self.charts += 1
+        link = self.assets.write_chart(chart)
+        title = str(chart.get("title") or chart.get("chart_type") or "Chart")
+        if link is None:
+            self.paragraph(f"[{title}: chart omitted - export to a file to include charts]")
+        elif link.endswith(".json"):
+            self.link(link, f"{title} (Vega-Lite spec)")
+        else:
+            self.image(link, title)
+
+    def table(self, columns: List[str], rows: Iterable[Sequence[Any]]) -> None:
+        self.tables += 1
+        self.begin_table(columns)
+        for row in rows:
+            self.table_row(row)
+            self.table_rows += 1
+        self.end_table()
+
+    @abstractmethod
+    def begin(self, report_data: Dict[str, Any], template: str) -> None:
+        """Write the document header: title, generation time and any opening markup."""
+
+    @abstractmethod
+    def end(self) -> None:
+        """Write the footer and close any open markup."""
+
+    @abstractmethod
+    def begin_section(self, title: str, kind: str) -> None:
+        """Start a top-level section; kind is the section's key in the report data."""
+
+    def end_section(self) -> None:
+        pass
+
+    @abstractmethod
+    def subheading(self, text: str) -> None:
+        """Write a heading for a nested value inside a section."""
+
+    @abstractmethod
+    def bullets(self, items: Iterable[Any], emphasis: bool = False) -> None:
+        """Write a bulleted list, highlighted when emphasis is set."""
+
+    @abstractmethod
+    def fields(self, items: List[Tuple[Any, Any]], metrics: bool = False) -> None:
+        """Write label/value pairs, styled as headline metrics when metrics is set."""
+
+    @abstractmethod
+    def paragraph(self, text: str) -> None:
+        """Write a block of plain text."""
+
+    @abstractmethod
+    def image(self, link: str, title: str) -> None:
+        """Embed a chart image written to the assets directory."""
+
+    @abstractmethod
+    def link(self, link: str, title: str) -> None:
+        """Link to an asset that cannot be embedded, such as a Vega-Lite spec."""
+
+    @abstractmethod
+    def begin_table(self, columns: List[str]) -> None:
+        """Start a table with a header row."""
+
+    @abstractmethod
+    def table_row(self, row: Sequence[Any]) -> None:
+        """Write one table row."""
+
+    @abstractmethod
+    def end_table(self) -> None:
+        """Close the current table."""
+
+
+def _cell(value: Any) -> str:
+    if value is None or (not isinstance(value, str) and _is_scalar(value) and pd.isna(value)):
+        return ""
+    return str(value)
+
+
+class HtmlReportWriter(ReportWriter):
+    """HTML report in the executive or default style."""
+
+    format = "html"
+
+    def begin(self, report_data: Dict[str, Any], template: str) -> None:
+        title = html.escape(str(report_data["title"]))
+        style = HTML_STYLES["executive" if template == "executive" else "default"]
+        self.handle.write(f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+    <style>{style}    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>{title}</h1>
+        <p><em>{html.escape(str(report_data['subtitle']))}</em></p>
+        <p><strong>Generated:</strong> {_generated_label(report_data)}</p>
+""")
+
+    def end(self) -> None:
+        self.handle.write("""
+    </div>
+</body>
+</html>""")
+
+    def begin_section(self, title: str, kind: str) -> None:
+        self.handle.write(f'\n        <div class="section">\n            <h2>{html.escape(title)}</h2>\n')
+
+    def end_section(self) -> None:
+        self.handle.write('        </div>\n')
+
+    def subheading(self, text: str) -> None:
+        self.handle.write(f'            <h3>{html.escape(text)}</h3>\n')
+
+    def bullets(self, items: Iterable[Any], emphasis: bool = False) -> None:
+        if emphasis:
+            self.handle.write('            <div class="exec-summary">\n')
+        self.handle.write('            <ul>\n')
+        for item in items:
+            self.handle.write(f'                <li>{html.escape(str(item))}</li>\n')
+        self.handle.write('            </ul>\n')
+        if emphasis:
+            self.handle.write('            </div>\n')
+
+    def fields(self, items: List[Tuple[Any, Any]], metrics: bool = False) -> None:
+        if metrics:
+            for key, value in items:
+                self.handle.write(f'            <div class="metric"><strong>{html.escape(_label(key))}:</strong> '
+                                  f'{html.escape(str(value))}</div>\n')
+            return
+        self.handle.write('            <ul>\n')
+        for key, value in items:
+            self.handle.write(f'                <li><strong>{html.escape(_label(key))}:</strong> {html.escape(str(value))}</li>\n')
+        self.handle.write('            </ul>\n')
+
+    def paragraph(self, text: str) -> None:
+        self.handle.write(f'            <p>{html.escape(text)}</p>\n')
+
+    def image(self, link: str, title: str) -> None:
+        self.handle.write(f'            <figure><img src="{html.escape(link)}" alt="{html.escape(title)}">'
+                          f'<figcaption>{html.escape(title)}</figcaption></figure>\n')
+
+    def link(self, link: str, title: str) -> None:
+        self.handle.write(f'            <p><a href="{html.escape(link)}">{html.escape(title)}</a></p>\n')
+
+    def begin_table(self, columns: List[str]) -> None:
+        header = "".join(f"<th>{html.escape(col)}</th>" for col in columns)
+        self.handle.write(f'            <table>\n                <thead><tr>{header}</tr></thead>\n                <tbody>\n')
+
+    def table_row(self, row: Sequence[Any]) -> None:
+        cells = "".join(f"<td>{html.escape(_cell(value))}</td>" for value in row)
+        self.handle.write(f'                <tr>{cells}</tr>\n')
+
+    def end_table(self) -> None:
+        self.handle.write('                </tbody>\n            </table>\n')
+
+
+class MarkdownReportWriter(ReportWriter):
+    """GitHub-flavoured Markdown report."""
+
+    format = "markdown"
+
+    def begin(self, report_data: Dict[str, Any], template: str) -> None:
+        self.handle.write(f"""# {report_data['title']}
+
+*{report_data['subtitle']}*
+
+**Generated:** {_generated_label(report_data)}
+
+---
+
+""")
+
+    def end(self) -> None:
+        self.handle.write(f"\n---\n*{REPORT_FOOTER}*")
+
+    def begin_section(self, title: str, kind: str) -> None:
+        self.handle.write(f"\n## {title}\n\n")
+
+    def subheading(self, text: str) -> None:
+        self.handle.write(f"### {text}\n\n")
+
+    def bullets(self, items: Iterable[Any], emphasis: bool = False) -> None:
+        for item in items:
+            self.handle.write(f"- {item}\n")
+        self.handle.write("\n")
+
+    def fields(self, items: List[Tuple[Any, Any]], metrics: bool = False) -> None:
+        for key, value in items:
+            self.handle.write(f"**{_label(key)}:** {value}  \n")
+        self.handle.write("\n")
+
+    def paragraph(self, text: str) -> None:
+        self.handle.write(f"{text}\n\n")
+
+    def image(self, link: str, title: str) -> None:
+        self.handle.write(f"![{title}]({link})\n\n")
+
+    def link(self, link: str, title: str) -> None:
+        self.handle.write(f"[{title}]({link})\n\n")
+
+    def begin_table(self, columns: List[str]) -> None:
+        self.handle.write("| " + " | ".join(self._escape(col) for col in columns) + " |\n")
+        self.handle.write("|" + "---|" * len(columns) + "\n")
+
+    def table_row(self, row: Sequence[Any]) -> None:
+        self.handle.write("| " + " | ".join(self._escape(_cell(value)) for value in row) + " |\n")
+
+    def end_table(self) -> None:
+        self.handle.write("\n")
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        return text.replace("|", "\\|").replace("\n", " ")
+
+
+class PdfReportWriter(ReportWriter):
+    """
+    Built-in PDF layout used when no HTML-to-PDF renderer is installed.
+
+    Text, tables and raster charts are laid out on A4 pages with matplotlib's PDF
+    backend; each page is written to the file and closed as soon as it is full.
+    """
+
+    format = "pdf"
+    PAGE_SIZE = (8.27, 11.69)
+    MARGIN = 0.75
+    LINE_HEIGHT = 1.3  # line pitch in font sizes
+    LINE_SPACING = 1.58  # matplotlib linespacing that yields that pitch
+
+    def __init__(self, pages: Any, assets: ReportAssets):
+        super().__init__(None, assets)
+        self.pages = pages
+        self.page_count = 0
+        self._figure = None
+        self._block = None
+        self._y = 0.0
+        self._columns: List[str] = []
+
+    @property
+    def _width(self) -> float:
+        return self.PAGE_SIZE[0] - 2 * self.MARGIN
+
+    def _new_page(self) -> None:
+        from matplotlib.figure import Figure
+
+        self._flush()
+        self._figure = Figure(figsize=self.PAGE_SIZE)
+        self._y = self.PAGE_SIZE[1] - self.MARGIN
+        self.page_count += 1
+
+    def _flush(self) -> None:
+        self._end_block()
+        if self._figure is not None:
+            self.pages.savefig(self._figure)
+            self._figure.clear()
+            self._figure = None
+
+    def _reserve(self, height: float) -> None:
+        if self._figure is None or self._y - height < self.MARGIN:
+            self._new_page()
+
+    def _text(self, text: str, size: float = 9, indent: float = 0.0, wrap: bool = True, **style: Any) -> None:
+        char_width = size / 72 * (0.6 if style.get("family") == "monospace" else 0.52)
+        width = max(10, int((self._width - indent) / char_width))
+        lines = textwrap.wrap(text, width) if wrap else [text[:width]]
+        height = size / 72 * self.LINE_HEIGHT
+        key = (size, indent, tuple(sorted(style.items())))
+        for line in lines or [""]:
+            self._reserve(height)
+            # Consecutive lines in one style are drawn as a single text artist per page
+            if self._block is None or self._block[0] != key:
+                self._end_block()
+                self._block = (key, self._y, [], style)
+            self._block[2].append(line)
+            self._y -= height
+
+    def _end_block(self) -> None:
+        if self._block is not None:
+            (size, indent, _), top, lines, style = self._block
+            self._block = None
+            self._figure.text((self.MARGIN + indent) / self.PAGE_SIZE[0], top / self.PAGE_SIZE[1], "\n".join(lines),
+                              fontsize=size, verticalalignment="top", linespacing=self.LINE_SPACING, **style)
+
+    def _gap(self, height: float = 0.12) -> None:
+        self._end_block()
+        self._y -= height
+
+    def begin(self, report_data: Dict[str, Any], template: str) -> None:
+        self._new_page()
+        self._text(str(report_data["title"]), size=18, weight="bold")
+        self._text(str(report_data["subtitle"]), size=11, style="italic")
+        self._text(f"Generated: {_generated_label(report_data)}", size=9)
+        self._gap(0.25)
+
+    def end(self) -> None:
+        self._gap(0.2)
+        self._text(REPORT_FOOTER, size=8, style="italic")
+        self._flush()
+
+    def begin_section(self, title: str, kind: str) -> None:
+        self._reserve(0.8)
+        self._gap(0.15)
+        self._text(title, size=13, weight="bold")
+        self._gap(0.05)
+
+    def subheading(self, text: str) -> None:
+        self._gap(0.05)
+        self._text(text, size=10.5, weight="bold")
+
+    def bullets(self, items: Iterable[Any], emphasis: bool = False) -> None:
+        for item in items:
+            self._text(f"\u2022 {item}", indent=0.15)
+        self._gap()
+
+    def fields(self, items: List[Tuple[Any, Any]], metrics: bool = False) -> None:
+        for key, value in items:
+            self._text(f"{_label(key)}: {value}", indent=0.15)
+        self._gap()
+
+    def paragraph(self, text: str) -> None:
+        self._text(text)
+        self._gap()
+
+    # chart() draws images onto the page itself; asset references are written as text
+
+    def image(self, link: str, title: str) -> None:
+        self.paragraph(f"[{title}: {link}]")
+
+    def link(self, link: str, title: str) -> None:
+        self.paragraph(f"{title}: {link}")
+
+    def chart(self, chart: Dict[str, Any]) -> None:
+        self.charts += 1
+        title = str(chart.get("title") or chart.get("chart_type") or "Chart")
+        if "chart_image" not in chart or chart.get("image_format") == "svg":
+            kind = "SVG chart" if chart.get("image_format") == "svg" else "Vega-Lite spec"
+            self.paragraph(f"[{title}: {kind} cannot be embedded in the PDF - export HTML to include it]")
+            return
+
+        import numpy as np
+        from PIL import Image
+
+        with Image.open(io.BytesIO(base64.b64decode(chart["chart_image"]))) as image:
+            pixels = np.asarray(image.convert("RGBA"))
+        height_px, width_px = pixels.shape[:2]
+        width = self._width
+        height = width * height_px / width_px
+        max_height = (self.PAGE_SIZE[1] - 2 * self.MARGIN) * 0.7
+        if height > max_height:
+            width, height = width * max_height / height, max_height
+        self._end_block()
+        self._reserve(height + 0.3)
+        self._y -= height
+        axes = self._figure.add_axes([self.MARGIN / self.PAGE_SIZE[0], self._y / self.PAGE_SIZE[1],
+                                      width / self.PAGE_SIZE[0], height / self.PAGE_SIZE[1]])
+        axes.imshow(pixels, interpolation="antialiased")
+        axes.set_axis_off()
+        self._text(title, size=8, style="italic")
+        self._gap()
+
+    def begin_table(self, columns: List[str]) -> None:
+        self._columns = columns
+        self._row(columns, weight="bold")
+
+    def table_row(self, row: Sequence[Any]) -> None:
+        self._row([_cell(value) for value in row])
+
+    def end_table(self) -> None:
+        self._gap()
+
+    def _row(self, cells: Sequence[str], **style: Any) -> None:
+        size = 7
+        total = int(self._width / (size / 72 * 0.6))
+        width = max(4, total // max(1, len(self._columns)) - 1)
+        line = " ".join(cell[:width - 1] + "\u2026" if len(cell) > width else cell.ljust(width) for cell in cells)
+        self._text(line, size=size, wrap=False, family="monospace", **style)
+
+
+def pdf_renderer() -> str:
+    """
+    PDF renderer from BI_PDF_RENDERER ("auto" by default).
+
+    "auto" picks the first installed HTML-to-PDF renderer (weasyprint, xhtml2pdf) and
+    falls back to the built-in matplotlib layout ("basic").
+    """
+
+    requested = os.getenv("BI_PDF_RENDERER", "auto").lower()
+    if requested in PDF_RENDERERS:
+        return requested
+    for name in PDF_RENDERERS[:-1]:
+        if importlib.util.find_spec(name) is not None:
+            return name
+    return "basic"
+
+
+def render_html_to_pdf(html_file: Path, pdf_file: Path, renderer: str) -> None:
+    """Convert an HTML file (with relative asset links) to PDF."""
+
+    if renderer == "weasyprint":
+        from weasyprint import HTML
+
+        HTML(filename=str(html_file), base_url=str(html_file.parent)).write_pdf(str(pdf_file))
+    elif renderer == "xhtml2pdf":
+        from xhtml2pdf import pisa
+
+        with open(html_file, "r", encoding="utf-8") as source, open(pdf_file, "wb") as target:
+            status = pisa.CreatePDF(source, dest=target, path=str(html_file))
+        if status.err:
+            raise RuntimeError(f"xhtml2pdf reported {status.err} errors")
+    else:
+        raise ValueError(f"Unsupported HTML-to-PDF renderer: {renderer}")
+
+
+WRITERS = {"html": (HtmlReportWriter, ".html"), "markdown": (MarkdownReportWriter, ".md")}
+
+
+def write_report(report_data: Dict[str, Any], template: str, report_format: str,
+                 output_path: str = "") -> Dict[str, Any]:
+    """
+    Stream an HTML or Markdown report to output_path, with charts in `<stem>_assets/`.
+
+    Without an output path the report is rendered into a string and returned as
+    "content"; charts are omitted then, since there is nowhere to write them.
+    """
+
+    writer_class, suffix = WRITERS[report_format]
+    if not output_path:
+        buffer = io.StringIO()
+        writer = writer_class(buffer, ReportAssets())
+        writer.write_report(report_data, template)
+        content = buffer.getvalue()
+        result = {"format": report_format, "content": content, "file_size": len(content.encode("utf-8"))}
+        return {**result, **_writer_stats(writer)}
+
+    output_file = Path(output_path)
+    if not output_file.suffix:
+        output_file = output_file.with_suffix(suffix)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        writer = writer_class(f, ReportAssets(output_file.parent / f"{output_file.stem}_assets"))
+        writer.write_report(report_data, template)
+        file_size = f.tell()
+    return {"format": report_format, "output_path": str(output_file), "file_size": file_size, **_writer_stats(writer)}
+
+
+def write_pdf_report(report_data: Dict[str, Any], template: str, output_path: str) -> Dict[str, Any]:
+    """
+    Write a PDF report.
+
+    With an HTML-to-PDF renderer the HTML report is streamed to a scratch directory
+    (charts as asset files) and converted; otherwise the built-in layout writes pages
+    directly. Either way the result is one self-contained PDF file.
+    """
+
+    output_file = Path(output_path)
+    if not output_file.suffix:
+        output_file = output_file.with_suffix(".pdf")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    renderer = pdf_renderer()
+    if renderer == "basic":
+        import matplotlib
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        # The PDF core fonts skip glyph layout and font embedding, which dominate text-heavy pages
+        with matplotlib.rc_context({"pdf.use14corefonts": True}), PdfPages(str(output_file)) as pages:
+            writer = PdfReportWriter(pages, ReportAssets())
+            writer.write_report(report_data, template)
+        stats = {**_writer_stats(writer), "pages": writer.page_count}
+    else:
+        with tempfile.TemporaryDirectory(prefix="bi_report_") as scratch:
+            html_file = Path(scratch) / "report.html"
+            with open(html_file, "w", encoding="utf-8") as f:
+                writer = HtmlReportWriter(f, ReportAssets(Path(scratch) / "report_assets"))
+                writer.write_report(report_data, template)
+            render_html_to_pdf(html_file, output_file, renderer)
+        # The chart files were scratch inputs to the renderer; the PDF embeds them
+        stats = {key: value for key, value in _writer_stats(writer).items() if key != "chart_files"}
+    logger.info(f"PDF report written to {output_file} with the {renderer} renderer")
+    return {
+        "format": "pdf",
+        "output_path": str(output_file),
+        "file_size": output_file.stat().st_size,
+        "renderer": renderer,
+        **stats
+    }
+
+
+def _writer_stats(writer: ReportWriter) -> Dict[str, Any]:
+    stats = {"charts": writer.charts, "tables": writer.tables, "table_rows": writer.table_rows}
+    if writer.assets.written:
+        stats["chart_files"] = writer.assets.written
+    if writer.assets.omitted:
+        stats["charts_omitted"] = writer.assets.omitted
+    return stats
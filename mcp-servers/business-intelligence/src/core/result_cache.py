@@ -0,0 +1,269 @@
+"""
+Result Cache
+Memoized BI tool results keyed on dataset content fingerprints and normalized arguments.
+"""
+
+import os
+import json
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.core.dataset_store import get_store
+from src.core.executor import get_executor
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_MAX_MB = 64
+
+
+@dataclass
+class CachedResult:
+    """A memoized tool result and its serialized size."""
+    key: str
+    tool_name: str
+    dataset_name: str
+    payload: bytes
+    created_at: float = field(default_factory=time.time)
+    hits: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.payload)
+
+
+class ResultCache:
+    """
+    LRU cache of tool results bounded by total pickled size.
+
+    Results are stored pickled, so every hit returns an independent copy. When a
+    cache directory is configured, entries are also written there and read back on
+    a memory miss, so repeated analyses survive a server restart. Each file starts
+    with a one-line JSON header naming its dataset, so invalidation can find a
+    dataset's files without unpickling them.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, cache_dir: Optional[str] = None):
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("BI_RESULT_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        if cache_dir is None:
+            cache_dir = os.getenv("BI_RESULT_CACHE_DIR", "") or _workspace_results_dir()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result and its metadata, or None on a miss."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._read_disk(key)
+                if entry is not None:
+                    self._insert(entry)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self._hits += 1
+
+        return {
+            "result": pickle.loads(entry.payload),
+            "age_seconds": round(time.time() - entry.created_at, 3),
+            "hits": entry.hits
+        }
+
+    def put(self, key: str, tool_name: str, dataset_name: str, result: Dict[str, Any]) -> bool:
+        """Cache a result; returns False when it is larger than the whole budget."""
+
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return False
+        entry = CachedResult(key=key, tool_name=tool_name, dataset_name=dataset_name, payload=payload)
+        with self._lock:
+            self._insert(entry)
+        self._write_disk(entry)
+        return True
+
+    def invalidate(self, dataset_name: Optional[str] = None) -> int:
+        """Drop all entries (or those for one dataset) from memory and disk; returns the number removed."""
+
+        with self._lock:
+            keys = {key for key, entry in self._entries.items()
+                    if dataset_name is None or entry.dataset_name == dataset_name}
+            for key in keys:
+                del self._entries[key]
+            if self.cache_dir is not None and self.cache_dir.exists():
+                for path in self.cache_dir.glob("*.pkl"):
+                    if dataset_name is None or _disk_dataset_name(path) == dataset_name:
+                        path.unlink(missing_ok=True)
+                        keys.add(path.stem)
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(e.nbytes for e in self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "cache_dir": str(self.cache_dir) if self.cache_dir else None
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _insert(self, entry: CachedResult) -> None:
+        self._entries.pop(entry.key, None)
+        self._entries[entry.key] = entry
+        total = sum(e.nbytes for e in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            total -= evicted.nbytes
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def _write_disk(self, entry: CachedResult) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._disk_path(entry.key).with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps({"dataset_name": entry.dataset_name}).encode() + b"\n")
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(entry.key))
+            self._prune_disk()
+        except Exception as e:
+            logger.warning(f"Failed to persist cached result {entry.key[:12]}: {e}")
+
+    def _read_disk(self, key: str) -> Optional[CachedResult]:
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                f.readline()  # header
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached result {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _prune_disk(self) -> None:
+        """Keep the cache directory within the byte budget, oldest files first."""
+
+        files = sorted(self.cache_dir.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files[:-1]:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+
+def _disk_dataset_name(path: Path) -> Optional[str]:
+    """Dataset named in a cache file's header, or None if it cannot be read."""
+
+    try:
+        with open(path, "rb") as f:
+            return json.loads(f.readline()).get("dataset_name")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def make_cache_key(tool_name: str, dataset_name: str, fingerprint: str, args: Dict[str, Any]) -> str:
+    """
+    Stable key for a tool call: tool name, dataset name and content fingerprint, and JSON-normalized arguments.
+
+    The dataset name is part of the key because results echo it back, so the same
+    content loaded under two names must not share entries.
+    """
+
+    normalized = json.dumps(args, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{tool_name}\0{dataset_name}\0{fingerprint}\0{normalized}".encode()).hexdigest()
+
+
+async def cached_tool_call(
+    tool_name: str,
+    dataset_name: str,
+    args: Dict[str, Any],
+    compute: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Return a memoized result for a dataset-scoped tool call, computing it on a miss.
+
+    Calls on datasets that are not registered in the store (and results carrying an
+    "error") are never cached. The returned dict gains a "cache" entry with
+    hit/miss metadata.
+    """
+
+    cache = get_result_cache()
+    fingerprint = None
+    if cache.enabled:
+        # Hashing (and materializing a lazy dataset) can take seconds, so it stays off the event loop
+        fingerprint = await get_executor().run_in_thread("fingerprint", get_store().fingerprint, dataset_name)
+    if fingerprint is None:
+        result = await compute()
+        if isinstance(result, dict):
+            result["cache"] = {"status": "bypass"}
+        return result
+
+    key = make_cache_key(tool_name, dataset_name, fingerprint, args)
+    cached = cache.get(key)
+    if cached is not None:
+        result = cached["result"]
+        result["cache"] = {"status": "hit", "key": key[:16], "age_seconds": cached["age_seconds"], "hits": cached["hits"]}
+        logger.info(f"Result cache hit for {tool_name} on '{dataset_name}'")
+        return result
+
+    started = time.perf_counter()
+    result = await compute()
+    elapsed = time.perf_counter() - started
+    stored = isinstance(result, dict) and "error" not in result and cache.put(key, tool_name, dataset_name, result)
+    if isinstance(result, dict):
+        result["cache"] = {"status": "miss", "key": key[:16], "stored": bool(stored), "compute_seconds": round(elapsed, 4)}
+    return result
+
+
+_CACHE: Optional[ResultCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _workspace_results_dir() -> str:
+    """Default cache directory: the persistent workspace's results folder, when enabled."""
+
+    from src.core.workspace import get_workspace
+
+    workspace = get_workspace()
+    return str(workspace.results_dir) if workspace is not None else ""
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache."""
+
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ResultCache()
+    return _CACHE
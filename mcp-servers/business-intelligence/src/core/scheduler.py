@@ -0,0 +1,435 @@
+"""
+Analysis Scheduler
+In-process cron scheduler for recurring analyses, backed by a SQLite (WAL) schedule table.
+"""
+
+import os
+import json
+import time
+import heapq
+import sqlite3
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent.parent / "schedules" / "schedules.db"
+DEFAULT_MAX_CONCURRENT_RUNS = 2
+DEFAULT_RUN_TIMEOUT_MINUTES = 30
+MAX_STORED_RESULT_BYTES = 64 * 1024   # larger results keep only their top-level keys in the run history
+FIRE_RETRY_SECONDS = 60               # a schedule that failed to fire is retried after this delay
+
+Runner = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    analysis_type TEXT NOT NULL,
+    cron TEXT NOT NULL,
+    config TEXT NOT NULL,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    created_at REAL NOT NULL,
+    next_run REAL,
+    last_run REAL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    schedule_id TEXT NOT NULL,
+    scheduled_for REAL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    duration_seconds REAL NOT NULL,
+    status TEXT NOT NULL,
+    trigger TEXT NOT NULL,
+    missed_fires INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_schedule ON runs (schedule_id, started_at);
+"""
+
+
+def next_fire_time(cron_expression: str, after: float) -> float:
+    """Epoch seconds of the first fire of a cron expression (evaluated in UTC) strictly after `after`."""
+    import croniter  # imported on first use so spawning the server does not load it
+
+    start = datetime.fromtimestamp(after, tz=timezone.utc)
+    return float(croniter.croniter(cron_expression, start).get_next(float))
+
+
+class ScheduleStore:
+    """
+    Schedules and their run history in one SQLite database.
+
+    The database runs in WAL mode so history reads never block the scheduler's
+    writes. Legacy one-file-per-schedule JSON configs found next to a new
+    database are imported once.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path or os.getenv("BI_SCHEDULE_DB", "") or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.db_path.exists()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        if is_new:
+            self._import_json_configs()
+
+    def upsert(self, config: Dict[str, Any], next_run: Optional[float] = None) -> None:
+        cron = config["schedule"]["cron_expression"]
+        created_at = _parse_timestamp(config.get("metadata", {}).get("created_at")) or time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO schedules (id, name, analysis_type, cron, config, enabled, created_at, next_run) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET name=excluded.name, "
+                "analysis_type=excluded.analysis_type, cron=excluded.cron, config=excluded.config, "
+                "enabled=excluded.enabled, next_run=excluded.next_run",
+                (config["id"], config["name"], config["analysis_type"], cron, json.dumps(config, default=str),
+                 int(config["schedule"].get("enabled", True)), created_at,
+                 next_run if next_run is not None else next_fire_time(cron, time.time()))
+            )
+
+    def get(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM schedules WHERE id = ?", (schedule_id,)).fetchone()
+        return _schedule_row(row) if row else None
+
+    def list(self, enabled_only: bool = False) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM schedules" + (" WHERE enabled = 1" if enabled_only else "") + " ORDER BY created_at"
+        with self._lock:
+            rows = self._conn.execute(query).fetchall()
+        return [_schedule_row(row) for row in rows]
+
+    def set_enabled(self, schedule_id: str, enabled: bool, next_run: Optional[float] = None) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT config FROM schedules WHERE id = ?", (schedule_id,)).fetchone()
+            if row is None:
+                return False
+            config = json.loads(row["config"])
+            config["schedule"]["enabled"] = enabled
+            config.setdefault("metadata", {})["status"] = "active" if enabled else "paused"
+            config["metadata"]["resumed_at" if enabled else "paused_at"] = datetime.now().isoformat()
+            self._conn.execute(
+                "UPDATE schedules SET enabled = ?, config = ?, next_run = COALESCE(?, next_run) WHERE id = ?",
+                (int(enabled), json.dumps(config, default=str), next_run, schedule_id)
+            )
+        return True
+
+    def set_next_run(self, schedule_id: str, next_run: float, last_run: Optional[float] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE schedules SET next_run = ?, last_run = COALESCE(?, last_run) WHERE id = ?",
+                (next_run, last_run, schedule_id)
+            )
+
+    def delete(self, schedule_id: str) -> bool:
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,)).rowcount
+            self._conn.execute("DELETE FROM runs WHERE schedule_id = ?", (schedule_id,))
+        return bool(deleted)
+
+    def record_run(self, run: Dict[str, Any]) -> int:
+        result = run.get("result")
+        stored = None
+        if result is not None:
+            stored = json.dumps(result, default=str)
+            if len(stored) > MAX_STORED_RESULT_BYTES:
+                stored = json.dumps({"truncated": True, "keys": sorted(result) if isinstance(result, dict) else []})
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (schedule_id, scheduled_for, started_at, finished_at, duration_seconds, status, "
+                "trigger, missed_fires, error, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run["schedule_id"], run.get("scheduled_for"), run["started_at"], run["finished_at"],
+                 run["duration_seconds"], run["status"], run["trigger"], run.get("missed_fires", 0),
+                 run.get("error"), stored)
+            )
+        return int(cursor.lastrowid)
+
+    def runs(self, schedule_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM runs" + (" WHERE schedule_id = ?" if schedule_id else "") + " ORDER BY id DESC LIMIT ?"
+        params = (schedule_id, limit) if schedule_id else (limit,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        history = []
+        for row in rows:
+            run = dict(row)
+            run["result"] = json.loads(run["result"]) if run["result"] else None
+            history.append(run)
+        return history
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _import_json_configs(self) -> None:
+        for path in sorted(self.db_path.parent.glob("*.json")):
+            try:
+                config = json.loads(path.read_text())
+                self.upsert(config)
+                logger.info(f"Imported schedule {config['id']} from {path.name}")
+            except Exception as e:
+                logger.warning(f"Skipping unreadable schedule file {path.name}: {e}")
+
+
+class AnalysisScheduler:
+    """
+    Fires enabled schedules from a min-heap of next-fire times on the event loop.
+
+    Each schedule has at most one heap entry that is current; entries are
+    invalidated lazily through a per-schedule version number when a schedule is
+    added, paused or deleted. Runs execute the analysis registered for the
+    schedule's analysis type, at most max_concurrent at a time, and every run is
+    recorded with its duration. Fires missed while the server was down are
+    coalesced into one catch-up run at start.
+    """
+
+    def __init__(self, store: Optional[ScheduleStore] = None, max_concurrent: Optional[int] = None):
+        self._store = store
+        self.max_concurrent = max_concurrent or int(os.getenv("BI_SCHEDULER_WORKERS", DEFAULT_MAX_CONCURRENT_RUNS))
+        self.runners: Dict[str, Runner] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._versions: Dict[str, int] = {}
+        self._seq = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._run_tasks: set = set()
+
+    @property
+    def store(self) -> ScheduleStore:
+        if self._store is None:
+            self._store = get_schedule_store()
+        return self._store
+
+    @property
+    def running(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    def register_runner(self, analysis_type: str, runner: Runner) -> None:
+        """Register the coroutine that executes an analysis type from its analysis_config."""
+        self.runners[analysis_type] = runner
+
+    async def start(self) -> None:
+        """Load enabled schedules, run catch-up for missed fires and start the fire loop."""
+
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._heap, self._versions = [], {}
+        now = time.time()
+        for schedule in self.store.list(enabled_only=True):
+            next_run = schedule["next_run"] or next_fire_time(schedule["cron"], now)
+            if next_run <= now:
+                missed = _count_fires(schedule["cron"], next_run, now)
+                logger.info(f"Schedule {schedule['id']} missed {missed} fire(s) while stopped; running catch-up")
+                self._spawn(schedule["id"], next_run, "catch_up", missed)
+                next_run = next_fire_time(schedule["cron"], now)
+                self.store.set_next_run(schedule["id"], next_run)
+            self._push(schedule["id"], next_run)
+        self._loop_task = asyncio.ensure_future(self._fire_loop())
+        logger.info(f"Analysis scheduler started with {len(self._heap)} active schedule(s)")
+
+    async def stop(self) -> None:
+        """Stop firing and cancel in-flight runs."""
+
+        tasks = [task for task in [self._loop_task, *self._run_tasks] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._wakeup = None
+        self._run_tasks.clear()
+
+    def add(self, config: Dict[str, Any]) -> float:
+        """Persist a schedule and, when the scheduler is running, queue its next fire."""
+
+        next_run = next_fire_time(config["schedule"]["cron_expression"], time.time())
+        self.store.upsert(config, next_run)
+        if config["schedule"].get("enabled", True):
+            self._push(config["id"], next_run)
+        return next_run
+
+    def pause(self, schedule_id: str) -> bool:
+        self._invalidate(schedule_id)
+        return self.store.set_enabled(schedule_id, False)
+
+    def resume(self, schedule_id: str) -> bool:
+        schedule = self.store.get(schedule_id)
+        if schedule is None:
+            return False
+        next_run = next_fire_time(schedule["cron"], time.time())
+        self.store.set_enabled(schedule_id, True, next_run)
+        self._push(schedule_id, next_run)
+        return True
+
+    def remove(self, schedule_id: str) -> bool:
+        self._invalidate(schedule_id)
+        return self.store.delete(schedule_id)
+
+    async def run_now(self, schedule_id: str) -> Dict[str, Any]:
+        """Execute a schedule immediately (outside its cron cadence) and return the run record."""
+        return await self._execute(schedule_id, None, "manual", 0)
+
+    def upcoming(self) -> List[Dict[str, Any]]:
+        """Current heap entries in fire order."""
+        return [{"schedule_id": sid, "next_run": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()}
+                for ts, seq, sid in sorted(self._heap) if self._is_current(sid, seq)]
+
+    def _push(self, schedule_id: str, fire_at: float) -> None:
+        self._seq += 1
+        self._versions[schedule_id] = self._seq
+        if self._wakeup is None:
+            return  # not started; start() loads the schedule from the store
+        heapq.heappush(self._heap, (fire_at, self._seq, schedule_id))
+        if self._heap[0][1] == self._seq:
+            self._wakeup.set()  # new earliest fire: re-arm the sleep
+
+    def _invalidate(self, schedule_id: str) -> None:
+        self._versions.pop(schedule_id, None)
+
+    def _is_current(self, schedule_id: str, seq: int) -> bool:
+        return self._versions.get(schedule_id) == seq
+
+    async def _fire_loop(self) -> None:
+        while True:
+            schedule_id = None
+            try:
+                while self._heap and not self._is_current(self._heap[0][2], self._heap[0][1]):
+                    heapq.heappop(self._heap)
+                delay = None if not self._heap else self._heap[0][0] - time.time()
+                if delay is None or delay > 0:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                fire_at, _, schedule_id = heapq.heappop(self._heap)
+                schedule = self.store.get(schedule_id)
+                if schedule is None or not schedule["enabled"]:
+                    self._invalidate(schedule_id)
+                    continue
+                # Next fire counts from the due time, skipping any fires that already passed
+                next_run = next_fire_time(schedule["cron"], max(fire_at, time.time()))
+                self.store.set_next_run(schedule_id, next_run, last_run=fire_at)
+                self._push(schedule_id, next_run)
+                self._spawn(schedule_id, fire_at, "cron", 0)
+            except Exception:
+                # One bad schedule or store error must not end the loop, and with it every schedule
+                logger.exception(f"Scheduler failed to fire {schedule_id or 'the next schedule'}; "
+                                 f"retrying in {FIRE_RETRY_SECONDS}s")
+                if schedule_id is not None:
+                    self._push(schedule_id, time.time() + FIRE_RETRY_SECONDS)
+                else:
+                    await asyncio.sleep(FIRE_RETRY_SECONDS)
+
+    def _spawn(self, schedule_id: str, fire_at: float, trigger: str, missed: int) -> None:
+        task = asyncio.ensure_future(self._execute(schedule_id, fire_at, trigger, missed))
+        self._run_tasks.add(task)
+        task.add_done_callback(self._run_tasks.discard)
+
+    async def _execute(self, schedule_id: str, fire_at: Optional[float], trigger: str, missed: int) -> Dict[str, Any]:
+        schedule = self.store.get(schedule_id)
+        if schedule is None:
+            return {"error": f"Schedule {schedule_id} not found"}
+
+        slots = self._slots or asyncio.Semaphore(self.max_concurrent)
+        async with slots:
+            config = schedule["config"]
+            runner = self.runners.get(schedule["analysis_type"])
+            timeout = 60 * config.get("execution", {}).get("timeout_minutes", DEFAULT_RUN_TIMEOUT_MINUTES)
+            started = time.time()
+            result, error = None, None
+            if runner is None:
+                error = f"No runner registered for analysis type '{schedule['analysis_type']}'"
+            else:
+                try:
+                    result = await asyncio.wait_for(runner(config["analysis_config"]), timeout)
+                    if isinstance(result, dict) and "error" in result:
+                        error = str(result["error"])
+                except asyncio.TimeoutError:
+                    error = f"Run exceeded its {timeout / 60:g} minute timeout"
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            finished = time.time()
+
+        run = {
+            "schedule_id": schedule_id,
+            "scheduled_for": fire_at,
+            "started_at": started,
+            "finished_at": finished,
+            "duration_seconds": round(finished - started, 4),
+            "status": "failed" if error else "succeeded",
+            "trigger": trigger,
+            "missed_fires": missed,
+            "error": error,
+            "result": result
+        }
+        run["id"] = self.store.record_run(run)
+        log = logger.warning if error else logger.info
+        log(f"Scheduled {schedule['analysis_type']} run for {schedule_id} {run['status']} in {run['duration_seconds']}s"
+            + (f": {error}" if error else ""))
+        return run
+
+
+def _schedule_row(row: sqlite3.Row) -> Dict[str, Any]:
+    schedule = dict(row)
+    schedule["config"] = json.loads(schedule["config"])
+    schedule["enabled"] = bool(schedule["enabled"])
+    return schedule
+
+
+def _count_fires(cron_expression: str, first: float, until: float, limit: int = 10_000) -> int:
+    """Number of fires in [first, until], capped at limit."""
+
+    count, fire_at = 0, first
+    while fire_at <= until and count < limit:
+        count += 1
+        fire_at = next_fire_time(cron_expression, fire_at)
+    return count
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+_STORE: Optional[ScheduleStore] = None
+_SCHEDULER: Optional[AnalysisScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_schedule_store() -> ScheduleStore:
+    """Return the process-wide schedule store."""
+
+    global _STORE
+    if _STORE is None:
+        with _SCHEDULER_LOCK:
+            if _STORE is None:
+                _STORE = ScheduleStore()
+    return _STORE
+
+
+def get_scheduler() -> AnalysisScheduler:
+    """Return the process-wide analysis scheduler."""
+
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        with _SCHEDULER_LOCK:
+            if _SCHEDULER is None:
+                _SCHEDULER = AnalysisScheduler()
+    return _SCHEDULER
@@ -0,0 +1,395 @@
+"""
+Sketches
+Mergeable streaming summaries: moments, quantiles, distinct counts and value frequencies.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+EXACT_QUANTILE_LIMIT = 50_000    # values kept verbatim before switching to a t-digest
+EXACT_DISTINCT_LIMIT = 100_000   # distinct hashes kept verbatim before switching to HyperLogLog
+EXACT_FREQUENCY_LIMIT = 10_000   # distinct values counted exactly before switching to count-min
+DEFAULT_COMPRESSION = 500
+HLL_PRECISION = 14
+TOP_K_CAPACITY = 64
+COUNT_MIN_WIDTH_BITS = 12
+COUNT_MIN_MULTIPLIERS = np.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93],
+    dtype=np.uint64
+)
+
+
+def hash_values(values: Any) -> np.ndarray:
+    """64-bit hashes of an array of values of any dtype, as fed to the distinct and frequency sketches."""
+    return pd.util.hash_array(np.asarray(values))
+
+
+class MomentSketch:
+    """Count, mean, min/max and central moment sums up to the fourth order, merged with Pebay's formulas."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.zeros = 0
+        self.negatives = 0
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of non-missing values."""
+
+        if values.size == 0:
+            return
+        batch = MomentSketch()
+        batch.count = int(values.size)
+        batch.mean = float(values.mean())
+        deviations = values - batch.mean
+        squared = deviations * deviations
+        batch.m2 = float(squared.sum())
+        batch.m3 = float((squared * deviations).sum())
+        batch.m4 = float((squared * squared).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        batch.zeros = int(np.count_nonzero(values == 0))
+        batch.negatives = int(np.count_nonzero(values < 0))
+        self.merge(batch)
+
+    def merge(self, other: "MomentSketch") -> "MomentSketch":
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        m2 = self.m2 + other.m2 + delta ** 2 * na * nb / n
+        m3 = (self.m3 + other.m3 + delta ** 3 * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4 + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * delta ** 2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+
+        self.mean += delta * nb / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.zeros += other.zeros
+        self.negatives += other.negatives
+        return self
+
+    def variance(self) -> float:
+        """Sample variance (ddof=1), as pandas."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    def std(self) -> float:
+        return math.sqrt(self.variance()) if self.count > 1 else math.nan
+
+    def skewness(self) -> float:
+        """Adjusted Fisher-Pearson skewness, matching pandas Series.skew."""
+
+        n = self.count
+        if n < 3:
+            return math.nan
+        if self.m2 == 0:
+            return 0.0
+        return (n * (n - 1) ** 0.5 / (n - 2)) * (self.m3 / self.m2 ** 1.5)
+
+    def kurtosis(self) -> float:
+        """Unbiased excess kurtosis, matching pandas Series.kurtosis."""
+
+        n = self.count
+        if n < 4:
+            return math.nan
+        if self.m2 == 0:
+            return 0.0
+        adjustment = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        return (n * (n + 1) * (n - 1) * self.m4) / ((n - 2) * (n - 3) * self.m2 ** 2) - adjustment
+
+
+class QuantileSketch:
+    """
+    Merging t-digest with an exact mode.
+
+    Up to exact_limit values are kept verbatim so small columns get exact quantiles
+    (linear interpolation, as pandas); beyond that values are folded into about
+    compression / 2 centroids that get smaller towards the tails.
+    """
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION, exact_limit: int = EXACT_QUANTILE_LIMIT):
+        self.compression = compression
+        self.exact_limit = exact_limit
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._values: List[np.ndarray] = []
+        self._buffered = 0
+        self._means: Optional[np.ndarray] = None
+        self._weights: Optional[np.ndarray] = None
+
+    @property
+    def exact(self) -> bool:
+        return self._means is None
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of non-missing values."""
+
+        if values.size == 0:
+            return
+        self.count += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._values.append(np.asarray(values, dtype=np.float64))
+        self._buffered += int(values.size)
+        if not self.exact or self._buffered > self.exact_limit:
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.count == 0:
+            return self
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._values.extend(other._values)
+        self._buffered += other._buffered
+        if other._means is not None:
+            self._compress(other._means, other._weights)
+        elif not self.exact or self._buffered > self.exact_limit:
+            self._compress()
+        return self
+
+    def quantiles(self, qs: List[float]) -> np.ndarray:
+        """Quantiles for each q in qs (NaN when the sketch is empty)."""
+
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        if self.exact:
+            return np.quantile(np.concatenate(self._values), qs)
+
+        # Each centroid sits at the rank of its middle observation; min and max anchor the ends
+        centers = np.cumsum(self._weights) - self._weights / 2 - 0.5
+        ranks = np.r_[0.0, centers, self.count - 1.0]
+        values = np.r_[self.min, self._means, self.max]
+        return np.interp(qs * (self.count - 1), ranks, values)
+
+    def _compress(self, extra_means: Optional[np.ndarray] = None, extra_weights: Optional[np.ndarray] = None) -> None:
+        """Fold buffered values (and any incoming centroids) into the centroid list."""
+
+        # Raw values are sorted on their own; centroid lists are already sorted and are spliced in
+        values = np.sort(np.concatenate(self._values)) if self._values else np.empty(0)
+        means, weights = values, np.ones(values.size)
+        for extra, extra_w in ((self._means, self._weights), (extra_means, extra_weights)):
+            if extra is None:
+                continue
+            positions = np.searchsorted(means, extra)
+            means = np.insert(means, positions, extra)
+            weights = np.insert(weights, positions, extra_w)
+
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1.0, 1.0))
+        bucket = np.floor(k)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+
+        self._weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / self._weights
+        self._values = []
+        self._buffered = 0
+
+
+class DistinctSketch:
+    """
+    Distinct count: exact value hashes up to exact_limit, HyperLogLog registers beyond.
+
+    Exact hashes are buffered per batch and only deduplicated once the buffer holds
+    twice the limit (or a count is requested), so streaming stays linear.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION, exact_limit: int = EXACT_DISTINCT_LIMIT):
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self._hashes: List[np.ndarray] = []
+        self._buffered = 0
+        self._registers: Optional[np.ndarray] = None
+
+    @property
+    def exact(self) -> bool:
+        return self._registers is None
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of count() relative to the true distinct count."""
+        return 0.0 if self.exact else 1.04 / math.sqrt(1 << self.precision)
+
+    def update(self, hashes: np.ndarray) -> None:
+        """Add 64-bit value hashes (duplicates allowed)."""
+
+        if hashes.size == 0:
+            return
+        if self._registers is None:
+            self._hashes.append(np.asarray(hashes, dtype=np.uint64))
+            self._buffered += int(hashes.size)
+            if self._buffered > 2 * self.exact_limit:
+                self._consolidate()
+        else:
+            self._add_to_registers(hashes)
+
+    def merge(self, other: "DistinctSketch") -> "DistinctSketch":
+        if other._registers is None:
+            for hashes in other._hashes:
+                self.update(hashes)
+        else:
+            if self._registers is None:
+                self._switch_to_registers()
+            np.maximum(self._registers, other._registers, out=self._registers)
+        return self
+
+    def count(self) -> int:
+        if self._registers is None:
+            self._consolidate()
+            if self._registers is None:
+                return self._buffered
+
+        m = self._registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.exp2(-self._registers.astype(np.float64)).sum()
+        empty = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and empty:
+            estimate = m * math.log(m / empty)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+    def _consolidate(self) -> None:
+        unique = np.unique(np.concatenate(self._hashes)) if self._hashes else np.empty(0, dtype=np.uint64)
+        self._hashes = [unique]
+        self._buffered = int(unique.size)
+        if unique.size > self.exact_limit:
+            self._switch_to_registers()
+
+    def _switch_to_registers(self) -> None:
+        self._registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        for hashes in self._hashes:
+            self._add_to_registers(hashes)
+        self._hashes = []
+        self._buffered = 0
+
+    def _add_to_registers(self, hashes: np.ndarray) -> None:
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        # the remaining 64 - p bits fit a float64 mantissa exactly, so frexp gives the bit length
+        rest = (hashes & np.uint64((1 << (64 - p)) - 1)).astype(np.float64)
+        _, bit_length = np.frexp(rest)
+        rank = (64 - p + 1 - bit_length).astype(np.uint8)
+        np.maximum.at(self._registers, index, rank)
+
+
+class FrequencySketch:
+    """
+    Value frequencies: exact counts for up to exact_limit distinct values, then a
+    count-min sketch plus a bounded set of heavy-hitter candidates for the top values.
+    """
+
+    def __init__(self, capacity: int = TOP_K_CAPACITY, exact_limit: int = EXACT_FREQUENCY_LIMIT):
+        self.capacity = capacity
+        self.exact_limit = exact_limit
+        self.total = 0
+        self._counts = pd.Series(dtype=np.int64, index=pd.Index([], dtype=np.uint64))
+        self._labels: Dict[int, Any] = {}
+        self._table: Optional[np.ndarray] = None
+
+    @property
+    def exact(self) -> bool:
+        return self._table is None
+
+    def update(self, hashes: np.ndarray, counts: np.ndarray, labels: Any) -> None:
+        """Add pre-aggregated counts for the distinct values `labels` whose hashes are `hashes`."""
+
+        if len(hashes) == 0:
+            return
+        counts = np.asarray(counts, dtype=np.int64)
+        self.total += int(counts.sum())
+        batch = pd.Series(counts, index=pd.Index(hashes, dtype=np.uint64))
+
+        if self._table is None and len(self._counts) + len(batch) <= 2 * self.exact_limit:
+            self._remember(hashes, labels)
+            self._counts = self._counts.add(batch, fill_value=0).astype(np.int64)
+            if len(self._counts) > self.exact_limit:
+                self._switch_to_table()
+            return
+
+        if self._table is None:
+            self._switch_to_table()
+        self._add_to_table(hashes, counts)
+        top = np.argsort(-counts, kind="stable")[:self.capacity]
+        self._remember(np.asarray(hashes)[top], np.asarray(labels, dtype=object)[top])
+        self._keep_candidates(np.union1d(self._counts.index.to_numpy(dtype=np.uint64), np.asarray(hashes)[top]))
+
+    def merge(self, other: "FrequencySketch") -> "FrequencySketch":
+        self.total += other.total
+        for key, label in other._labels.items():
+            self._labels.setdefault(key, label)
+
+        if self._table is None and other._table is None:
+            self._counts = self._counts.add(other._counts, fill_value=0).astype(np.int64)
+            if len(self._counts) > self.exact_limit:
+                self._switch_to_table()
+            return self
+
+        if self._table is None:
+            self._switch_to_table()
+        other_hashes = other._counts.index.to_numpy(dtype=np.uint64)
+        if other._table is None:
+            self._add_to_table(other_hashes, other._counts.to_numpy())
+        else:
+            self._table += other._table
+        self._keep_candidates(np.union1d(self._counts.index.to_numpy(dtype=np.uint64), other_hashes))
+        return self
+
+    def most_common(self, k: int) -> List[Tuple[Any, int]]:
+        """The k most frequent values with their (estimated, once approximate) counts."""
+
+        top = self._counts.sort_values(ascending=False, kind="stable").head(k)
+        return [(self._labels[int(key)], int(count)) for key, count in top.items()]
+
+    def least_common(self) -> Optional[Tuple[Any, int]]:
+        """The least frequent value; only known while counts are exact."""
+
+        if self._table is not None or self._counts.empty:
+            return None
+        ordered = self._counts.sort_values(ascending=False, kind="stable")
+        return self._labels[int(ordered.index[-1])], int(ordered.iloc[-1])
+
+    def exact_counts(self) -> Optional[np.ndarray]:
+        """All value counts while exact, otherwise None."""
+        return self._counts.to_numpy() if self._table is None else None
+
+    def _remember(self, hashes: np.ndarray, labels: Any) -> None:
+        for key, label in zip(hashes, labels):
+            self._labels.setdefault(int(key), label)
+
+    def _switch_to_table(self) -> None:
+        self._table = np.zeros((len(COUNT_MIN_MULTIPLIERS), 1 << COUNT_MIN_WIDTH_BITS), dtype=np.int64)
+        hashes = self._counts.index.to_numpy(dtype=np.uint64)
+        self._add_to_table(hashes, self._counts.to_numpy())
+        self._keep_candidates(hashes)
+
+    def _slots(self, hashes: np.ndarray, row: int) -> np.ndarray:
+        return ((hashes * COUNT_MIN_MULTIPLIERS[row]) >> np.uint64(64 - COUNT_MIN_WIDTH_BITS)).astype(np.intp)
+
+    def _add_to_table(self, hashes: np.ndarray, counts: np.ndarray) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        for row in range(self._table.shape[0]):
+            np.add.at(self._table[row], self._slots(hashes, row), counts)
+
+    def _keep_candidates(self, hashes: np.ndarray) -> None:
+        estimates = np.min([self._table[row][self._slots(hashes, row)] for row in range(self._table.shape[0])], axis=0)
+        self._counts = pd.Series(estimates, index=pd.Index(hashes, dtype=np.uint64)).nlargest(self.capacity)
+        keep = {int(key) for key in self._counts.index}
+        self._labels = {key: label for key, label in self._labels.items() if key in keep}
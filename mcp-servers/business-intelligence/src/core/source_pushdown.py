@@ -0,0 +1,306 @@
+"""
+Source Pushdown
+Column projection, row filters and limits applied inside SQLite and Parquet sources.
+"""
+
+import sqlite3
+import logging
+import operator
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("business-intelligence")
+
+COMPARISON_OPERATORS = ["==", "!=", "<", "<=", ">", ">="]
+SET_OPERATORS = ["in", "not in"]
+NULL_OPERATORS = ["is null", "is not null"]
+SUPPORTED_OPERATORS = COMPARISON_OPERATORS + SET_OPERATORS + NULL_OPERATORS
+
+# Only the requested comparison is evaluated: unordered categoricals and mixed-type
+# object columns support == and != but raise on ordering comparisons
+_COMPARISONS = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge
+}
+
+Filter = Tuple[str, str, Any]
+
+
+def normalize_filters(filters: Any) -> List[Filter]:
+    """
+    Filters as (column, operator, value) triples, all of which must hold.
+
+    Accepts a list of [column, operator, value] triples (pyarrow style; "=" is read
+    as "==" and null operators take no value) or a {column: value} mapping, where a
+    list value means "in" and None means "is null".
+    """
+
+    if not filters:
+        return []
+    if isinstance(filters, dict):
+        triples = []
+        for column, value in filters.items():
+            if value is None:
+                triples.append((column, "is null", None))
+            elif isinstance(value, (list, tuple, set)):
+                triples.append((column, "in", list(value)))
+            else:
+                triples.append((column, "==", value))
+        return triples
+
+    normalized = []
+    for item in filters:
+        if not isinstance(item, (list, tuple)) or len(item) not in (2, 3):
+            raise ValueError(f"Filters must be [column, operator, value] triples, got: {item}")
+        column, operator = item[0], str(item[1]).strip().lower()
+        operator = "==" if operator == "=" else operator
+        if operator not in SUPPORTED_OPERATORS:
+            raise ValueError(f"Unsupported filter operator '{item[1]}'. Supported: {SUPPORTED_OPERATORS}")
+        value = item[2] if len(item) == 3 else None
+        if operator in SET_OPERATORS:
+            if not isinstance(value, (list, tuple, set)):
+                raise ValueError(f"Operator '{operator}' needs a list of values for column '{column}'")
+            value = list(value)
+        elif operator not in NULL_OPERATORS and len(item) != 3:
+            raise ValueError(f"Operator '{operator}' needs a value for column '{column}'")
+        normalized.append((str(column), operator, value))
+    return normalized
+
+
+def read_sqlite(
+    source_path: str,
+    table_name: str = "",
+    query: str = "",
+    columns: Optional[List[str]] = None,
+    filters: Any = None,
+    limit: int = 0
+) -> Dict[str, Any]:
+    """
+    Read a SQLite table (or query) with the projection, filters and limit in the SQL.
+
+    Without a table name or query the first table is used. A custom query is wrapped
+    as a subquery, so filters and limits apply to its result.
+    """
+
+    triples = normalize_filters(filters)
+    conn = sqlite3.connect(source_path)
+    try:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        if query:
+            source = f"({query.strip().rstrip(';')}) AS source"
+            table_info = "Custom query"
+        else:
+            if not tables:
+                raise ValueError("No tables found in database")
+            if table_name and table_name not in tables:
+                raise ValueError(f"Table '{table_name}' not found. Available tables: {tables}")
+            if not table_name:
+                table_name = tables[0]
+                table_info = f"Using first table: {table_name} (from {len(tables)} available)"
+            else:
+                table_info = f"Table: {table_name}"
+            source = quote_identifier(table_name)
+
+        if query and not (columns or triples or limit):
+            sql, params = query, []
+        else:
+            sql, params = sqlite_select(source, columns, triples, limit)
+        df = pd.read_sql_query(sql, conn, params=params or None)
+    finally:
+        conn.close()
+
+    return {
+        "data": df,
+        "table_info": table_info,
+        "query_used": sql,
+        "pushdown": {"columns": list(columns) if columns else "all", "filters": len(triples),
+                     "limit": limit or None, "rows_read": len(df)}
+    }
+
+
+def sqlite_select(source: str, columns: Optional[List[str]], filters: List[Filter],
+                  limit: int = 0) -> Tuple[str, List[Any]]:
+    """A parameterized SELECT over source with the given projection, filters and limit."""
+
+    projection = ", ".join(quote_identifier(col) for col in columns) if columns else "*"
+    clauses, params = [], []
+    for column, operator, value in filters:
+        identifier = quote_identifier(column)
+        if operator in NULL_OPERATORS:
+            clauses.append(f"{identifier} {operator.upper()}")
+        elif operator in SET_OPERATORS:
+            placeholders = ", ".join("?" for _ in value) or "NULL"
+            clauses.append(f"{identifier} {operator.upper()} ({placeholders})")
+            params.extend(_sql_value(v) for v in value)
+        else:
+            clauses.append(f"{identifier} {'=' if operator == '==' else operator} ?")
+            params.append(_sql_value(value))
+
+    sql = f"SELECT {projection} FROM {source}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if limit and limit > 0:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+def sqlite_schema(source_path: str, table_name: str = "") -> Dict[str, Any]:
+    """
+    Columns and declared types of a SQLite table without reading its rows.
+
+    rows is the estimate ANALYZE left in sqlite_stat1, or None when the table has
+    never been analyzed: an exact COUNT(*) would scan the whole table.
+    """
+
+    conn = sqlite3.connect(source_path)
+    try:
+        if not table_name:
+            row = conn.execute("SELECT name FROM sqlite_master WHERE type='table' LIMIT 1").fetchone()
+            if row is None:
+                raise ValueError("No tables found in database")
+            table_name = row[0]
+        info = conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})").fetchall()
+        if not info:
+            raise ValueError(f"Table '{table_name}' not found")
+        rows = _sqlite_row_estimate(conn, table_name)
+    finally:
+        conn.close()
+    return {"table": table_name, "columns": {row[1]: row[2] or "ANY" for row in info}, "rows": rows}
+
+
+def _sqlite_row_estimate(conn: sqlite3.Connection, table_name: str) -> Optional[int]:
+    """Row count recorded for a table by the last ANALYZE, if any."""
+
+    try:
+        row = conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (table_name,)).fetchone()
+    except sqlite3.OperationalError:
+        return None  # no sqlite_stat1 table: the database was never analyzed
+    return int(row[0].split()[0]) if row and row[0] else None
+
+
+def read_parquet(
+    source_path: str,
+    columns: Optional[List[str]] = None,
+    filters: Any = None,
+    limit: int = 0
+) -> Dict[str, Any]:
+    """
+    Read only the requested columns and the row groups that can match the filters.
+
+    Filters become a pyarrow dataset expression, so row groups whose min/max
+    statistics exclude them are skipped without being read; with a limit the scan
+    stops once enough rows are found.
+    """
+
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(source_path, format="parquet")
+    expression = arrow_filter_expression(normalize_filters(filters))
+    columns = list(columns) if columns else None
+
+    fragments = list(dataset.get_fragments())
+    row_groups_total = sum(fragment.metadata.num_row_groups for fragment in fragments)
+    row_groups_matching = row_groups_total
+    if expression is not None:
+        row_groups_matching = sum(len(fragment.split_by_row_group(filter=expression)) for fragment in fragments)
+
+    if limit and limit > 0:
+        table = dataset.head(int(limit), columns=columns, filter=expression)
+    else:
+        table = dataset.to_table(columns=columns, filter=expression)
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+
+    return {
+        "data": df,
+        "load_method": "pyarrow.dataset",
+        "pushdown": {
+            "columns": columns or "all",
+            "columns_read": len(df.columns),
+            "columns_total": len(dataset.schema.names),
+            "row_groups_total": row_groups_total,
+            "row_groups_matching": row_groups_matching,
+            "limit": limit or None,
+            "rows_read": len(df)
+        }
+    }
+
+
+def parquet_schema(source_path: str) -> Dict[str, Any]:
+    """Columns, types and row count of a Parquet file from its footer."""
+
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(source_path)
+    schema = parquet_file.schema_arrow
+    return {"columns": {name: str(schema.field(name).type) for name in schema.names},
+            "rows": parquet_file.metadata.num_rows}
+
+
+def arrow_filter_expression(filters: List[Filter]):
+    """Combine filter triples into one pyarrow dataset expression (None when there are none)."""
+
+    import pyarrow.dataset as ds
+
+    expression = None
+    for column, operator, value in filters:
+        field = ds.field(column)
+        if operator == "is null":
+            term = field.is_null()
+        elif operator == "is not null":
+            term = ~field.is_null()
+        elif operator == "in":
+            term = field.isin(value)
+        elif operator == "not in":
+            term = ~field.isin(value)
+        else:
+            term = _COMPARISONS[operator](field, value)
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def filter_frame(df: pd.DataFrame, columns: Optional[List[str]] = None, filters: Any = None,
+                 limit: int = 0) -> pd.DataFrame:
+    """Apply the same projection, filters and limit to an already loaded frame."""
+
+    triples = normalize_filters(filters)
+    if triples:
+        mask = np.ones(len(df), dtype=bool)
+        for column, operator, value in triples:
+            if column not in df.columns:
+                raise ValueError(f"Filter column '{column}' not found in dataset")
+            series = df[column]
+            if operator == "is null":
+                term = series.isna()
+            elif operator == "is not null":
+                term = series.notna()
+            elif operator == "in":
+                term = series.isin(value)
+            elif operator == "not in":
+                term = ~series.isin(value)
+            else:
+                term = _COMPARISONS[operator](series, value)
+            mask &= term.to_numpy(dtype=bool, na_value=False)
+        df = df[mask]
+    if columns:
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found in dataset: {missing}")
+        df = df[list(columns)]
+    if limit and limit > 0:
+        df = df.head(int(limit))
+    return df.reset_index(drop=True) if triples or limit else df
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return str(pd.Timestamp(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -0,0 +1,414 @@
+"""
+SQL Engine
+Pluggable SQL backends over registered datasets (DuckDB zero-copy, SQLite fallback).
+"""
+
+import os
+import re
+import uuid
+import sqlite3
+import logging
+import tempfile
+import threading
+import warnings
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from src.core.dataset_store import get_store
+
+logger = logging.getLogger("business-intelligence")
+
+SQLITE_MAX_VARIABLES = 999  # conservative default for SQLITE_MAX_VARIABLE_NUMBER
+DEFAULT_BATCH_ROWS = 50_000
+
+QueryParams = Optional[Union[List[Any], Dict[str, Any]]]
+
+
+def table_name_for(dataset_name: str) -> str:
+    """Sanitize a dataset name into a SQL identifier."""
+    table_name = re.sub(r"\W", "_", dataset_name)
+    if not table_name or table_name[0].isdigit():
+        table_name = f"t_{table_name}"
+    return table_name
+
+
+def rewrite_table_references(sql_query: str, dataset_name: str, table_name: str) -> str:
+    """Replace standalone references to a dataset name with its table name."""
+    if dataset_name == table_name:
+        return sql_query
+    pattern = r'(?<![\w"])' + re.escape(dataset_name) + r'(?![\w"])'
+    return re.sub(pattern, table_name, sql_query)
+
+
+class SQLBackend:
+    """
+    Base class for SQL backends.
+
+    A backend keeps one connection for the whole session and exposes registered
+    datasets as tables. Registration is tracked by dataset version (and whether the
+    dataset was still unread) so a replaced or newly materialized dataset is
+    re-registered on the next query. Tables whose frames the store lets go of (see
+    release()) are re-pointed at the dataset's Arrow file, or dropped when it has none.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._registered: Dict[str, Tuple[int, bool]] = {}  # table name -> (dataset version, virtual)
+        self._released: set = set()
+        self._released_lock = threading.Lock()
+        self._streams = 0  # open iter_batches results; their tables must outlive the stream
+
+    def ensure_registered(self, dataset_name: str) -> Optional[str]:
+        """Register a dataset from the store if it is new or changed; return its table name."""
+
+        entry = get_store().resolve(dataset_name)
+        if entry is None:
+            return None
+        with self._lock:
+            self._apply_released()
+        # A view's inputs are (re-)registered first so the view reads their current versions
+        for dependency in entry.depends_on:
+            self.ensure_registered(dependency)
+
+        table_name = table_name_for(dataset_name)
+        with self._lock:
+            if self._registered.get(table_name) != (entry.version, entry.virtual):
+                self._register(table_name, dataset_name, entry.source_path)
+                # Registering may have materialized the dataset, so the state is read again
+                self._registered[table_name] = (entry.version, entry.virtual)
+        return table_name
+
+    def unregister(self, dataset_name: str) -> None:
+        table_name = table_name_for(dataset_name)
+        with self._lock:
+            if self._registered.pop(table_name, None) is not None:
+                self._unregister(table_name)
+
+    def release(self, dataset_name: str) -> None:
+        """
+        Store release listener: stop the dataset's table from referencing the released frame.
+
+        Called with the store locked, so the connection lock is only tried; if a query
+        holds it, the table is updated before the connection's next use instead.
+        """
+
+        with self._released_lock:
+            self._released.add(dataset_name)
+        if self._lock.acquire(blocking=False):
+            try:
+                self._apply_released()
+            finally:
+                self._lock.release()
+
+    def execute(self, sql_query: str, params: QueryParams = None) -> pd.DataFrame:
+        """Execute a query and return the full result as a DataFrame."""
+
+        with self._lock:
+            self._sync_removed()
+            return self._execute(sql_query, params)
+
+    def iter_batches(self, sql_query: str, params: QueryParams = None,
+                     batch_rows: int = DEFAULT_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        Execute a query and yield its result in DataFrames of at most batch_rows rows.
+
+        Yields at least one (possibly empty) frame so callers always see the columns.
+        The connection stays locked until the iterator is exhausted or closed.
+        """
+
+        with self._lock:
+            self._sync_removed()
+            self._streams += 1
+            try:
+                yield from self._iter_batches(sql_query, params, max(1, int(batch_rows)))
+            finally:
+                self._streams -= 1
+
+    def registered_tables(self) -> List[str]:
+        with self._lock:
+            return list(self._registered.keys())
+
+    def _sync_removed(self) -> None:
+        """Drop tables whose datasets are no longer in the store."""
+
+        live_tables = {table_name_for(name) for name in get_store().names()}
+        for table_name in [t for t in self._registered if t not in live_tables]:
+            self._registered.pop(table_name)
+            self._unregister(table_name)
+        self._apply_released()
+
+    def _apply_released(self) -> None:
+        if self._streams:
+            return
+        with self._released_lock:
+            released, self._released = self._released, set()
+        store = get_store()
+        for dataset_name in released:
+            table_name = table_name_for(dataset_name)
+            registered = self._registered.get(table_name)
+            if registered is None:
+                continue
+            entry = store.entry(dataset_name)
+            if entry is not None and registered == (entry.version, entry.virtual) \
+                    and store.arrow_file(dataset_name) is not None:
+                # Spilled or released to its snapshot: same version, now read from the file
+                self._register(table_name, dataset_name, entry.source_path)
+            else:
+                self._registered.pop(table_name)
+                self._unregister(table_name)
+
+    def _register(self, table_name: str, dataset_name: str, source_path: str) -> None:
+        raise NotImplementedError
+
+    def _unregister(self, table_name: str) -> None:
+        raise NotImplementedError
+
+    def _execute(self, sql_query: str, params: QueryParams) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def _iter_batches(self, sql_query: str, params: QueryParams, batch_rows: int) -> Iterator[pd.DataFrame]:
+        result = self._execute(sql_query, params)
+        for start in range(0, max(len(result), 1), batch_rows):
+            yield result.iloc[start:start + batch_rows]
+
+
+class DuckDBBackend(SQLBackend):
+    """
+    In-process columnar engine that scans registered DataFrames and Parquet files in place.
+
+    A registered DataFrame stays referenced by the connection, so the backend listens for
+    store releases; datasets with a spill or snapshot file are registered from the
+    memory-mapped Arrow file instead, so spilling them actually frees their frame.
+    """
+
+    name = "duckdb"
+
+    def __init__(self):
+        super().__init__()
+        import duckdb
+
+        self._conn = duckdb.connect(database=":memory:")
+        threads = os.getenv("BI_SQL_THREADS")
+        if threads:
+            self._conn.execute(f"SET threads = {int(threads)}")
+        get_store().add_release_listener(self.release)
+
+    def _register(self, table_name: str, dataset_name: str, source_path: str) -> None:
+        self._unregister(table_name)
+        entry = get_store().entry(dataset_name)
+        arrow_file = get_store().arrow_file(dataset_name)
+        view_query = None if entry.resident else _view_sql(dataset_name)
+        if view_query is not None:
+            # Unbuilt views run as SQL over their inputs' tables instead of being materialized
+            with _quiet_arrow_strings():
+                self._conn.execute(f'CREATE VIEW "{table_name}" AS {view_query}')
+            logger.info(f"DuckDB view '{table_name}' created over {', '.join(entry.depends_on)}")
+        elif entry.virtual and source_path.lower().endswith(".parquet") and os.path.exists(source_path):
+            # An unread lazy Parquet source is scanned in place so projections and filters are pushed
+            # down; once the store holds a frame, SQL reads that frame like every other tool
+            escaped = source_path.replace("'", "''")
+            self._conn.execute(f'CREATE VIEW "{table_name}" AS SELECT * FROM read_parquet(\'{escaped}\')')
+            logger.info(f"DuckDB view '{table_name}' created over {source_path}")
+        elif arrow_file is not None:
+            import pyarrow.feather as feather
+
+            self._conn.register(table_name, feather.read_table(str(arrow_file), memory_map=True))
+            logger.info(f"DuckDB registered '{dataset_name}' as '{table_name}' from {arrow_file}")
+        else:
+            with _quiet_arrow_strings():
+                self._conn.register(table_name, get_store().get(dataset_name))
+            logger.info(f"DuckDB registered DataFrame '{dataset_name}' as '{table_name}'")
+
+    def _unregister(self, table_name: str) -> None:
+        self._conn.execute(f'DROP VIEW IF EXISTS "{table_name}"')
+        try:
+            self._conn.unregister(table_name)
+        except Exception:
+            pass
+
+    def _execute(self, sql_query: str, params: QueryParams) -> pd.DataFrame:
+        with _quiet_arrow_strings():
+            if params:
+                return self._conn.execute(sql_query, params).df()
+            return self._conn.execute(sql_query).df()
+
+    def _iter_batches(self, sql_query: str, params: QueryParams, batch_rows: int) -> Iterator[pd.DataFrame]:
+        # Record batches are pulled from the running query, so only one batch is in memory
+        with _quiet_arrow_strings():
+            relation = self._conn.execute(sql_query, params) if params else self._conn.execute(sql_query)
+            reader = relation.to_arrow_reader(batch_rows) if hasattr(relation, "to_arrow_reader") \
+                else relation.fetch_record_batch(batch_rows)
+            empty = True
+            for batch in reader:
+                empty = False
+                yield batch.to_pandas()
+            if empty:
+                yield reader.schema.empty_table().to_pandas()
+
+
+def _view_sql(dataset_name: str) -> Optional[str]:
+    from src.core.views import view_sql_for
+    return view_sql_for(dataset_name, table_name_for)
+
+
+@contextmanager
+def _quiet_arrow_strings() -> Iterator[None]:
+    """DuckDB's pandas scan reads Arrow-backed string columns through an attribute pandas deprecates."""
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*_data is a deprecated", category=FutureWarning)
+        yield
+
+
+class SQLiteBackend(SQLBackend):
+    """SQLite fallback; datasets are copied into a session database file on registration."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Optional[str] = None):
+        super().__init__()
+        if db_path is None:
+            session_id = str(uuid.uuid4())[:8]
+            db_path = os.path.join(tempfile.gettempdir(), f"mcp_bi_database_{session_id}.db")
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        logger.info(f"SQLite database opened at {db_path} with WAL mode")
+
+    def _register(self, table_name: str, dataset_name: str, source_path: str) -> None:
+        df = get_store().get(dataset_name)
+        chunksize = max(1, SQLITE_MAX_VARIABLES // max(1, len(df.columns)))
+        df.to_sql(table_name, self._conn, if_exists="replace", index=False, method="multi", chunksize=chunksize)
+        self._conn.commit()
+        logger.info(f"SQLite stored dataset '{dataset_name}' as table '{table_name}'")
+
+    def _unregister(self, table_name: str) -> None:
+        self._conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        self._conn.commit()
+
+    def _execute(self, sql_query: str, params: QueryParams) -> pd.DataFrame:
+        return pd.read_sql_query(sql_query, self._conn, params=params or None)
+
+    def _iter_batches(self, sql_query: str, params: QueryParams, batch_rows: int) -> Iterator[pd.DataFrame]:
+        yield from pd.read_sql_query(sql_query, self._conn, params=params or None, chunksize=batch_rows)
+
+
+_ENGINE: Optional[SQLBackend] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def create_sql_engine(backend: str = "auto") -> SQLBackend:
+    """Create a SQL backend by name ("duckdb", "sqlite" or "auto")."""
+
+    backend = backend.lower()
+    if backend in ["auto", "duckdb"]:
+        try:
+            return DuckDBBackend()
+        except ImportError:
+            if backend == "duckdb":
+                raise
+            logger.warning("duckdb not available - falling back to SQLite backend")
+    if backend in ["auto", "sqlite"]:
+        return SQLiteBackend()
+    raise ValueError(f"Unsupported SQL backend: {backend}")
+
+
+def get_sql_engine() -> SQLBackend:
+    """Return the session-wide SQL backend, selected by BI_SQL_BACKEND (default auto)."""
+
+    global _ENGINE
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            if _ENGINE is None:
+                _ENGINE = create_sql_engine(os.getenv("BI_SQL_BACKEND", "auto"))
+                logger.info(f"SQL engine initialized with '{_ENGINE.name}' backend")
+    return _ENGINE
+
+
+def run_query(dataset_name: str, sql_query: str, params: QueryParams = None, max_rows: int = 0) -> Dict[str, Any]:
+    """
+    Run a query against a registered dataset.
+
+    Any other registered dataset referenced by the query is registered too, so joins
+    across datasets work. With max_rows, only the first max_rows rows are fetched while
+    total_rows still reports the exact size of the full result.
+    """
+
+    engine = get_sql_engine()
+    table_name, modified_query = _prepare_query(engine, dataset_name, sql_query)
+
+    result = None
+    total_rows = None
+    if max_rows > 0:
+        result, total_rows = _run_capped(engine, modified_query, params, max_rows)
+    if result is None:
+        result = engine.execute(modified_query, params)
+        total_rows = len(result)
+        if max_rows > 0:
+            result = result.iloc[:max_rows]
+
+    return {
+        "backend": engine.name,
+        "table_name": table_name,
+        "modified_query": modified_query,
+        "result": result,
+        "total_rows": total_rows,
+        "truncated": len(result) < total_rows
+    }
+
+
+def run_query_batches(dataset_name: str, sql_query: str, params: QueryParams = None,
+                      batch_rows: int = DEFAULT_BATCH_ROWS) -> Dict[str, Any]:
+    """
+    Run a query like run_query, but return its result as an iterator of DataFrame batches.
+
+    Used by exports so that writing a large result never materializes it in full.
+    """
+
+    engine = get_sql_engine()
+    table_name, modified_query = _prepare_query(engine, dataset_name, sql_query)
+    return {
+        "backend": engine.name,
+        "table_name": table_name,
+        "modified_query": modified_query,
+        "batches": engine.iter_batches(modified_query, params, batch_rows)
+    }
+
+
+def _prepare_query(engine: SQLBackend, dataset_name: str, sql_query: str):
+    """Register the dataset and any other dataset the query references; return (table_name, rewritten query)."""
+
+    table_name = engine.ensure_registered(dataset_name)
+    if table_name is None:
+        raise KeyError(dataset_name)
+
+    modified_query = rewrite_table_references(sql_query, dataset_name, table_name)
+    for other_name in get_store().names():
+        if other_name == dataset_name:
+            continue
+        other_table = table_name_for(other_name)
+        rewritten = rewrite_table_references(modified_query, other_name, other_table)
+        if rewritten != modified_query or re.search(r"\b" + re.escape(other_table) + r"\b", rewritten):
+            engine.ensure_registered(other_name)
+            modified_query = rewritten
+    return table_name, modified_query
+
+
+def _run_capped(engine: SQLBackend, sql_query: str, params: QueryParams, max_rows: int):
+    """Fetch at most max_rows rows plus an exact count by wrapping the query as a subquery."""
+
+    inner_query = sql_query.strip().rstrip(";")
+    if not re.match(r"(?is)^\s*(select|with)\b", inner_query):
+        return None, None
+    try:
+        count = engine.execute(f"SELECT COUNT(*) AS row_count FROM ({inner_query}) AS capped_query", params)
+        result = engine.execute(f"SELECT * FROM ({inner_query}) AS capped_query LIMIT {int(max_rows)}", params)
+        return result, int(count["row_count"].iloc[0])
+    except Exception as e:
+        logger.warning(f"Capped query wrapping failed, running full query instead: {e}")
+        return None, None
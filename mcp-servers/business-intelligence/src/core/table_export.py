@@ -0,0 +1,165 @@
+"""
+Table Export
+Chunked CSV, Parquet and XLSX writers for datasets and query results.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("business-intelligence")
+
+EXPORT_FORMATS = ["csv", "parquet", "xlsx"]
+FORMAT_ALIASES = {"excel": "xlsx", "xls": "xlsx"}
+DEFAULT_CHUNK_ROWS = 50_000
+XLSX_MAX_ROWS = 1_048_576  # Excel's sheet limit, header row included
+
+
+def normalize_format(export_format: str) -> Optional[str]:
+    """Map a requested format (including aliases such as "excel") to an export format, or None."""
+
+    export_format = (export_format or "").lower().lstrip(".")
+    export_format = FORMAT_ALIASES.get(export_format, export_format)
+    return export_format if export_format in EXPORT_FORMATS else None
+
+
+def export_chunk_rows() -> int:
+    """Rows per written chunk, from BI_EXPORT_CHUNK_ROWS."""
+
+    return max(1, int(os.getenv("BI_EXPORT_CHUNK_ROWS", DEFAULT_CHUNK_ROWS)))
+
+
+def iter_frame_chunks(df: pd.DataFrame, chunk_rows: int = 0) -> Iterator[pd.DataFrame]:
+    """Slice a frame into row chunks (views, not copies); always yields at least one frame."""
+
+    chunk_rows = chunk_rows or export_chunk_rows()
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_table(chunks: Iterable[pd.DataFrame], output_path: str, export_format: str) -> Dict[str, Any]:
+    """
+    Write DataFrame chunks to a CSV, Parquet or XLSX file one chunk at a time.
+
+    Only the chunk being written is held in memory: CSV chunks are appended to the open
+    file, Parquet chunks become row groups and XLSX rows go through openpyxl's write-only
+    workbook (rolling over to a new sheet at Excel's row limit).
+    """
+
+    export_format = normalize_format(export_format)
+    if export_format is None:
+        return {"error": f"Unsupported export format. Supported: {', '.join(EXPORT_FORMATS)}"}
+
+    output_file = Path(output_path)
+    if not output_file.suffix:
+        output_file = output_file.with_suffix(f".{export_format}")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    writer = {"csv": _write_csv, "parquet": _write_parquet, "xlsx": _write_xlsx}[export_format]
+    try:
+        details = writer(chunks, output_file)
+    except ImportError as e:
+        return {"error": f"{e.name or 'A dependency'} required for {export_format} export. "
+                         f"Install with: pip install {e.name or export_format}"}
+
+    details.update({
+        "format": export_format,
+        "output_path": str(output_file),
+        "file_size": output_file.stat().st_size
+    })
+    logger.info(f"Exported {details['rows']} rows in {details['chunks']} chunks to {output_file}")
+    return details
+
+
+def export_frame(df: pd.DataFrame, output_path: str, export_format: str, chunk_rows: int = 0) -> Dict[str, Any]:
+    """Write a whole DataFrame in chunks."""
+
+    return write_table(iter_frame_chunks(df, chunk_rows), output_path, export_format)
+
+
+def _write_csv(chunks: Iterable[pd.DataFrame], output_file: Path) -> Dict[str, Any]:
+    rows = count = 0
+    columns: List[str] = []
+    with open(output_file, "w", encoding="utf-8", newline="") as f:
+        for chunk in chunks:
+            chunk.to_csv(f, header=count == 0, index=False)
+            columns = columns or [str(col) for col in chunk.columns]
+            rows += len(chunk)
+            count += 1
+    return {"rows": rows, "chunks": count, "columns": columns}
+
+
+def _write_parquet(chunks: Iterable[pd.DataFrame], output_file: Path) -> Dict[str, Any]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = count = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(str(output_file), table.schema)
+            else:
+                # Later chunks are cast to the first chunk's schema (e.g. an all-null chunk)
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+            count += 1
+        columns = list(writer.schema.names) if writer is not None else []
+    finally:
+        if writer is not None:
+            writer.close()
+    return {"rows": rows, "chunks": count, "columns": columns}
+
+
+def _write_xlsx(chunks: Iterable[pd.DataFrame], output_file: Path) -> Dict[str, Any]:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheets = rows = count = sheet_rows = 0
+    columns: List[str] = []
+    for chunk in chunks:
+        if not columns:
+            columns = [str(col) for col in chunk.columns]
+        for row in _excel_rows(chunk):
+            if sheet is None or sheet_rows >= XLSX_MAX_ROWS:
+                sheets += 1
+                sheet = workbook.create_sheet("Data" if sheets == 1 else f"Data {sheets}")
+                sheet.append(columns)
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+            rows += 1
+        count += 1
+    if sheet is None:
+        workbook.create_sheet("Data").append(columns)
+        sheets = 1
+    workbook.save(str(output_file))
+    return {"rows": rows, "chunks": count, "columns": columns, "sheets": sheets}
+
+
+def _excel_rows(chunk: pd.DataFrame) -> Iterator[list]:
+    """Convert a chunk column-wise into cell values openpyxl can write (None for missing)."""
+
+    values = []
+    for col in chunk.columns:
+        series = chunk[col]
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            series = series.dt.tz_localize(None)
+        if isinstance(series.dtype, pd.PeriodDtype) or series.dtype == object or \
+                not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)):
+            column = series.astype(object).where(series.notna(), None).tolist()
+            values.append([value if value is None or isinstance(value, (int, float, bool, str)) or
+                           hasattr(value, "isoformat") else str(value) for value in column])
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            values.append([None if value is pd.NaT else value.to_pydatetime() for value in series])
+        else:
+            column = series.astype(object).where(series.notna(), None).tolist()
+            values.append([value.item() if isinstance(value, np.generic) else value for value in column])
+    return map(list, zip(*values)) if values else iter([])
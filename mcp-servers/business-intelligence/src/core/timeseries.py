@@ -0,0 +1,668 @@
+"""
+Time Series Engine
+Decomposition, seasonality, change points, robust anomalies and Holt-Winters forecasts over stored datasets.
+"""
+
+import heapq
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("business-intelligence")
+
+MAX_SEASONAL_PERIOD = 10_080  # a week of minute bars
+MIN_SEASONAL_ACF = 0.3
+MIN_SEASONAL_PROMINENCE = 0.1
+MAX_DEFAULT_METRICS = 8
+DEFAULT_ANOMALY_WINDOW = 61
+DEFAULT_ANOMALY_THRESHOLD = 3.5
+DEFAULT_MAX_CHANGE_POINTS = 5
+DEFAULT_MAX_ANOMALIES = 10
+FORECAST_MAX_POINTS = 20_000  # most recent observations the forecast model is fitted on
+FORECAST_MAX_RETURNED = 60
+DAMPING = 0.98
+HW_ALPHAS = (0.05, 0.2, 0.5, 0.8)
+HW_BETAS = (0.01, 0.1, 0.3)
+HW_GAMMAS = (0.05, 0.2, 0.5)
+Z_80, Z_95 = 1.2816, 1.96
+
+
+async def analyze_time_series(
+    df: pd.DataFrame,
+    time_column: str = "",
+    metrics: Optional[List[str]] = None,
+    options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze each metric of a dataset as a time series.
+
+    The time column defaults to the first datetime column and metrics to the numeric
+    columns (at most MAX_DEFAULT_METRICS). Metrics are analyzed in worker processes,
+    in parallel when there are several; see analyze_metric for the options.
+    """
+
+    from src.core.executor import get_executor
+    from src.core.profiler import text_to_numeric
+
+    options = dict(options or {})
+    time_column = time_column or _default_time_column(df)
+    if not time_column:
+        raise ValueError("No datetime column found; pass time_column")
+    if time_column not in df.columns:
+        raise ValueError(f"Time column '{time_column}' not found in dataset")
+    times = df[time_column]
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        times = pd.to_datetime(times, errors="coerce")
+    if times.isna().all():
+        raise ValueError(f"Time column '{time_column}' holds no parseable timestamps")
+    if getattr(times.dt, "tz", None) is not None:
+        times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+
+    if metrics:
+        missing = [metric for metric in metrics if metric not in df.columns]
+        if missing:
+            raise ValueError(f"Metric columns not found: {missing}")
+    else:
+        metrics = [column for column in df.columns if column != time_column and _is_metric(df[column])]
+        metrics = metrics[:MAX_DEFAULT_METRICS]
+    if not metrics:
+        raise ValueError("No numeric metric columns to analyze")
+
+    started = time.perf_counter()
+    times_ns = times.to_numpy(dtype="datetime64[ns]")
+    jobs = [(metric, times_ns, text_to_numeric(df[metric]).to_numpy(dtype=np.float64))
+            for metric in metrics]
+    executor = get_executor()
+    if len(jobs) > 1:
+        analyses = await asyncio.gather(*(executor.run_in_process("trend_analysis", analyze_metric, *job, options)
+                                          for job in jobs))
+    else:
+        analyses = [await executor.run_in_thread("trend_analysis", analyze_metric, *jobs[0], options)]
+    return {
+        "time_column": time_column,
+        "metrics": {analysis["metric"]: analysis for analysis in analyses},
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+def analyze_metric(metric: str, times: np.ndarray, values: np.ndarray,
+                   options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Full analysis of one metric.
+
+    options: "freq" (resample to this frequency, default inferred), "aggregation"
+    (for resampling, default "mean"), "period" (seasonal period in points, default
+    detected), "max_period", "horizon" (forecast periods), "anomaly_window",
+    "anomaly_threshold", "max_anomalies", "max_change_points" and "min_segment".
+    """
+
+    options = options or {}
+    timings = {}
+    clock = time.perf_counter()
+
+    def lap(stage):
+        nonlocal clock
+        now = time.perf_counter()
+        timings[stage] = round(now - clock, 4)
+        clock = now
+
+    series, freq, missing = regularize(times, values, options.get("freq"), options.get("aggregation", "mean"))
+    y = series.to_numpy(dtype=np.float64)
+    n = len(y)
+    lap("regularize")
+    result = {
+        "metric": metric,
+        "points": n,
+        "frequency": freq,
+        "start": series.index[0].isoformat() if n else None,
+        "end": series.index[-1].isoformat() if n else None,
+        "missing_periods": missing
+    }
+    if n < 8:
+        result["error"] = f"Too few observations for time-series analysis ({n})"
+        return result
+
+    period = options.get("period")
+    candidates = []
+    if period is None:
+        candidates = detect_periods(y, int(options.get("max_period", MAX_SEASONAL_PERIOD)),
+                                    natural=_natural_periods(freq))
+        period = candidates[0]["period"] if candidates else None
+    period = int(period) if period and 2 <= int(period) <= n // 2 else None
+    lap("seasonality")
+
+    trend, seasonal, resid = decompose(y, period)
+    lap("decomposition")
+
+    result["trend"] = trend_summary(y, trend, resid)
+    result["seasonality"] = {
+        "period": period,
+        "period_label": _period_label(period, freq) if period else None,
+        "candidates": [{**candidate, "label": _period_label(candidate["period"], freq)} for candidate in candidates],
+        "strength": round(_strength(seasonal, resid), 4) if period else 0.0,
+        "amplitude": float(seasonal.max() - seasonal.min()) if period else 0.0,
+        "peak_at": series.index[int(np.argmax(seasonal[:period]))].isoformat() if period else None
+    }
+    result["level"] = {"first": float(y[0]), "last": float(y[-1]), "mean": float(y.mean()), "std": float(y.std())}
+    result["volatility"] = float(resid.std() / abs(y.mean())) if y.mean() else None
+
+    result["change_points"] = [
+        {**point, "date": series.index[point["index"]].isoformat()}
+        for point in change_points(y - seasonal, int(options.get("max_change_points", DEFAULT_MAX_CHANGE_POINTS)),
+                                   options.get("min_segment"))
+    ]
+    lap("change_points")
+
+    result["anomalies"] = robust_anomalies(
+        resid, series.index, trend + seasonal, y,
+        window=int(options.get("anomaly_window", DEFAULT_ANOMALY_WINDOW)),
+        threshold=float(options.get("anomaly_threshold", DEFAULT_ANOMALY_THRESHOLD)),
+        limit=int(options.get("max_anomalies", DEFAULT_MAX_ANOMALIES))
+    )
+    lap("anomalies")
+
+    horizon = int(options.get("horizon") or max(period or 0, 12))
+    result["forecast"] = forecast(y, series.index, freq, period, max(1, min(horizon, n // 3 or 1)))
+    lap("forecast")
+
+    result["timings"] = timings
+    return result
+
+
+def regularize(times: np.ndarray, values: np.ndarray, freq: Optional[str] = None,
+               aggregation: str = "mean") -> Tuple[pd.Series, str, int]:
+    """
+    Values on an evenly spaced time grid, the grid frequency and the number of filled gaps.
+
+    Series already on a regular grid pass through untouched; otherwise duplicate or
+    uneven timestamps are aggregated with resample and empty periods interpolated.
+    """
+
+    series = pd.Series(values, index=pd.DatetimeIndex(times))
+    series = series[series.index.notna()]
+    if not series.index.is_monotonic_increasing:
+        series = series.sort_index()
+    if len(series) < 3:
+        return series.dropna(), freq or "", 0
+
+    if freq is None:
+        freq = _infer_freq(series.index)
+        if freq is not None and not series.isna().any() and series.index.is_unique:
+            try:
+                expected = pd.date_range(series.index[0], periods=len(series), freq=freq)
+                if expected[-1] == series.index[-1]:
+                    return series, freq, 0
+            except ValueError:
+                pass
+        freq = freq or _fallback_freq(series.index)
+
+    resampled = series.resample(freq).agg(aggregation)
+    missing = int(resampled.isna().sum())
+    if missing:
+        resampled = resampled.interpolate(limit_direction="both")
+    return resampled, freq, missing
+
+
+def detect_periods(y: np.ndarray, max_period: int = MAX_SEASONAL_PERIOD, top: int = 3,
+                   natural: Sequence[int] = ()) -> List[Dict[str, Any]]:
+    """
+    Seasonal periods (in points) ranked by autocorrelation.
+
+    The series is high-pass filtered by subtracting a centred moving average longer
+    than any candidate period, the autocorrelation of every lag is computed at once
+    through the FFT, and prominent local maxima are kept. Peaks within 2% of a
+    natural period (a day or a week of the series' frequency) snap to it; peaks near
+    a stronger one, and multiples of a kept period that do not correlate clearly
+    better, are dropped.
+    """
+
+    n = len(y)
+    max_period = min(max_period, n // 2)
+    if max_period < 2:
+        return []
+    x = y - _centered_mean(y, min(2 * max_period + 1, n))
+    x = x - x.mean()
+    nfft = 1 << int(np.ceil(np.log2(2 * n)))
+    power = np.abs(np.fft.rfft(x, nfft)) ** 2
+    acf = np.fft.irfft(power, nfft)[:max_period + 2]
+    if acf[0] <= 0:
+        return []
+    acf = acf / acf[0]
+
+    lags = np.arange(2, max_period + 1)
+    current = acf[2:max_period + 1]
+    running_min = np.minimum.accumulate(acf)[1:max_period]
+    is_peak = ((current > acf[1:max_period]) & (current >= acf[3:max_period + 2]) & (current >= MIN_SEASONAL_ACF)
+               & (current - running_min >= MIN_SEASONAL_PROMINENCE))
+
+    kept = []
+    for lag in sorted(lags[is_peak], key=lambda lag: -acf[lag]):
+        lag = next((period for period in natural if 2 <= period <= max_period
+                    and abs(lag - period) <= max(1, 0.02 * period)), int(lag))
+        if any(abs(lag - other) <= 0.05 * other for other in kept):
+            continue
+        if any(lag > base and abs(lag - round(lag / base) * base) <= max(1, 0.05 * base)
+               and acf[lag] <= acf[base] + 0.05 for base in kept):
+            continue
+        kept.append(lag)
+        if len(kept) == top:
+            break
+    return [{"period": lag, "acf": round(float(acf[lag]), 4)} for lag in kept]
+
+
+def decompose(y: np.ndarray, period: Optional[int], robust_passes: int = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    STL-style additive decomposition into trend, seasonal and remainder.
+
+    The trend is a centred moving average over one period (2xm for even periods) of
+    the deseasonalized series, the seasonal component the mean detrended value at
+    each phase of the period. Both are refined in turn, and each robustness pass
+    re-weights observations with bisquare weights on the remainder so outliers do
+    not leak into the components. Everything is cumulative sums and bincounts.
+    """
+
+    n = len(y)
+    window = period if period else max(3, n // 50)
+    weights = np.ones(n)
+    seasonal = np.zeros(n)
+    phase = np.arange(n) % period if period else None
+
+    for _ in range(robust_passes + 1):
+        for _ in range(2):
+            trend = _centered_mean(y - seasonal, window, weights)
+            if period:
+                detrended = (y - trend) * weights
+                totals = np.bincount(phase, weights=detrended, minlength=period)
+                counts = np.bincount(phase, weights=weights, minlength=period)
+                means = np.divide(totals, counts, out=np.zeros(period), where=counts > 0)
+                seasonal = (means - means.mean())[phase]
+        resid = y - trend - seasonal
+        scale = 6 * np.median(np.abs(resid))
+        if scale <= 1e-9 * np.abs(y).max():
+            break
+        weights = np.clip(1 - (resid / scale) ** 2, 0, None) ** 2
+    return trend, seasonal, y - trend - seasonal
+
+
+def trend_summary(y: np.ndarray, trend: np.ndarray, resid: np.ndarray) -> Dict[str, Any]:
+    """Linear fit of the series plus the strength of its smooth trend component."""
+
+    n = len(y)
+    t = np.arange(n, dtype=np.float64)
+    t_centered = t - t.mean()
+    y_centered = y - y.mean()
+    slope = float(t_centered @ y_centered / (t_centered @ t_centered))
+    fitted_start = y.mean() - slope * t.mean()
+    fitted_end = fitted_start + slope * (n - 1)
+    denominator = np.sqrt((t_centered @ t_centered) * (y_centered @ y_centered))
+    r_squared = float((t_centered @ y_centered / denominator) ** 2) if denominator else 0.0
+
+    strength = _strength(trend, resid)
+    if abs(slope) * n < 0.1 * y.std() or strength < 0.1:
+        direction = "Flat"
+    else:
+        direction = "Upward" if slope > 0 else "Downward"
+    return {
+        "direction": direction,
+        "strength": "Strong" if strength >= 0.7 else "Moderate" if strength >= 0.4 else "Weak",
+        "strength_score": round(strength, 4),
+        "slope_per_period": slope,
+        "growth_pct_per_period": slope / abs(y.mean()) * 100 if y.mean() else None,
+        "total_change_pct": (fitted_end - fitted_start) / abs(fitted_start) * 100 if fitted_start else None,
+        "r_squared": round(r_squared, 4),
+        "fitted_start": float(fitted_start)
+    }
+
+
+def change_points(y: np.ndarray, max_points: int = DEFAULT_MAX_CHANGE_POINTS,
+                  min_segment: Optional[int] = None, penalty: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Breaks in level or slope found by binary segmentation of a piecewise-linear fit.
+
+    The squared error of a straight-line fit on either side of every candidate split
+    comes from prefix sums of t, t^2, y, y^2 and t*y, so all splits of a segment are
+    scored at once. The best split of the most improvable segment is taken until the
+    gain falls below a BIC-style penalty, 3 * sigma^2 * log(n) with sigma from the
+    median absolute first difference, or max_points is reached. Each pass is O(n),
+    so the whole search is O(n log n).
+    """
+
+    n = len(y)
+    min_segment = int(min_segment or max(5, n // 50))
+    if n < 2 * min_segment or max_points <= 0:
+        return []
+    t = np.arange(n, dtype=np.float64) / n
+    centered = y - y.mean()
+    sums = {name: np.concatenate(([0.0], np.cumsum(values))) for name, values in
+            (("t", t), ("tt", t * t), ("y", centered), ("yy", centered * centered), ("ty", t * centered))}
+    sigma = np.median(np.abs(np.diff(y))) / 0.6745 / np.sqrt(2)
+    sigma2 = sigma ** 2 if sigma > 0 else float(np.var(y)) or 1.0
+    penalty = penalty if penalty is not None else 3 * sigma2 * np.log(n)
+
+    def fit(lo, hi):
+        """Squared error, slope and intercept of the least-squares line over [lo, hi)."""
+        count = hi - lo
+        st, stt, sy, syy, sty = (sums[name][hi] - sums[name][lo] for name in ("t", "tt", "y", "yy", "ty"))
+        var_t = stt - st * st / count
+        cov = sty - st * sy / count
+        slope = np.divide(cov, var_t, out=np.zeros_like(cov), where=var_t > 0)
+        intercept = (sy - slope * st) / count
+        return np.maximum(syy - sy * sy / count - slope * cov, 0.0), slope, intercept
+
+    def best_split(start: int, end: int) -> Optional[Tuple[float, int, int, int]]:
+        if end - start < 2 * min_segment:
+            return None
+        splits = np.arange(start + min_segment, end - min_segment + 1)
+        whole, _, _ = fit(np.array([start]), np.array([end]))
+        left, _, _ = fit(np.full(len(splits), start), splits)
+        right, _, _ = fit(splits, np.full(len(splits), end))
+        gains = whole - left - right
+        best = int(np.argmax(gains))
+        return float(gains[best]), int(splits[best]), start, end
+
+    heap = []
+    first = best_split(0, n)
+    if first:
+        heapq.heappush(heap, (-first[0], first[1], first[2], first[3]))
+    found = []
+    while heap and len(found) < max_points:
+        negative_gain, split, start, end = heapq.heappop(heap)
+        if -negative_gain < penalty:
+            break
+        found.append((split, start, end, -negative_gain))
+        for child in (best_split(start, split), best_split(split, end)):
+            if child:
+                heapq.heappush(heap, (-child[0], child[1], child[2], child[3]))
+
+    points = []
+    mean = float(y.mean())
+    for split, start, end, gain in sorted(found):
+        _, (slope_before, slope_after), (intercept_before, intercept_after) = fit(
+            np.array([start, split]), np.array([split, end]))
+        # Fitted values of both lines at the split, back on the original scale
+        before = float(intercept_before + slope_before * t[split]) + mean
+        after = float(intercept_after + slope_after * t[split]) + mean
+        points.append({
+            "index": split,
+            "level_before": before,
+            "level_after": after,
+            "shift": after - before,
+            "shift_pct": (after - before) / abs(before) * 100 if before else None,
+            "slope_before": float(slope_before) / n,
+            "slope_after": float(slope_after) / n,
+            "score": round(gain / penalty, 2)
+        })
+    return points
+
+
+def robust_anomalies(resid: np.ndarray, index: pd.DatetimeIndex, expected: np.ndarray, y: np.ndarray,
+                     window: int = DEFAULT_ANOMALY_WINDOW, threshold: float = DEFAULT_ANOMALY_THRESHOLD,
+                     limit: int = DEFAULT_MAX_ANOMALIES) -> Dict[str, Any]:
+    """
+    Runs of points whose remainder has a rolling robust z-score above the threshold.
+
+    z = 0.6745 * (r - rolling median) / rolling MAD over a centred window, so local
+    shifts in level or volatility do not flag whole regimes. Consecutive flagged
+    points with the same sign form one event; the strongest events are returned.
+    """
+
+    remainder = pd.Series(resid)
+    min_periods = max(3, window // 2)
+    median = remainder.rolling(window, center=True, min_periods=min_periods).median()
+    mad = (remainder - median).abs().rolling(window, center=True, min_periods=min_periods).median()
+    global_mad = float(np.median(np.abs(resid - np.median(resid))))
+    mad = mad.where(mad > 0, global_mad).to_numpy()
+    if global_mad == 0 and not (mad > 0).any():
+        return {"count": 0, "points": 0, "threshold": threshold, "window": window, "events": []}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = 0.6745 * (resid - median.to_numpy()) / mad
+    z = np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0)
+
+    flagged = np.flatnonzero(np.abs(z) > threshold)
+    if not len(flagged):
+        return {"count": 0, "points": 0, "threshold": threshold, "window": window, "events": []}
+    signs = np.sign(z[flagged])
+    starts = np.flatnonzero(np.r_[True, (np.diff(flagged) > 1) | (np.diff(signs) != 0)])
+    ends = np.r_[starts[1:], len(flagged)]
+    peaks = np.array([flagged[s:e][np.argmax(np.abs(z[flagged[s:e]]))] for s, e in zip(starts, ends)])
+    order = np.argsort(-np.abs(z[peaks]))[:limit]
+
+    events = []
+    for event in order:
+        peak = int(peaks[event])
+        first, last = int(flagged[starts[event]]), int(flagged[ends[event] - 1])
+        events.append({
+            "start": index[first].isoformat(),
+            "end": index[last].isoformat(),
+            "points": last - first + 1,
+            "peak_date": index[peak].isoformat(),
+            "value": float(y[peak]),
+            "expected": float(expected[peak] + (median.iloc[peak] if pd.notna(median.iloc[peak]) else 0.0)),
+            "z_score": round(float(z[peak]), 2),
+            "direction": "spike" if z[peak] > 0 else "dip"
+        })
+    return {"count": len(starts), "points": len(flagged), "threshold": threshold, "window": window, "events": events}
+
+
+def forecast(y: np.ndarray, index: pd.DatetimeIndex, freq: str, period: Optional[int], horizon: int) -> Dict[str, Any]:
+    """
+    Damped-trend Holt-Winters (additive ETS) forecast with approximate intervals.
+
+    Smoothing parameters are chosen on a grid by one-step-ahead squared error, with the
+    whole grid run as one vectorized recursion. Accuracy is the weighted absolute
+    percentage error of a fit that held out the last `horizon` observations.
+    """
+
+    y = y[-FORECAST_MAX_POINTS:]
+    n = len(y)
+    seasonal = bool(period) and n >= 2 * period + horizon
+    alphas, betas, gammas = np.meshgrid(HW_ALPHAS, HW_BETAS, HW_GAMMAS if seasonal else (0.0,), indexing="ij")
+    alphas, betas, gammas = alphas.ravel(), betas.ravel(), gammas.ravel()
+    season_length = period if seasonal else None
+
+    holdout = min(horizon, max(1, n // 5))
+    train = y[:-holdout]
+    state, mse = _holt_winters(train, season_length, alphas, betas, gammas)
+    best = int(np.nanargmin(mse))
+    predicted = _extrapolate(state, best, len(train), season_length, holdout)
+    actual = y[-holdout:]
+    wape = float(np.abs(actual - predicted).sum() / np.abs(actual).sum() * 100) if np.abs(actual).sum() else None
+
+    params = (alphas[best:best + 1], betas[best:best + 1], gammas[best:best + 1])
+    state, mse = _holt_winters(y, season_length, *params)
+    path = _extrapolate(state, 0, n, season_length, horizon)
+    sigma = float(np.sqrt(mse[0]))
+    steps = np.arange(1, horizon + 1)
+    spread = sigma * np.sqrt(steps)
+    dates = _future_dates(index, freq, horizon)
+
+    stride = max(1, int(np.ceil(horizon / FORECAST_MAX_RETURNED)))
+    shown = sorted(set(range(stride - 1, horizon, stride)) | {horizon - 1})
+    return {
+        "method": "Holt-Winters additive, damped trend" if seasonal else "Holt linear, damped trend",
+        "parameters": {"alpha": float(params[0][0]), "beta": float(params[1][0]),
+                       "gamma": float(params[2][0]) if seasonal else None, "phi": DAMPING,
+                       "seasonal_period": season_length},
+        "horizon": horizon,
+        "fitted_points": n,
+        "current": float(y[-1]),
+        "end": {
+            "date": dates[-1].isoformat() if len(dates) else None,
+            "forecast": float(path[-1]),
+            "lower_80": float(path[-1] - Z_80 * spread[-1]), "upper_80": float(path[-1] + Z_80 * spread[-1]),
+            "lower_95": float(path[-1] - Z_95 * spread[-1]), "upper_95": float(path[-1] + Z_95 * spread[-1])
+        },
+        "points": [{"date": dates[i].isoformat() if len(dates) else None, "forecast": float(path[i]),
+                    "lower_80": float(path[i] - Z_80 * spread[i]), "upper_80": float(path[i] + Z_80 * spread[i])}
+                   for i in shown],
+        "holdout_points": holdout,
+        "holdout_wape_pct": round(wape, 2) if wape is not None else None,
+        "residual_std": sigma
+    }
+
+
+def _holt_winters(y: np.ndarray, period: Optional[int], alpha: np.ndarray, beta: np.ndarray,
+                  gamma: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Run the damped additive recursion for every parameter set at once; returns final states and MSE."""
+
+    size = len(alpha)
+    if period:
+        first = y[:period].mean()
+        level = np.full(size, first)
+        trend = np.full(size, (y[period:2 * period].mean() - first) / period)
+        season = np.tile(y[:period] - first, (size, 1))
+        warmup = period
+    else:
+        level = np.full(size, y[0])
+        trend = np.full(size, y[1] - y[0] if len(y) > 1 else 0.0)
+        season = None
+        warmup = 1
+
+    sse = np.zeros(size)
+    for t, value in enumerate(y):
+        s = season[:, t % period] if period else 0.0
+        error = value - (level + DAMPING * trend + s)
+        if t >= warmup:
+            sse += error * error
+        new_level = alpha * (value - s) + (1 - alpha) * (level + DAMPING * trend)
+        trend = beta * (new_level - level) + (1 - beta) * DAMPING * trend
+        if period:
+            season[:, t % period] = gamma * (value - new_level) + (1 - gamma) * s
+        level = new_level
+    mse = sse / max(1, len(y) - warmup)
+    return {"level": level, "trend": trend, "season": season}, mse
+
+
+def _extrapolate(state: Dict[str, np.ndarray], which: int, fitted: int, period: Optional[int], horizon: int) -> np.ndarray:
+    steps = np.arange(1, horizon + 1)
+    damped = np.cumsum(DAMPING ** steps)
+    path = state["level"][which] + damped * state["trend"][which]
+    if period:
+        path = path + state["season"][which][(fitted + steps - 1) % period]
+    return path
+
+
+def _centered_mean(values: np.ndarray, window: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Centred (weighted) moving average from cumulative sums, shrinking at the edges.
+
+    Even windows use the 2xm average (half weight on the two end points), which
+    cancels a seasonal pattern of that length exactly.
+    """
+
+    n = len(values)
+    weighted = weights is not None
+    weights = weights if weighted else np.ones(n)
+    value_sums = np.concatenate(([0.0], np.cumsum(values * weights)))
+    weight_sums = np.concatenate(([0.0], np.cumsum(weights)))
+    positions = np.arange(n)
+    half = window // 2
+
+    def mean(lo_offset: int, hi_offset: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo = np.clip(positions + lo_offset, 0, n)
+        hi = np.clip(positions + hi_offset, 0, n)
+        return value_sums[hi] - value_sums[lo], weight_sums[hi] - weight_sums[lo]
+
+    if window % 2:
+        total, weight = mean(-half, half + 1)
+    else:
+        left_total, left_weight = mean(-half, half)
+        right_total, right_weight = mean(-half + 1, half + 1)
+        total, weight = left_total + right_total, left_weight + right_weight
+    means = np.divide(total, weight, out=np.full(n, np.nan), where=weight > 1e-9)
+    empty = np.isnan(means)
+    if empty.any() and weighted:
+        # Windows whose points were all down-weighted fall back to the plain average
+        means[empty] = _centered_mean(values, window)[empty]
+    return means
+
+
+def _strength(component: np.ndarray, resid: np.ndarray) -> float:
+    """Share of the component-plus-remainder variance explained by the component (0-1)."""
+
+    combined = np.var(component + resid)
+    return float(max(0.0, 1 - np.var(resid) / combined)) if combined > 0 else 0.0
+
+
+def _infer_freq(index: pd.DatetimeIndex) -> Optional[str]:
+    try:
+        return pd.infer_freq(index) if index.is_unique else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _fallback_freq(index: pd.DatetimeIndex) -> str:
+    """Frequency of an uneven index: calendar months, quarters or years, else the median spacing."""
+
+    unique = index.unique()
+    step = pd.Timedelta(np.median(np.diff(unique.asi8))) if len(unique) > 1 else pd.Timedelta(days=1)
+    days = step / pd.Timedelta(days=1)
+    if 28 <= days <= 31:
+        return "MS"
+    if 89 <= days <= 92:
+        return "QS"
+    if 365 <= days <= 366:
+        return "YS"
+    return pd.tseries.frequencies.to_offset(step).freqstr
+
+
+def _future_dates(index: pd.DatetimeIndex, freq: str, horizon: int) -> pd.DatetimeIndex:
+    try:
+        return pd.date_range(index[-1], periods=horizon + 1, freq=freq)[1:]
+    except (ValueError, TypeError):
+        return pd.DatetimeIndex([])
+
+
+def _period_label(period: int, freq: str) -> str:
+    """Human-readable length of a seasonal period, e.g. "7 days" or "12 months"."""
+
+    try:
+        offset = pd.tseries.frequencies.to_offset(freq)
+    except (ValueError, TypeError):
+        return f"{period} periods"
+    if isinstance(offset, pd.offsets.Tick):
+        span = pd.Timedelta(offset) * period
+        for unit, name in ((pd.Timedelta(weeks=1), "weeks"), (pd.Timedelta(days=1), "days"),
+                           (pd.Timedelta(hours=1), "hours"), (pd.Timedelta(minutes=1), "minutes")):
+            if span >= unit and span % unit == pd.Timedelta(0):
+                count = span // unit
+                return f"{count} {name[:-1] if count == 1 else name}"
+        return str(span)
+    names = {"M": "months", "Q": "quarters", "Y": "years", "A": "years", "W": "weeks", "B": "business days", "D": "days"}
+    name = next((label for prefix, label in names.items() if offset.name.startswith(prefix)), "periods")
+    count = period * offset.n
+    return f"{count} {name[:-1] if count == 1 else name}"
+
+
+def _natural_periods(freq: str) -> List[int]:
+    """Points per hour, day and week for sub-daily and daily series; per year for monthly and quarterly ones."""
+
+    try:
+        offset = pd.tseries.frequencies.to_offset(freq)
+    except (ValueError, TypeError):
+        return []
+    if isinstance(offset, pd.offsets.Tick):
+        step = pd.Timedelta(offset)
+        spans = (pd.Timedelta(hours=1), pd.Timedelta(days=1), pd.Timedelta(weeks=1))
+        return [span // step for span in spans if span > step and span % step == pd.Timedelta(0)]
+    if offset.name.startswith("M"):
+        return [12 // offset.n] if 12 % offset.n == 0 else []
+    if offset.name.startswith("Q"):
+        return [4]
+    return []
+
+
+def _default_time_column(df: pd.DataFrame) -> str:
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            return column
+    return ""
+
+
+def _is_metric(series: pd.Series) -> bool:
+    return (pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+            and not pd.api.types.is_datetime64_any_dtype(series))
@@ -0,0 +1,342 @@
+"""
+Dataset Views
+Named joins over stored datasets, registered as lazily built datasets every tool can read.
+"""
+
+import os
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+from src.core.dataset_store import DatasetEntry, DatasetStore, get_store
+
+logger = logging.getLogger("business-intelligence")
+
+JOIN_TYPES = ["inner", "left", "right", "outer", "asof"]
+JOIN_STRATEGIES = ["auto", "hash", "sort_merge"]
+ASOF_DIRECTIONS = ["backward", "forward", "nearest"]
+DEFAULT_SORT_MERGE_ROWS = 1_000_000
+SQL_JOINS = {"inner": "INNER JOIN", "left": "LEFT JOIN", "right": "RIGHT JOIN", "outer": "FULL OUTER JOIN"}
+
+
+@dataclass
+class JoinSpec:
+    """
+    A view joining two or more datasets on key columns.
+
+    Datasets are joined left to right, each onto the result so far. Key columns keep
+    the first dataset's names and appear once; any other column name that occurs in
+    more than one dataset is suffixed with its dataset's label. For "asof" joins the
+    last key is the ordered key (a timestamp) and the earlier keys must match exactly.
+    """
+    name: str
+    datasets: List[str]
+    keys: Dict[str, List[str]]
+    how: str = "inner"
+    columns: Dict[str, List[str]] = field(default_factory=dict)  # projection per dataset, default all
+    strategy: str = "auto"
+    direction: str = "backward"
+    tolerance: Optional[Union[str, float]] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @classmethod
+    def from_request(cls, name: str, datasets: List[str], on: Union[str, List[str], Dict[str, Any]],
+                     available: Dict[str, List[str]], how: str = "inner",
+                     columns: Optional[Dict[str, Any]] = None, strategy: str = "auto",
+                     direction: str = "backward", tolerance: Optional[Union[str, float]] = None) -> "JoinSpec":
+        """Validate a join request against the input datasets' columns; raises ValueError."""
+
+        datasets = [datasets] if isinstance(datasets, str) else list(datasets or [])
+        if len(datasets) < 2:
+            raise ValueError("A view joins at least two datasets")
+        if len(set(datasets)) != len(datasets):
+            raise ValueError("Each dataset can appear in a view only once")
+        if name in datasets:
+            raise ValueError(f"View '{name}' cannot have the same name as one of its datasets")
+        if how not in JOIN_TYPES:
+            raise ValueError(f"Unsupported join type '{how}'; use {JOIN_TYPES}")
+        if strategy not in JOIN_STRATEGIES:
+            raise ValueError(f"Unsupported join strategy '{strategy}'; use {JOIN_STRATEGIES}")
+        if direction not in ASOF_DIRECTIONS:
+            raise ValueError(f"Unsupported as-of direction '{direction}'; use {ASOF_DIRECTIONS}")
+
+        if isinstance(on, dict):
+            keys = {dataset: _as_list(on.get(dataset)) for dataset in datasets}
+        else:
+            keys = {dataset: _as_list(on) for dataset in datasets}
+        if not all(keys.values()) or len({len(dataset_keys) for dataset_keys in keys.values()}) != 1:
+            raise ValueError("Give the same number of join keys for every dataset")
+
+        columns = {dataset: _as_list(selected) for dataset, selected in (columns or {}).items() if selected}
+        unknown = [dataset for dataset in columns if dataset not in datasets]
+        if unknown:
+            raise ValueError(f"Column selection for datasets not in the view: {unknown}")
+        for dataset in datasets:
+            missing = [col for col in keys[dataset] + columns.get(dataset, []) if col not in available[dataset]]
+            if missing:
+                raise ValueError(f"Columns not found in dataset '{dataset}': {missing}")
+
+        return cls(name=name, datasets=datasets, keys=keys, how=how, columns=columns, strategy=strategy,
+                   direction=direction, tolerance=tolerance if tolerance not in ("", None) else None)
+
+    @property
+    def key_names(self) -> List[str]:
+        return self.keys[self.datasets[0]]
+
+    def labels(self) -> Dict[str, str]:
+        """
+        Suffix for each dataset's clashing columns: the dataset name without the prefix
+        all of them share, so crypto_data_BTC and crypto_data_ETH give "BTC" and "ETH".
+        """
+
+        prefix = os.path.commonprefix(self.datasets)
+        prefix = prefix[:max(prefix.rfind("_"), prefix.rfind("-")) + 1]
+        labels = {dataset: dataset[len(prefix):] for dataset in self.datasets}
+        if not all(labels.values()) or len(set(labels.values())) != len(labels):
+            return {dataset: dataset for dataset in self.datasets}
+        return labels
+
+    def output_names(self, input_columns: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+        """Per dataset, the selected input columns (keys first) mapped to their names in the view."""
+
+        selected = {dataset: [col for col in (self.columns.get(dataset) or input_columns[dataset])
+                              if col not in self.keys[dataset]] for dataset in self.datasets}
+        counts = Counter(col for dataset in self.datasets for col in selected[dataset])
+        labels = self.labels()
+        names = {}
+        for dataset in self.datasets:
+            mapping = dict(zip(self.keys[dataset], self.key_names))
+            for col in selected[dataset]:
+                clashes = counts[col] > 1 or col in self.key_names
+                mapping[col] = f"{col}_{labels[dataset]}" if clashes else col
+            names[dataset] = mapping
+        return names
+
+    def output_columns(self, input_columns: Dict[str, List[str]]) -> List[str]:
+        names = self.output_names(input_columns)
+        return self.key_names + [out for dataset in self.datasets for col, out in names[dataset].items()
+                                 if col not in self.keys[dataset]]
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "view_name": self.name,
+            "datasets": self.datasets,
+            "how": self.how,
+            "keys": self.keys,
+            "columns": self.columns or None,
+            "strategy": self.strategy,
+            "direction": self.direction if self.how == "asof" else None,
+            "tolerance": self.tolerance if self.how == "asof" else None,
+            "created_at": self.created_at
+        }
+
+
+def build_view(spec: JoinSpec, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Join the input frames as the view describes."""
+
+    names = spec.output_names({dataset: [str(col) for col in frame.columns] for dataset, frame in frames.items()})
+    # Project and rename without copying the column data
+    inputs = [pd.DataFrame({out: frames[dataset][col] for col, out in names[dataset].items()}, copy=False)
+              for dataset in spec.datasets]
+
+    result = inputs[0]
+    for right in inputs[1:]:
+        if spec.how == "asof":
+            result = _asof_join(result, right, spec)
+        elif _use_sort_merge(result, right, spec):
+            result = _sort_merge_join(result, right, spec.key_names[0], spec.how)
+        else:
+            result = pd.merge(result, right, on=spec.key_names, how=spec.how, sort=False)
+    return result.reset_index(drop=True)
+
+
+def _use_sort_merge(left: pd.DataFrame, right: pd.DataFrame, spec: JoinSpec) -> bool:
+    """
+    Sort-merge on a single numeric or datetime key; "auto" picks it only for large
+    inputs that are both already sorted on the key, where it skips hashing entirely.
+    """
+
+    if spec.strategy == "hash" or len(spec.key_names) != 1:
+        return False
+    key = spec.key_names[0]
+    left_key, right_key = left[key], right[key]
+    if left_key.dtype != right_key.dtype or left_key.hasnans or right_key.hasnans:
+        return False
+    if not (pd.api.types.is_numeric_dtype(left_key) or pd.api.types.is_datetime64_any_dtype(left_key)) or \
+            pd.api.types.is_bool_dtype(left_key):
+        return False
+    if spec.strategy == "sort_merge":
+        return True
+    threshold = int(os.getenv("BI_JOIN_SORT_MERGE_ROWS", DEFAULT_SORT_MERGE_ROWS))
+    return len(left) + len(right) >= threshold and left_key.is_monotonic_increasing and \
+        right_key.is_monotonic_increasing
+
+
+def _sort_merge_join(left: pd.DataFrame, right: pd.DataFrame, key: str, how: str) -> pd.DataFrame:
+    """Equi-join on one key by merging the two sorted key columns; rows come out in key order."""
+
+    left = left if left[key].is_monotonic_increasing else left.sort_values(key, kind="stable", ignore_index=True)
+    right = right if right[key].is_monotonic_increasing else right.sort_values(key, kind="stable", ignore_index=True)
+    joined, left_indexer, right_indexer = pd.Index(left[key]).join(pd.Index(right[key]), how=how,
+                                                                  return_indexers=True)
+    parts = [pd.DataFrame({key: joined.to_numpy()}),
+             _take(left.drop(columns=key), left_indexer),
+             _take(right.drop(columns=key), right_indexer)]
+    return pd.concat(parts, axis=1, copy=False)
+
+
+def _take(frame: pd.DataFrame, indexer) -> pd.DataFrame:
+    """Rows of frame at the join indexer positions; -1 becomes a missing value."""
+
+    if indexer is None:
+        return frame.reset_index(drop=True)
+    columns = {}
+    for col in frame.columns:
+        series = frame[col]
+        values = series.array if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) else series.to_numpy()
+        columns[col] = pd.api.extensions.take(values, indexer, allow_fill=True)
+    return pd.DataFrame(columns, columns=frame.columns, copy=False)
+
+
+def _asof_join(left: pd.DataFrame, right: pd.DataFrame, spec: JoinSpec) -> pd.DataFrame:
+    """Align each left row with the nearest right row on the ordered key, within the by-keys."""
+
+    on, by = spec.key_names[-1], spec.key_names[:-1]
+    # merge_asof needs both sides sorted on the ordered key and no missing values in it
+    left, right = left[left[on].notna()], right[right[on].notna()]
+    if not left[on].is_monotonic_increasing:
+        left = left.sort_values(on, kind="stable")
+    if not right[on].is_monotonic_increasing:
+        right = right.sort_values(on, kind="stable")
+    return pd.merge_asof(left, right, on=on, by=by or None, direction=spec.direction,
+                         tolerance=_tolerance(spec.tolerance, left[on]))
+
+
+def _tolerance(tolerance: Optional[Union[str, float]], key: pd.Series):
+    if tolerance is None:
+        return None
+    if pd.api.types.is_datetime64_any_dtype(key):
+        return pd.Timedelta(tolerance)
+    if pd.api.types.is_integer_dtype(key):
+        return int(tolerance)
+    return float(tolerance)
+
+
+def view_sql(spec: JoinSpec, input_columns: Dict[str, List[str]], table_name: Callable[[str], str]) -> Optional[str]:
+    """
+    The view as one SQL SELECT over the inputs' tables, so the SQL engine can run it
+    without materializing the join. None when the join has no SQL equivalent here
+    (nearest or tolerance-bounded as-of joins).
+    """
+
+    if spec.how == "asof" and (spec.direction == "nearest" or spec.tolerance is not None):
+        return None
+
+    names = spec.output_names(input_columns)
+    keys = spec.key_names
+
+    def source(dataset: str) -> str:
+        select = ", ".join(f"{_quote(col)} AS {_quote(out)}" for col, out in names[dataset].items())
+        where = f" WHERE {_quote(keys[-1])} IS NOT NULL" if spec.how == "asof" else ""
+        return f"(SELECT * FROM (SELECT {select} FROM {_quote(table_name(dataset))}) AS s{where})"
+
+    query = source(spec.datasets[0])
+    others = [out for col, out in names[spec.datasets[0]].items() if col not in spec.keys[spec.datasets[0]]]
+    for dataset in spec.datasets[1:]:
+        right_columns = [out for col, out in names[dataset].items() if col not in spec.keys[dataset]]
+        if spec.how == "asof":
+            operator = ">=" if spec.direction == "backward" else "<="
+            conditions = [f"l.{_quote(key)} = r.{_quote(key)}" for key in keys[:-1]]
+            conditions.append(f"l.{_quote(keys[-1])} {operator} r.{_quote(keys[-1])}")
+            join = "ASOF LEFT JOIN"
+        else:
+            conditions = [f"l.{_quote(key)} = r.{_quote(key)}" for key in keys]
+            join = SQL_JOINS[spec.how]
+        key_side = {"right": "r", "outer": None}.get(spec.how, "l")
+        select = [f"{key_side}.{_quote(key)} AS {_quote(key)}" if key_side else
+                  f"COALESCE(l.{_quote(key)}, r.{_quote(key)}) AS {_quote(key)}" for key in keys]
+        select += [f"l.{_quote(col)}" for col in others] + [f"r.{_quote(col)}" for col in right_columns]
+        query = (f"(SELECT {', '.join(select)} FROM {query} AS l {join} {source(dataset)} AS r "
+                 f"ON {' AND '.join(conditions)})")
+        others += right_columns
+    return f"SELECT * FROM {query} AS v"
+
+
+def _quote(identifier: str) -> str:
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else [str(item) for item in value]
+
+
+# Registry of view definitions; the views themselves live in the dataset store
+
+_VIEWS: Dict[str, JoinSpec] = {}
+_VIEWS_LOCK = threading.Lock()
+
+
+def define_view(spec: JoinSpec, store: Optional[DatasetStore] = None) -> DatasetEntry:
+    """Register a view in the store; it is built on first access and rebuilt after its inputs change."""
+
+    store = store or get_store()
+
+    def load() -> pd.DataFrame:
+        frames = {}
+        for dataset in spec.datasets:
+            frame = store.get(dataset)
+            if frame is None:
+                raise ValueError(f"View '{spec.name}' needs dataset '{dataset}', which is no longer loaded")
+            frames[dataset] = frame
+        logger.info(f"Building view '{spec.name}' ({spec.how} join of {', '.join(spec.datasets)})")
+        return build_view(spec, frames)
+
+    input_columns = {dataset: store.entry(dataset).columns for dataset in spec.datasets}
+    first = store.entry(spec.datasets[0])
+    with _VIEWS_LOCK:
+        _VIEWS[spec.name] = spec
+    return store.put_view(spec.name, load, spec.output_columns(input_columns), spec.datasets, rows=first.rows)
+
+
+def get_view(name: str, store: Optional[DatasetStore] = None) -> Optional[JoinSpec]:
+    """The definition of a registered view, or None if the name is not (or no longer) a view."""
+
+    entry = (store or get_store()).entry(name)
+    if entry is None or not entry.depends_on:
+        return None
+    with _VIEWS_LOCK:
+        return _VIEWS.get(name)
+
+
+def drop_view(name: str) -> bool:
+    """Forget a view definition (the caller removes its store entry)."""
+
+    with _VIEWS_LOCK:
+        return _VIEWS.pop(name, None) is not None
+
+
+def list_views(store: Optional[DatasetStore] = None) -> List[Dict[str, Any]]:
+    with _VIEWS_LOCK:
+        names = list(_VIEWS)
+    views = [get_view(name, store) for name in names]
+    return [view.describe() for view in views if view is not None]
+
+
+def view_sql_for(name: str, table_name: Callable[[str], str], store: Optional[DatasetStore] = None) -> Optional[str]:
+    """SQL for a registered view, or None when it is not a view or has no SQL form."""
+
+    store = store or get_store()
+    spec = get_view(name, store)
+    if spec is None:
+        return None
+    entries = {dataset: store.entry(dataset) for dataset in spec.datasets}
+    if any(entry is None for entry in entries.values()):
+        return None
+    return view_sql(spec, {dataset: entry.columns for dataset, entry in entries.items()}, table_name)
@@ -0,0 +1,331 @@
+"""
+Workspace
+Durable manifest of loaded datasets with Arrow snapshots, re-attached on server start.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.core.dataset_store import DatasetStore, compact_frame, dataset_fingerprint, get_store
+
+logger = logging.getLogger("business-intelligence")
+
+DEFAULT_WORKSPACE_DIR = Path(__file__).parent.parent.parent / "state" / "workspace"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    """What the workspace knows about one dataset: its source, options and snapshot."""
+    name: str
+    snapshot: str  # file name inside the snapshot directory
+    rows: int
+    columns: List[str]
+    nbytes: int = 0
+    raw_nbytes: int = 0
+    fingerprint: Optional[str] = None
+    source_path: str = ""
+    source_type: str = ""
+    options: Dict[str, Any] = field(default_factory=dict)
+    source_mtime: Optional[float] = None
+    source_size: Optional[int] = None
+    saved_at: float = field(default_factory=time.time)
+
+
+class Workspace:
+    """
+    Durable workspace directory shared across server restarts.
+
+    Every loaded dataset is saved as an uncompressed Arrow IPC snapshot of its
+    compacted frame and recorded in manifest.json with its source path, load
+    options, fingerprint and the source's mtime and size. On start-up the manifest
+    is re-attached without reading any rows: snapshots are memory-mapped on first
+    access, and a dataset whose source changed since the snapshot is re-read from
+    the source on first access instead. Cached analysis results live alongside in
+    results/ (see src/core/result_cache.py).
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or os.getenv("BI_WORKSPACE_DIR", "") or DEFAULT_WORKSPACE_DIR)
+        self.snapshot_dir = self.root / "snapshots"
+        self.results_dir = self.root / "results"
+        self.manifest_path = self.root / "manifest.json"
+        self._entries: Dict[str, ManifestEntry] = self._read_manifest()
+        self._lock = threading.RLock()
+
+    def save(self, name: str, source_path: str = "", source_type: str = "",
+             options: Optional[Dict[str, Any]] = None, store: Optional[DatasetStore] = None) -> Optional[ManifestEntry]:
+        """Snapshot a registered dataset and record it in the manifest."""
+
+        store = store or get_store()
+        entry = store.entry(name)
+        if entry is None or entry.virtual:
+            return None
+        frame = store.get(name)
+        record = self._snapshot(name, frame, store.fingerprint(name), entry.nbytes, entry.raw_nbytes,
+                                source_path, source_type, options)
+        store.set_snapshot(name, self.snapshot_dir / record.snapshot, entry.version)
+        return record
+
+    def remove(self, name: str) -> bool:
+        """Forget a dataset and delete its snapshot."""
+
+        with self._lock:
+            record = self._entries.pop(name, None)
+            if record is None:
+                return False
+            self._write_manifest()
+        self._remove_snapshot(record.snapshot)
+        return True
+
+    def restore(self, store: Optional[DatasetStore] = None) -> Dict[str, Any]:
+        """
+        Re-attach every manifest dataset that is not already registered.
+
+        Only the manifest is read and the sources are stat-ed, so this takes
+        milliseconds regardless of dataset sizes.
+        """
+
+        started = time.perf_counter()
+        store = store or get_store()
+        attached, stale, missing = [], [], []
+        with self._lock:
+            records = list(self._entries.values())
+        for record in records:
+            if record.name in store:
+                continue
+            snapshot = self.snapshot_dir / record.snapshot
+            if self.is_stale(record) and record.source_type in SOURCE_READERS and Path(record.source_path).exists():
+                store.put_virtual(record.name, lambda name=record.name: self._refresh(name, store), record.columns,
+                                  rows=record.rows, source_path=record.source_path)
+                stale.append(record.name)
+            elif snapshot.exists():
+                store.attach(record.name, snapshot, record.rows, record.columns, nbytes=record.nbytes,
+                             raw_nbytes=record.raw_nbytes, source_path=record.source_path,
+                             fingerprint=record.fingerprint)
+                attached.append(record.name)
+            else:
+                missing.append(record.name)
+
+        for name in missing:
+            logger.warning(f"Workspace snapshot for '{name}' is missing and its source cannot be re-read; forgetting it")
+            self.remove(name)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Workspace restored {len(attached)} datasets, {len(stale)} stale, in {elapsed * 1000:.1f} ms")
+        return {"attached": attached, "stale": stale, "dropped": missing, "restore_ms": round(elapsed * 1000, 2)}
+
+    def is_stale(self, record: ManifestEntry) -> bool:
+        """Whether the record's source file changed (mtime or size) since its snapshot was taken."""
+
+        if not record.source_path or record.source_mtime is None:
+            return False
+        current = _source_stat(record.source_path)
+        if current["source_mtime"] is None:
+            return False  # source gone: the snapshot is the only copy left
+        return current["source_mtime"] != record.source_mtime or current["source_size"] != record.source_size
+
+    def describe(self) -> Dict[str, Any]:
+        with self._lock:
+            records = list(self._entries.values())
+        return {
+            "workspace_dir": str(self.root),
+            "datasets": [{
+                "name": record.name,
+                "rows": record.rows,
+                "columns": len(record.columns),
+                "source_path": record.source_path,
+                "snapshot": str(self.snapshot_dir / record.snapshot),
+                "snapshot_bytes": _file_size(self.snapshot_dir / record.snapshot),
+                "stale": self.is_stale(record),
+                "saved_at": pd.Timestamp(record.saved_at, unit="s").isoformat()
+            } for record in records]
+        }
+
+    def entry(self, name: str) -> Optional[ManifestEntry]:
+        with self._lock:
+            return self._entries.get(name)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def _refresh(self, name: str, store: DatasetStore) -> pd.DataFrame:
+        """Loader for a stale dataset: re-read its source and re-snapshot it, falling back to the old snapshot."""
+
+        record = self.entry(name)
+        try:
+            loaded = read_source(record.source_path, record.source_type, record.options)
+        except Exception as e:
+            logger.warning(f"Re-reading '{record.source_path}' for '{name}' failed, using the stale snapshot: {e}")
+            return _read_snapshot(self.snapshot_dir / record.snapshot)
+
+        logger.info(f"Re-read stale dataset '{name}' from {record.source_path}")
+        frame = compact_frame(loaded)
+        refreshed = self._snapshot(name, frame, dataset_fingerprint(frame), int(frame.memory_usage(deep=True).sum()),
+                                   int(loaded.memory_usage(deep=True).sum()), record.source_path,
+                                   record.source_type, record.options)
+        entry = store.entry(name)
+        if entry is not None:
+            store.set_snapshot(name, self.snapshot_dir / refreshed.snapshot, entry.version)
+        return frame
+
+    def _snapshot(self, name: str, frame: pd.DataFrame, fingerprint: str, nbytes: int, raw_nbytes: int,
+                  source_path: str, source_type: str, options: Optional[Dict[str, Any]]) -> ManifestEntry:
+        # Every save writes a new file: store versions restart with the process, so only a
+        # fresh id guarantees an existing file is never mistaken for this frame's snapshot
+        snapshot = self.snapshot_dir / f"{_safe_name(name)}-{uuid.uuid4().hex}.arrow"
+        self._write_snapshot(frame, snapshot)
+
+        record = ManifestEntry(
+            name=name,
+            snapshot=snapshot.name,
+            rows=len(frame),
+            columns=[str(col) for col in frame.columns],
+            nbytes=nbytes,
+            raw_nbytes=raw_nbytes,
+            fingerprint=fingerprint,
+            source_path=source_path,
+            source_type=source_type,
+            options=dict(options or {}),
+            **_source_stat(source_path)
+        )
+        with self._lock:
+            previous = self._entries.get(name)
+            self._entries[name] = record
+            self._write_manifest()
+        if previous is not None:
+            self._remove_snapshot(previous.snapshot)
+        logger.info(f"Saved dataset '{name}' to workspace snapshot {snapshot.name}")
+        return record
+
+    def _write_snapshot(self, frame: pd.DataFrame, path: Path) -> None:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        feather.write_feather(pa.Table.from_pandas(frame), str(tmp_path), compression="uncompressed")
+        os.replace(tmp_path, path)
+
+    def _remove_snapshot(self, snapshot: str) -> None:
+        (self.snapshot_dir / snapshot).unlink(missing_ok=True)
+
+    def _read_manifest(self) -> Dict[str, ManifestEntry]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            return {item["name"]: ManifestEntry(**item) for item in manifest.get("datasets", [])}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable workspace manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _write_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = {"version": MANIFEST_VERSION, "datasets": [asdict(record) for record in self._entries.values()]}
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+
+def read_source(source_path: str, source_type: str, options: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """Re-read a file source the way its loader read it."""
+
+    reader = SOURCE_READERS.get(source_type)
+    if reader is None:
+        raise ValueError(f"Cannot re-read '{source_type}' sources")
+    return reader(source_path, options or {})
+
+
+def _read_csv(source_path: str, options: Dict[str, Any]) -> pd.DataFrame:
+    from src.core.csv_ingest import read_csv_file
+    return read_csv_file(source_path, options)["data"]
+
+
+def _read_tsv(source_path: str, options: Dict[str, Any]) -> pd.DataFrame:
+    return _read_csv(source_path, {"delimiter": "\t", **options})
+
+
+def _read_excel(source_path: str, options: Dict[str, Any]) -> pd.DataFrame:
+    from src.core.excel_ingest import read_excel_file
+    return read_excel_file(source_path, options)["data"]
+
+
+def _read_json(source_path: str, options: Dict[str, Any]) -> pd.DataFrame:
+    from src.core.json_ingest import read_json_file
+    return read_json_file(source_path, options)["data"]
+
+
+def _read_jsonl(source_path: str, options: Dict[str, Any]) -> pd.DataFrame:
+    from src.core.json_ingest import read_jsonl_file
+    return read_jsonl_file(source_path, options)["data"]
+
+
+def _read_parquet(source_path: str, options: Dict[str, Any]) -> pd.DataFrame:
+    return pd.read_parquet(source_path, columns=options.get("columns"))
+
+
+SOURCE_READERS = {
+    "csv": _read_csv,
+    "tsv": _read_tsv,
+    "excel": _read_excel,
+    "json": _read_json,
+    "jsonl": _read_jsonl,
+    "parquet": _read_parquet
+}
+
+
+def _read_snapshot(path: Path) -> pd.DataFrame:
+    import pyarrow.feather as feather
+    return feather.read_table(str(path), memory_map=True).to_pandas()
+
+
+def _source_stat(source_path: str) -> Dict[str, Any]:
+    try:
+        stat = os.stat(source_path)
+        return {"source_mtime": stat.st_mtime, "source_size": stat.st_size}
+    except (OSError, ValueError):
+        return {"source_mtime": None, "source_size": None}
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _safe_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+
+
+_WORKSPACE: Optional[Workspace] = None
+_WORKSPACE_LOCK = threading.Lock()
+
+
+def workspace_enabled() -> bool:
+    """Workspace persistence is on unless BI_WORKSPACE is 0/false/off."""
+
+    return os.getenv("BI_WORKSPACE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def get_workspace() -> Optional[Workspace]:
+    """Return the process-wide workspace, or None when persistence is disabled."""
+
+    global _WORKSPACE
+    if not workspace_enabled():
+        return None
+    if _WORKSPACE is None:
+        with _WORKSPACE_LOCK:
+            if _WORKSPACE is None:
+                _WORKSPACE = Workspace()
+    return _WORKSPACE
@@ -5,13 +5,25 @@ Generate charts, dashboards, and interactive visualizations.
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import json
 import base64
-from io import BytesIO
+
+from src.core.chart_render import (
+    HEXBIN_THRESHOLD, KDE_SAMPLE_SIZE, OUTPUT_FORMATS, SCATTER_SAMPLE_SIZE, axis_values, box_stats,
+    downsample_line, encode_figure, get_figure_pool, point_budget, sample_rows, vega_lite_spec
+)
+from src.core.dataset_store import resolve_dataset, list_available_datasets
+from src.core.executor import get_executor, run_coroutine
+from src.core.profiler import text_to_numeric
+
+# Chart types that can be returned as a Vega-Lite spec instead of an image
+SPEC_CHART_TYPES = ["bar", "line", "scatter", "histogram", "pie", "heatmap"]
 
 
 async def create_visualization_tool(
@@ -21,10 +33,14 @@ async def create_visualization_tool(
     y_column: str = "",
     group_by: str = "",
     title: str = "",
-    output_path: str = ""
+    output_path: str = "",
+    output_format: str = "png",
+    dpi: int = 0
 ) -> Dict[str, Any]:
     """
     Generate charts, dashboards, and interactive visualizations.
+    output_format is png, webp or svg for an image, or vega-lite for a JSON chart
+    spec; dpi defaults to BI_CHART_DPI (screen resolution).
     """
     
     try:
@@ -40,14 +56,22 @@ async def create_visualization_tool(
         
         # Validate and prepare visualization parameters
         viz_params = await _prepare_visualization_params(
-            df, chart_type, x_column, y_column, group_by, title
+            df, chart_type, x_column, y_column, group_by, title, output_format, dpi
         )
         
         if "error" in viz_params:
             return viz_params
         
-        # Generate visualization
-        visualization_result = await _generate_visualization(df, viz_params)
+        # Reduce to what the chart draws, and derive insights from the full data, off the
+        # event loop; only the reduced rows are pickled to the renderer
+        df_plot, render_params, insights, recommendations = await get_executor().run_in_thread(
+            "create_visualization", run_coroutine, _prepare_render, df, viz_params
+        )
+        
+        # Render in the process pool: matplotlib is CPU-bound and not thread-safe
+        visualization_result = await get_executor().run_in_process(
+            "create_visualization", run_coroutine, _generate_visualization, df_plot, render_params
+        )
         
         # Save visualization if output path specified
         if output_path:
@@ -59,8 +83,8 @@ async def create_visualization_tool(
             "visualization_type": chart_type,
             "status": "success",
             "visualization": visualization_result,
-            "insights": await _generate_visualization_insights(df, viz_params),
-            "recommendations": await _generate_visualization_recommendations(df, viz_params)
+            "insights": insights,
+            "recommendations": recommendations
         }
         
     except Exception as e:
@@ -79,43 +103,13 @@ async def create_visualization_tool(
 
 
 async def _load_dataset(dataset_name: str) -> Optional[pd.DataFrame]:
-    """Load dataset from storage (mock implementation)."""
-    
-    base_path = Path(__file__).parent.parent.parent / "data"
-    
-    # Try common file patterns
-    possible_files = [
-        base_path / f"{dataset_name}.csv",
-        base_path / f"{dataset_name}.xlsx", 
-        base_path / f"sample_{dataset_name}.csv",
-        base_path / f"sample_{dataset_name}.xlsx"
-    ]
-    
-    for file_path in possible_files:
-        if file_path.exists():
-            try:
-                if file_path.suffix.lower() == '.csv':
-                    return pd.read_csv(file_path)
-                elif file_path.suffix.lower() in ['.xlsx', '.xls']:
-                    return pd.read_excel(file_path)
-            except Exception:
-                continue
-    
-    return None
+    """Load dataset from the shared dataset store."""
+    return resolve_dataset(dataset_name)
 
 
 async def _list_available_datasets() -> List[str]:
     """List available datasets."""
-    
-    base_path = Path(__file__).parent.parent.parent / "data"
-    datasets = []
-    
-    if base_path.exists():
-        for file_path in base_path.glob("*"):
-            if file_path.suffix.lower() in ['.csv', '.xlsx', '.xls']:
-                datasets.append(file_path.stem)
-    
-    return datasets
+    return list_available_datasets()
 
 
 async def _prepare_visualization_params(
@@ -124,7 +118,9 @@ async def _prepare_visualization_params(
     x_column: str,
     y_column: str,
     group_by: str,
-    title: str
+    title: str,
+    output_format: str = "png",
+    dpi: int = 0
 ) -> Dict[str, Any]:
     """Prepare and validate visualization parameters."""
     
@@ -149,9 +145,25 @@ async def _prepare_visualization_params(
             "suggestion": "Choose from supported chart types"
         }
     
+    if output_format not in OUTPUT_FORMATS:
+        return {
+            "error": f"Unsupported output format: {output_format}",
+            "supported_formats": list(OUTPUT_FORMATS.keys()),
+            "suggestion": "Use png, webp or svg for images, or vega-lite for a JSON chart spec"
+        }
+    
+    if output_format == "vega-lite" and chart_type not in SPEC_CHART_TYPES:
+        return {
+            "error": f"Chart type {chart_type} is not available as a vega-lite spec",
+            "supported_types": SPEC_CHART_TYPES,
+            "suggestion": "Use png, webp or svg output for this chart type"
+        }
+    
     params = {
         "chart_type": chart_type,
         "chart_name": supported_charts[chart_type],
+        "output_format": output_format,
+        "dpi": dpi,
         "title": title or f"{supported_charts[chart_type]} - {chart_type.title()}",
         "columns": {
             "x": x_column,
@@ -190,7 +202,7 @@ async def _auto_select_x_column(df: pd.DataFrame, chart_type: str) -> str:
     # For different chart types, prefer different column types
     if chart_type in ["bar", "pie"]:
         # Prefer categorical columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
         if len(categorical_cols) > 0:
             return categorical_cols[0]
     
@@ -240,7 +252,7 @@ async def _validate_chart_requirements(df: pd.DataFrame, params: Dict[str, Any])
             return {"error": "Scatter plot requires both X and Y columns"}
         
         # Both should be numeric for meaningful scatter plot
-        if df[x_col].dtype not in [np.number] or df[y_col].dtype not in [np.number]:
+        if not pd.api.types.is_numeric_dtype(df[x_col]) or not pd.api.types.is_numeric_dtype(df[y_col]):
             return {
                 "error": "Scatter plot works best with numeric columns",
                 "suggestion": "Consider using different chart type for non-numeric data"
@@ -269,8 +281,139 @@ async def _validate_chart_requirements(df: pd.DataFrame, params: Dict[str, Any])
     return {"status": "valid"}
 
 
+async def _prepare_render(
+    df: pd.DataFrame, params: Dict[str, Any]
+) -> Tuple[pd.DataFrame, Dict[str, Any], List[str], List[str]]:
+    """Reduced frame and render parameters for the chart, plus insights and recommendations from the full data."""
+
+    reduced, source = await _reduce_for_render(df, params)
+    return (
+        reduced,
+        {**params, "source": source},
+        await _generate_visualization_insights(df, params),
+        await _generate_visualization_recommendations(df, params)
+    )
+
+
+async def _reduce_for_render(df: pd.DataFrame, params: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    The rows a chart draws, and the figures it reports about the full data.
+
+    Aggregation, downsampling and sampling happen here, next to the dataset, so the
+    renderer process is sent what ends up on the chart rather than every row.
+    """
+
+    chart_type = params["chart_type"]
+    x_col = params["columns"]["x"]
+    y_col = params["columns"]["y"]
+    group_by = params["columns"]["group_by"]
+    source: Dict[str, Any] = {"rows": len(df)}
+
+    if chart_type == "bar":
+        source["categories"] = int(df[x_col].nunique())
+        if y_col:
+            keys = [x_col, group_by] if group_by else [x_col]
+            reduced = df.groupby(keys, observed=True)[y_col].sum().reset_index()
+        else:
+            reduced = _category_counts(df[x_col]).head(20)
+
+    elif chart_type == "pie":
+        reduced = _category_counts(df[x_col]).head(10)
+
+    elif chart_type == "line":
+        series = await _line_series(df, params)
+        frames = [pd.DataFrame({x_col: line["x"].reset_index(drop=True), y_col: line["y"].reset_index(drop=True)})
+                  .assign(**({group_by: line["label"]} if group_by else {})) for line in series]
+        reduced = pd.concat(frames, ignore_index=True) if frames else df[[x_col, y_col]].head(0)
+        source["downsampled"] = len(reduced) < sum(line["rows"] for line in series)
+        source["trend"] = await _calculate_trend(df[x_col], df[y_col]) if pd.api.types.is_numeric_dtype(df[y_col]) else "N/A"
+
+    elif chart_type == "scatter":
+        data = df[[col for col in dict.fromkeys((x_col, y_col, group_by)) if col]].dropna(subset=[x_col, y_col])
+        source["points"] = len(data)
+        # Trend line fitted on every point
+        if len(data) > 1:
+            x_values = data[x_col].to_numpy(dtype=np.float64)
+            source["fit"] = np.polyfit(x_values, data[y_col].to_numpy(dtype=np.float64), 1)
+            source["x_range"] = np.array([x_values.min(), x_values.max()])
+        source["correlation"] = round(float(df[x_col].corr(df[y_col])), 3)
+        # Hexagonal bins need every point; markers and specs only ever show a sample
+        if params.get("output_format") == "vega-lite" or (group_by and len(data) > HEXBIN_THRESHOLD):
+            reduced = sample_rows(data, SCATTER_SAMPLE_SIZE)
+        else:
+            reduced = data
+
+    elif chart_type == "histogram":
+        reduced = _histogram_bins(df[x_col], 30)
+        source.update({
+            "mean": df[x_col].mean(),
+            "median": df[x_col].median(),
+            "std": df[x_col].std(),
+            "count": int(df[x_col].count())
+        })
+
+    elif chart_type == "box":
+        # Box statistics are computed up front so only the most extreme fliers are drawn
+        if y_col and x_col:
+            data = df.dropna(subset=[x_col, y_col])
+            source["boxes"] = [box_stats(values.to_numpy(dtype=np.float64), str(group))
+                               for group, values in data.groupby(x_col, observed=True)[y_col]]
+        else:
+            column = y_col or x_col
+            source["boxes"] = [box_stats(df[column].dropna().to_numpy(dtype=np.float64), column)]
+        reduced = df.head(0)
+
+    elif chart_type == "violin":
+        # Kernel density estimates cost O(rows) per grid point, so they are fitted on a sample
+        reduced = sample_rows(df[[col for col in dict.fromkeys((x_col, y_col)) if col]], KDE_SAMPLE_SIZE)
+
+    elif chart_type == "heatmap":
+        reduced = df.select_dtypes(include=[np.number]).corr()
+
+    elif chart_type == "pair":
+        # First 1000 rows of up to 5 numeric columns
+        reduced = df.select_dtypes(include=[np.number]).head(1000).iloc[:, :5]
+
+    else:  # dashboard
+        numeric_df = df.select_dtypes(include=[np.number])
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+        source.update({
+            "columns": len(df.columns),
+            "missing": df.isnull().sum(),
+            "numeric_columns": len(numeric_df.columns),
+            "categorical_columns": len(categorical_cols),
+            "correlation": numeric_df.corr() if len(numeric_df.columns) > 1 else None
+        })
+        if len(numeric_df.columns) > 0:
+            source["distribution"] = {"column": numeric_df.columns[0], "bins": _histogram_bins(numeric_df.iloc[:, 0], 20)}
+        elif len(categorical_cols) > 0:
+            source["distribution"] = {"column": categorical_cols[0], "counts": _category_counts(df[categorical_cols[0]]).head(10)}
+        reduced = df.head(0)
+
+    return reduced, source
+
+
+def _category_counts(values: pd.Series) -> pd.DataFrame:
+    """Rows per category, most common first."""
+    return values.value_counts().rename_axis(values.name).reset_index(name="count")
+
+
+def _histogram_bins(values: pd.Series, bins: int) -> pd.DataFrame:
+    """Equal-width bins over the non-null values, as the histogram renderers draw them."""
+
+    counts, edges = np.histogram(values.dropna().to_numpy(dtype=np.float64), bins=bins)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+
+def _draw_bins(ax, bins: pd.DataFrame) -> None:
+    """Draw pre-computed histogram bins exactly as Axes.hist would draw the raw values."""
+
+    edges = np.append(bins["bin_start"].to_numpy(), bins["bin_end"].iloc[-1])
+    ax.hist(bins["bin_start"], bins=edges, weights=bins["count"], alpha=0.7, edgecolor='black')
+
+
 async def _generate_visualization(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate the actual visualization."""
+    """Generate the actual visualization from the frame _reduce_for_render produced."""
     
     chart_type = params["chart_type"]
     
@@ -279,7 +422,9 @@ async def _generate_visualization(df: pd.DataFrame, params: Dict[str, Any]) -> D
     sns.set_palette("husl")
     
     try:
-        if chart_type == "bar":
+        if params.get("output_format") == "vega-lite":
+            return await _create_chart_spec(df, params)
+        elif chart_type == "bar":
             return await _create_bar_chart(df, params)
         elif chart_type == "line":
             return await _create_line_chart(df, params)
@@ -309,80 +454,105 @@ async def _generate_visualization(df: pd.DataFrame, params: Dict[str, Any]) -> D
 async def _create_bar_chart(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create bar chart."""
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
     x_col = params["columns"]["x"]
     y_col = params["columns"]["y"]
     group_by = params["columns"]["group_by"]
     
-    if y_col:
-        # Grouped bar chart
-        if group_by:
-            data_pivot = df.pivot_table(values=y_col, index=x_col, columns=group_by, aggfunc='sum', fill_value=0)
-            data_pivot.plot(kind='bar', ax=ax, rot=45)
+    with get_figure_pool().figure((10, 6)) as (fig, ax):
+        if y_col:
+            # Grouped bar chart
+            if group_by:
+                data_pivot = df.pivot_table(values=y_col, index=x_col, columns=group_by, aggfunc='sum', fill_value=0, observed=True)
+                data_pivot.plot(kind='bar', ax=ax, rot=45)
+            else:
+                df.groupby(x_col, observed=True)[y_col].sum().plot(kind='bar', ax=ax, rot=45)
         else:
-            df.groupby(x_col)[y_col].sum().plot(kind='bar', ax=ax, rot=45)
-    else:
-        # Simple count bar chart
-        df[x_col].value_counts().head(20).plot(kind='bar', ax=ax, rot=45)
-    
-    ax.set_title(params["title"])
-    ax.set_xlabel(x_col)
-    ax.set_ylabel(y_col if y_col else "Count")
-    plt.tight_layout()
-    
-    # Convert to base64
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
+            # Simple count bar chart
+            df.set_index(x_col)["count"].plot(kind='bar', ax=ax, rot=45)
+        
+        ax.set_title(params["title"])
+        ax.set_xlabel(x_col)
+        ax.set_ylabel(y_col if y_col else "Count")
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "bar",
         "data_summary": {
             "x_column": x_col,
             "y_column": y_col,
-            "categories": int(df[x_col].nunique()),
-            "total_records": len(df)
+            "categories": params["source"]["categories"],
+            "total_records": params["source"]["rows"]
         }
     }
 
 
+async def _line_series(df: pd.DataFrame, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Sorted (x, y) points per line, downsampled to the chart's point budget."""
+    
+    x_col = params["columns"]["x"]
+    y_col = params["columns"]["y"]
+    group_by = params["columns"]["group_by"]
+    
+    data = df.dropna(subset=[x_col, y_col])
+    groups = list(data.groupby(group_by, observed=True, sort=False)) if group_by else [(None, data)]
+    budget = max(point_budget() // max(len(groups), 1), 2)
+    numeric_y = pd.api.types.is_numeric_dtype(data[y_col]) and not pd.api.types.is_bool_dtype(data[y_col])
+    
+    series = []
+    for label, part in groups:
+        part = part.sort_values(x_col, kind="stable")
+        if numeric_y:
+            keep = downsample_line(axis_values(part[x_col]), part[y_col].to_numpy(dtype=np.float64), budget)
+        else:
+            keep = np.unique(np.linspace(0, len(part) - 1, min(len(part), budget)).astype(np.int64))
+        series.append({
+            "label": label,
+            "x": part[x_col].iloc[keep],
+            "y": part[y_col].iloc[keep],
+            "rows": len(part)
+        })
+    return series
+
+
 async def _create_line_chart(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create line chart."""
     
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
     x_col = params["columns"]["x"]
     y_col = params["columns"]["y"]
     group_by = params["columns"]["group_by"]
     
-    if group_by:
-        for group in df[group_by].unique():
-            group_data = df[df[group_by] == group]
-            ax.plot(group_data[x_col], group_data[y_col], label=str(group), marker='o')
-        ax.legend()
-    else:
-        # Sort by x column for better line visualization
-        df_sorted = df.sort_values(x_col)
-        ax.plot(df_sorted[x_col], df_sorted[y_col], marker='o')
-    
-    ax.set_title(params["title"])
-    ax.set_xlabel(x_col)
-    ax.set_ylabel(y_col)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    series = await _line_series(df, params)
+    points_plotted = sum(len(line["x"]) for line in series)
+    downsampled = params["source"]["downsampled"]
     
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
+    with get_figure_pool().figure((12, 6)) as (fig, ax):
+        for line in series:
+            # Markers only mean something while every point is drawn
+            ax.plot(line["x"], line["y"], label=str(line["label"]), marker=None if downsampled else 'o')
+        if group_by:
+            ax.legend()
+        
+        ax.set_title(params["title"])
+        ax.set_xlabel(x_col)
+        ax.set_ylabel(y_col)
+        ax.tick_params(axis='x', labelrotation=45)
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "line",
         "data_summary": {
             "x_column": x_col,
             "y_column": y_col,
-            "data_points": len(df),
-            "trend": await _calculate_trend(df[x_col], df[y_col]) if df[y_col].dtype in [np.number] else "N/A"
+            "data_points": params["source"]["rows"],
+            "points_plotted": points_plotted,
+            "downsampling": "minmax_lttb" if downsampled else "none",
+            "trend": params["source"]["trend"]
         }
     }
 
@@ -390,47 +560,48 @@ async def _create_line_chart(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[s
 async def _create_scatter_plot(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create scatter plot."""
     
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
     x_col = params["columns"]["x"]
     y_col = params["columns"]["y"]
     group_by = params["columns"]["group_by"]
     
-    if group_by:
-        for group in df[group_by].unique():
-            group_data = df[df[group_by] == group]
-            ax.scatter(group_data[x_col], group_data[y_col], label=str(group), alpha=0.6)
-        ax.legend()
-    else:
-        ax.scatter(df[x_col], df[y_col], alpha=0.6)
+    source = params["source"]
+    large = source["points"] > HEXBIN_THRESHOLD
     
-    # Add trend line if both columns are numeric
-    if df[x_col].dtype in [np.number] and df[y_col].dtype in [np.number]:
-        z = np.polyfit(df[x_col].dropna(), df[y_col].dropna(), 1)
-        p = np.poly1d(z)
-        ax.plot(df[x_col], p(df[x_col]), "r--", alpha=0.8, label="Trend")
-    
-    ax.set_title(params["title"])
-    ax.set_xlabel(x_col)
-    ax.set_ylabel(y_col)
-    plt.tight_layout()
-    
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
-    
-    # Calculate correlation if both numeric
-    correlation = None
-    if df[x_col].dtype in [np.number] and df[y_col].dtype in [np.number]:
-        correlation = round(float(df[x_col].corr(df[y_col])), 3)
+    with get_figure_pool().figure((10, 8)) as (fig, ax):
+        if large and not group_by:
+            # Density instead of millions of overlapping markers
+            bins = ax.hexbin(df[x_col], df[y_col], gridsize=60, bins='log', mincnt=1, cmap='viridis')
+            fig.colorbar(bins, ax=ax, label="Count")
+            rendering = "hexbin"
+        else:
+            if group_by:
+                for group, group_data in df.groupby(group_by, observed=True, sort=False):
+                    ax.scatter(group_data[x_col], group_data[y_col], label=str(group), alpha=0.6)
+                ax.legend()
+            else:
+                ax.scatter(df[x_col], df[y_col], alpha=0.6)
+            rendering = "sampled_points" if large else "points"
+        
+        # Trend line fitted on every point, drawn from its two endpoints
+        if "fit" in source:
+            ax.plot(source["x_range"], np.polyval(source["fit"], source["x_range"]), "r--", alpha=0.8, label="Trend")
+        
+        ax.set_title(params["title"])
+        ax.set_xlabel(x_col)
+        ax.set_ylabel(y_col)
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "scatter",
         "data_summary": {
             "x_column": x_col,
             "y_column": y_col,
-            "data_points": len(df),
-            "correlation": correlation
+            "data_points": source["rows"],
+            "rendering": rendering,
+            "correlation": source["correlation"]
         }
     }
 
@@ -438,36 +609,35 @@ async def _create_scatter_plot(df: pd.DataFrame, params: Dict[str, Any]) -> Dict
 async def _create_histogram(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create histogram."""
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
     x_col = params["columns"]["x"]
     
-    ax.hist(df[x_col].dropna(), bins=30, alpha=0.7, edgecolor='black')
-    ax.set_title(params["title"])
-    ax.set_xlabel(x_col)
-    ax.set_ylabel("Frequency")
-    
     # Add statistics
-    mean_val = df[x_col].mean()
-    median_val = df[x_col].median()
-    ax.axvline(mean_val, color='red', linestyle='--', label=f'Mean: {mean_val:.2f}')
-    ax.axvline(median_val, color='green', linestyle='--', label=f'Median: {median_val:.2f}')
-    ax.legend()
+    source = params["source"]
+    mean_val = source["mean"]
+    median_val = source["median"]
     
-    plt.tight_layout()
-    
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
+    with get_figure_pool().figure((10, 6)) as (fig, ax):
+        _draw_bins(ax, df)
+        ax.set_title(params["title"])
+        ax.set_xlabel(x_col)
+        ax.set_ylabel("Frequency")
+        
+        ax.axvline(mean_val, color='red', linestyle='--', label=f'Mean: {mean_val:.2f}')
+        ax.axvline(median_val, color='green', linestyle='--', label=f'Median: {median_val:.2f}')
+        ax.legend()
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "histogram",
         "data_summary": {
             "column": x_col,
             "mean": round(float(mean_val), 3),
             "median": round(float(median_val), 3),
-            "std": round(float(df[x_col].std()), 3),
-            "data_points": int(df[x_col].count())
+            "std": round(float(source["std"]), 3),
+            "data_points": source["count"]
         }
     }
 
@@ -475,29 +645,25 @@ async def _create_histogram(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[st
 async def _create_box_plot(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create box plot."""
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
     x_col = params["columns"]["x"]
     y_col = params["columns"]["y"]
     
-    if y_col and x_col:
-        # Grouped box plot
-        df.boxplot(column=y_col, by=x_col, ax=ax)
+    with get_figure_pool().figure((10, 6)) as (fig, ax):
+        ax.bxp(params["source"]["boxes"])
         ax.set_title(params["title"])
-    else:
-        # Simple box plot
-        column = y_col or x_col
-        ax.boxplot(df[column].dropna())
-        ax.set_title(params["title"])
-        ax.set_ylabel(column)
-    
-    plt.tight_layout()
-    
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
+        if y_col and x_col:
+            # Grouped box plot
+            ax.set_xlabel(x_col)
+            ax.set_ylabel(y_col)
+            ax.tick_params(axis='x', labelrotation=45)
+        else:
+            ax.set_ylabel(y_col or x_col)
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "box",
         "data_summary": {
             "columns_analyzed": [col for col in [x_col, y_col] if col],
@@ -509,28 +675,33 @@ async def _create_box_plot(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str
 async def _create_heatmap(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create correlation heatmap."""
     
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
-    # Select numeric columns
-    numeric_df = df.select_dtypes(include=[np.number])
+    # The reduced frame is the correlation matrix of the numeric columns
+    corr_matrix = df
     
-    if len(numeric_df.columns) < 2:
+    if len(corr_matrix.columns) < 2:
         return {"error": "Need at least 2 numeric columns for heatmap"}
     
-    # Calculate correlation matrix
-    corr_matrix = numeric_df.corr()
-    
-    # Create heatmap
-    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
-                square=True, ax=ax, fmt='.2f')
-    ax.set_title(params["title"])
-    
-    plt.tight_layout()
-    
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
+    with get_figure_pool().figure((12, 8)) as (fig, ax):
+        # Create heatmap
+        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
+                    square=True, ax=ax, fmt='.2f')
+        ax.set_title(params["title"])
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
-    # Find strongest correlations
+    return {
+        **encoded,
+        "chart_type": "heatmap",
+        "data_summary": {
+            "variables_analyzed": len(corr_matrix.columns),
+            "strong_correlations": _strong_correlations(corr_matrix)[:5],  # Top 5
+            "average_correlation": round(float(abs(corr_matrix).mean().mean()), 3)
+        }
+    }
+
+
+def _strong_correlations(corr_matrix: pd.DataFrame) -> List[Dict[str, Any]]:
     strong_corr = []
     for i in range(len(corr_matrix.columns)):
         for j in range(i+1, len(corr_matrix.columns)):
@@ -541,46 +712,35 @@ async def _create_heatmap(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str,
                     "var2": corr_matrix.columns[j],
                     "correlation": round(float(corr_val), 3)
                 })
-    
-    return {
-        "chart_image": img_base64,
-        "chart_type": "heatmap",
-        "data_summary": {
-            "variables_analyzed": len(numeric_df.columns),
-            "strong_correlations": strong_corr[:5],  # Top 5
-            "average_correlation": round(float(abs(corr_matrix).mean().mean()), 3)
-        }
-    }
+    return strong_corr
 
 
 async def _create_pie_chart(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create pie chart."""
     
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
     x_col = params["columns"]["x"]
     
-    # Get value counts and limit to top categories
-    value_counts = df[x_col].value_counts().head(10)
-    
-    # Create pie chart
-    wedges, texts, autotexts = ax.pie(value_counts.values, labels=value_counts.index, 
-                                      autopct='%1.1f%%', startangle=90)
-    
-    ax.set_title(params["title"])
+    # Counts of the top categories
+    value_counts = df.set_index(x_col)["count"]
     
-    # Make percentage text more readable
-    for autotext in autotexts:
-        autotext.set_color('white')
-        autotext.set_fontweight('bold')
-    
-    plt.tight_layout()
-    
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
+    with get_figure_pool().figure((10, 8)) as (fig, ax):
+        # Create pie chart
+        wedges, texts, autotexts = ax.pie(value_counts.values, labels=value_counts.index, 
+                                          autopct='%1.1f%%', startangle=90)
+        
+        ax.set_title(params["title"])
+        
+        # Make percentage text more readable
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_fontweight('bold')
+        
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "pie",
         "data_summary": {
             "column": x_col,
@@ -597,29 +757,31 @@ async def _create_pie_chart(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[st
 async def _create_violin_plot(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create violin plot."""
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
     x_col = params["columns"]["x"]
     y_col = params["columns"]["y"]
     
-    if x_col and y_col:
-        sns.violinplot(data=df, x=x_col, y=y_col, ax=ax)
-    else:
-        column = y_col or x_col
-        sns.violinplot(y=df[column], ax=ax)
-    
-    ax.set_title(params["title"])
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    # Kernel density estimates cost O(rows) per grid point, so they are fitted on a sample
+    sample = sample_rows(df, KDE_SAMPLE_SIZE)
     
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
+    with get_figure_pool().figure((10, 6)) as (fig, ax):
+        if x_col and y_col:
+            sns.violinplot(data=sample, x=x_col, y=y_col, ax=ax)
+        else:
+            column = y_col or x_col
+            sns.violinplot(y=sample[column], ax=ax)
+        
+        ax.set_title(params["title"])
+        ax.tick_params(axis='x', labelrotation=45)
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "violin",
         "data_summary": {
             "columns_analyzed": [col for col in [x_col, y_col] if col],
+            "rows_sampled": len(sample),
             "distribution_info": "Check visualization for distribution shapes"
         }
     }
@@ -638,15 +800,15 @@ async def _create_pair_plot(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[st
     columns_to_plot = numeric_df.columns[:5]
     plot_df = numeric_df[columns_to_plot]
     
-    # Create pair plot
+    # Create pair plot (seaborn builds its own figure grid, so it is not pooled)
     g = sns.pairplot(plot_df, diag_kind='hist')
     g.fig.suptitle(params["title"], y=1.02)
     
-    img_base64 = await _fig_to_base64(g.fig)
+    encoded = await _encode_chart(g.fig, params)
     plt.close(g.fig)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "pair",
         "data_summary": {
             "variables_analyzed": len(columns_to_plot),
@@ -659,101 +821,186 @@ async def _create_pair_plot(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[st
 async def _create_dashboard(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
     """Create a comprehensive dashboard."""
     
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    fig.suptitle(f"Data Dashboard - {params['title']}", fontsize=16)
-    
-    # Top-left: Data overview
-    ax1 = axes[0, 0]
-    overview_text = f"""
-    Dataset Overview:
-    • Rows: {len(df):,}
-    • Columns: {len(df.columns)}
-    • Missing Values: {df.isnull().sum().sum():,}
-    • Numeric Columns: {len(df.select_dtypes(include=[np.number]).columns)}
-    • Categorical Columns: {len(df.select_dtypes(include=['object']).columns)}
-    """
-    ax1.text(0.1, 0.5, overview_text, fontsize=12, verticalalignment='center',
-             transform=ax1.transAxes)
-    ax1.set_title("Dataset Overview")
-    ax1.axis('off')
-    
-    # Top-right: Missing data pattern
-    ax2 = axes[0, 1]
-    missing_data = df.isnull().sum().head(10)
-    if missing_data.sum() > 0:
-        missing_data.plot(kind='bar', ax=ax2)
-        ax2.set_title("Missing Data by Column")
-        ax2.set_ylabel("Missing Count")
-    else:
-        ax2.text(0.5, 0.5, "No Missing Data", ha='center', va='center',
-                transform=ax2.transAxes, fontsize=14)
-        ax2.set_title("Missing Data Analysis")
-        ax2.axis('off')
-    
-    # Bottom-left: Numeric columns correlation (if available)
-    ax3 = axes[1, 0]
-    numeric_df = df.select_dtypes(include=[np.number])
-    if len(numeric_df.columns) > 1:
-        corr_matrix = numeric_df.corr()
-        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0,
-                   square=True, ax=ax3, fmt='.2f', cbar_kws={'shrink': 0.8})
-        ax3.set_title("Correlation Matrix")
-    else:
-        ax3.text(0.5, 0.5, "Need 2+ numeric columns\nfor correlation", 
-                ha='center', va='center', transform=ax3.transAxes, fontsize=12)
-        ax3.set_title("Correlation Analysis")
-        ax3.axis('off')
-    
-    # Bottom-right: Data distribution (first numeric column)
-    ax4 = axes[1, 1]
-    if len(numeric_df.columns) > 0:
-        first_numeric = numeric_df.columns[0]
-        ax4.hist(numeric_df[first_numeric].dropna(), bins=20, alpha=0.7, edgecolor='black')
-        ax4.set_title(f"Distribution: {first_numeric}")
-        ax4.set_xlabel(first_numeric)
-        ax4.set_ylabel("Frequency")
-    else:
-        # Show categorical distribution instead
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        if len(categorical_cols) > 0:
-            first_cat = categorical_cols[0]
-            df[first_cat].value_counts().head(10).plot(kind='bar', ax=ax4)
-            ax4.set_title(f"Top Categories: {first_cat}")
-            ax4.tick_params(axis='x', rotation=45)
-        else:
-            ax4.text(0.5, 0.5, "No suitable columns\nfor distribution plot", 
-                    ha='center', va='center', transform=ax4.transAxes, fontsize=12)
-            ax4.set_title("Data Distribution")
-            ax4.axis('off')
-    
-    plt.tight_layout()
+    source = params["source"]
+    total_rows = source["rows"]
+    total_columns = source["columns"]
+    missing_values = int(source["missing"].sum())
     
-    img_base64 = await _fig_to_base64(fig)
-    plt.close(fig)
+    with get_figure_pool().figure((16, 12), nrows=2, ncols=2) as (fig, axes):
+        fig.suptitle(f"Data Dashboard - {params['title']}", fontsize=16)
+        
+        # Top-left: Data overview
+        ax1 = axes[0, 0]
+        overview_text = f"""
+        Dataset Overview:
+        • Rows: {total_rows:,}
+        • Columns: {total_columns}
+        • Missing Values: {missing_values:,}
+        • Numeric Columns: {source["numeric_columns"]}
+        • Categorical Columns: {source["categorical_columns"]}
+        """
+        ax1.text(0.1, 0.5, overview_text, fontsize=12, verticalalignment='center',
+                 transform=ax1.transAxes)
+        ax1.set_title("Dataset Overview")
+        ax1.axis('off')
+        
+        # Top-right: Missing data pattern
+        ax2 = axes[0, 1]
+        missing_data = source["missing"].head(10)
+        if missing_data.sum() > 0:
+            missing_data.plot(kind='bar', ax=ax2)
+            ax2.set_title("Missing Data by Column")
+            ax2.set_ylabel("Missing Count")
+        else:
+            ax2.text(0.5, 0.5, "No Missing Data", ha='center', va='center',
+                    transform=ax2.transAxes, fontsize=14)
+            ax2.set_title("Missing Data Analysis")
+            ax2.axis('off')
+        
+        # Bottom-left: Numeric columns correlation (if available)
+        ax3 = axes[1, 0]
+        corr_matrix = source["correlation"]
+        if corr_matrix is not None:
+            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0,
+                       square=True, ax=ax3, fmt='.2f', cbar_kws={'shrink': 0.8})
+            ax3.set_title("Correlation Matrix")
+        else:
+            ax3.text(0.5, 0.5, "Need 2+ numeric columns\nfor correlation", 
+                    ha='center', va='center', transform=ax3.transAxes, fontsize=12)
+            ax3.set_title("Correlation Analysis")
+            ax3.axis('off')
+        
+        # Bottom-right: Data distribution (first numeric column)
+        ax4 = axes[1, 1]
+        distribution = source.get("distribution")
+        if distribution is not None and "bins" in distribution:
+            first_numeric = distribution["column"]
+            _draw_bins(ax4, distribution["bins"])
+            ax4.set_title(f"Distribution: {first_numeric}")
+            ax4.set_xlabel(first_numeric)
+            ax4.set_ylabel("Frequency")
+        else:
+            # Show categorical distribution instead
+            if distribution is not None:
+                first_cat = distribution["column"]
+                distribution["counts"].set_index(first_cat)["count"].plot(kind='bar', ax=ax4)
+                ax4.set_title(f"Top Categories: {first_cat}")
+                ax4.tick_params(axis='x', rotation=45)
+            else:
+                ax4.text(0.5, 0.5, "No suitable columns\nfor distribution plot", 
+                        ha='center', va='center', transform=ax4.transAxes, fontsize=12)
+                ax4.set_title("Data Distribution")
+                ax4.axis('off')
+        
+        fig.tight_layout()
+        
+        encoded = await _encode_chart(fig, params)
     
     return {
-        "chart_image": img_base64,
+        **encoded,
         "chart_type": "dashboard",
         "data_summary": {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "missing_values": int(df.isnull().sum().sum()),
-            "data_quality_score": round(((len(df) * len(df.columns) - df.isnull().sum().sum()) / (len(df) * len(df.columns))) * 100, 1)
+            "total_rows": total_rows,
+            "total_columns": total_columns,
+            "missing_values": missing_values,
+            "data_quality_score": round(((total_rows * total_columns - missing_values) / (total_rows * total_columns)) * 100, 1)
         }
     }
 
 
-async def _fig_to_base64(fig) -> str:
-    """Convert matplotlib figure to base64 string."""
+async def _create_chart_spec(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a Vega-Lite spec from the same reduced frame the image renderers draw."""
     
-    buffer = BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
+    chart_type = params["chart_type"]
+    x_col = params["columns"]["x"]
+    y_col = params["columns"]["y"]
+    group_by = params["columns"]["group_by"]
+    title = params["title"]
     
-    img_base64 = base64.b64encode(buffer.getvalue()).decode()
-    buffer.close()
+    if chart_type == "bar":
+        if y_col:
+            keys = [x_col, group_by] if group_by else [x_col]
+            data = df.groupby(keys, observed=True)[y_col].sum().reset_index()
+            value_field = y_col
+        else:
+            data = df
+            value_field = "count"
+        encoding = {
+            "x": {"field": x_col, "type": "nominal", "sort": "-y"},
+            "y": {"field": value_field, "type": "quantitative"}
+        }
+        if group_by and y_col:
+            encoding.update({"color": {"field": group_by, "type": "nominal"}, "xOffset": {"field": group_by}})
+        spec = vega_lite_spec("bar", data, encoding, title)
     
-    return img_base64
+    elif chart_type == "line":
+        series = await _line_series(df, params)
+        frames = [pd.DataFrame({x_col: line["x"].to_numpy(), y_col: line["y"].to_numpy()}).assign(**({group_by: line["label"]} if group_by else {}))
+                  for line in series]
+        data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[x_col, y_col])
+        x_type = "temporal" if pd.api.types.is_datetime64_any_dtype(df[x_col]) else (
+            "quantitative" if pd.api.types.is_numeric_dtype(df[x_col]) else "ordinal")
+        encoding = {
+            "x": {"field": x_col, "type": x_type},
+            "y": {"field": y_col, "type": "quantitative"}
+        }
+        if group_by:
+            encoding["color"] = {"field": group_by, "type": "nominal"}
+        spec = vega_lite_spec("line", data, encoding, title)
+    
+    elif chart_type == "scatter":
+        data = df
+        encoding = {
+            "x": {"field": x_col, "type": "quantitative"},
+            "y": {"field": y_col, "type": "quantitative"}
+        }
+        if group_by:
+            encoding["color"] = {"field": group_by, "type": "nominal"}
+        spec = vega_lite_spec({"type": "point", "opacity": 0.6}, data, encoding, title)
+    
+    elif chart_type == "histogram":
+        data = df
+        encoding = {
+            "x": {"field": "bin_start", "type": "quantitative", "bin": {"binned": True}, "title": x_col},
+            "x2": {"field": "bin_end"},
+            "y": {"field": "count", "type": "quantitative"}
+        }
+        spec = vega_lite_spec("bar", data, encoding, title)
+    
+    elif chart_type == "pie":
+        data = df
+        encoding = {
+            "theta": {"field": "count", "type": "quantitative"},
+            "color": {"field": x_col, "type": "nominal"}
+        }
+        spec = vega_lite_spec("arc", data, encoding, title)
+    
+    else:  # heatmap
+        data = df.round(3).rename_axis("var1").reset_index().melt(id_vars="var1", var_name="var2", value_name="correlation")
+        encoding = {
+            "x": {"field": "var1", "type": "nominal"},
+            "y": {"field": "var2", "type": "nominal"},
+            "color": {"field": "correlation", "type": "quantitative", "scale": {"scheme": "redblue", "domain": [-1, 1]}}
+        }
+        spec = vega_lite_spec("rect", data, encoding, title)
+    
+    payload = json.dumps(spec, default=str)
+    return {
+        "chart_spec": spec,
+        "chart_type": chart_type,
+        "image_format": "vega-lite",
+        "mime_type": OUTPUT_FORMATS["vega-lite"],
+        "payload_bytes": len(payload.encode("utf-8")),
+        "data_summary": {
+            "data_points": params["source"]["rows"],
+            "points_in_spec": len(spec["data"]["values"])
+        }
+    }
+
+
+async def _encode_chart(fig, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode a rendered figure in the requested image format."""
+    return encode_figure(fig, params.get("output_format", "png"), params.get("dpi", 0))
 
 
 async def _calculate_trend(x_series: pd.Series, y_series: pd.Series) -> str:
@@ -765,8 +1012,8 @@ async def _calculate_trend(x_series: pd.Series, y_series: pd.Series) -> str:
             return "insufficient_data"
         
         # Convert to numeric if needed
-        x_numeric = pd.to_numeric(x_series, errors='coerce')
-        y_numeric = pd.to_numeric(y_series, errors='coerce')
+        x_numeric = text_to_numeric(x_series)
+        y_numeric = text_to_numeric(y_series)
         
         # Remove NaN values
         valid_mask = ~(x_numeric.isna() | y_numeric.isna())
@@ -795,9 +1042,20 @@ async def _save_visualization(viz_result: Dict[str, Any], output_path: str) -> D
     
     try:
         output_file = Path(output_path)
+        if not output_file.suffix:
+            output_file = output_file.with_suffix(".json" if "chart_spec" in viz_result else f".{viz_result.get('image_format', 'png')}")
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Decode base64 and save as PNG
+        if "chart_spec" in viz_result:
+            spec_text = json.dumps(viz_result["chart_spec"], indent=2, default=str)
+            output_file.write_text(spec_text, encoding="utf-8")
+            return {
+                "saved": True,
+                "output_path": str(output_file),
+                "file_size": len(spec_text.encode("utf-8"))
+            }
+        
+        # Decode base64 and save in its image format
         if "chart_image" in viz_result:
             img_data = base64.b64decode(viz_result["chart_image"])
             
@@ -832,7 +1090,7 @@ async def _generate_visualization_insights(df: pd.DataFrame, params: Dict[str, A
             insights.append(f"'{top_category}' is the most common category, representing {top_percentage:.1f}% of the data")
     
     elif chart_type == "scatter" and x_col and y_col:
-        if df[x_col].dtype in [np.number] and df[y_col].dtype in [np.number]:
+        if pd.api.types.is_numeric_dtype(df[x_col]) and pd.api.types.is_numeric_dtype(df[y_col]):
             correlation = df[x_col].corr(df[y_col])
             if abs(correlation) > 0.7:
                 relationship = "strong positive" if correlation > 0 else "strong negative"
@@ -844,7 +1102,7 @@ async def _generate_visualization_insights(df: pd.DataFrame, params: Dict[str, A
                 insights.append(f"There's a weak correlation ({correlation:.3f}) between {x_col} and {y_col}")
     
     elif chart_type == "histogram" and x_col:
-        if df[x_col].dtype in [np.number]:
+        if pd.api.types.is_numeric_dtype(df[x_col]):
             skewness = df[x_col].skew()
             if abs(skewness) > 1:
                 direction = "right" if skewness > 0 else "left"
@@ -856,7 +1114,7 @@ async def _generate_visualization_insights(df: pd.DataFrame, params: Dict[str, A
                 insights.append(f"The distribution of {x_col} is approximately normal")
     
     elif chart_type == "line" and x_col and y_col:
-        if df[y_col].dtype in [np.number]:
+        if pd.api.types.is_numeric_dtype(df[y_col]):
             trend = await _calculate_trend(df[x_col], df[y_col])
             if trend == "increasing":
                 insights.append(f"{y_col} shows an increasing trend over {x_col}")
@@ -887,7 +1145,7 @@ async def _generate_visualization_recommendations(df: pd.DataFrame, params: Dict
     
     # Chart-specific recommendations
     if chart_type == "scatter" and x_col and y_col:
-        if df[x_col].dtype in [np.number] and df[y_col].dtype in [np.number]:
+        if pd.api.types.is_numeric_dtype(df[x_col]) and pd.api.types.is_numeric_dtype(df[y_col]):
             correlation = abs(df[x_col].corr(df[y_col]))
             if correlation > 0.7:
                 recommendations.append("Strong correlation detected - consider predictive modeling")
@@ -905,7 +1163,7 @@ async def _generate_visualization_recommendations(df: pd.DataFrame, params: Dict
         recommendations.append("Use 'trend-analysis' prompt for detailed temporal patterns")
     
     elif chart_type == "histogram":
-        if x_col and df[x_col].dtype in [np.number]:
+        if x_col and pd.api.types.is_numeric_dtype(df[x_col]):
             # Check for outliers
             q1, q3 = df[x_col].quantile([0.25, 0.75])
             iqr = q3 - q1
@@ -9,8 +9,9 @@ from typing import Dict, Any, List, Optional
 from pathlib import Path
 import json
 from datetime import datetime
-import base64
-from io import BytesIO
+
+from src.core.executor import get_executor, run_coroutine
+from src.core.report_writer import table_rows, write_pdf_report, write_report
 
 
 async def export_report_tool(
@@ -32,8 +33,10 @@ async def export_report_tool(
         # Prepare report data
         report_data = await _prepare_report_data(content, template)
         
-        # Generate report based on format
-        export_result = await _generate_report(report_data, format, template, output_path)
+        # Generate report based on format (section writing and PDF rendering run in the process pool)
+        export_result = await get_executor().run_in_process(
+            "export_report", run_coroutine, _generate_report, report_data, format, template, output_path
+        )
         
         return {
             "export_status": "success",
@@ -42,7 +45,7 @@ async def export_report_tool(
             "output_path": export_result.get("output_path", ""),
             "report_summary": {
                 "sections": len(report_data.get("sections", [])),
-                "total_content_length": sum(len(str(section.get("content", ""))) for section in report_data.get("sections", [])),
+                "total_content_length": sum(_content_length(section.get("content", "")) for section in report_data.get("sections", [])),
                 "generation_timestamp": datetime.now().isoformat(),
                 "file_size": export_result.get("file_size", 0)
             },
@@ -65,6 +68,20 @@ async def export_report_tool(
         }
 
 
+def _content_length(value: Any) -> int:
+    """Characters of content in a section, counted without rendering large tables to one string."""
+    
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_content_length(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_content_length(item) for item in value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.size)
+    return len(str(value))
+
+
 async def _validate_export_params(
     content: Dict[str, Any],
     format: str,
@@ -321,122 +338,12 @@ async def _generate_html_report(
     template: str,
     output_path: str
 ) -> Dict[str, Any]:
-    """Generate HTML report."""
-    
-    # HTML template based on style
-    if template == "executive":
-        css_style = """
-        <style>
-            body { font-family: 'Segoe UI', Arial, sans-serif; line-height: 1.6; margin: 40px; background: #f8f9fa; }
-            .container { max-width: 1000px; margin: 0 auto; background: white; padding: 40px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-            h1 { color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }
-            h2 { color: #34495e; margin-top: 30px; }
-            .exec-summary { background: #ecf0f1; padding: 20px; border-left: 4px solid #3498db; margin: 20px 0; }
-            .metric { display: inline-block; margin: 10px 20px 10px 0; padding: 10px; background: #3498db; color: white; border-radius: 4px; }
-            ul { margin: 10px 0; }
-            li { margin: 5px 0; }
-        </style>
-        """
-    else:
-        css_style = """
-        <style>
-            body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; }
-            .container { max-width: 800px; }
-            h1 { color: #333; border-bottom: 2px solid #007acc; }
-            h2 { color: #444; margin-top: 25px; }
-            .section { margin: 20px 0; }
-            ul { margin: 10px 0; }
-            li { margin: 3px 0; }
-        </style>
-        """
-    
-    # Build HTML content
-    html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{report_data['title']}</title>
-    {css_style}
-</head>
-<body>
-    <div class="container">
-        <h1>{report_data['title']}</h1>
-        <p><em>{report_data['subtitle']}</em></p>
-        <p><strong>Generated:</strong> {datetime.fromisoformat(report_data['generated_at']).strftime('%B %d, %Y at %I:%M %p')}</p>
-"""
+    """Generate HTML report, streamed section by section with charts as linked files."""
     
-    # Add sections
-    for section in report_data['sections']:
-        html_content += f'\n        <div class="section">\n'
-        html_content += f'            <h2>{section["title"]}</h2>\n'
-        
-        content = section['content']
-        if section['type'] == 'executive_summary':
-            html_content += '            <div class="exec-summary">\n'
-            if isinstance(content, dict) and 'summary_points' in content:
-                html_content += '                <ul>\n'
-                for point in content['summary_points']:
-                    html_content += f'                    <li>{point}</li>\n'
-                html_content += '                </ul>\n'
-            html_content += '            </div>\n'
-        
-        elif section['type'] == 'findings' or section['type'] == 'recommendations':
-            if isinstance(content, list):
-                html_content += '            <ul>\n'
-                for item in content:
-                    html_content += f'                <li>{item}</li>\n'
-                html_content += '            </ul>\n'
-        
-        elif section['type'] == 'data_summary':
-            if isinstance(content, dict):
-                for key, value in content.items():
-                    html_content += f'            <div class="metric"><strong>{key.replace("_", " ").title()}:</strong> {value}</div>\n'
-        
-        else:
-            # Generic content rendering
-            if isinstance(content, dict):
-                html_content += '            <ul>\n'
-                for key, value in content.items():
-                    if isinstance(value, (list, dict)):
-                        continue  # Skip complex nested structures
-                    html_content += f'                <li><strong>{key.replace("_", " ").title()}:</strong> {value}</li>\n'
-                html_content += '            </ul>\n'
-            elif isinstance(content, list):
-                html_content += '            <ul>\n'
-                for item in content:
-                    html_content += f'                <li>{item}</li>\n'
-                html_content += '            </ul>\n'
-            else:
-                html_content += f'            <p>{content}</p>\n'
-        
-        html_content += '        </div>\n'
-    
-    html_content += """
-    </div>
-</body>
-</html>"""
-    
-    # Save file
-    if output_path:
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        return {
-            "format": "html",
-            "output_path": str(output_file),
-            "file_size": len(html_content.encode('utf-8')),
-            "preview_url": f"file://{output_file.absolute()}"
-        }
-    else:
-        # Return content for preview
-        return {
-            "format": "html",
-            "content": html_content,
-            "file_size": len(html_content.encode('utf-8'))
-        }
+    result = write_report(report_data, template, "html", output_path)
+    if "output_path" in result:
+        result["preview_url"] = f"file://{Path(result['output_path']).absolute()}"
+    return result
 
 
 async def _generate_markdown_report(
@@ -444,82 +351,9 @@ async def _generate_markdown_report(
     template: str,
     output_path: str
 ) -> Dict[str, Any]:
-    """Generate Markdown report."""
+    """Generate Markdown report, streamed section by section with charts as linked files."""
     
-    # Build markdown content
-    md_content = f"""# {report_data['title']}
-
-*{report_data['subtitle']}*
-
-**Generated:** {datetime.fromisoformat(report_data['generated_at']).strftime('%B %d, %Y at %I:%M %p')}
-
----
-
-"""
-    
-    # Add sections
-    for section in report_data['sections']:
-        md_content += f"\n## {section['title']}\n\n"
-        
-        content = section['content']
-        if section['type'] == 'executive_summary':
-            if isinstance(content, dict) and 'summary_points' in content:
-                for point in content['summary_points']:
-                    md_content += f"- {point}\n"
-                md_content += "\n"
-        
-        elif section['type'] == 'findings' or section['type'] == 'recommendations':
-            if isinstance(content, list):
-                for item in content:
-                    md_content += f"- {item}\n"
-                md_content += "\n"
-        
-        elif section['type'] == 'data_summary':
-            if isinstance(content, dict):
-                for key, value in content.items():
-                    md_content += f"**{key.replace('_', ' ').title()}:** {value}  \n"
-                md_content += "\n"
-        
-        else:
-            # Generic content rendering
-            if isinstance(content, dict):
-                for key, value in content.items():
-                    if isinstance(value, (list, dict)):
-                        continue  # Skip complex nested structures
-                    md_content += f"**{key.replace('_', ' ').title()}:** {value}  \n"
-                md_content += "\n"
-            elif isinstance(content, list):
-                for item in content:
-                    md_content += f"- {item}\n"
-                md_content += "\n"
-            else:
-                md_content += f"{content}\n\n"
-    
-    # Add footer
-    md_content += f"\n---\n*Report generated by BI MCP Server*"
-    
-    # Save file
-    if output_path:
-        output_file = Path(output_path)
-        if not output_file.suffix:
-            output_file = output_file.with_suffix('.md')
-        
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(md_content)
-        
-        return {
-            "format": "markdown",
-            "output_path": str(output_file),
-            "file_size": len(md_content.encode('utf-8'))
-        }
-    else:
-        return {
-            "format": "markdown",
-            "content": md_content,
-            "file_size": len(md_content.encode('utf-8'))
-        }
+    return write_report(report_data, template, "markdown", output_path)
 
 
 async def _generate_json_report(
@@ -541,10 +375,9 @@ async def _generate_json_report(
         "sections": report_data['sections']
     }
     
-    # Serialize to JSON
-    json_content = json.dumps(json_data, indent=2, ensure_ascii=False, default=str)
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=str)
     
-    # Save file
+    # Save file, writing the encoder's chunks as they are produced
     if output_path:
         output_file = Path(output_path)
         if not output_file.suffix:
@@ -553,14 +386,16 @@ async def _generate_json_report(
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(json_content)
+            for chunk in encoder.iterencode(json_data):
+                f.write(chunk)
         
         return {
             "format": "json",
             "output_path": str(output_file),
-            "file_size": len(json_content.encode('utf-8'))
+            "file_size": output_file.stat().st_size
         }
     else:
+        json_content = encoder.encode(json_data)
         return {
             "format": "json",
             "content": json_content,
@@ -573,51 +408,16 @@ async def _generate_pdf_report(
     template: str,
     output_path: str
 ) -> Dict[str, Any]:
-    """Generate PDF report (simplified implementation)."""
-    
-    # For a full implementation, you would use libraries like reportlab, weasyprint, or pdfkit
-    # Here we'll generate HTML first and suggest PDF conversion
+    """Generate PDF report (HTML-to-PDF renderer if installed, built-in page layout otherwise)."""
     
-    html_result = await _generate_html_report(report_data, template, "")
-    html_content = html_result.get("content", "")
-    
-    if output_path:
-        # In a real implementation, convert HTML to PDF
-        output_file = Path(output_path)
-        if not output_file.suffix:
-            output_file = output_file.with_suffix('.pdf')
-        
-        # Simulate PDF generation (in reality, you'd use a PDF library)
-        pdf_placeholder = f"""PDF Report Placeholder
-        
-Title: {report_data['title']}
-Generated: {report_data['generated_at']}
-
-To generate actual PDF, install a PDF library like:
-- reportlab: pip install reportlab
-- weasyprint: pip install weasyprint  
-- pdfkit: pip install pdfkit
-
-HTML content is ready for conversion."""
-        
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(pdf_placeholder)
-        
+    if not output_path:
         return {
             "format": "pdf",
-            "output_path": str(output_file),
-            "file_size": len(pdf_placeholder.encode('utf-8')),
-            "note": "PDF generation requires additional libraries - HTML version generated",
-            "html_content": html_content
-        }
-    else:
-        return {
-            "format": "pdf",
-            "note": "PDF generation requires additional libraries",
-            "suggestion": "Use HTML format or install PDF conversion library",
-            "html_alternative": html_content
+            "note": "PDF reports are written to a file",
+            "suggestion": "Provide output_path, or use HTML/Markdown format for an inline preview"
         }
+    
+    return write_pdf_report(report_data, template, output_path)
 
 
 async def _generate_pptx_report(
@@ -733,7 +533,7 @@ async def _generate_export_recommendations(
         recommendations.append("📊 Visualizations included - ensure proper display in chosen format")
     
     has_data_tables = any(
-        "correlation_results" in str(section.get("content", ""))
+        section.get("type") == "correlation_results" or table_rows(section.get("content")) is not None
         for section in report_data.get("sections", [])
     )
     
@@ -9,26 +9,31 @@ import pandas as pd
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import sqlite3
-import requests
 import logging
 from datetime import datetime
 import re
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.io as pio
-import plotly.subplots as sp
-import plotly.figure_factory as ff
-import plotly.colors as pc
-import plotly.offline as pyo
-import plotly.graph_objs as go
+
+from src.core.api_source import fetch_api
+from src.core.dataset_store import DatasetEntry, store_dataset, store_virtual_dataset
+from src.core.csv_ingest import read_csv_file
+from src.core.excel_ingest import load_excel
+from src.core.json_ingest import read_json_file, read_jsonl_file
+from src.core.profiler import text_to_numeric
+from src.core.source_pushdown import (
+    filter_frame, normalize_filters, parquet_schema, read_parquet, read_sqlite, sqlite_schema
+)
+
+PUSHDOWN_SOURCE_TYPES = ["sqlite", "parquet"]  # sources that apply columns/filters/limit while reading
 
 async def load_datasource_tool(source_path: str, source_type: str = "auto", dataset_name: str = "", options: Dict[str, Any] = {}) -> Dict[str, Any]:
     """
     Load data from various sources and prepare for analysis.
     Supports CSV, Excel, JSON, databases, and APIs.
+
+    options["columns"], options["filters"] and options["limit"] select what is loaded;
+    SQLite and Parquet sources apply them while reading. options["lazy"] registers a
+    SQLite or Parquet source as a virtual dataset that is read when a tool first uses it.
     """
     
     try:
@@ -44,19 +49,28 @@ async def load_datasource_tool(source_path: str, source_type: str = "auto", data
         if source_type == "auto":
             source_type = _detect_source_type(source_path)
         
+        # Register without reading rows when a lazy load is requested
+        if options.get('lazy', False):
+            return await _register_virtual_dataset(source_path, source_type, dataset_name, options)
+        
         # Load data based on source type
         load_result = await _load_data_by_type(source_path, source_type, options)
         
         if "error" in load_result:
             return load_result
         
+        # Sources without pushdown apply the same selection after loading
+        if source_type not in PUSHDOWN_SOURCE_TYPES and _pushdown_requested(options):
+            load_result["data"] = filter_frame(load_result["data"], **_pushdown_options(options))
+            load_result["pushdown"] = {"applied": "after load", "rows_read": len(load_result["data"])}
+        
         # Validate and clean data
         processed_data = await _process_loaded_data(load_result["data"], dataset_name)
         
         # Generate load summary
         summary = _generate_load_summary(processed_data, source_path, source_type)
         
-        return {
+        result = {
             "dataset_name": dataset_name,
             "source_path": source_path,
             "source_type": source_type,
@@ -66,9 +80,18 @@ async def load_datasource_tool(source_path: str, source_type: str = "auto", data
             "schema": processed_data["schema"],
             "data_quality": processed_data["quality_report"],
             "recommendations": processed_data["recommendations"],
+            "memory": processed_data["memory"],
             "troubleshooting": _generate_troubleshooting_tips(source_path, source_type)
         }
         
+        # Throughput statistics from loaders that report them
+        if "ingest" in load_result:
+            result["ingest"] = load_result["ingest"]
+        if "pushdown" in load_result:
+            result["pushdown"] = load_result["pushdown"]
+        
+        return result
+        
     except Exception as e:
         return {
             "dataset_name": dataset_name,
@@ -90,7 +113,7 @@ def _detect_source_type(source_path: str) -> str:
         return "excel"
     elif path_lower.endswith('.json'):
         return "json"
-    elif path_lower.endswith('.jsonl'):
+    elif path_lower.endswith(('.jsonl', '.ndjson')):
         return "jsonl"
     elif path_lower.endswith('.parquet'):
         return "parquet"
@@ -132,147 +155,41 @@ async def _load_data_by_type(source_path: str, source_type: str, options: Dict[s
 
 
 async def _load_csv(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
-    """Load CSV file with robust parsing."""
-    
-    # Default CSV options
-    csv_options = {
-        'encoding': options.get('encoding', 'utf-8'),
-        'delimiter': options.get('delimiter', ','),
-        'header': options.get('header', 0),
-        'skip_blank_lines': True,
-        'na_values': ['', 'NULL', 'null', 'N/A', 'n/a', '#N/A'],
-        'keep_default_na': True,
-        'low_memory': False
-    }
+    """Load CSV file with encoding/delimiter sniffing and a single parse pass."""
     
-    # Try different encodings if specified encoding fails
-    encodings_to_try = [csv_options['encoding'], 'utf-8', 'latin-1', 'cp1252']
-    
-    for encoding in encodings_to_try:
-        try:
-            csv_options['encoding'] = encoding
-            df = pd.read_csv(source_path, **csv_options)
-            
-            return {
-                "data": df,
-                "encoding_used": encoding,
-                "load_method": "pandas.read_csv"
-            }
-            
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            if encoding == encodings_to_try[-1]:  # Last encoding attempt
-                return {"error": f"Failed to read CSV: {str(e)}"}
-    
-    return {"error": "Could not decode CSV file with any supported encoding"}
+    try:
+        return read_csv_file(source_path, {
+            'encoding': options.get('encoding'),
+            'delimiter': options.get('delimiter'),
+            'header': options.get('header', 0)
+        })
+    except Exception as e:
+        return {"error": f"Failed to read CSV: {str(e)}"}
 
 
 async def _load_excel(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
-    """Load Excel file."""
-    
-    excel_options = {
-        'sheet_name': options.get('sheet_name', 0),  # First sheet by default
-        'header': options.get('header', 0),
-        'na_values': ['', 'NULL', 'null', 'N/A', 'n/a', '#N/A'],
-        'keep_default_na': True
-    }
-    
-    # Handle multiple sheets if requested
-    if options.get('all_sheets', False):
-        df_dict = pd.read_excel(source_path, sheet_name=None, **{k: v for k, v in excel_options.items() if k != 'sheet_name'})
-        
-        # Combine sheets or return first non-empty sheet
-        if len(df_dict) == 1:
-            df = list(df_dict.values())[0]
-            sheet_info = f"Single sheet: {list(df_dict.keys())[0]}"
-        else:
-            # Find largest sheet
-            largest_sheet = max(df_dict.keys(), key=lambda k: len(df_dict[k]))
-            df = df_dict[largest_sheet]
-            sheet_info = f"Largest sheet selected: {largest_sheet} (from {len(df_dict)} sheets)"
-    else:
-        df = pd.read_excel(source_path, **excel_options)
-        sheet_info = f"Sheet: {excel_options['sheet_name']}"
-    
-    return {
-        "data": df,
-        "sheet_info": sheet_info,
-        "load_method": "pandas.read_excel"
-    }
+    """Load Excel sheets with the fastest available engine, from the Parquet cache when unchanged."""
+    return await load_excel(source_path, options)
 
 
 async def _load_json(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
-    """Load JSON file."""
-    
-    with open(source_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Convert to DataFrame based on structure
-    if isinstance(data, list):
-        if data and isinstance(data[0], dict):
-            df = pd.DataFrame(data)
-            structure_info = f"Array of {len(data)} objects"
-        else:
-            df = pd.DataFrame({"values": data})
-            structure_info = f"Array of {len(data)} values"
-    elif isinstance(data, dict):
-        # Try to find the main data array
-        main_key = None
-        for key, value in data.items():
-            if isinstance(value, list) and value and isinstance(value[0], dict):
-                main_key = key
-                break
-        
-        if main_key:
-            df = pd.DataFrame(data[main_key])
-            structure_info = f"Object with main data in '{main_key}' key"
-        else:
-            # Flatten single object
-            df = pd.DataFrame([data])
-            structure_info = "Single object flattened to row"
-    else:
-        df = pd.DataFrame({"value": [data]})
-        structure_info = "Single value"
-    
-    return {
-        "data": df,
-        "structure_info": structure_info,
-        "load_method": "json.load + pandas.DataFrame"
-    }
+    """Load the record array of a JSON file (options["json_path"] selects it), streamed when ijson is installed."""
+    return read_json_file(source_path, options)
 
 
 async def _load_jsonl(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
-    """Load JSON Lines file."""
-    
-    records = []
-    with open(source_path, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if line:
-                try:
-                    record = json.loads(line)
-                    records.append(record)
-                except json.JSONDecodeError as e:
-                    if options.get('strict', True):
-                        return {"error": f"Invalid JSON on line {line_num}: {str(e)}"}
-                    # Skip invalid lines in non-strict mode
-                    continue
-    
-    if not records:
-        return {"error": "No valid JSON records found"}
-    
-    df = pd.DataFrame(records)
-    
-    return {
-        "data": df,
-        "records_loaded": len(records),
-        "load_method": "json.loads per line + pandas.DataFrame"
-    }
+    """Load JSON Lines file in a single streaming pass."""
+    return read_jsonl_file(source_path, options)
 
 
 async def _load_parquet(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
-    """Load Parquet file."""
+    """Load Parquet file, reading only the selected columns and the row groups that can match the filters."""
+    
+    try:
+        return read_parquet(source_path, **_pushdown_options(options))
+    except ImportError:
+        if _pushdown_requested(options):
+            return {"error": "Parquet pushdown requires pyarrow. Install pyarrow."}
     
     try:
         df = pd.read_parquet(source_path)
@@ -294,111 +211,134 @@ async def _load_tsv(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]
 
 
 async def _load_sqlite(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
-    """Load data from SQLite database."""
+    """Load data from SQLite database, with the column selection, filters and limit in the SQL."""
     
     try:
-        conn = sqlite3.connect(source_path)
+        result = read_sqlite(
+            source_path,
+            table_name=options.get('table_name', ''),
+            query=options.get('query', ''),
+            **_pushdown_options(options)
+        )
+        result["load_method"] = "pandas.read_sql_query"
+        return result
         
-        # Get table name
-        table_name = options.get('table_name')
-        if not table_name:
-            # List available tables
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [row[0] for row in cursor.fetchall()]
-            
-            if not tables:
-                conn.close()
-                return {"error": "No tables found in database"}
-            
-            table_name = tables[0]  # Use first table
-            table_info = f"Using first table: {table_name} (from {len(tables)} available)"
-        else:
-            table_info = f"Table: {table_name}"
-        
-        # Load data
-        query = options.get('query', f"SELECT * FROM {table_name}")
-        df = pd.read_sql_query(query, conn)
-        
-        conn.close()
-        
-        return {
-            "data": df,
-            "table_info": table_info,
-            "query_used": query,
-            "load_method": "pandas.read_sql_query"
-        }
-        
-    except sqlite3.Error as e:
+    except ValueError as e:
+        return {"error": str(e)}
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
         return {"error": f"SQLite error: {str(e)}"}
 
 
 async def _load_api(source_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
-    """Load data from API endpoint."""
+    """Load data from API endpoint, following pagination and revalidating cached pages."""
     
     try:
-        import requests
-        
-        # API request options
-        headers = options.get('headers', {})
-        params = options.get('params', {})
-        auth = options.get('auth', None)
-        timeout = options.get('timeout', 30)
-        
-        response = requests.get(source_path, headers=headers, params=params, auth=auth, timeout=timeout)
-        response.raise_for_status()
-        
-        # Parse response based on content type
-        content_type = response.headers.get('content-type', '').lower()
-        
-        if 'json' in content_type:
-            data = response.json()
-            # Convert to DataFrame similar to JSON loading
-            if isinstance(data, list):
-                df = pd.DataFrame(data)
-            elif isinstance(data, dict):
-                # Look for main data array
-                main_key = None
-                for key, value in data.items():
-                    if isinstance(value, list):
-                        main_key = key
-                        break
-                
-                if main_key:
-                    df = pd.DataFrame(data[main_key])
-                else:
-                    df = pd.DataFrame([data])
-            else:
-                df = pd.DataFrame({"value": [data]})
-        else:
-            # Try to parse as CSV
-            from io import StringIO
-            df = pd.read_csv(StringIO(response.text))
-        
-        return {
-            "data": df,
-            "api_info": f"Status: {response.status_code}, Content-Type: {content_type}",
-            "load_method": "requests.get + parsing"
-        }
-        
+        import httpx
     except ImportError:
-        return {"error": "API loading requires 'requests' library"}
-    except requests.RequestException as e:
+        return {"error": "API loading requires the 'httpx' library"}
+    
+    try:
+        return await fetch_api(source_path, options)
+    except ValueError as e:
+        return {"error": f"API response could not be decoded: {str(e)}"}
+    except httpx.HTTPError as e:
         return {"error": f"API request failed: {str(e)}"}
 
 
+async def _register_virtual_dataset(source_path: str, source_type: str, dataset_name: str,
+                                    options: Dict[str, Any]) -> Dict[str, Any]:
+    """Register a SQLite or Parquet source that is read on first use, reporting its schema from metadata."""
+    
+    if source_type not in PUSHDOWN_SOURCE_TYPES:
+        return {"error": f"Lazy loading supports {PUSHDOWN_SOURCE_TYPES} sources, not '{source_type}'"}
+    if source_type == "sqlite" and options.get('query'):
+        return {"error": "Lazy loading reads a table; use 'table_name' instead of 'query'"}
+    
+    pushdown = _pushdown_options(options)
+    if source_type == "parquet":
+        metadata = parquet_schema(source_path)
+    else:
+        metadata = sqlite_schema(source_path, options.get('table_name', ''))
+    
+    unknown = [col for col in (pushdown["columns"] or []) + [f[0] for f in pushdown["filters"]]
+               if col not in metadata["columns"]]
+    if unknown:
+        return {"error": f"Columns not found in source: {sorted(set(unknown))}"}
+    
+    columns = pushdown["columns"] or list(metadata["columns"])
+    # SQLite row counts are ANALYZE estimates or unknown (None); a limit caps either
+    rows = metadata["rows"]
+    if pushdown["limit"]:
+        rows = min(rows, pushdown["limit"]) if rows is not None else pushdown["limit"]
+    table_name = metadata.get("table", "")
+    
+    def load() -> pd.DataFrame:
+        if source_type == "parquet":
+            df = read_parquet(source_path, **pushdown)["data"]
+        else:
+            df = read_sqlite(source_path, table_name=table_name, **pushdown)["data"]
+        return _clean_frame(df)
+    
+    # An unfiltered Parquet file keeps its path so SQL queries can scan it without materializing
+    registered_path = source_path if source_type == "sqlite" or not _pushdown_requested(options) else ""
+    entry = store_virtual_dataset(dataset_name, load, columns, rows=rows, source_path=registered_path)
+    
+    return {
+        "dataset_name": dataset_name,
+        "source_path": source_path,
+        "source_type": source_type,
+        "load_status": "registered",
+        "mode": "virtual",
+        "schema": {
+            "columns": [{"name": col, "dtype": metadata["columns"][col]} for col in columns],
+            "total_columns": len(columns),
+            "estimated_rows": rows,
+            "rows_exact": source_type == "parquet" and not pushdown["filters"]
+        },
+        "pushdown": {
+            "columns": pushdown["columns"] or "all",
+            "filters": len(pushdown["filters"]),
+            "limit": pushdown["limit"] or None
+        },
+        "version": entry.version,
+        "note": "Data is read from the source when a tool first uses this dataset"
+    }
+
+
+def _pushdown_requested(options: Dict[str, Any]) -> bool:
+    return bool(options.get('columns') or options.get('filters') or options.get('limit'))
+
+
+def _pushdown_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Column selection, normalized filters and row limit from the load options."""
+    
+    columns = options.get('columns') or None
+    if isinstance(columns, str):
+        columns = [col.strip() for col in columns.split(',') if col.strip()]
+    return {
+        "columns": list(columns) if columns else None,
+        "filters": normalize_filters(options.get('filters')),
+        "limit": int(options.get('limit') or 0)
+    }
+
+
+def _clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Remove completely empty rows and columns and clean column names."""
+    
+    df = df.dropna(how='all').dropna(axis=1, how='all')
+    df.columns = df.columns.astype(str)
+    df.columns = df.columns.str.strip()
+    return df
+
+
 async def _process_loaded_data(df: pd.DataFrame, dataset_name: str) -> Dict[str, Any]:
     """Process and validate loaded data."""
     
     # Basic data cleaning
     original_shape = df.shape
     
-    # Remove completely empty rows and columns
-    df = df.dropna(how='all').dropna(axis=1, how='all')
-    
-    # Clean column names
-    df.columns = df.columns.astype(str)
-    df.columns = df.columns.str.strip()
+    # Remove completely empty rows and columns, clean column names
+    df = _clean_frame(df)
     
     # Generate schema information
     schema = _generate_schema(df)
@@ -412,8 +352,8 @@ async def _process_loaded_data(df: pd.DataFrame, dataset_name: str) -> Dict[str,
     # Generate recommendations
     recommendations = _generate_data_recommendations(df, quality_report)
     
-    # Store data reference (in a real implementation, this would be stored in a data store)
-    _store_dataset_reference(dataset_name, df)
+    # Register the dataset so other tools can retrieve it by name
+    entry = _store_dataset_reference(dataset_name, df)
     
     processed_shape = df.shape
     cleaning_summary = f"Shape: {original_shape} → {processed_shape}"
@@ -425,7 +365,8 @@ async def _process_loaded_data(df: pd.DataFrame, dataset_name: str) -> Dict[str,
         "schema": schema,
         "quality_report": quality_report,
         "recommendations": recommendations,
-        "cleaning_summary": cleaning_summary
+        "cleaning_summary": cleaning_summary,
+        "memory": entry.compaction()
     }
 
 
@@ -508,7 +449,7 @@ def _assess_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
     for col in df.columns:
         if df[col].dtype in ['object', 'string']:
             # Check if it could be numeric
-            numeric_values = pd.to_numeric(df[col], errors='coerce').notna().sum()
+            numeric_values = text_to_numeric(df[col]).notna().sum()
             if numeric_values > len(df) * 0.8:  # 80% numeric
                 issues.append(f"Column '{col}' appears to be numeric but stored as text")
     
@@ -691,11 +632,8 @@ def _get_file_size(file_path: str) -> str:
         return "Unknown"
 
 
-def _store_dataset_reference(dataset_name: str, df: pd.DataFrame) -> None:
-    """Store dataset reference for later use by other tools."""
-    
-    # In a real implementation, this would store the dataset in a proper data store
-    # For simulation, we just validate that we could store it
+def _store_dataset_reference(dataset_name: str, df: pd.DataFrame) -> DatasetEntry:
+    """Store dataset in the shared dataset store for later use by other tools."""
     
     if len(df) == 0:
         raise ValueError("Cannot store empty dataset")
@@ -703,8 +641,7 @@ def _store_dataset_reference(dataset_name: str, df: pd.DataFrame) -> None:
     if len(df.columns) == 0:
         raise ValueError("Cannot store dataset with no columns")
     
-    # Simulate storage success
-    pass
+    return store_dataset(dataset_name, df)
 
 
 def _generate_troubleshooting_tips(source_path: str, source_type: str) -> List[str]:
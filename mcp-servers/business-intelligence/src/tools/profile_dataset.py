@@ -5,52 +5,51 @@ Statistical profiling and data quality assessment.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional
-from pathlib import Path
-import json
-import fuzzywuzzy.fuzz
-import fuzzywuzzy.process
+from typing import Dict, Any, List, Optional, Tuple
 
+from src.core.correlation_engine import PearsonMoments
+from src.core.dataset_store import resolve_dataset, list_available_datasets
+from src.core.executor import get_executor, run_coroutine
+from src.core.profiler import DEFAULT_CHUNK_ROWS, WEEKDAY_NAMES, ColumnStats, DatasetStats, iter_chunks, profile_frame
 
-async def profile_dataset_tool(dataset_name: str, detailed: bool = True, sample_size: int = 10000) -> Dict[str, Any]:
+
+async def profile_dataset_tool(dataset_name: str, detailed: bool = True, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict[str, Any]:
     """
     Perform comprehensive statistical profiling and data quality assessment.
+
+    Every row is profiled: the dataset is streamed in chunks of chunk_rows through
+    mergeable per-column sketches, and each statistic is computed once and shared
+    by all profile sections.
     """
-    
+
     try:
         # Load dataset (in real implementation, retrieve from data store)
         df = await _load_dataset(dataset_name)
-        
+
         if df is None:
             return {
                 "error": f"Dataset '{dataset_name}' not found",
                 "suggestion": "Use 'load-datasource' tool first to load data",
                 "available_datasets": await _list_available_datasets()
             }
-        
-        # Sample data if too large
-        if len(df) > sample_size:
-            df_sample = df.sample(n=sample_size, random_state=42)
-            is_sampled = True
-        else:
-            df_sample = df.copy()
-            is_sampled = False
-        
-        # Generate comprehensive profile
-        profile = await _generate_comprehensive_profile(df_sample, detailed)
-        
+
+        # Profile on a worker thread so the event loop keeps serving other requests
+        stats, profile = await get_executor().run_in_thread(
+            "profile_dataset", _build_profile, df, chunk_rows, detailed
+        )
+
         # Add metadata
         profile.update({
             "dataset_name": dataset_name,
             "profiling_timestamp": pd.Timestamp.now().isoformat(),
             "original_shape": df.shape,
-            "profiled_shape": df_sample.shape,
-            "is_sampled": is_sampled,
-            "sample_size": sample_size if is_sampled else len(df)
+            "profiled_shape": df.shape,
+            "is_sampled": False,
+            "profiling_method": {**stats.describe(), "chunk_rows": chunk_rows}
         })
-        
+
         return profile
-        
+
     except Exception as e:
         return {
             "dataset_name": dataset_name,
@@ -59,319 +58,306 @@ async def profile_dataset_tool(dataset_name: str, detailed: bool = True, sample_
                 "Ensure dataset was loaded successfully with 'load-datasource'",
                 "Check dataset name spelling",
                 "Verify dataset is not empty or corrupted",
-                "Try with smaller sample_size if memory issues occur"
+                "Try with smaller chunk_rows if memory issues occur"
             ]
         }
 
 
+def _build_profile(df: pd.DataFrame, chunk_rows: int, detailed: bool) -> Tuple[DatasetStats, Dict[str, Any]]:
+    """Stream the dataset through the profiler and build every profile section (runs in a worker)."""
+    stats = profile_frame(df, chunk_rows=chunk_rows, detailed=detailed)
+    return stats, run_coroutine(_generate_comprehensive_profile, df, stats, detailed, chunk_rows)
+
+
 async def _load_dataset(dataset_name: str) -> Optional[pd.DataFrame]:
-    """Load dataset from storage (mock implementation)."""
-    
-    # In real implementation, this would retrieve from a proper data store
-    # For now, try to load common sample files or recently loaded data
-    
-    base_path = Path(__file__).parent.parent.parent / "data"
-    
-    # First, try to load by direct dataset_name
-    possible_files = [
-        base_path / f"{dataset_name}.csv",
-        base_path / f"{dataset_name}.xlsx", 
-        base_path / f"sample_{dataset_name}.csv",
-        base_path / f"sample_{dataset_name}.xlsx"
-    ]
-    
-    for file_path in possible_files:
-        if file_path.exists():
-            try:
-                if file_path.suffix.lower() == '.csv':
-                    return pd.read_csv(file_path)
-                elif file_path.suffix.lower() in ['.xlsx', '.xls']:
-                    return pd.read_excel(file_path)
-            except Exception:
-                continue
-    
-    # If not found by direct name, try fuzzy matching with available datasets
-    available_datasets_on_disk = await _list_available_datasets()
-    best_match_name = None
-    if available_datasets_on_disk:
-        # Use fuzzy matching to find the closest available dataset name
-        # A score_cutoff of 80 means matches must be at least 80% similar
-        match = fuzzywuzzy.process.extractOne(dataset_name, available_datasets_on_disk, score_cutoff=80)
-        if match:
-            best_match_name, score = match
-            # Try to load the best fuzzy-matched dataset
-            fuzzy_possible_files = [
-                base_path / f"{best_match_name}.csv",
-                base_path / f"{best_match_name}.xlsx",
-                base_path / f"sample_{best_match_name}.csv",
-                base_path / f"sample_{best_match_name}.xlsx"
-            ]
-            for file_path in fuzzy_possible_files:
-                if file_path.exists():
-                    try:
-                        if file_path.suffix.lower() == '.csv':
-                            return pd.read_csv(file_path)
-                        elif file_path.suffix.lower() in ['.xlsx', '.xls']:
-                            return pd.read_excel(file_path)
-                    except Exception:
-                        continue
-    
-    return None
+    """Load dataset from the shared dataset store."""
+    return resolve_dataset(dataset_name)
 
 
 async def _list_available_datasets() -> List[str]:
     """List available datasets."""
-    
-    base_path = Path(__file__).parent.parent.parent / "data"
-    datasets = []
-    
-    if base_path.exists():
-        for file_path in base_path.glob("*"):
-            if file_path.suffix.lower() in ['.csv', '.xlsx', '.xls']:
-                datasets.append(file_path.stem)
-    
-    return datasets
+    return list_available_datasets()
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
 
 
-async def _generate_comprehensive_profile(df: pd.DataFrame, detailed: bool) -> Dict[str, Any]:
+def _completeness(stats: DatasetStats) -> float:
+    total_cells = stats.rows * len(stats.columns)
+    return ((total_cells - stats.missing_cells) / total_cells) * 100
+
+
+async def _generate_comprehensive_profile(df: pd.DataFrame, stats: DatasetStats, detailed: bool,
+                                          chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict[str, Any]:
     """Generate comprehensive dataset profile."""
-    
+
+    # The sections below only look at names and dtypes; on an empty slice select_dtypes copies nothing
+    schema = df.head(0)
+    corr_matrix = _pearson_matrix(df, list(schema.select_dtypes(include=[np.number]).columns), chunk_rows)
+
     profile = {
-        "overview": await _generate_overview(df),
-        "columns": await _profile_columns(df, detailed),
-        "data_quality": await _assess_data_quality(df),
-        "statistical_summary": await _generate_statistical_summary(df),
-        "patterns": await _detect_patterns(df),
-        "business_insights": await _generate_business_insights(df),
-        "recommendations": await _generate_profiling_recommendations(df)
+        "overview": await _generate_overview(df, stats),
+        "columns": await _profile_columns(stats, detailed),
+        "data_quality": await _assess_data_quality(stats),
+        "statistical_summary": await _generate_statistical_summary(schema, stats, corr_matrix),
+        "patterns": await _detect_patterns(schema, stats),
+        "business_insights": await _generate_business_insights(schema, stats),
+        "recommendations": await _generate_profiling_recommendations(schema, stats)
     }
-    
+
     if detailed:
         profile.update({
-            "correlations": await _analyze_correlations(df),
-            "distributions": await _analyze_distributions(df),
-            "outliers": await _detect_outliers(df),
-            "temporal_analysis": await _analyze_temporal_patterns(df)
+            "correlations": await _analyze_correlations(corr_matrix),
+            "distributions": await _analyze_distributions(stats),
+            "outliers": await _detect_outliers(stats),
+            "temporal_analysis": await _analyze_temporal_patterns(stats)
         })
-    
+
     return profile
 
 
-async def _generate_overview(df: pd.DataFrame) -> Dict[str, Any]:
+def _pearson_matrix(df: pd.DataFrame, columns: List[str], chunk_rows: int) -> Optional[pd.DataFrame]:
+    """Pairwise-complete Pearson matrix of columns, summed chunk by chunk instead of over a float copy of df."""
+
+    if len(columns) < 2:
+        return None
+    moments = PearsonMoments(columns)
+    for chunk in iter_chunks(df, chunk_rows):
+        moments.update(chunk)
+    return moments.matrices().r
+
+
+async def _generate_overview(df: pd.DataFrame, stats: DatasetStats) -> Dict[str, Any]:
     """Generate high-level dataset overview."""
-    
+
     memory_usage = df.memory_usage(deep=True).sum()
-    
+    schema = df.head(0)
+
     return {
         "shape": {
-            "rows": len(df),
-            "columns": len(df.columns)
+            "rows": stats.rows,
+            "columns": len(stats.columns)
         },
         "memory_usage": {
             "bytes": int(memory_usage),
             "human_readable": f"{memory_usage / 1024 / 1024:.2f} MB"
         },
         "data_types": {
-            "numeric": len(df.select_dtypes(include=[np.number]).columns),
-            "categorical": len(df.select_dtypes(include=['object']).columns),
-            "datetime": len(df.select_dtypes(include=['datetime']).columns),
-            "boolean": len(df.select_dtypes(include=['bool']).columns)
+            "numeric": len(schema.select_dtypes(include=[np.number]).columns),
+            "categorical": len(schema.select_dtypes(include=['object', 'category']).columns),
+            "datetime": len(schema.select_dtypes(include=['datetime']).columns),
+            "boolean": len(schema.select_dtypes(include=['bool']).columns)
         },
         "completeness": {
-            "total_cells": len(df) * len(df.columns),
-            "missing_cells": int(df.isnull().sum().sum()),
-            "completeness_percentage": round(((len(df) * len(df.columns) - df.isnull().sum().sum()) / (len(df) * len(df.columns))) * 100, 2)
+            "total_cells": stats.rows * len(stats.columns),
+            "missing_cells": stats.missing_cells,
+            "completeness_percentage": round(_completeness(stats), 2)
         }
     }
 
 
-async def _profile_columns(df: pd.DataFrame, detailed: bool) -> List[Dict[str, Any]]:
+async def _profile_columns(stats: DatasetStats, detailed: bool) -> List[Dict[str, Any]]:
     """Generate detailed column profiles."""
-    
+
     column_profiles = []
-    
-    for col in df.columns:
+
+    for col in stats.columns.values():
+        unique_count = col.unique_count
         col_profile = {
-            "name": col,
-            "dtype": str(df[col].dtype),
+            "name": col.name,
+            "dtype": col.dtype,
             "basic_stats": {
-                "count": int(df[col].count()),
-                "missing": int(df[col].isnull().sum()),
-                "missing_percentage": round((df[col].isnull().sum() / len(df)) * 100, 2),
-                "unique_count": int(df[col].nunique()),
-                "uniqueness_percentage": round((df[col].nunique() / df[col].count()) * 100, 2) if df[col].count() > 0 else 0
+                "count": col.count,
+                "missing": col.missing,
+                "missing_percentage": round((col.missing / stats.rows) * 100, 2),
+                "unique_count": unique_count,
+                "uniqueness_percentage": round((unique_count / col.count) * 100, 2) if col.count > 0 else 0
             }
         }
-        
+        if col.approximate:
+            col_profile["basic_stats"]["approximate"] = True
+
         try:
             # Type-specific analysis
-            if df[col].dtype in [np.int64, np.float64]:
-                col_profile.update(await _profile_numeric_column(df[col], detailed))
-            elif df[col].dtype == 'object':
-                col_profile.update(await _profile_categorical_column(df[col], detailed))
-            elif pd.api.types.is_datetime64_any_dtype(df[col]):
-                col_profile.update(await _profile_datetime_column(df[col], detailed))
-            elif df[col].dtype == 'bool':
-                col_profile.update(await _profile_boolean_column(df[col], detailed))
+            if col.kind == "numeric":
+                col_profile.update(await _profile_numeric_column(col, detailed))
+            elif col.kind == "text":
+                col_profile.update(await _profile_categorical_column(col, detailed))
+            elif col.kind == "datetime":
+                col_profile.update(await _profile_datetime_column(col, detailed))
+            elif col.kind == "boolean":
+                col_profile.update(await _profile_boolean_column(col, detailed))
             # Handle other dtypes if necessary, or pass through
         except Exception as col_e:
-            col_profile["error"] = f"Failed to profile column '{col}': {str(col_e)}"
+            col_profile["error"] = f"Failed to profile column '{col.name}': {str(col_e)}"
             col_profile["troubleshooting"] = "Data in this column might be inconsistent or in an unexpected format, or it triggered an edge case in profiling logic. Check for mixed types or unusual values."
-        
+
         column_profiles.append(col_profile)
-    
+
     return column_profiles
 
 
-async def _profile_numeric_column(series: pd.Series, detailed: bool) -> Dict[str, Any]:
+async def _profile_numeric_column(col: ColumnStats, detailed: bool) -> Dict[str, Any]:
     """Profile numeric column."""
-    
+
+    moments = col.moments
+    has_values = moments.count > 0
+    q1, median, q3 = col.quartiles()
+
     profile = {
         "type": "numeric",
         "statistics": {
-            "mean": float(series.mean()) if not series.empty else None,
-            "median": float(series.median()) if not series.empty else None,
-            "std": float(series.std()) if not series.empty else None,
-            "min": float(series.min()) if not series.empty else None,
-            "max": float(series.max()) if not series.empty else None,
-            "range": float(series.max() - series.min()) if not series.empty else None
+            "mean": moments.mean if has_values else None,
+            "median": _float_or_none(median),
+            "std": _float_or_none(moments.std()),
+            "min": moments.min if has_values else None,
+            "max": moments.max if has_values else None,
+            "range": moments.max - moments.min if has_values else None
         }
     }
-    
-    if detailed and not series.empty:
+
+    if detailed and has_values:
         profile["statistics"].update({
-            "q1": float(series.quantile(0.25)),
-            "q3": float(series.quantile(0.75)),
-            "iqr": float(series.quantile(0.75) - series.quantile(0.25)),
-            "skewness": float(series.skew()),
-            "kurtosis": float(series.kurtosis()),
-            "variance": float(series.var())
+            "q1": float(q1),
+            "q3": float(q3),
+            "iqr": float(q3 - q1),
+            "skewness": _float_or_none(moments.skewness()),
+            "kurtosis": _float_or_none(moments.kurtosis()),
+            "variance": _float_or_none(moments.variance())
         })
-        
+
         # Distribution insights
         profile["distribution"] = {
-            "zeros_count": int((series == 0).sum()),
-            "zeros_percentage": round(((series == 0).sum() / len(series)) * 100, 2),
-            "negative_count": int((series < 0).sum()),
-            "negative_percentage": round(((series < 0).sum() / len(series)) * 100, 2)
-        }
-        
-        # Potential outliers (IQR method)
-        q1, q3 = series.quantile([0.25, 0.75])
-        iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-        outliers = series[(series < lower_bound) | (series > upper_bound)]
-        
-        profile["outliers"] = {
-            "count": len(outliers),
-            "percentage": round((len(outliers) / len(series)) * 100, 2),
-            "method": "IQR (1.5 * IQR rule)"
+            "zeros_count": moments.zeros,
+            "zeros_percentage": round((moments.zeros / col.rows) * 100, 2),
+            "negative_count": moments.negatives,
+            "negative_percentage": round((moments.negatives / col.rows) * 100, 2)
         }
-    
+
+        # Potential outliers (IQR method), counted over every row by the profiler
+        if col.outliers is not None:
+            profile["outliers"] = {
+                "count": col.outliers["count"],
+                "percentage": round((col.outliers["count"] / col.rows) * 100, 2),
+                "method": "IQR (1.5 * IQR rule)"
+            }
+
     return profile
 
 
-async def _profile_categorical_column(series: pd.Series, detailed: bool) -> Dict[str, Any]:
+async def _profile_categorical_column(col: ColumnStats, detailed: bool) -> Dict[str, Any]:
     """Profile categorical column."""
-    
-    value_counts = series.value_counts()
-    
+
+    frequencies = col.frequencies
+    top_values = frequencies.most_common(10)
+    least_common = frequencies.least_common()
+
     profile = {
         "type": "categorical",
         "categories": {
-            "unique_count": int(series.nunique()),
-            "most_frequent": str(value_counts.index[0]) if not value_counts.empty else None,
-            "most_frequent_count": int(value_counts.iloc[0]) if not value_counts.empty else 0,
-            "least_frequent": str(value_counts.index[-1]) if not value_counts.empty else None,
-            "least_frequent_count": int(value_counts.iloc[-1]) if not value_counts.empty else 0
+            "unique_count": col.unique_count,
+            "most_frequent": str(top_values[0][0]) if top_values else None,
+            "most_frequent_count": top_values[0][1] if top_values else 0,
+            "least_frequent": str(least_common[0]) if least_common else None,
+            "least_frequent_count": least_common[1] if least_common else 0
         }
     }
-    
+
     if detailed:
         # Top categories
-        top_categories = value_counts.head(10).to_dict()
-        profile["top_categories"] = {str(k): int(v) for k, v in top_categories.items()}
-        
-        # Category distribution
-        profile["distribution"] = {
-            "single_occurrence_count": int((value_counts == 1).sum()),
-            "single_occurrence_percentage": round(((value_counts == 1).sum() / len(value_counts)) * 100, 2),
-            "entropy": float(-sum((value_counts / len(series)) * np.log2(value_counts / len(series))))
-        }
-        
+        profile["top_categories"] = {str(value): count for value, count in top_values}
+
+        # Category distribution (needs every value's count, so only while counts are exact)
+        counts = frequencies.exact_counts()
+        if counts is not None and len(counts) > 0:
+            shares = counts / col.rows
+            singles = int((counts == 1).sum())
+            profile["distribution"] = {
+                "single_occurrence_count": singles,
+                "single_occurrence_percentage": round((singles / len(counts)) * 100, 2),
+                "entropy": float(-np.sum(shares * np.log2(shares)))
+            }
+        elif counts is None:
+            profile["distribution"] = {
+                "single_occurrence_count": None,
+                "single_occurrence_percentage": None,
+                "entropy": None,
+                "note": "Too many distinct values for exact frequencies; top categories are count-min estimates"
+            }
+
         # Text analysis for string categories
-        if series.dtype == 'object':
-            text_lengths = series.astype(str).str.len()
+        if col.text_lengths.count > 0:
             profile["text_analysis"] = {
-                "avg_length": round(float(text_lengths.mean()), 2),
-                "min_length": int(text_lengths.min()),
-                "max_length": int(text_lengths.max()),
-                "contains_numbers": int(series.astype(str).str.contains(r'\d').sum()),
-                "contains_special_chars": int(series.astype(str).str.contains(r'[^a-zA-Z0-9\s]').sum())
+                "avg_length": round(col.text_lengths.mean, 2),
+                "min_length": int(col.text_lengths.min),
+                "max_length": int(col.text_lengths.max),
+                "contains_numbers": col.contains_digits,
+                "contains_special_chars": col.contains_special
             }
-    
+
     return profile
 
 
-async def _profile_datetime_column(series: pd.Series, detailed: bool) -> Dict[str, Any]:
+async def _profile_datetime_column(col: ColumnStats, detailed: bool) -> Dict[str, Any]:
     """Profile datetime column."""
-    
+
+    has_values = col.earliest is not None
+
     profile = {
         "type": "datetime",
         "time_range": {
-            "earliest": str(series.min()) if not series.empty else None,
-            "latest": str(series.max()) if not series.empty else None,
-            "span_days": int((series.max() - series.min()).days) if not series.empty else 0
+            "earliest": str(col.earliest) if has_values else None,
+            "latest": str(col.latest) if has_values else None,
+            "span_days": int((col.latest - col.earliest).days) if has_values else 0
         }
     }
-    
-    if detailed and not series.empty:
+
+    if detailed and has_values:
+        calendar = col.calendar
+        weekdays = calendar["weekday"].sort_values(ascending=False, kind="stable")
+
         # Temporal patterns
         profile["patterns"] = {
-            "year_range": f"{series.dt.year.min()} - {series.dt.year.max()}",
-            "months_present": sorted(series.dt.month.unique().tolist()),
-            "weekdays_distribution": series.dt.day_name().value_counts().to_dict(),
-            "hours_distribution": series.dt.hour.value_counts().to_dict() if hasattr(series.dt, 'hour') else {}
+            "year_range": f"{calendar['year'].index.min()} - {calendar['year'].index.max()}",
+            "months_present": sorted(int(month) for month in calendar["month"].index),
+            "weekdays_distribution": {WEEKDAY_NAMES[int(day)]: int(count) for day, count in weekdays.items()},
+            "hours_distribution": {int(hour): int(count) for hour, count in calendar["hour"].sort_values(ascending=False, kind="stable").items()}
         }
-        
+
         # Frequency analysis
-        time_diffs = series.sort_values().diff()
-        profile["frequency"] = {
-            "median_interval_hours": float(time_diffs.median().total_seconds() / 3600) if not time_diffs.empty else None,
-            "most_common_interval": str(time_diffs.mode().iloc[0]) if not time_diffs.empty and not time_diffs.mode().empty else None
-        }
-    
+        if col.intervals is not None:
+            profile["frequency"] = col.intervals
+
     return profile
 
 
-async def _profile_boolean_column(series: pd.Series, detailed: bool) -> Dict[str, Any]:
+async def _profile_boolean_column(col: ColumnStats, detailed: bool) -> Dict[str, Any]:
     """Profile boolean column."""
-    
-    value_counts = series.value_counts()
-    
+
+    false_count = col.count - col.true_count
+
     profile = {
         "type": "boolean",
         "distribution": {
-            "true_count": int(value_counts.get(True, 0)),
-            "false_count": int(value_counts.get(False, 0)),
-            "true_percentage": round((value_counts.get(True, 0) / len(series)) * 100, 2),
-            "false_percentage": round((value_counts.get(False, 0) / len(series)) * 100, 2)
+            "true_count": col.true_count,
+            "false_count": false_count,
+            "true_percentage": round((col.true_count / col.rows) * 100, 2),
+            "false_percentage": round((false_count / col.rows) * 100, 2)
         }
     }
-    
+
     return profile
 
 
-async def _assess_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
+async def _assess_data_quality(stats: DatasetStats) -> Dict[str, Any]:
     """Comprehensive data quality assessment."""
-    
+
     quality_issues = []
     quality_strengths = []
-    
+
     # Completeness issues
-    missing_data = df.isnull().sum()
-    high_missing_cols = missing_data[missing_data > len(df) * 0.2].index.tolist()
+    high_missing_cols = [col.name for col in stats.columns.values() if col.missing > stats.rows * 0.2]
     if high_missing_cols:
         quality_issues.append({
             "type": "high_missing_data",
@@ -379,23 +365,20 @@ async def _assess_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
             "description": f"Columns with >20% missing data: {', '.join(high_missing_cols)}",
             "affected_columns": high_missing_cols
         })
-    
+
     # Duplicate rows
-    duplicate_count = df.duplicated().sum()
+    duplicate_count = stats.duplicate_rows
     if duplicate_count > 0:
         quality_issues.append({
             "type": "duplicate_rows",
             "severity": "medium",
-            "description": f"{duplicate_count} duplicate rows ({duplicate_count/len(df)*100:.1f}%)",
+            "description": f"{duplicate_count} duplicate rows ({duplicate_count/stats.rows*100:.1f}%)",
             "count": int(duplicate_count)
         })
-    
+
     # Constant columns
-    constant_cols = []
-    for col in df.columns:
-        if df[col].nunique() <= 1:
-            constant_cols.append(col)
-    
+    constant_cols = [col.name for col in stats.columns.values() if col.unique_count <= 1]
+
     if constant_cols:
         quality_issues.append({
             "type": "constant_columns",
@@ -403,19 +386,10 @@ async def _assess_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
             "description": f"Columns with single unique value: {', '.join(constant_cols)}",
             "affected_columns": constant_cols
         })
-    
-    # Data type inconsistencies
-    type_issues = []
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            # Check if should be numeric
-            try:
-                numeric_converted = pd.to_numeric(df[col], errors='coerce')
-                if numeric_converted.notna().sum() > len(df) * 0.8:
-                    type_issues.append(col)
-            except:
-                pass
-    
+
+    # Data type inconsistencies: text columns whose values mostly parse as numbers
+    type_issues = [col.name for col in stats.of_kind("text") if col.numeric_like > stats.rows * 0.8]
+
     if type_issues:
         quality_issues.append({
             "type": "data_type_inconsistency",
@@ -423,29 +397,29 @@ async def _assess_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
             "description": f"Columns that appear numeric but stored as text: {', '.join(type_issues)}",
             "affected_columns": type_issues
         })
-    
+
     # Identify strengths
-    completeness = ((len(df) * len(df.columns) - df.isnull().sum().sum()) / (len(df) * len(df.columns))) * 100
-    
+    completeness = _completeness(stats)
+
     if completeness > 95:
         quality_strengths.append("Excellent data completeness (>95%)")
     elif completeness > 90:
         quality_strengths.append("Good data completeness (>90%)")
-    
+
     if duplicate_count == 0:
         quality_strengths.append("No duplicate rows")
-    
-    if len(df) > 1000:
-        quality_strengths.append(f"Substantial dataset size ({len(df):,} rows)")
-    
+
+    if stats.rows > 1000:
+        quality_strengths.append(f"Substantial dataset size ({stats.rows:,} rows)")
+
     # Overall quality score
     base_score = completeness
     base_score -= len([issue for issue in quality_issues if issue["severity"] == "high"]) * 15
     base_score -= len([issue for issue in quality_issues if issue["severity"] == "medium"]) * 10
     base_score -= len([issue for issue in quality_issues if issue["severity"] == "low"]) * 5
-    
+
     quality_score = max(0, min(100, base_score))
-    
+
     return {
         "overall_score": round(quality_score, 1),
         "completeness_percentage": round(completeness, 2),
@@ -455,38 +429,42 @@ async def _assess_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
-async def _generate_statistical_summary(df: pd.DataFrame) -> Dict[str, Any]:
+async def _generate_statistical_summary(df: pd.DataFrame, stats: DatasetStats,
+                                        corr_matrix: Optional[pd.DataFrame]) -> Dict[str, Any]:
     """Generate statistical summary."""
-    
-    numeric_df = df.select_dtypes(include=[np.number])
-    
+
+    numeric_columns = df.select_dtypes(include=[np.number]).columns
+
     summary = {
-        "numeric_columns": len(numeric_df.columns),
-        "categorical_columns": len(df.select_dtypes(include=['object']).columns),
+        "numeric_columns": len(numeric_columns),
+        "categorical_columns": len(df.select_dtypes(include=['object', 'category']).columns),
         "datetime_columns": len(df.select_dtypes(include=['datetime']).columns),
         "boolean_columns": len(df.select_dtypes(include=['bool']).columns)
     }
-    
-    if not numeric_df.empty:
+
+    if len(numeric_columns) > 0:
+        moments = {col: stats.columns[col].moments for col in numeric_columns}
+        means = [m.mean for m in moments.values() if m.count > 0]
+        variances = pd.Series({col: m.variance() for col, m in moments.items()}, dtype=float).dropna()
         summary["numeric_summary"] = {
-            "mean_of_means": float(numeric_df.mean().mean()),
-            "overall_correlation_strength": float(abs(numeric_df.corr()).mean().mean()) if len(numeric_df.columns) > 1 else 0,
-            "highest_variance_column": numeric_df.var().idxmax() if len(numeric_df.columns) > 0 else None,
-            "lowest_variance_column": numeric_df.var().idxmin() if len(numeric_df.columns) > 0 else None
+            "mean_of_means": float(np.mean(means)) if means else None,
+            "overall_correlation_strength": float(abs(corr_matrix).mean().mean()) if corr_matrix is not None else 0,
+            "highest_variance_column": variances.idxmax() if not variances.empty else None,
+            "lowest_variance_column": variances.idxmin() if not variances.empty else None
         }
-    
+
     return summary
 
 
-async def _detect_patterns(df: pd.DataFrame) -> Dict[str, Any]:
+async def _detect_patterns(df: pd.DataFrame, stats: DatasetStats) -> Dict[str, Any]:
     """Detect interesting patterns in the data."""
-    
+
     patterns = {
         "column_name_patterns": await _analyze_column_names(df),
-        "value_patterns": await _analyze_value_patterns(df),
-        "structural_patterns": await _analyze_structural_patterns(df)
+        "value_patterns": await _analyze_value_patterns(df, stats),
+        "structural_patterns": await _analyze_structural_patterns(stats)
     }
-    
+
     return patterns
 
 
@@ -525,65 +503,61 @@ async def _analyze_column_names(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
-async def _analyze_value_patterns(df: pd.DataFrame) -> Dict[str, Any]:
+async def _analyze_value_patterns(df: pd.DataFrame, stats: DatasetStats) -> Dict[str, Any]:
     """Analyze patterns in data values."""
-    
+
     patterns = {}
-    
-    # ID-like patterns
+
+    # ID-like patterns: integer or text columns with a distinct value in every row
     id_columns = []
-    for col in df.columns:
-        if df[col].dtype in ['int64', 'object']:
-            # Check if values look like IDs (unique, sequential, or formatted)
-            if df[col].nunique() == len(df) and len(df) > 1:  # Unique values
-                id_columns.append(col)
-    
+    for col in stats.columns.values():
+        if pd.api.types.is_integer_dtype(df[col.name]) or col.kind == "text":
+            if col.looks_unique(stats.rows):
+                id_columns.append(col.name)
+
     patterns["potential_id_columns"] = id_columns
-    
+
     # Email/phone patterns
     contact_columns = []
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            sample = df[col].dropna().head(100)
-            if len(sample) > 0:
-                if sample.str.contains('@').sum() > len(sample) * 0.5:
-                    contact_columns.append({"column": col, "type": "email"})
-                elif sample.str.contains(r'\d{3}[-.]?\d{3}[-.]?\d{4}').sum() > len(sample) * 0.3:
-                    contact_columns.append({"column": col, "type": "phone"})
-    
+    for col in stats.of_kind("text"):
+        sample = pd.Series(col.head, dtype=object).astype(str)
+        if len(sample) > 0:
+            if sample.str.contains('@').sum() > len(sample) * 0.5:
+                contact_columns.append({"column": col.name, "type": "email"})
+            elif sample.str.contains(r'\d{3}[-.]?\d{3}[-.]?\d{4}').sum() > len(sample) * 0.3:
+                contact_columns.append({"column": col.name, "type": "phone"})
+
     patterns["contact_info_columns"] = contact_columns
-    
+
     return patterns
 
 
-async def _analyze_structural_patterns(df: pd.DataFrame) -> Dict[str, Any]:
+async def _analyze_structural_patterns(stats: DatasetStats) -> Dict[str, Any]:
     """Analyze structural patterns."""
-    
+
+    column_count = len(stats.columns)
+
     return {
-        "column_count": len(df.columns),
-        "row_count": len(df),
-        "density": round((df.count().sum() / (len(df) * len(df.columns))) * 100, 2),
-        "shape_category": "wide" if len(df.columns) > len(df) else "tall" if len(df) > len(df.columns) * 10 else "balanced"
+        "column_count": column_count,
+        "row_count": stats.rows,
+        "density": round(_completeness(stats), 2),
+        "shape_category": "wide" if column_count > stats.rows else "tall" if stats.rows > column_count * 10 else "balanced"
     }
 
 
-async def _analyze_correlations(df: pd.DataFrame) -> Dict[str, Any]:
+async def _analyze_correlations(corr_matrix: Optional[pd.DataFrame]) -> Dict[str, Any]:
     """Analyze correlations between numeric columns."""
-    
-    numeric_df = df.select_dtypes(include=[np.number])
-    
-    if len(numeric_df.columns) < 2:
+
+    if corr_matrix is None:
         return {"message": "Need at least 2 numeric columns for correlation analysis"}
-    
-    corr_matrix = numeric_df.corr()
-    
+
     # Find strong correlations
     strong_correlations = []
     for i in range(len(corr_matrix.columns)):
         for j in range(i+1, len(corr_matrix.columns)):
             col1, col2 = corr_matrix.columns[i], corr_matrix.columns[j]
             corr_value = corr_matrix.iloc[i, j]
-            
+
             if abs(corr_value) > 0.7:  # Strong correlation
                 strong_correlations.append({
                     "column1": col1,
@@ -591,7 +565,7 @@ async def _analyze_correlations(df: pd.DataFrame) -> Dict[str, Any]:
                     "correlation": round(float(corr_value), 3),
                     "strength": "strong" if abs(corr_value) > 0.8 else "moderate"
                 })
-    
+
     return {
         "correlation_matrix": corr_matrix.round(3).to_dict(),
         "strong_correlations": strong_correlations,
@@ -600,97 +574,76 @@ async def _analyze_correlations(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
-async def _analyze_distributions(df: pd.DataFrame) -> Dict[str, Any]:
+async def _analyze_distributions(stats: DatasetStats) -> Dict[str, Any]:
     """Analyze distributions of numeric columns."""
-    
-    numeric_df = df.select_dtypes(include=[np.number])
+
     distributions = {}
-    
-    for col in numeric_df.columns:
-        series = numeric_df[col].dropna()
-        
-        if len(series) == 0:
+
+    for col in stats.of_kind("numeric"):
+        if col.count == 0:
             continue
-        
+
+        skewness = col.moments.skewness()
+
         # Basic distribution characteristics
         dist_info = {
-            "skewness": round(float(series.skew()), 3),
-            "kurtosis": round(float(series.kurtosis()), 3),
-            "distribution_type": "normal" if abs(series.skew()) < 0.5 else "skewed",
+            "skewness": round(float(skewness), 3),
+            "kurtosis": round(float(col.moments.kurtosis()), 3),
+            "distribution_type": "normal" if abs(skewness) < 0.5 else "skewed",
             "outlier_percentage": 0
         }
-        
-        # Outlier detection using IQR
-        q1, q3 = series.quantile([0.25, 0.75])
-        iqr = q3 - q1
-        outliers = series[(series < q1 - 1.5 * iqr) | (series > q3 + 1.5 * iqr)]
-        dist_info["outlier_percentage"] = round((len(outliers) / len(series)) * 100, 2)
-        
-        distributions[col] = dist_info
-    
+
+        # Outlier share using the IQR fences counted by the profiler
+        if col.outliers is not None:
+            dist_info["outlier_percentage"] = round((col.outliers["count"] / col.count) * 100, 2)
+
+        distributions[col.name] = dist_info
+
     return distributions
 
 
-async def _detect_outliers(df: pd.DataFrame) -> Dict[str, Any]:
+async def _detect_outliers(stats: DatasetStats) -> Dict[str, Any]:
     """Detect outliers across the dataset."""
-    
-    numeric_df = df.select_dtypes(include=[np.number])
+
     outlier_summary = {
         "columns_with_outliers": [],
         "total_outlier_rows": 0,
         "outlier_detection_method": "IQR (1.5 * IQR rule)"
     }
-    
-    outlier_rows = set()
-    
-    for col in numeric_df.columns:
-        series = numeric_df[col].dropna()
-        
-        if len(series) == 0:
+
+    for col in stats.of_kind("numeric"):
+        if col.outliers is None or col.outliers["count"] == 0:
             continue
-        
-        # IQR method
-        q1, q3 = series.quantile([0.25, 0.75])
-        iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-        
-        outlier_mask = (series < lower_bound) | (series > upper_bound)
-        outlier_indices = series[outlier_mask].index
-        
-        if len(outlier_indices) > 0:
-            outlier_summary["columns_with_outliers"].append({
-                "column": col,
-                "outlier_count": len(outlier_indices),
-                "outlier_percentage": round((len(outlier_indices) / len(series)) * 100, 2),
-                "bounds": {"lower": round(float(lower_bound), 3), "upper": round(float(upper_bound), 3)}
-            })
-            
-            outlier_rows.update(outlier_indices)
-    
-    outlier_summary["total_outlier_rows"] = len(outlier_rows)
-    outlier_summary["outlier_row_percentage"] = round((len(outlier_rows) / len(df)) * 100, 2)
-    
+
+        outlier_summary["columns_with_outliers"].append({
+            "column": col.name,
+            "outlier_count": col.outliers["count"],
+            "outlier_percentage": round((col.outliers["count"] / col.count) * 100, 2),
+            "bounds": {"lower": round(col.outliers["lower"], 3), "upper": round(col.outliers["upper"], 3)}
+        })
+
+    outlier_summary["total_outlier_rows"] = stats.outlier_rows or 0
+    outlier_summary["outlier_row_percentage"] = round((outlier_summary["total_outlier_rows"] / stats.rows) * 100, 2)
+
     return outlier_summary
 
 
-async def _analyze_temporal_patterns(df: pd.DataFrame) -> Dict[str, Any]:
+async def _analyze_temporal_patterns(stats: DatasetStats) -> Dict[str, Any]:
     """Analyze temporal patterns in datetime columns."""
-    
-    datetime_columns = df.select_dtypes(include=['datetime']).columns
-    
+
+    datetime_columns = stats.of_kind("datetime")
+
     if len(datetime_columns) == 0:
         # Try to detect date-like string columns
         potential_date_cols = []
-        for col in df.select_dtypes(include=['object']).columns:
-            sample = df[col].dropna().head(100)
-            if len(sample) > 0:
+        for col in stats.of_kind("text"):
+            if len(col.head) > 0:
                 try:
-                    pd.to_datetime(sample.head(10))
-                    potential_date_cols.append(col)
+                    pd.to_datetime(pd.Series(col.head[:10], dtype=object))
+                    potential_date_cols.append(col.name)
                 except:
                     pass
-        
+
         if potential_date_cols:
             return {
                 "message": "No datetime columns found, but potential date columns detected",
@@ -699,76 +652,80 @@ async def _analyze_temporal_patterns(df: pd.DataFrame) -> Dict[str, Any]:
             }
         else:
             return {"message": "No temporal columns detected"}
-    
+
     temporal_analysis = {}
-    
+
     for col in datetime_columns:
-        series = df[col].dropna()
-        
-        if len(series) == 0:
+        if col.earliest is None:
             continue
-        
+
+        calendar = col.calendar
         analysis = {
             "date_range": {
-                "start": str(series.min()),
-                "end": str(series.max()),
-                "span_days": int((series.max() - series.min()).days)
+                "start": str(col.earliest),
+                "end": str(col.latest),
+                "span_days": int((col.latest - col.earliest).days)
             },
             "frequency_analysis": {
-                "most_common_year": int(series.dt.year.mode().iloc[0]) if not series.dt.year.mode().empty else None,
-                "most_common_month": int(series.dt.month.mode().iloc[0]) if not series.dt.month.mode().empty else None,
-                "most_common_weekday": series.dt.day_name().mode().iloc[0] if not series.dt.day_name().mode().empty else None
+                "most_common_year": int(_mode_of_counts(calendar["year"])),
+                "most_common_month": int(_mode_of_counts(calendar["month"])),
+                "most_common_weekday": WEEKDAY_NAMES[int(_mode_of_counts(calendar["weekday"]))]
             }
         }
-        
-        temporal_analysis[col] = analysis
-    
+
+        temporal_analysis[col.name] = analysis
+
     return temporal_analysis
 
 
-async def _generate_business_insights(df: pd.DataFrame) -> Dict[str, Any]:
+def _mode_of_counts(counts: pd.Series) -> Any:
+    """Most frequent key of a value-count series (smallest key on ties, as Series.mode)."""
+    return counts[counts == counts.max()].index.min()
+
+
+async def _generate_business_insights(df: pd.DataFrame, stats: DatasetStats) -> Dict[str, Any]:
     """Generate business-focused insights from the data profile."""
-    
+
     insights = {
         "data_readiness": "unknown",
         "analysis_opportunities": [],
         "business_value_indicators": [],
         "recommended_next_steps": []
     }
-    
+
     # Assess data readiness for analysis
-    completeness = ((len(df) * len(df.columns) - df.isnull().sum().sum()) / (len(df) * len(df.columns))) * 100
-    
-    if completeness > 95 and len(df) > 100:
+    completeness = _completeness(stats)
+
+    if completeness > 95 and stats.rows > 100:
         insights["data_readiness"] = "excellent - ready for advanced analytics"
-    elif completeness > 85 and len(df) > 50:
+    elif completeness > 85 and stats.rows > 50:
         insights["data_readiness"] = "good - suitable for most analyses with minor cleaning"
     elif completeness > 70:
         insights["data_readiness"] = "fair - requires data cleaning before analysis"
     else:
         insights["data_readiness"] = "poor - significant data quality issues need addressing"
-    
+
     # Identify analysis opportunities
     numeric_cols = df.select_dtypes(include=[np.number]).columns
-    categorical_cols = df.select_dtypes(include=['object']).columns
+    categorical_cols = df.select_dtypes(include=['object', 'category']).columns
     datetime_cols = df.select_dtypes(include=['datetime']).columns
-    
+
     if len(numeric_cols) > 1:
         insights["analysis_opportunities"].append("Correlation analysis between numeric variables")
         insights["analysis_opportunities"].append("Statistical modeling and regression analysis")
-    
+
     if len(datetime_cols) > 0 and len(numeric_cols) > 0:
         insights["analysis_opportunities"].append("Time series analysis and trend forecasting")
         insights["analysis_opportunities"].append("Seasonal pattern detection")
-    
+
     if len(categorical_cols) > 0 and len(numeric_cols) > 0:
         insights["analysis_opportunities"].append("Segmentation analysis by categories")
         insights["analysis_opportunities"].append("Group comparison and statistical testing")
-    
-    if len(df) > 1000:
+
+    if stats.rows > 1000:
         insights["analysis_opportunities"].append("Machine learning model development")
         insights["analysis_opportunities"].append("Advanced statistical analysis")
-    
+
     # Business value indicators
     business_keywords = {
         "revenue": ["revenue", "sales", "income", "profit"],
@@ -777,91 +734,86 @@ async def _generate_business_insights(df: pd.DataFrame) -> Dict[str, Any]:
         "marketing": ["campaign", "channel", "source", "medium"],
         "operations": ["order", "transaction", "process", "workflow"]
     }
-    
+
     for domain, keywords in business_keywords.items():
         matching_cols = [col for col in df.columns if any(keyword in col.lower() for keyword in keywords)]
         if matching_cols:
             insights["business_value_indicators"].append(f"{domain.title()} data available: {', '.join(matching_cols[:3])}")
-    
+
     # Recommended next steps
     if len(numeric_cols) > 1:
         insights["recommended_next_steps"].append("Run correlation analysis to identify key relationships")
-    
-    if datetime_cols:
+
+    if len(datetime_cols) > 0:
         insights["recommended_next_steps"].append("Perform trend analysis on time-based metrics")
-    
+
     if completeness < 90:
         insights["recommended_next_steps"].append("Address data quality issues before proceeding with analysis")
-    
+
     insights["recommended_next_steps"].append("Create visualizations to explore patterns")
     insights["recommended_next_steps"].append("Generate executive summary for stakeholders")
-    
+
     return insights
 
 
-async def _generate_profiling_recommendations(df: pd.DataFrame) -> List[str]:
+async def _generate_profiling_recommendations(df: pd.DataFrame, stats: DatasetStats) -> List[str]:
     """Generate actionable recommendations based on profiling results."""
-    
+
     recommendations = []
-    
+
     # Data quality recommendations
-    completeness = ((len(df) * len(df.columns) - df.isnull().sum().sum()) / (len(df) * len(df.columns))) * 100
-    
+    completeness = _completeness(stats)
+
     if completeness < 95:
         recommendations.append(f"🔧 Data completeness is {completeness:.1f}% - consider imputation strategies for missing values")
-    
+
     # Duplicate detection
-    duplicate_count = df.duplicated().sum()
+    duplicate_count = stats.duplicate_rows
     if duplicate_count > 0:
         recommendations.append(f"🔄 {duplicate_count} duplicate rows detected - consider deduplication")
-    
+
     # Column-specific recommendations
-    for col in df.columns:
-        missing_pct = (df[col].isnull().sum() / len(df)) * 100
-        
+    for col in stats.columns.values():
+        missing_pct = (col.missing / stats.rows) * 100
+
         if missing_pct > 50:
-            recommendations.append(f"❌ Column '{col}' has {missing_pct:.1f}% missing data - consider removal")
+            recommendations.append(f"❌ Column '{col.name}' has {missing_pct:.1f}% missing data - consider removal")
         elif missing_pct > 20:
-            recommendations.append(f"⚠️ Column '{col}' has {missing_pct:.1f}% missing data - investigate patterns")
-        
-        if df[col].nunique() == 1:
-            recommendations.append(f"🗑️ Column '{col}' has constant values - consider removal")
-        
+            recommendations.append(f"⚠️ Column '{col.name}' has {missing_pct:.1f}% missing data - investigate patterns")
+
+        if col.unique_count == 1:
+            recommendations.append(f"🗑️ Column '{col.name}' has constant values - consider removal")
+
         # Type conversion suggestions
-        if df[col].dtype == 'object':
-            try:
-                numeric_converted = pd.to_numeric(df[col], errors='coerce')
-                if numeric_converted.notna().sum() > len(df) * 0.8:
-                    recommendations.append(f"🔢 Column '{col}' appears numeric - consider type conversion")
-            except:
-                pass
-    
+        if col.kind == "text" and col.numeric_like > stats.rows * 0.8:
+            recommendations.append(f"🔢 Column '{col.name}' appears numeric - consider type conversion")
+
     # Analysis recommendations
     numeric_cols = len(df.select_dtypes(include=[np.number]).columns)
     if numeric_cols > 1:
         recommendations.append("📊 Multiple numeric columns - run correlation analysis")
-    
+
     datetime_cols = df.select_dtypes(include=['datetime']).columns
     if len(datetime_cols) > 0:
         recommendations.append("📅 Temporal data available - consider trend analysis")
-    
-    if len(df) > 10000:
+
+    if stats.rows > 10000:
         recommendations.append("📈 Large dataset - consider sampling for exploratory analysis")
-    
+
     # Business intelligence recommendations
     business_indicators = ['revenue', 'sales', 'customer', 'user', 'order', 'product']
     detected_context = []
     for indicator in business_indicators:
         if any(indicator in col.lower() for col in df.columns):
             detected_context.append(indicator)
-    
+
     if detected_context:
         context_str = ', '.join(detected_context)
         recommendations.append(f"💼 Business context detected ({context_str}) - ready for business intelligence workflows")
-    
+
     if not recommendations:
         recommendations.append("✅ Data profile looks good - ready for analysis")
-    
+
     # Limit to most important recommendations
     return recommendations[:8]
 
@@ -6,10 +6,12 @@ Statistical correlation analysis with business interpretation.
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
-from pathlib import Path
-from scipy.stats import pearsonr, spearmanr, kendalltau
-from scipy.stats import chi2_contingency
-import warnings
+from src.core.dataset_store import resolve_dataset, list_available_datasets
+from src.core.correlation_engine import (
+    CorrelationMatrices, PearsonMoments, correlation_matrices, kendall_matrices, top_pairs, significance_labels
+)
+from src.core.executor import get_executor, run_coroutine
+from src.core.incremental import incremental_update
 
 
 async def run_correlation_tool(
@@ -17,10 +19,16 @@ async def run_correlation_tool(
     method: str = "pearson",
     target_column: str = "",
     columns: List[str] = [],
-    threshold: float = 0.3
+    threshold: float = 0.3,
+    top_k: int = 0,
+    incremental: bool = False,
+    watermark_column: str = ""
 ) -> Dict[str, Any]:
     """
     Statistical correlation analysis with business interpretation.
+    With top_k, only the k strongest pairs at or above the threshold are returned.
+    With incremental (Pearson only), co-moment sums are kept between calls and only
+    rows appended since the previous call are folded in.
     """
     
     try:
@@ -38,12 +46,32 @@ async def run_correlation_tool(
         validation_result = await _validate_correlation_params(df, method, target_column, columns, threshold)
         if "error" in validation_result:
             return validation_result
+        if incremental and method != "pearson":
+            return {
+                "error": f"Incremental correlation supports only the pearson method, got {method}",
+                "suggestion": "Use method='pearson' or disable incremental"
+            }
         
         # Prepare data for correlation analysis
         analysis_data = await _prepare_correlation_data(df, target_column, columns)
         
-        # Run correlation analysis
-        correlation_results = await _run_correlation_analysis(analysis_data, method, threshold)
+        # Bring the saved co-moment sums up to date with the appended rows only
+        matrices, incremental_info = None, None
+        if incremental:
+            matrices, incremental_info = await get_executor().run_in_thread(
+                "run_correlation", run_coroutine, _incremental_pearson, dataset_name, df, analysis_data, watermark_column
+            )
+        elif method == "kendall":
+            # Kendall has no matrix form; its pairs are spread over the executor's process pool
+            target = analysis_data["target_column"]
+            kendall_pairs = [(target, col) for col in analysis_data["analysis_df"].columns if col != target] \
+                if target else None
+            matrices = await kendall_matrices(analysis_data["analysis_df"], kendall_pairs)
+        
+        # Run correlation analysis on a worker thread (numpy/scipy release the GIL)
+        correlation_results = await get_executor().run_in_thread(
+            "run_correlation", run_coroutine, _run_correlation_analysis, analysis_data, method, threshold, top_k, matrices
+        )
         
         # Generate business insights
         business_insights = await _generate_business_insights(correlation_results, analysis_data, df)
@@ -51,7 +79,7 @@ async def run_correlation_tool(
         # Generate recommendations
         recommendations = await _generate_correlation_recommendations(correlation_results, analysis_data)
         
-        return {
+        result = {
             "dataset_name": dataset_name,
             "method": method,
             "target_column": target_column,
@@ -65,6 +93,9 @@ async def run_correlation_tool(
                 "significant_correlations": len([r for r in correlation_results.get("correlations", []) if abs(r["correlation"]) >= threshold])
             }
         }
+        if incremental_info:
+            result["incremental"] = incremental_info
+        return result
         
     except Exception as e:
         return {
@@ -82,43 +113,13 @@ async def run_correlation_tool(
 
 
 async def _load_dataset(dataset_name: str) -> Optional[pd.DataFrame]:
-    """Load dataset from storage (mock implementation)."""
-    
-    base_path = Path(__file__).parent.parent.parent / "data"
-    
-    # Try common file patterns
-    possible_files = [
-        base_path / f"{dataset_name}.csv",
-        base_path / f"{dataset_name}.xlsx", 
-        base_path / f"sample_{dataset_name}.csv",
-        base_path / f"sample_{dataset_name}.xlsx"
-    ]
-    
-    for file_path in possible_files:
-        if file_path.exists():
-            try:
-                if file_path.suffix.lower() == '.csv':
-                    return pd.read_csv(file_path)
-                elif file_path.suffix.lower() in ['.xlsx', '.xls']:
-                    return pd.read_excel(file_path)
-            except Exception:
-                continue
-    
-    return None
+    """Load dataset from the shared dataset store."""
+    return resolve_dataset(dataset_name)
 
 
 async def _list_available_datasets() -> List[str]:
     """List available datasets."""
-    
-    base_path = Path(__file__).parent.parent.parent / "data"
-    datasets = []
-    
-    if base_path.exists():
-        for file_path in base_path.glob("*"):
-            if file_path.suffix.lower() in ['.csv', '.xlsx', '.xls']:
-                datasets.append(file_path.stem)
-    
-    return datasets
+    return list_available_datasets()
 
 
 async def _validate_correlation_params(
@@ -196,34 +197,47 @@ async def _prepare_correlation_data(
         if target_column in df.columns:
             correlation_columns.append(target_column)
     
-    # Create clean dataset for analysis
-    analysis_df = df[correlation_columns].copy()
-    
-    # Remove rows with any missing values
+    # Missing values are handled pairwise by the correlation engine, so no rows are dropped here
+    analysis_df = df[correlation_columns]
     original_rows = len(analysis_df)
-    analysis_df = analysis_df.dropna()
-    rows_removed = original_rows - len(analysis_df)
+    rows_with_missing = int(analysis_df.isna().any(axis=1).sum())
     
     return {
         "analysis_df": analysis_df,
         "correlation_columns": correlation_columns,
         "target_column": target_column,
         "original_rows": original_rows,
-        "analysis_rows": len(analysis_df),
-        "rows_removed": rows_removed,
-        "missing_data_percentage": round((rows_removed / original_rows) * 100, 2) if original_rows > 0 else 0
+        "analysis_rows": original_rows - rows_with_missing,  # refined to the smallest pairwise sample after analysis
+        "rows_removed": rows_with_missing,
+        "missing_data_percentage": round((rows_with_missing / original_rows) * 100, 2) if original_rows > 0 else 0
     }
 
 
+async def _incremental_pearson(
+    dataset_name: str,
+    df: pd.DataFrame,
+    analysis_data: Dict[str, Any],
+    watermark_column: str
+) -> Tuple[CorrelationMatrices, Dict[str, Any]]:
+    """Pearson matrices from persisted co-moment sums, updated with the rows appended since the last call."""
+    
+    columns = analysis_data["correlation_columns"]
+    moments, info = incremental_update(
+        dataset_name, "pearson", {"columns": columns}, df, lambda: PearsonMoments(columns), watermark_column
+    )
+    return moments.matrices(), info
+
+
 async def _run_correlation_analysis(
     analysis_data: Dict[str, Any],
     method: str,
-    threshold: float
+    threshold: float,
+    top_k: int = 0,
+    matrices: Optional[CorrelationMatrices] = None
 ) -> Dict[str, Any]:
     """Run the correlation analysis."""
     
     df = analysis_data["analysis_df"]
-    columns = analysis_data["correlation_columns"]
     target_column = analysis_data["target_column"]
     
     results = {
@@ -235,48 +249,35 @@ async def _run_correlation_analysis(
         "significant_correlations": []
     }
     
-    # Calculate correlation matrix
-    if method == "pearson":
-        corr_matrix = df.corr(method='pearson')
-    elif method == "spearman":
-        corr_matrix = df.corr(method='spearman')
-    elif method == "kendall":
-        corr_matrix = df.corr(method='kendall')
-    
-    results["correlation_matrix"] = corr_matrix.round(4).to_dict()
-    
-    # Calculate pairwise correlations with significance tests
-    correlations = []
-    
-    if target_column:
-        # Focus on correlations with target column
-        for col in columns:
-            if col != target_column:
-                corr_result = await _calculate_correlation_with_significance(
-                    df[target_column], df[col], method
-                )
-                corr_result.update({
-                    "variable1": target_column,
-                    "variable2": col,
-                    "is_target_correlation": True
-                })
-                correlations.append(corr_result)
+    # Correlations, p-values and pairwise sample sizes for all columns at once
+    if matrices is None:
+        matrices = correlation_matrices(df, method)
+    
+    # Pair list: all pairs (or target pairs), or only the strongest pairs in top-k mode
+    pairs = top_pairs(matrices, threshold if top_k > 0 else 0.0, top_k, target_column)
+    
+    if top_k > 0:
+        shown = list(dict.fromkeys(pairs["variable1"].tolist() + pairs["variable2"].tolist()))
+        results["correlation_matrix"] = matrices.r.loc[shown, shown].round(4).to_dict()
+        results["top_k"] = top_k
     else:
-        # Calculate all pairwise correlations
-        for i, col1 in enumerate(columns):
-            for j, col2 in enumerate(columns[i+1:], i+1):
-                corr_result = await _calculate_correlation_with_significance(
-                    df[col1], df[col2], method
-                )
-                corr_result.update({
-                    "variable1": col1,
-                    "variable2": col2,
-                    "is_target_correlation": False
-                })
-                correlations.append(corr_result)
-    
-    # Sort correlations by absolute value
-    correlations.sort(key=lambda x: abs(x["correlation"]), reverse=True)
+        results["correlation_matrix"] = matrices.r.round(4).to_dict()
+    
+    sample_sizes = pairs["sample_size"].to_numpy()
+    labels = significance_labels(pairs["p_value"].to_numpy(), sample_sizes)
+    undefined = np.isnan(pairs["correlation"].to_numpy()) | (sample_sizes < 3)
+    correlations = [
+        {
+            "correlation": 0.0 if undefined[i] else round(float(row.correlation), 4),
+            "p_value": 1.0 if undefined[i] else round(float(row.p_value), 6),
+            "sample_size": int(row.sample_size),
+            "significance": str(labels[i]),
+            "variable1": row.variable1,
+            "variable2": row.variable2,
+            "is_target_correlation": bool(target_column)
+        }
+        for i, row in enumerate(pairs.itertuples(index=False))
+    ]
     results["correlations"] = correlations
     
     # Filter significant correlations
@@ -286,6 +287,10 @@ async def _run_correlation_analysis(
     ]
     results["significant_correlations"] = significant_correlations
     
+    # Smallest pairwise sample backs the sample size assessment
+    if len(sample_sizes) > 0:
+        analysis_data["analysis_rows"] = int(sample_sizes.min())
+    
     # Generate summary statistics
     if correlations:
         corr_values = [abs(corr["correlation"]) for corr in correlations]
@@ -301,63 +306,6 @@ async def _run_correlation_analysis(
     return results
 
 
-async def _calculate_correlation_with_significance(
-    series1: pd.Series,
-    series2: pd.Series,
-    method: str
-) -> Dict[str, Any]:
-    """Calculate correlation with significance test."""
-    
-    # Remove missing values pairwise
-    combined = pd.DataFrame({"x": series1, "y": series2}).dropna()
-    
-    if len(combined) < 3:
-        return {
-            "correlation": 0.0,
-            "p_value": 1.0,
-            "sample_size": len(combined),
-            "significance": "insufficient_data"
-        }
-    
-    x, y = combined["x"], combined["y"]
-    
-    try:
-        if method == "pearson":
-            correlation, p_value = pearsonr(x, y)
-        elif method == "spearman":
-            correlation, p_value = spearmanr(x, y)
-        elif method == "kendall":
-            correlation, p_value = kendalltau(x, y)
-        else:
-            correlation, p_value = pearsonr(x, y)  # Default fallback
-        
-        # Determine significance level
-        if p_value < 0.001:
-            significance = "highly_significant"
-        elif p_value < 0.01:
-            significance = "very_significant"
-        elif p_value < 0.05:
-            significance = "significant"
-        else:
-            significance = "not_significant"
-        
-        return {
-            "correlation": round(float(correlation), 4),
-            "p_value": round(float(p_value), 6),
-            "sample_size": len(combined),
-            "significance": significance
-        }
-    
-    except Exception as e:
-        return {
-            "correlation": 0.0,
-            "p_value": 1.0,
-            "sample_size": len(combined),
-            "significance": "calculation_error",
-            "error": str(e)
-        }
-
-
 async def _generate_business_insights(
     correlation_results: Dict[str, Any],
     analysis_data: Dict[str, Any],
@@ -419,11 +367,11 @@ async def _generate_business_insights(
         missing_pct = analysis_data["missing_data_percentage"]
         if missing_pct > 20:
             insights["data_quality_notes"].append(
-                f"High missing data: {missing_pct:.1f}% of rows removed - may affect correlation reliability"
+                f"High missing data: {missing_pct:.1f}% of rows incomplete - may affect correlation reliability"
             )
         else:
             insights["data_quality_notes"].append(
-                f"{missing_pct:.1f}% of rows removed due to missing values"
+                f"{missing_pct:.1f}% of rows have missing values - each pair uses its complete rows"
             )
     
     # Sample size assessment
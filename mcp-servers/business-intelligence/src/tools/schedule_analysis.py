@@ -4,13 +4,13 @@ Set up automated recurring insights and monitoring.
 """
 
 import pandas as pd
-import json
 from typing import Dict, Any, List, Optional
-from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import croniter
 import uuid
 
+from src.core.scheduler import get_scheduler
+
 
 async def schedule_analysis_tool(
     analysis_config: Dict[str, Any],
@@ -38,8 +38,10 @@ async def schedule_analysis_tool(
         # Validate cron expression
         schedule_info = await _parse_schedule(schedule)
         
-        # Store schedule (in real implementation, this would be stored in a job scheduler)
+        # Store schedule and queue it with the in-process scheduler
         storage_result = await _store_schedule(schedule_config)
+        if not storage_result["stored"]:
+            return {"schedule_status": "failed", "error": storage_result["error"]}
         
         # Generate monitoring setup
         monitoring_setup = await _setup_monitoring(schedule_config, alert_conditions)
@@ -106,7 +108,7 @@ async def _validate_schedule_params(
     
     # Validate analysis type
     supported_analysis_types = [
-        "correlation", "profiling", "trend", "visualization", "insight_investigation"
+        "correlation", "profiling", "kpi", "segmentation", "trend", "visualization"
     ]
     if analysis_config["analysis_type"] not in supported_analysis_types:
         return {
@@ -205,10 +207,11 @@ async def _parse_schedule(schedule: str) -> Dict[str, Any]:
     """Parse and interpret cron schedule."""
     
     try:
-        cron = croniter.croniter(schedule)
+        # Schedules fire in UTC (see src/core/scheduler.py)
+        cron = croniter.croniter(schedule, datetime.now(timezone.utc))
         
         # Get next few executions
-        now = datetime.now()
+        now = datetime.now(timezone.utc)
         next_runs = []
         for _ in range(3):
             next_run = cron.get_next(datetime)
@@ -303,14 +306,14 @@ async def _calculate_next_runs(schedule: str, count: int = 5) -> List[Dict[str,
     """Calculate next scheduled runs."""
     
     try:
-        cron = croniter.croniter(schedule)
+        cron = croniter.croniter(schedule, datetime.now(timezone.utc))
         next_runs = []
         
         for i in range(count):
             next_run = cron.get_next(datetime)
             
             # Calculate time until execution
-            time_until = next_run - datetime.now()
+            time_until = next_run - datetime.now(timezone.utc)
             
             next_runs.append({
                 "datetime": next_run.isoformat(),
@@ -344,24 +347,18 @@ def _format_time_delta(delta: timedelta) -> str:
 
 
 async def _store_schedule(schedule_config: Dict[str, Any]) -> Dict[str, Any]:
-    """Store schedule configuration (mock implementation)."""
-    
-    # In real implementation, this would store in a persistent job scheduler
-    # like Celery, APScheduler, or a database with a cron processor
-    
-    storage_path = Path(__file__).parent.parent.parent / "schedules"
-    storage_path.mkdir(exist_ok=True)
-    
-    schedule_file = storage_path / f"{schedule_config['id']}.json"
+    """Persist the schedule in the scheduler's SQLite table and queue its next fire."""
     
     try:
-        with open(schedule_file, 'w') as f:
-            json.dump(schedule_config, f, indent=2, default=str)
+        scheduler = get_scheduler()
+        next_run = scheduler.add(schedule_config)
         
         return {
             "stored": True,
-            "storage_path": str(schedule_file),
-            "schedule_id": schedule_config["id"]
+            "storage_path": str(scheduler.store.db_path),
+            "schedule_id": schedule_config["id"],
+            "next_run": datetime.fromtimestamp(next_run).isoformat(),
+            "scheduler_running": scheduler.running
         }
     
     except Exception as e:
@@ -525,57 +522,71 @@ async def _generate_schedule_recommendations(schedule_config: Dict[str, Any]) ->
 async def list_schedules() -> List[Dict[str, Any]]:
     """List all scheduled analyses."""
     
-    schedules_path = Path(__file__).parent.parent.parent / "schedules"
     schedules = []
-    
-    if schedules_path.exists():
-        for schedule_file in schedules_path.glob("*.json"):
-            try:
-                with open(schedule_file, 'r') as f:
-                    schedule_config = json.load(f)
-                    
-                    # Add summary info
-                    summary = {
-                        "id": schedule_config["id"],
-                        "name": schedule_config["name"],
-                        "analysis_type": schedule_config["analysis_type"],
-                        "schedule": schedule_config["schedule"]["cron_expression"],
-                        "status": schedule_config["metadata"]["status"],
-                        "created_at": schedule_config["metadata"]["created_at"],
-                        "next_run": await _calculate_next_runs(schedule_config["schedule"]["cron_expression"], 1)
-                    }
-                    schedules.append(summary)
-            
-            except Exception:
-                continue  # Skip invalid schedule files
+    for schedule in get_scheduler().store.list():
+        config = schedule["config"]
+        schedules.append({
+            "id": schedule["id"],
+            "name": schedule["name"],
+            "analysis_type": schedule["analysis_type"],
+            "schedule": schedule["cron"],
+            "status": "active" if schedule["enabled"] else "paused",
+            "created_at": config.get("metadata", {}).get("created_at"),
+            "next_run": datetime.fromtimestamp(schedule["next_run"]).isoformat() if schedule["enabled"] and schedule["next_run"] else None,
+            "last_run": datetime.fromtimestamp(schedule["last_run"]).isoformat() if schedule["last_run"] else None
+        })
     
     return schedules
 
 
-async def pause_schedule(schedule_id: str) -> Dict[str, Any]:
-    """Pause a scheduled analysis."""
+async def get_schedule_history(schedule_id: str = "", limit: int = 20) -> Dict[str, Any]:
+    """Recent runs (all schedules, or one) with their status and duration."""
     
-    schedules_path = Path(__file__).parent.parent.parent / "schedules"
-    schedule_file = schedules_path / f"{schedule_id}.json"
-    
-    if not schedule_file.exists():
+    scheduler = get_scheduler()
+    if schedule_id and scheduler.store.get(schedule_id) is None:
         return {"error": f"Schedule {schedule_id} not found"}
     
+    runs = scheduler.store.runs(schedule_id or None, limit)
+    for run in runs:
+        for key in ("scheduled_for", "started_at", "finished_at"):
+            if run[key] is not None:
+                run[key] = datetime.fromtimestamp(run[key]).isoformat()
+    
+    durations = [run["duration_seconds"] for run in runs]
+    return {
+        "schedule_id": schedule_id or None,
+        "runs": runs,
+        "summary": {
+            "runs": len(runs),
+            "succeeded": sum(run["status"] == "succeeded" for run in runs),
+            "failed": sum(run["status"] == "failed" for run in runs),
+            "average_duration_seconds": round(sum(durations) / len(durations), 4) if durations else None
+        }
+    }
+
+
+async def run_schedule_now(schedule_id: str) -> Dict[str, Any]:
+    """Execute a scheduled analysis immediately and return its run record."""
+    
+    run = await get_scheduler().run_now(schedule_id)
+    if "error" in run and "status" not in run:
+        return run
+    for key in ("started_at", "finished_at"):
+        run[key] = datetime.fromtimestamp(run[key]).isoformat()
+    return run
+
+
+async def pause_schedule(schedule_id: str) -> Dict[str, Any]:
+    """Pause a scheduled analysis."""
+    
     try:
-        with open(schedule_file, 'r') as f:
-            schedule_config = json.load(f)
-        
-        schedule_config["schedule"]["enabled"] = False
-        schedule_config["metadata"]["status"] = "paused"
-        schedule_config["metadata"]["paused_at"] = datetime.now().isoformat()
-        
-        with open(schedule_file, 'w') as f:
-            json.dump(schedule_config, f, indent=2, default=str)
+        if not get_scheduler().pause(schedule_id):
+            return {"error": f"Schedule {schedule_id} not found"}
         
         return {
             "status": "paused",
             "schedule_id": schedule_id,
-            "paused_at": schedule_config["metadata"]["paused_at"]
+            "paused_at": datetime.now().isoformat()
         }
     
     except Exception as e:
@@ -585,28 +596,16 @@ async def pause_schedule(schedule_id: str) -> Dict[str, Any]:
 async def resume_schedule(schedule_id: str) -> Dict[str, Any]:
     """Resume a paused scheduled analysis."""
     
-    schedules_path = Path(__file__).parent.parent.parent / "schedules"
-    schedule_file = schedules_path / f"{schedule_id}.json"
-    
-    if not schedule_file.exists():
-        return {"error": f"Schedule {schedule_id} not found"}
-    
     try:
-        with open(schedule_file, 'r') as f:
-            schedule_config = json.load(f)
-        
-        schedule_config["schedule"]["enabled"] = True
-        schedule_config["metadata"]["status"] = "active"
-        schedule_config["metadata"]["resumed_at"] = datetime.now().isoformat()
-        
-        with open(schedule_file, 'w') as f:
-            json.dump(schedule_config, f, indent=2, default=str)
+        scheduler = get_scheduler()
+        if not scheduler.resume(schedule_id):
+            return {"error": f"Schedule {schedule_id} not found"}
         
         return {
             "status": "active",
             "schedule_id": schedule_id,
-            "resumed_at": schedule_config["metadata"]["resumed_at"],
-            "next_runs": await _calculate_next_runs(schedule_config["schedule"]["cron_expression"], 3)
+            "resumed_at": datetime.now().isoformat(),
+            "next_runs": await _calculate_next_runs(scheduler.store.get(schedule_id)["cron"], 3)
         }
     
     except Exception as e:
@@ -614,16 +613,11 @@ async def resume_schedule(schedule_id: str) -> Dict[str, Any]:
 
 
 async def delete_schedule(schedule_id: str) -> Dict[str, Any]:
-    """Delete a scheduled analysis."""
-    
-    schedules_path = Path(__file__).parent.parent.parent / "schedules"
-    schedule_file = schedules_path / f"{schedule_id}.json"
-    
-    if not schedule_file.exists():
-        return {"error": f"Schedule {schedule_id} not found"}
+    """Delete a scheduled analysis and its run history."""
     
     try:
-        schedule_file.unlink()
+        if not get_scheduler().remove(schedule_id):
+            return {"error": f"Schedule {schedule_id} not found"}
         
         return {
             "status": "deleted",
@@ -0,0 +1,364 @@
+"""
+Segment Data Tool
+Business segmentation with a single grouped aggregation pass.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, Union
+
+from src.core.dataset_store import resolve_dataset, list_available_datasets
+from src.core.incremental import SegmentTotals, incremental_update
+
+NUMERIC_AGGREGATIONS = ["count", "mean", "sum", "min", "max"]
+OTHER_SEGMENTS_KEY = "other_segments"  # merged bucket, kept apart so it never shadows a segment named "other"
+
+
+async def segment_data_tool(
+    dataset_name: str,
+    segment_columns: Union[str, List[str]],
+    metric_columns: List[str],
+    top_n: int = 0,
+    quantiles: List[float] = [],
+    incremental: bool = False,
+    watermark_column: str = ""
+) -> Dict[str, Any]:
+    """
+    Segment a dataset by one or more key columns and summarize metrics per segment.
+
+    With incremental, per-segment totals are kept between calls and only rows appended
+    since the previous call (by row count, or above the watermark column's last value)
+    are aggregated. Quantiles are not mergeable, so requesting them recomputes in full.
+    """
+
+    try:
+        df = resolve_dataset(dataset_name)
+        if df is None:
+            return {
+                "error": f"Dataset '{dataset_name}' not found",
+                "available_datasets": list_available_datasets()
+            }
+
+        keys = [segment_columns] if isinstance(segment_columns, str) else list(segment_columns)
+        if not keys:
+            return {"error": "At least one segment column is required"}
+        for key in keys:
+            if key not in df.columns:
+                return {"error": f"Segment column '{key}' not found in dataset"}
+
+        available_metrics = [col for col in metric_columns if col in df.columns and col not in keys]
+        if not available_metrics:
+            return {"error": f"No valid metric columns found. Available columns: {list(df.columns)}"}
+
+        invalid_quantiles = [q for q in quantiles if not 0 <= q <= 1]
+        if invalid_quantiles:
+            return {"error": f"Quantiles must be between 0 and 1, got: {invalid_quantiles}"}
+
+        numeric_metrics = [col for col in available_metrics if pd.api.types.is_numeric_dtype(df[col])]
+        other_metrics = [col for col in available_metrics if col not in numeric_metrics]
+
+        if incremental and not quantiles:
+            return await _segment_incrementally(dataset_name, df, keys, available_metrics, numeric_metrics,
+                                                other_metrics, top_n, watermark_column)
+
+        grouped = df.groupby(keys, observed=True, sort=False, dropna=True)
+        sizes = grouped.size().sort_values(ascending=False, kind="stable")
+
+        top_index = sizes.index
+        other_frame = None
+        if top_n and len(sizes) > top_n:
+            top_index = sizes.index[:top_n]
+            other_frame = df[_other_rows_mask(df, keys, top_index)]
+
+        segments = {}
+        segment_metrics = _aggregate_groups(grouped, numeric_metrics, other_metrics, quantiles, top_index, keys, df)
+        size_values = sizes.to_numpy()
+        for i, key_value in enumerate(top_index):
+            size = int(size_values[i])
+            segments[_segment_label(key_value)] = {
+                "size": size,
+                "percentage": round((size / len(df)) * 100, 2),
+                "metrics": segment_metrics[key_value]
+            }
+
+        other_segments = None
+        if other_frame is not None and len(other_frame) > 0:
+            other_segments = {
+                "size": len(other_frame),
+                "percentage": round((len(other_frame) / len(df)) * 100, 2),
+                "segments_merged": int(len(sizes) - len(top_index)),
+                "metrics": _aggregate_frame(other_frame, numeric_metrics, other_metrics, quantiles)
+            }
+
+        result = {
+            "dataset_name": dataset_name,
+            "segment_column": keys[0] if len(keys) == 1 else keys,
+            "metric_columns": available_metrics,
+            "total_segments": int(len(sizes)),
+            "segments_returned": len(top_index),
+            "segments": segments,
+            OTHER_SEGMENTS_KEY: other_segments,
+            "insights": _generate_segment_insights(segments, other_segments, numeric_metrics)
+        }
+        if incremental:
+            result["incremental"] = {"mode": "full", "rows_processed": len(df), "rows_total": len(df),
+                                     "reason": "quantiles are not mergeable"}
+        return result
+
+    except Exception as e:
+        return {"error": f"Segmentation failed: {str(e)}"}
+
+
+async def _segment_incrementally(dataset_name: str, df: pd.DataFrame, keys: List[str], available_metrics: List[str],
+                                 numeric_metrics: List[str], other_metrics: List[str], top_n: int,
+                                 watermark_column: str) -> Dict[str, Any]:
+    """Segment from running per-segment totals, aggregating only the rows appended since the last call."""
+
+    totals, update = incremental_update(
+        dataset_name, "segmentation", {"keys": keys, "metrics": available_metrics}, df,
+        lambda: SegmentTotals(keys, numeric_metrics, other_metrics), watermark_column
+    )
+
+    sizes = totals.sizes.sort_values(ascending=False, kind="stable")
+    top_index = sizes.index
+    other_index = sizes.index[:0]
+    if top_n and len(sizes) > top_n:
+        top_index, other_index = sizes.index[:top_n], sizes.index[top_n:]
+
+    segments = {}
+    segment_metrics = _metrics_from_totals(totals, top_index)
+    size_values = sizes.to_numpy()
+    for i, key_value in enumerate(top_index):
+        size = int(size_values[i])
+        segments[_segment_label(key_value)] = {
+            "size": size,
+            "percentage": round((size / len(df)) * 100, 2),
+            "metrics": segment_metrics[key_value]
+        }
+
+    other_segments = None
+    if len(other_index) > 0:
+        other_size = int(size_values[len(top_index):].sum())
+        other_segments = {
+            "size": other_size,
+            "percentage": round((other_size / len(df)) * 100, 2),
+            "segments_merged": int(len(other_index)),
+            "metrics": _combined_metrics_from_totals(totals, other_index)
+        }
+
+    return {
+        "dataset_name": dataset_name,
+        "segment_column": keys[0] if len(keys) == 1 else keys,
+        "metric_columns": available_metrics,
+        "total_segments": int(len(sizes)),
+        "segments_returned": len(top_index),
+        "segments": segments,
+        OTHER_SEGMENTS_KEY: other_segments,
+        "insights": _generate_segment_insights(segments, other_segments, numeric_metrics),
+        "incremental": update
+    }
+
+
+def _aggregate_groups(grouped, numeric_metrics: List[str], other_metrics: List[str], quantiles: List[float],
+                      top_index: pd.Index, keys: List[str], df: pd.DataFrame) -> Dict[Any, Dict[str, Any]]:
+    """Compute per-segment metric summaries for the selected segments in one pass per statistic."""
+
+    metrics = {key_value: {} for key_value in top_index}
+
+    if numeric_metrics:
+        stats = grouped[numeric_metrics].agg(NUMERIC_AGGREGATIONS).reindex(top_index)
+        quantile_stats = None
+        if quantiles:
+            quantile_stats = grouped[numeric_metrics].quantile(list(quantiles)).unstack(level=-1).reindex(top_index)
+
+        for metric in numeric_metrics:
+            counts = stats[(metric, "count")].to_numpy()
+            values = {agg: stats[(metric, agg)].astype(float).fillna(0).to_numpy() for agg in NUMERIC_AGGREGATIONS[1:]}
+            quantile_values = {}
+            if quantile_stats is not None:
+                quantile_values = {_quantile_label(q): quantile_stats[(metric, q)].to_numpy() for q in quantiles}
+            for i, key_value in enumerate(top_index):
+                summary = {"count": int(counts[i])}
+                summary.update({agg: float(values[agg][i]) for agg in values})
+                if quantile_values:
+                    summary["quantiles"] = {label: _float_or_none(q_values[i]) for label, q_values in quantile_values.items()}
+                metrics[key_value][metric] = summary
+
+    if other_metrics:
+        counts = grouped[other_metrics].count().reindex(top_index)
+        uniques = grouped[other_metrics].nunique().reindex(top_index)
+        for metric in other_metrics:
+            metric_counts = counts[metric].to_numpy()
+            metric_uniques = uniques[metric].to_numpy()
+            most_common = _most_common_per_group(df, keys, metric).reindex(top_index).to_numpy()
+            for i, key_value in enumerate(top_index):
+                metrics[key_value][metric] = {
+                    "count": int(metric_counts[i]),
+                    "unique_values": int(metric_uniques[i]),
+                    "most_common": "N/A" if pd.isna(most_common[i]) else str(most_common[i])
+                }
+
+    return metrics
+
+
+def _aggregate_frame(df: pd.DataFrame, numeric_metrics: List[str], other_metrics: List[str],
+                     quantiles: List[float]) -> Dict[str, Any]:
+    """Summarize metrics over a whole frame (used for the merged other_segments bucket)."""
+
+    metrics = {}
+    for metric in numeric_metrics:
+        series = df[metric]
+        count = int(series.count())
+        metrics[metric] = {
+            "count": count,
+            "mean": float(series.mean()) if count > 0 else 0,
+            "sum": float(series.sum()) if count > 0 else 0,
+            "min": float(series.min()) if count > 0 else 0,
+            "max": float(series.max()) if count > 0 else 0
+        }
+        if quantiles:
+            values = series.quantile(list(quantiles))
+            metrics[metric]["quantiles"] = {_quantile_label(q): _float_or_none(values[q]) for q in quantiles}
+
+    for metric in other_metrics:
+        series = df[metric]
+        mode = series.mode()
+        metrics[metric] = {
+            "count": int(series.count()),
+            "unique_values": int(series.nunique()),
+            "most_common": str(mode.iloc[0]) if len(mode) > 0 else "N/A"
+        }
+
+    return metrics
+
+
+def _metrics_from_totals(totals: SegmentTotals, top_index: pd.Index) -> Dict[Any, Dict[str, Any]]:
+    """Per-segment metric summaries for the selected segments from running totals."""
+
+    metrics = {key_value: {} for key_value in top_index}
+
+    if totals.numeric_metrics:
+        stats = totals.numeric.reindex(top_index)
+        for metric in totals.numeric_metrics:
+            counts = stats[(metric, "count")].fillna(0).to_numpy()
+            sums = stats[(metric, "sum")].astype(float).fillna(0).to_numpy()
+            means = np.divide(sums, counts, out=np.zeros(len(counts)), where=counts > 0)
+            mins = stats[(metric, "min")].astype(float).fillna(0).to_numpy()
+            maxs = stats[(metric, "max")].astype(float).fillna(0).to_numpy()
+            for i, key_value in enumerate(top_index):
+                metrics[key_value][metric] = {
+                    "count": int(counts[i]),
+                    "mean": float(means[i]),
+                    "sum": float(sums[i]),
+                    "min": float(mins[i]),
+                    "max": float(maxs[i])
+                }
+
+    for metric in totals.other_metrics:
+        value_counts = totals.value_counts[metric]
+        group_levels = list(range(len(totals.keys)))
+        counts = value_counts.groupby(level=group_levels, observed=True, sort=False).sum().reindex(top_index).fillna(0).to_numpy()
+        uniques = value_counts.groupby(level=group_levels, observed=True, sort=False).size().reindex(top_index).fillna(0).to_numpy()
+        most_common = _most_common_from_counts(value_counts, totals.keys, metric).reindex(top_index).to_numpy()
+        for i, key_value in enumerate(top_index):
+            metrics[key_value][metric] = {
+                "count": int(counts[i]),
+                "unique_values": int(uniques[i]),
+                "most_common": "N/A" if pd.isna(most_common[i]) else str(most_common[i])
+            }
+
+    return metrics
+
+
+def _combined_metrics_from_totals(totals: SegmentTotals, other_index: pd.Index) -> Dict[str, Any]:
+    """Summarize metrics over several segments' running totals (the merged other_segments bucket)."""
+
+    metrics = {}
+    if totals.numeric_metrics:
+        stats = totals.numeric.reindex(other_index)
+        for metric in totals.numeric_metrics:
+            count = int(stats[(metric, "count")].sum())
+            total = float(stats[(metric, "sum")].sum())
+            metrics[metric] = {
+                "count": count,
+                "mean": total / count if count > 0 else 0,
+                "sum": total if count > 0 else 0,
+                "min": float(stats[(metric, "min")].min()) if count > 0 else 0,
+                "max": float(stats[(metric, "max")].max()) if count > 0 else 0
+            }
+
+    for metric in totals.other_metrics:
+        value_counts = totals.value_counts[metric]
+        in_other = value_counts.index.droplevel(-1).isin(other_index)
+        counts = value_counts[in_other].groupby(level=-1, observed=True, sort=False).sum()
+        metrics[metric] = {
+            "count": int(counts.sum()),
+            "unique_values": int((counts > 0).sum()),
+            "most_common": str(counts.idxmax()) if len(counts) > 0 else "N/A"
+        }
+
+    return metrics
+
+
+def _most_common_per_group(df: pd.DataFrame, keys: List[str], metric: str) -> pd.Series:
+    """Most frequent value of a column within each segment, from a single value count."""
+    return _most_common_from_counts(df.groupby(keys + [metric], observed=True, sort=False).size(), keys, metric)
+
+
+def _most_common_from_counts(counts: pd.Series, keys: List[str], metric: str) -> pd.Series:
+    """Most frequent value per segment from value counts indexed by the segment keys and the value."""
+
+    if counts.empty:
+        return pd.Series(dtype=object)
+    counts = counts.sort_values(ascending=False, kind="stable").reset_index()
+    first = counts.drop_duplicates(subset=keys, keep="first")
+    if len(keys) == 1:
+        return pd.Series(first[metric].to_numpy(), index=first[keys[0]].to_numpy())
+    return pd.Series(first[metric].to_numpy(), index=pd.MultiIndex.from_frame(first[keys]))
+
+
+def _other_rows_mask(df: pd.DataFrame, keys: List[str], top_index: pd.Index) -> np.ndarray:
+    """Rows with a complete segment key that is not among the top segments."""
+
+    if len(keys) == 1:
+        in_top = df[keys[0]].isin(top_index)
+    else:
+        in_top = pd.MultiIndex.from_frame(df[keys]).isin(top_index)
+    has_key = df[keys].notna().all(axis=1).to_numpy()
+    return has_key & ~np.asarray(in_top)
+
+
+def _segment_label(key_value: Any) -> str:
+    if isinstance(key_value, tuple):
+        return " | ".join(str(v) for v in key_value)
+    return str(key_value)
+
+
+def _quantile_label(q: float) -> str:
+    return f"p{q * 100:g}"
+
+
+def _float_or_none(value: Any):
+    return None if pd.isna(value) else float(value)
+
+
+def _generate_segment_insights(segments: Dict[str, Any], other_segments: Optional[Dict[str, Any]],
+                               numeric_metrics: List[str]) -> List[str]:
+    """Generate insights from segment summaries."""
+
+    insights = []
+    if not segments:
+        return insights
+
+    largest_segment = max(segments.items(), key=lambda x: x[1]["size"])
+    insights.append(f"Largest segment: {largest_segment[0]} ({largest_segment[1]['percentage']}% of data)")
+
+    for metric in numeric_metrics:
+        highest_segment = max(segments.items(), key=lambda x: x[1]["metrics"].get(metric, {}).get("mean", 0))
+        insights.append(f"Highest {metric}: {highest_segment[0]} (avg: {highest_segment[1]['metrics'][metric]['mean']:.2f})")
+
+    if other_segments is not None:
+        insights.append(f"{other_segments['segments_merged']} smaller segments merged into '{OTHER_SEGMENTS_KEY}' "
+                        f"({other_segments['percentage']}% of data)")
+
+    return insights
@@ -3,12 +3,20 @@ Test configuration and fixtures for Business Intelligence MCP Server.
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 import tempfile
 import os
+import sys
 from pathlib import Path
 from unittest.mock import Mock, AsyncMock
 
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Keep test runs out of the persistent workspace under state/
+os.environ.setdefault("BI_WORKSPACE_DIR", tempfile.mkdtemp(prefix="bi-workspace-"))
+
 
 @pytest.fixture
 def sample_dataset():
@@ -23,6 +31,44 @@ def sample_dataset():
     return pd.DataFrame(data)
 
 
+@pytest.fixture
+def make_orders():
+    """
+    Factory for seeded order frames: one row per hour from 2024-01-01, numbered from start.
+
+    Frames built with the same start and seed are identical, so a later start appends
+    rows to an earlier frame; missing_units blanks that share of units (as floats).
+    """
+
+    def make(rows=4000, start=0, seed=0, columns=None, missing_units=0.0):
+        rng = np.random.default_rng(seed)
+        positions = np.arange(start, start + rows)
+        frame = pd.DataFrame({
+            "order_id": positions,
+            "ordered_at": pd.Timestamp("2024-01-01") + pd.to_timedelta(positions, unit="h"),
+            "region": rng.choice(["North", "South", "East", "West"], rows),
+            "channel": rng.choice(["web", "store", "phone"], rows),
+            "revenue": rng.gamma(2.0, 50.0, rows),
+            "units": rng.integers(1, 20, rows)
+        })
+        if missing_units:
+            frame["units"] = frame["units"].astype(float)
+            frame.loc[rng.random(rows) < missing_units, "units"] = np.nan
+        return frame[columns] if columns else frame
+
+    return make
+
+
+@pytest.fixture
+def state_store(tmp_path, monkeypatch):
+    """Incremental analysis state kept under tmp_path for the test."""
+    from src.core import incremental
+
+    store = incremental.IncrementalStateStore(str(tmp_path / "state"))
+    monkeypatch.setattr(incremental, "_STORE", store)
+    return store
+
+
 @pytest.fixture
 def temp_csv_file(sample_dataset):
     """Create a temporary CSV file with sample data."""
@@ -0,0 +1,175 @@
+"""
+Tests for the paginated, cached HTTP data source against a local stand-in API.
+"""
+
+import json
+import threading
+import pytest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.api_source import HttpCache, close_http_client, fetch_api
+from src.tools.load_datasource import load_datasource_tool
+
+RECORDS = [{"id": i, "name": f"item{i}", "meta": {"score": i * 0.5}} for i in range(250)]
+
+
+class _StandInApi(BaseHTTPRequestHandler):
+    """Offset, page, cursor and Link-header endpoints over RECORDS, with ETags."""
+
+    requests = []
+    failures_left = {}
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        type(self).requests.append(parts.path)
+
+        if type(self).failures_left.get(parts.path, 0) > 0:
+            type(self).failures_left[parts.path] -= 1
+            return self._send(503, b"busy", "text/plain", {"Retry-After": "0"})
+
+        headers = {}
+        if parts.path == "/offset":
+            start, size = int(query.get("offset", 0)), int(query.get("limit", 100))
+            body = {"data": RECORDS[start:start + size], "meta": {"total": len(RECORDS)}}
+        elif parts.path == "/pages":
+            page, size = int(query.get("page", 1)), int(query.get("per_page", 100))
+            body = RECORDS[(page - 1) * size:page * size]
+        elif parts.path == "/cursor":
+            start = int(query.get("cursor", 0))
+            following = start + 100 if start + 100 < len(RECORDS) else None
+            body = {"items": RECORDS[start:start + 100], "next_cursor": following}
+        elif parts.path == "/link":
+            page = int(query.get("page", 1))
+            base = f"http://127.0.0.1:{self.server.server_port}/link"
+            headers["Link"] = f'<{base}?page={page + 1}>; rel="next", <{base}?page=3>; rel="last"' if page < 3 else ""
+            body = RECORDS[(page - 1) * 100:page * 100]
+        elif parts.path == "/report.csv":
+            payload = "id,value\n" + "".join(f"{i},{i * 2}\n" for i in range(10))
+            return self._send(200, payload.encode(), "text/csv")
+        else:
+            return self._send(404, b"not found", "text/plain")
+
+        payload = json.dumps(body).encode()
+        etag = f'"{hash(payload) & 0xffffffff:x}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", "application/json", {"ETag": etag})
+        self._send(200, payload, "application/json", {"ETag": etag, **{k: v for k, v in headers.items() if v}})
+
+    def _send(self, status, payload, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server():
+    _StandInApi.requests = []
+    _StandInApi.failures_left = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInApi)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    return HttpCache(str(tmp_path / "http_cache"))
+
+
+@pytest.mark.asyncio
+class TestFetchApi:
+    """Test pagination styles, retries and conditional caching."""
+
+    async def test_offset_pagination_with_total(self, api_server, http_cache):
+        result = await fetch_api(f"{api_server}/offset", {
+            "pagination": "offset", "page_size": 100, "records_path": "data", "total_path": "meta.total"
+        }, cache=http_cache)
+        df = result["data"]
+        assert df["id"].tolist() == list(range(250))
+        assert "meta.score" in df.columns
+        assert result["ingest"]["pages"] == 3 and result["ingest"]["requests"] == 3
+        await close_http_client()
+
+    async def test_page_pagination_stops_at_short_page(self, api_server, http_cache):
+        result = await fetch_api(f"{api_server}/pages", {
+            "pagination": "page", "page_size": 100, "concurrency": 2
+        }, cache=http_cache)
+        assert result["data"]["id"].tolist() == list(range(250))
+        await close_http_client()
+
+    async def test_cursor_pagination(self, api_server, http_cache):
+        result = await fetch_api(f"{api_server}/cursor", {
+            "pagination": "cursor", "records_path": "$.items[*]", "cursor_path": "next_cursor"
+        }, cache=http_cache)
+        assert result["data"]["id"].tolist() == list(range(250))
+        assert result["ingest"]["pages"] == 3
+        await close_http_client()
+
+    async def test_link_header_pagination(self, api_server, http_cache):
+        result = await fetch_api(f"{api_server}/link", {"pagination": "link"}, cache=http_cache)
+        assert result["data"]["id"].tolist() == list(range(250))
+        assert _StandInApi.requests.count("/link") == 3
+        await close_http_client()
+
+    async def test_reload_revalidates_with_etags(self, api_server, http_cache):
+        options = {"pagination": "offset", "page_size": 100, "records_path": "data", "total_path": "meta.total"}
+        await fetch_api(f"{api_server}/offset", options, cache=http_cache)
+        result = await fetch_api(f"{api_server}/offset", options, cache=http_cache)
+        assert result["ingest"]["not_modified"] == 3
+        assert result["ingest"]["bytes_downloaded"] == 0
+        assert len(result["data"]) == 250
+        await close_http_client()
+
+    async def test_cached_responses_are_per_credentials(self, api_server, http_cache):
+        await fetch_api(f"{api_server}/pages", {"pagination": "none", "auth": ["alice", "pw1"]}, cache=http_cache)
+        other_user = await fetch_api(f"{api_server}/pages", {"pagination": "none", "auth": ["bob", "pw2"]}, cache=http_cache)
+        assert other_user["ingest"]["not_modified"] == 0 and other_user["ingest"]["bytes_downloaded"] > 0
+        same_user = await fetch_api(f"{api_server}/pages", {"pagination": "none", "auth": ["alice", "pw1"]}, cache=http_cache)
+        assert same_user["ingest"]["not_modified"] == 1
+        assert not any(b"pw1" in path.read_bytes() for path in http_cache.cache_dir.glob("*.json"))
+        await close_http_client()
+
+    async def test_retries_unavailable_responses(self, api_server, http_cache):
+        _StandInApi.failures_left = {"/pages": 2}
+        result = await fetch_api(f"{api_server}/pages", {"pagination": "none"}, cache=http_cache)
+        assert result["ingest"]["retries"] == 2
+        assert len(result["data"]) == 100
+        await close_http_client()
+
+    async def test_csv_body(self, api_server, http_cache):
+        result = await fetch_api(f"{api_server}/report.csv", {}, cache=http_cache)
+        assert result["data"]["value"].sum() == 90
+        await close_http_client()
+
+
+@pytest.mark.asyncio
+class TestLoadApiSource:
+    """Test API sources through the load tool."""
+
+    async def test_load_tool_registers_paginated_api(self, api_server, tmp_path, monkeypatch):
+        monkeypatch.setenv("BI_HTTP_CACHE_DIR", str(tmp_path / "http_cache"))
+        result = await load_datasource_tool(f"{api_server}/cursor", dataset_name="api_items", options={
+            "pagination": "cursor", "records_path": "items"})
+        assert result["load_status"] == "success"
+        assert result["summary"]["data_summary"]["rows"] == 250
+        assert result["ingest"]["pages"] == 3
+
+        missing = await load_datasource_tool(f"{api_server}/missing", dataset_name="api_missing")
+        assert "404" in missing["error"]
+        await close_http_client()
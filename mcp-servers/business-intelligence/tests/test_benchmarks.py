@@ -0,0 +1,63 @@
+"""
+Tests for the benchmark helpers: synthetic datasets, measurements and baseline comparison.
+"""
+
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root and the benchmark helpers to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from harness import compare, load_baseline, measure, save_results
+from synthetic import BASE_COLUMNS, parse_rows, sales_frame, shape_id
+
+
+class TestSyntheticData:
+    """Test the seeded sales generator."""
+
+    def test_same_seed_same_frame(self):
+        pd.testing.assert_frame_equal(sales_frame(500, 14), sales_frame(500, 14))
+        assert not sales_frame(500, seed=1).equals(sales_frame(500, seed=2))
+
+    @pytest.mark.parametrize("columns", [4, 10, 25])
+    def test_shape(self, columns):
+        frame = sales_frame(300, columns)
+        assert frame.shape == (300, columns)
+        assert list(frame.columns[:min(columns, 10)]) == BASE_COLUMNS[:columns]
+
+    def test_shape_labels(self):
+        assert [parse_rows(value) for value in ["10k", "1m", "2500", "1.5k"]] == [10_000, 1_000_000, 2500, 1500]
+        assert [shape_id(10_000, 10), shape_id(1_000_000, 100), shape_id(2500, 3)] == ["10k-x10", "1m-x100",
+                                                                                         "2500-x3"]
+
+
+class TestHarness:
+    """Test measurements and the baseline comparison."""
+
+    def test_measure_coroutine(self, tmp_path):
+        target = tmp_path / "out.txt"
+        target.write_text("x" * 1000)
+
+        async def tool():
+            return {"export_details": {"output_path": str(target)}}
+
+        stats = measure(tool, rounds=2)
+        assert stats["rounds"] == 2 and stats["wall_s"] <= stats["wall_s_median"]
+        assert stats["output_bytes"] > 1000 and stats["peak_rss_mb"] > 0
+
+    def test_measure_raises_on_tool_error(self):
+        with pytest.raises(AssertionError, match="not found"):
+            measure(lambda: {"error": "Dataset 'x' not found"}, rounds=1)
+
+    def test_compare_against_saved_baseline(self, tmp_path):
+        baseline = {"a": {"wall_s": 1.0, "rss_delta_mb": 100.0}, "b": {"wall_s": 0.001, "rss_delta_mb": 1.0},
+                    "c": {"wall_s": 1.0, "rss_delta_mb": None}}
+        save_results(baseline, str(tmp_path / "baseline.json"))
+        current = {"a": {"wall_s": 1.2, "rss_delta_mb": 300.0}, "b": {"wall_s": 0.01, "rss_delta_mb": 8.0},
+                   "c": {"wall_s": 2.0, "rss_delta_mb": 50.0}, "new": {"wall_s": 9.0, "rss_delta_mb": 900.0}}
+
+        regressions = compare(current, load_baseline(str(tmp_path / "baseline.json")), tolerance=0.5)
+        assert [(r["benchmark"], r["metric"]) for r in regressions] == [("a", "rss_delta_mb"), ("c", "wall_s")]
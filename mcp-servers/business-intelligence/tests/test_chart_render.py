@@ -0,0 +1,141 @@
+"""
+Tests for the chart rendering pipeline.
+"""
+
+import pytest
+import base64
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.chart_render import FigurePool, box_stats, downsample_line, encode_figure, lttb_indices, minmax_indices
+from src.core.dataset_store import store_dataset
+from src.core.executor import get_executor
+from src.tools.create_visualization import create_visualization_tool
+
+
+@pytest.fixture
+def long_series():
+    rng = np.random.default_rng(11)
+    y = rng.normal(size=400_000).cumsum()
+    y[123_457] = y.max() + 50  # a single spike must survive downsampling
+    return np.arange(len(y), dtype=np.float64), y
+
+
+class TestDownsampling:
+    """Test min-max and LTTB point selection."""
+
+    def test_minmax_keeps_extremes(self, long_series):
+        _, y = long_series
+        keep = minmax_indices(y, 1000)
+        assert len(keep) <= 2002
+        assert y.argmax() in keep and y.argmin() in keep
+        assert keep[0] == 0 and keep[-1] == len(y) - 1
+
+    def test_lttb_keeps_endpoints_and_order(self, long_series):
+        x, y = long_series
+        keep = lttb_indices(x[:10_000], y[:10_000], 500)
+        assert len(keep) == 500
+        assert keep[0] == 0 and keep[-1] == 9_999
+        assert np.all(np.diff(keep) > 0)
+
+    def test_downsample_respects_budget(self, long_series):
+        x, y = long_series
+        keep = downsample_line(x, y, 2000)
+        assert len(keep) == 2000
+        assert 123_457 in keep
+        assert np.array_equal(downsample_line(x[:50], y[:50], 2000), np.arange(50))
+
+    def test_box_stats_caps_fliers(self):
+        values = np.concatenate([np.zeros(5000), np.linspace(100, 200, 1000), -np.linspace(100, 200, 1000)])
+        stats = box_stats(values, "v")
+        assert len(stats["fliers"]) == 200
+        assert stats["fliers"].max() == 200 and stats["fliers"].min() == -200
+
+
+class TestFigurePool:
+    """Test figure reuse and encoding."""
+
+    def test_reuses_cleared_figures(self):
+        pool = FigurePool()
+        with pool.figure((4, 3)) as (fig, ax):
+            ax.plot([1, 2, 3])
+            first = fig
+        with pool.figure((4, 3)) as (fig, ax):
+            assert fig is first
+            assert len(fig.axes) == 1 and not ax.lines
+            encoded = encode_figure(fig, "webp", dpi=50)
+        assert pool.stats() == {"created": 1, "reused": 1, "pooled": 1}
+        assert base64.b64decode(encoded["chart_image"])[8:12] == b"WEBP"
+        assert encoded["mime_type"] == "image/webp"
+
+
+@pytest.mark.asyncio
+class TestCreateVisualization:
+    """Test that chart payloads stop growing with row count."""
+
+    async def test_line_payload_independent_of_rows(self):
+        rng = np.random.default_rng(2)
+        sizes = {}
+        for rows in (1_000, 300_000):
+            df = pd.DataFrame({"day": pd.date_range("2020-01-01", periods=rows, freq="min"),
+                               "revenue": rng.normal(size=rows).cumsum()})
+            store_dataset(f"line_{rows}", df)
+            result = await create_visualization_tool(f"line_{rows}", "line", "day", "revenue")
+            sizes[rows] = result["visualization"]
+        assert sizes[300_000]["data_summary"]["points_plotted"] <= 2000
+        assert sizes[300_000]["data_summary"]["downsampling"] == "minmax_lttb"
+        assert sizes[300_000]["payload_bytes"] < 3 * sizes[1_000]["payload_bytes"]
+
+    async def test_large_scatter_uses_hexbin(self):
+        rng = np.random.default_rng(4)
+        store_dataset("scatter_big", pd.DataFrame({"a": rng.normal(size=60_000), "b": rng.normal(size=60_000)}))
+        result = await create_visualization_tool("scatter_big", "scatter", "a", "b")
+        assert result["visualization"]["data_summary"]["rendering"] == "hexbin"
+
+    async def test_renderer_receives_reduced_rows(self, monkeypatch):
+        rng = np.random.default_rng(6)
+        rows = 200_000
+        df = pd.DataFrame({"region": rng.choice(["north", "south", "east", "west"], rows),
+                           "sales": rng.gamma(2.0, 50.0, rows), "units": rng.integers(1, 20, rows).astype(float)})
+        store_dataset("reduced_sales", df)
+        tool_executor = get_executor()
+        render_process = tool_executor.run_in_process
+        shipped = []
+
+        async def capture(tool_name, fn, render, frame, params):
+            shipped.append(len(frame))
+            return await render_process(tool_name, fn, render, frame, params)
+
+        monkeypatch.setattr(tool_executor, "run_in_process", capture)
+        bar = await create_visualization_tool("reduced_sales", "bar", "region", "sales")
+        histogram = await create_visualization_tool("reduced_sales", "histogram", "sales")
+        dashboard = await create_visualization_tool("reduced_sales", "dashboard")
+
+        assert shipped == [4, 30, 0]
+        assert bar["visualization"]["data_summary"]["total_records"] == rows
+        assert histogram["visualization"]["data_summary"]["median"] == round(float(df["sales"].median()), 3)
+        assert dashboard["visualization"]["data_summary"]["total_rows"] == rows
+        assert bar["insights"] and histogram["recommendations"]
+
+    async def test_vega_lite_spec(self, sample_dataset, tmp_path):
+        store_dataset("spec_sales", sample_dataset)
+        output = tmp_path / "chart"
+        result = await create_visualization_tool("spec_sales", "bar", "region", "sales",
+                                                 output_path=str(output), output_format="vega-lite")
+        viz = result["visualization"]
+        assert viz["chart_spec"]["mark"] == "bar"
+        expected = sample_dataset.groupby("region")["sales"].sum()
+        assert {row["region"]: row["sales"] for row in viz["chart_spec"]["data"]["values"]} == expected.to_dict()
+        assert viz["output_path"].endswith(".json")
+
+    async def test_rejects_unknown_format(self, sample_dataset):
+        store_dataset("spec_sales", sample_dataset)
+        result = await create_visualization_tool("spec_sales", "bar", output_format="gif")
+        assert "supported_formats" in result
+        result = await create_visualization_tool("spec_sales", "violin", "region", "sales", output_format="vega-lite")
+        assert "error" in result
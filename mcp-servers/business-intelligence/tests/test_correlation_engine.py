@@ -0,0 +1,108 @@
+"""
+Tests for the vectorized correlation engine.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+from scipy import stats
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import correlation_engine, executor as executor_module
+from src.core.correlation_engine import correlation_matrices, kendall_matrices, top_pairs
+from src.core.executor import ToolExecutor
+
+
+@pytest.fixture
+def data_with_gaps():
+    """Correlated columns with different missing-value patterns."""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame(rng.normal(size=(200, 4)), columns=["a", "b", "c", "d"])
+    df["b"] += df["a"]
+    df["c"] = df["c"].round(0)  # ties for rank-based methods
+    df.loc[rng.choice(200, 25, replace=False), "a"] = np.nan
+    df.loc[rng.choice(200, 15, replace=False), "d"] = np.nan
+    return df
+
+
+class TestCorrelationMatrices:
+    """Test agreement with scipy on pairwise-complete data."""
+
+    @pytest.mark.parametrize("method,scipy_func", [
+        ("pearson", stats.pearsonr),
+        ("spearman", stats.spearmanr),
+        ("kendall", stats.kendalltau),
+    ])
+    def test_matches_scipy(self, data_with_gaps, method, scipy_func):
+        matrices = correlation_matrices(data_with_gaps, method, exact_spearman=True)
+        for x in data_with_gaps.columns:
+            for y in data_with_gaps.columns:
+                if x == y:
+                    continue
+                pair = data_with_gaps[[x, y]].dropna()
+                expected_r, expected_p = scipy_func(pair[x], pair[y])
+                assert matrices.r.loc[x, y] == pytest.approx(expected_r, abs=1e-10)
+                assert matrices.p.loc[x, y] == pytest.approx(expected_p, abs=1e-10)
+                assert matrices.n.loc[x, y] == len(pair)
+
+    def test_spearman_ranks_each_column_once(self, data_with_gaps, monkeypatch):
+        exact = correlation_matrices(data_with_gaps, "spearman", exact_spearman=True)
+        rankdata, calls = stats.rankdata, []
+        monkeypatch.setattr(stats, "rankdata", lambda values: calls.append(1) or rankdata(values))
+        matrices = correlation_matrices(data_with_gaps, "spearman")
+        assert len(calls) == 4
+        # Pairs sharing every present row are exact; the others stay close to scipy
+        assert matrices.r.loc["b", "c"] == pytest.approx(exact.r.loc["b", "c"], abs=1e-10)
+        np.testing.assert_allclose(matrices.r.to_numpy(), exact.r.to_numpy(), atol=0.02)
+        assert (matrices.n == exact.n).all().all()
+
+    def test_constant_column_is_undefined(self, sample_correlation_data):
+        df = sample_correlation_data.select_dtypes("number").assign(flat=1.0)
+        matrices = correlation_matrices(df, "pearson")
+        assert np.isnan(matrices.r.loc["flat", "var1"])
+        assert matrices.r.loc["var1", "var2"] == pytest.approx(1.0)
+
+    def test_kendall_only_requested_pairs(self, data_with_gaps):
+        matrices = correlation_matrices(data_with_gaps, "kendall", pairs=[("a", "b")])
+        assert not np.isnan(matrices.r.loc["a", "b"])
+        assert np.isnan(matrices.r.loc["c", "d"])
+
+
+@pytest.mark.asyncio
+class TestKendallMatrices:
+    """Test Kendall pairs dispatched through the tool executor."""
+
+    async def test_chunks_run_in_the_process_pool(self, data_with_gaps, monkeypatch):
+        executor = ToolExecutor(thread_workers=2, process_workers=2)
+        monkeypatch.setattr(executor_module, "_EXECUTOR", executor)
+        monkeypatch.setattr(correlation_engine, "KENDALL_PARALLEL_MIN_WORK", 0)
+        try:
+            matrices = await kendall_matrices(data_with_gaps)
+        finally:
+            executor.shutdown(wait=True)
+        expected = correlation_matrices(data_with_gaps, "kendall")
+        np.testing.assert_allclose(matrices.r.to_numpy(), expected.r.to_numpy(), atol=1e-12)
+        assert executor.stats()["completed"] == 2
+
+class TestTopPairs:
+    """Test pair flattening and top-k selection."""
+
+    def test_all_pairs_sorted(self, data_with_gaps):
+        pairs = top_pairs(correlation_matrices(data_with_gaps))
+        assert len(pairs) == 6
+        assert pairs["correlation"].abs().is_monotonic_decreasing
+        assert set(pairs.iloc[0][["variable1", "variable2"]]) == {"a", "b"}
+
+    def test_threshold_and_k(self, data_with_gaps):
+        pairs = top_pairs(correlation_matrices(data_with_gaps), threshold=0.5, k=10)
+        assert len(pairs) == 1
+        assert (pairs["correlation"].abs() >= 0.5).all()
+
+    def test_target_column(self, data_with_gaps):
+        pairs = top_pairs(correlation_matrices(data_with_gaps), target_column="d")
+        assert len(pairs) == 3
+        assert (pairs["variable1"] == "d").all()
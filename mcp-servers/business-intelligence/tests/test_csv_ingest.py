@@ -0,0 +1,67 @@
+"""
+Tests for CSV ingestion.
+"""
+
+import codecs
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import csv_ingest
+from src.core.csv_ingest import read_csv_file, sniff_csv, sniff_encoding
+
+
+class TestSniffing:
+    """Test encoding and delimiter detection."""
+
+    def test_utf8_bom(self):
+        assert sniff_encoding(codecs.BOM_UTF8 + b"a,b\n1,2\n") == "utf-8-sig"
+
+    def test_truncated_multibyte_still_utf8(self):
+        assert sniff_encoding("name\ncafé".encode("utf-8")[:-1]) == "utf-8"
+
+    def test_legacy_encoding(self):
+        assert sniff_encoding("name\ncafé\n".encode("cp1252")) == "cp1252"
+
+    def test_semicolon_delimiter(self, tmp_path):
+        path = tmp_path / "semi.csv"
+        path.write_text("region;sales;units\nNorth;1,5;3\nSouth;2,5;4\n")
+        assert sniff_csv(str(path))["delimiter"] == ";"
+
+
+class TestReadCsvFile:
+    """Test single-pass reading and ingest statistics."""
+
+    def test_matches_pandas(self, temp_csv_file):
+        result = read_csv_file(temp_csv_file)
+        expected = pd.read_csv(temp_csv_file)
+        assert result["data"].shape == expected.shape
+        assert result["data"]["sales"].sum() == pytest.approx(expected["sales"].sum())
+        assert result["ingest"]["rows"] == len(expected)
+        assert result["ingest"]["rows_per_second"] > 0
+
+    def test_legacy_encoding_decoded(self, tmp_path):
+        path = tmp_path / "legacy.csv"
+        path.write_bytes("name,amount\ncafé,1\nThé,2\n".encode("cp1252"))
+        result = read_csv_file(str(path))
+        assert result["data"]["name"].tolist() == ["café", "Thé"]
+
+    def test_late_non_utf8_bytes_trigger_reread(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(csv_ingest, "SNIFF_BYTES", 16)
+        path = tmp_path / "late.csv"
+        path.write_bytes(("name,amount\n" + "plain,1\n" * 10 + "café,2\n").encode("latin-1"))
+        result = read_csv_file(str(path))
+        assert result["data"]["name"].iloc[-1] == "café"
+
+    def test_pandas_chunked_path_reports_progress(self, temp_csv_file, monkeypatch):
+        monkeypatch.setattr(csv_ingest, "PANDAS_CHUNK_ROWS", 30)
+        progress = []
+        result = read_csv_file(temp_csv_file, {"header": None}, progress_callback=progress.append)
+        assert result["ingest"]["engine"] == "pandas_chunked"
+        assert len(result["data"]) == 101  # header row kept as data
+        assert [p["stage"] for p in progress].count("parsing") == 4
+        assert progress[-1]["stage"] == "complete"
@@ -0,0 +1,160 @@
+"""
+Tests for the shared dataset store.
+"""
+
+import threading
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import DatasetStore, arrow_string_dtype, compact_frame, dataset_fingerprint
+
+
+class TestCompactFrame:
+    """Test lossless dataset compaction."""
+
+    def test_integers_downcast(self):
+        df = pd.DataFrame({"small": [1, 2, 3], "large": [0, 1, 2**40]})
+        compacted = compact_frame(df)
+        assert compacted["small"].dtype == np.int8
+        assert compacted["large"].dtype == np.int64
+        assert (compacted["small"] == df["small"]).all()
+
+    def test_floats_keep_float64_sums(self):
+        exact = np.full(1_000_000, 1.1, dtype=np.float32).astype(np.float64)  # every value fits float32
+        df = pd.DataFrame({"exact": exact, "lossy": 0.1})
+        compacted = compact_frame(df)
+        assert compacted["exact"].dtype == np.float64
+        assert compacted["lossy"].dtype == np.float64
+        assert compacted["exact"].sum() == df["exact"].sum()
+
+    def test_low_cardinality_strings_become_categorical(self, sample_dataset):
+        compacted = compact_frame(sample_dataset)
+        assert isinstance(compacted["region"].dtype, pd.CategoricalDtype)
+        assert compacted["region"].astype(str).tolist() == sample_dataset["region"].tolist()
+        assert compacted.memory_usage(deep=True).sum() < sample_dataset.memory_usage(deep=True).sum()
+
+    def test_date_strings_become_datetime(self):
+        df = pd.DataFrame({
+            "day": ["2024-01-05", "2024-02-10", None, "2024-03-15"],
+            "stamp": ["05/01/2024 10:30", "06/01/2024 11:00", "07/01/2024 12:15", "08/01/2024 09:45"],
+            "mixed": ["2024-01-05", "soon", "2024-03-01", "later"],
+            "code": ["20240105", "20240210", "20240301", "20240415"]
+        })
+        compacted = compact_frame(df, category_max_ratio=0)
+        assert compacted["day"].dtype == "datetime64[ns]"
+        assert compacted["day"].isna().sum() == 1
+        assert compacted["stamp"].dt.hour.tolist() == [10, 11, 12, 9]
+        assert not pd.api.types.is_datetime64_any_dtype(compacted["mixed"])
+        assert not pd.api.types.is_datetime64_any_dtype(compacted["code"])
+
+    def test_high_cardinality_strings_use_arrow(self):
+        string_dtype = arrow_string_dtype()
+        if string_dtype is None:
+            pytest.skip("pyarrow not installed")
+        df = pd.DataFrame({"note": [f"order note {i}" for i in range(500)] + [np.nan]})
+        compacted = compact_frame(df)
+        assert compacted["note"].dtype == string_dtype
+        assert compacted["note"].isna().sum() == 1
+        assert compacted.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+
+    def test_source_frame_untouched(self, sample_dataset):
+        original_dtypes = sample_dataset.dtypes.copy()
+        compact_frame(sample_dataset)
+        assert (sample_dataset.dtypes == original_dtypes).all()
+
+
+class TestDatasetStore:
+    """Test registration, versioning and spill behaviour."""
+
+    def test_put_and_get(self, sample_dataset, tmp_path):
+        store = DatasetStore(cache_dir=str(tmp_path))
+        entry = store.put("sales", sample_dataset)
+        assert entry.rows == len(sample_dataset)
+        assert "sales" in store
+        assert store.get("sales").shape == sample_dataset.shape
+        assert store.get("missing") is None
+
+    def test_reports_bytes_before_compaction(self, sample_dataset, tmp_path):
+        entry = DatasetStore(cache_dir=str(tmp_path)).put("sales", sample_dataset)
+        report = entry.compaction()
+        assert report["bytes_before"] == sample_dataset.memory_usage(deep=True).sum()
+        assert report["bytes_after"] == entry.nbytes < report["bytes_before"]
+        assert report["reduction"] > 1
+
+    def test_replace_bumps_version(self, sample_dataset, tmp_path):
+        store = DatasetStore(cache_dir=str(tmp_path))
+        store.put("sales", sample_dataset)
+        entry = store.put("sales", sample_dataset.head(10))
+        assert entry.version == 2
+        assert len(store.get("sales")) == 10
+
+    def test_lru_spill_and_reload(self, sample_dataset, tmp_path):
+        pytest.importorskip("pyarrow")
+        store = DatasetStore(memory_budget_bytes=1, cache_dir=str(tmp_path))
+        store.put("first", sample_dataset)
+        store.put("second", sample_dataset)
+
+        stats = store.stats()
+        assert stats["spilled"] == 1
+        assert store.entry("first").spill_path.exists()
+
+        reloaded = store.get("first")
+        pd.testing.assert_frame_equal(reloaded, compact_frame(sample_dataset))
+        assert store.entry("second").resident is False
+
+    def test_spill_round_trip_keeps_arrow_strings(self, tmp_path):
+        if arrow_string_dtype() is None:
+            pytest.skip("pyarrow not installed")
+        df = pd.DataFrame({"note": [f"note {i}" for i in range(200)], "value": np.arange(200)})
+        store = DatasetStore(memory_budget_bytes=1, cache_dir=str(tmp_path))
+        store.put("notes", df)
+        store.put("other", df)
+        pd.testing.assert_frame_equal(store.get("notes"), compact_frame(df))
+
+    def test_remove_deletes_spill_file(self, sample_dataset, tmp_path):
+        pytest.importorskip("pyarrow")
+        store = DatasetStore(memory_budget_bytes=1, cache_dir=str(tmp_path))
+        store.put("first", sample_dataset)
+        store.put("second", sample_dataset)
+        spill_path = store.entry("first").spill_path
+        assert store.remove("first") is True
+        assert not spill_path.exists()
+        assert store.names() == ["second"]
+
+    def test_virtual_build_runs_outside_store_lock_once(self, sample_dataset, tmp_path):
+        store = DatasetStore(cache_dir=str(tmp_path))
+        store.put("ready", sample_dataset)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return sample_dataset
+
+        store.put_virtual("slow", slow_loader, list(sample_dataset.columns))
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            builds = [pool.submit(store.get, "slow") for _ in range(2)]
+            assert started.wait(5)
+            assert store.get("ready") is not None  # not blocked by the build
+            release.set()
+            frames = [build.result(5) for build in builds]
+
+        assert calls == [1]
+        assert frames[0] is frames[1] is store.get("slow")
+        assert store.entry("slow").loading is None
+
+    def test_fingerprint_covers_every_row(self):
+        df = pd.DataFrame(np.random.default_rng(0).normal(size=(600_000, 10)), columns=[f"c{i}" for i in range(10)])
+        edited = df.copy()
+        edited.loc[5000, "c3"] = 999.0
+        assert dataset_fingerprint(df) == dataset_fingerprint(df.copy())
+        assert dataset_fingerprint(edited) != dataset_fingerprint(df)
@@ -0,0 +1,112 @@
+"""
+Tests for Excel workbook ingestion.
+"""
+
+import os
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import excel_ingest
+from src.core.excel_ingest import list_sheets, load_excel, read_excel_file, read_sheet
+from src.tools.load_datasource import load_datasource_tool
+
+
+@pytest.fixture
+def workbook(tmp_path, sample_dataset):
+    path = tmp_path / "finance.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        sample_dataset.to_excel(writer, sheet_name="Q1", index=False)
+        sample_dataset.head(40).to_excel(writer, sheet_name="Q2", index=False)
+        sample_dataset.head(60).to_excel(writer, sheet_name="Totals", index=False)
+    return str(path)
+
+
+class TestSheets:
+    """Test sheet listing and single-sheet parsing."""
+
+    def test_lists_sheets_from_dimensions(self, workbook):
+        assert list_sheets(workbook) == [
+            {"name": "Q1", "rows": 101, "columns": 5},
+            {"name": "Q2", "rows": 41, "columns": 5},
+            {"name": "Totals", "rows": 61, "columns": 5}
+        ]
+
+    def test_stream_matches_pandas(self, workbook):
+        expected = pd.read_excel(workbook, sheet_name="Q2")
+        pd.testing.assert_frame_equal(read_sheet(workbook, "Q2", engine="openpyxl-stream"), expected)
+
+    def test_stream_matches_pandas_missing_values(self, tmp_path):
+        path = tmp_path / "gaps.xlsx"
+        pd.DataFrame({
+            "amount": [10.5, "N/A", 7, "NULL", "#N/A", 3.25],
+            "status": ["open", "n/a", "closed", "NA", "", "None"]
+        }).to_excel(path, index=False)
+        stream = read_sheet(str(path), "Sheet1", engine="openpyxl-stream")
+        pd.testing.assert_frame_equal(stream, read_sheet(str(path), "Sheet1", engine="pandas"))
+        assert stream["amount"].dtype == "float64" and stream["amount"].isna().sum() == 3
+
+    def test_usecols_and_nrows(self, workbook):
+        by_letter = read_sheet(workbook, "Q1", usecols="A,C:D", nrows=10, engine="openpyxl-stream")
+        assert list(by_letter.columns) == ["date", "customers", "region"]
+        assert len(by_letter) == 10
+        by_name = read_sheet(workbook, "Q1", usecols=["sales", "region"], nrows=3, engine="openpyxl-stream")
+        assert list(by_name.columns) == ["sales", "region"]
+        with pytest.raises(ValueError):
+            read_sheet(workbook, "Q1", usecols=["missing"], engine="openpyxl-stream")
+
+
+class TestParquetCache:
+    """Test the mtime-keyed Parquet cache next to the workbook."""
+
+    def test_second_read_comes_from_cache(self, workbook, monkeypatch):
+        first = read_excel_file(workbook, {"sheet_name": "Q1"})
+        assert first["ingest"]["sheets_from_cache"] == 0
+        assert list(Path(workbook).parent.glob(".finance.xlsx.cache/Q1_*.parquet"))
+
+        monkeypatch.setattr(excel_ingest, "read_sheet", lambda *args: pytest.fail("sheet was re-parsed"))
+        second = read_excel_file(workbook, {"sheet_name": "Q1"})
+        assert second["ingest"]["sheets_from_cache"] == 1
+        pd.testing.assert_frame_equal(first["data"], second["data"])
+
+    def test_modified_workbook_is_reparsed(self, workbook, sample_dataset):
+        read_excel_file(workbook, {"sheet_name": "Q2"})
+        with pd.ExcelWriter(workbook) as writer:
+            sample_dataset.head(5).to_excel(writer, sheet_name="Q2", index=False)
+        stat = os.stat(workbook)
+        os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        result = read_excel_file(workbook, {"sheet_name": "Q2"})
+        assert result["ingest"]["sheets_from_cache"] == 0
+        assert len(result["data"]) == 5
+        assert len(list(Path(workbook).parent.glob(".finance.xlsx.cache/Q2_*.parquet"))) == 1
+
+
+@pytest.mark.asyncio
+class TestLoadExcel:
+    """Test sheet selection through the async loader and the load tool."""
+
+    async def test_concat_selected_sheets(self, workbook):
+        result = await load_excel(workbook, {"sheets": ["Q1", "Q2"], "combine_sheets": "concat", "cache": False})
+        df = result["data"]
+        assert len(df) == 140
+        assert df.columns[0] == "sheet"
+        assert df["sheet"].value_counts().to_dict() == {"Q1": 100, "Q2": 40}
+
+    async def test_all_sheets_parses_only_the_largest(self, workbook, monkeypatch):
+        parsed = []
+        original = excel_ingest.read_sheet
+        monkeypatch.setattr(excel_ingest, "read_sheet", lambda path, sheet, *args: parsed.append(sheet) or
+                            original(path, sheet, *args))
+        result = await load_excel(workbook, {"all_sheets": True, "cache": False})
+        assert parsed == ["Q1"]
+        assert result["sheet_info"] == "Largest sheet selected: Q1 (from 3 sheets)"
+
+    async def test_load_datasource_excel(self, workbook):
+        result = await load_datasource_tool(workbook, dataset_name="finance", options={"sheet_name": "Q2"})
+        assert result["load_status"] == "success"
+        assert result["summary"]["data_summary"]["rows"] == 40
+        assert result["ingest"]["engine"] in ("calamine", "openpyxl-stream")
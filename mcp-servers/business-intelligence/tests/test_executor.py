@@ -0,0 +1,109 @@
+"""
+Tests for the tool executor layer.
+"""
+
+import pytest
+import asyncio
+import os
+import time
+import threading
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import executor
+from src.core.dataset_store import store_dataset
+from src.core.executor import ToolExecutor, ToolTimeoutError, check_cancelled, parse_concurrency, run_coroutine
+from src.tools.create_visualization import create_visualization_tool
+
+
+def _sleep_then_pid(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _spin_until_cancelled(started, stopped):
+    started.set()
+    try:
+        while True:
+            check_cancelled()
+            time.sleep(0.005)
+    finally:
+        stopped.set()
+
+
+async def _double(value):
+    return value * 2
+
+
+@pytest.fixture
+def tool_executor():
+    pool = ToolExecutor(thread_workers=4, process_workers=1, limits={"slow": 1}, timeout=10)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+class TestToolExecutor:
+    """Test dispatch, per-tool limits, time limits and cancellation."""
+
+    async def test_runs_async_helpers_in_workers(self, tool_executor):
+        assert await tool_executor.run_in_thread("tool", run_coroutine, _double, 21) == 42
+        assert await tool_executor.run_in_process("tool", _sleep_then_pid, 0) != os.getpid()
+
+    async def test_event_loop_stays_responsive(self, tool_executor):
+        work = asyncio.ensure_future(tool_executor.run_in_thread("tool", time.sleep, 0.3))
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        assert time.perf_counter() - started < 0.2
+        await work
+
+    async def test_per_tool_concurrency_limit(self, tool_executor):
+        started = time.perf_counter()
+        await asyncio.gather(*[tool_executor.run_in_thread("slow", time.sleep, 0.1) for _ in range(3)])
+        assert time.perf_counter() - started >= 0.3
+
+        started = time.perf_counter()
+        await asyncio.gather(*[tool_executor.run_in_thread("fast", time.sleep, 0.1) for _ in range(3)])
+        assert time.perf_counter() - started < 0.25
+
+    async def test_timeout_stops_cooperative_thread_work(self, tool_executor):
+        started, stopped = threading.Event(), threading.Event()
+        with pytest.raises(ToolTimeoutError):
+            await tool_executor.run_in_thread("tool", _spin_until_cancelled, started, stopped, timeout=0.1)
+        assert started.is_set()
+        assert await asyncio.get_running_loop().run_in_executor(None, stopped.wait, 2)
+        assert tool_executor.stats()["timed_out"] == 1
+
+    async def test_timeout_terminates_process_work(self, tool_executor):
+        with pytest.raises(ToolTimeoutError):
+            await tool_executor.run_in_process("tool", _sleep_then_pid, 30, timeout=0.5)
+        # The pool is recycled, so the next call gets a fresh worker rather than waiting 30s
+        started = time.perf_counter()
+        assert await tool_executor.run_in_process("tool", _sleep_then_pid, 0) != os.getpid()
+        assert time.perf_counter() - started < 10
+
+    async def test_client_cancellation_propagates(self, tool_executor):
+        task = asyncio.ensure_future(tool_executor.run_in_thread("tool", time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert tool_executor.stats()["cancelled"] == 1
+
+    async def test_visualization_renders_through_executor(self, monkeypatch, sample_dataset, tool_executor):
+        monkeypatch.setattr(executor, "_EXECUTOR", tool_executor)
+        store_dataset("executor_sales", sample_dataset)
+        result = await create_visualization_tool("executor_sales", chart_type="bar", x_column="region", y_column="sales")
+        assert result["status"] == "success"
+        assert result["visualization"]["chart_image"]
+        assert tool_executor.stats()["completed"] == 2  # reduction on a thread, rendering in a process
+
+
+class TestParseConcurrency:
+    """Test BI_TOOL_CONCURRENCY parsing."""
+
+    def test_parses_and_ignores_invalid_items(self):
+        assert parse_concurrency("profile_dataset=4, export_report=0,bogus,x=abc") == {"profile_dataset": 4, "export_report": 1}
@@ -0,0 +1,147 @@
+"""
+Tests for incremental analysis state over append-only datasets.
+"""
+
+import functools
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.correlation_engine import PearsonMoments, correlation_matrices
+from src.core.dataset_store import store_dataset
+from src.core.incremental import ColumnTotals, IncrementalStateStore, incremental_update
+from src.tools.run_correlation import run_correlation_tool
+from src.tools.segment_data import segment_data_tool
+
+
+COLUMNS = ["order_id", "region", "channel", "revenue", "units"]
+
+
+@pytest.fixture
+def orders(make_orders):
+    """Order frames with 5% of units missing."""
+    return functools.partial(make_orders, columns=COLUMNS, missing_units=0.05)
+
+
+class TestIncrementalUpdate:
+    """Test appended-row detection and state reuse."""
+
+    def test_row_count_mode_processes_only_new_rows(self, state_store, orders):
+        history = orders(1000)
+        incremental_update("orders", "kpi", {}, history, ColumnTotals)
+        grown = pd.concat([history, orders(50, start=1000, seed=1)], ignore_index=True)
+        totals, info = incremental_update("orders", "kpi", {}, grown, ColumnTotals)
+
+        assert info == {"mode": "incremental", "rows_processed": 50, "rows_total": 1050}
+        assert totals.rows == 1050
+        assert totals.numeric["revenue"]["sum"] == pytest.approx(grown["revenue"].sum())
+        assert totals.numeric["units"]["count"] == grown["units"].count()
+        assert totals.missing["units"] == grown["units"].isna().sum()
+
+    def test_rewritten_history_forces_full_recompute(self, state_store, orders):
+        history = orders(1000)
+        incremental_update("orders", "kpi", {}, history, ColumnTotals)
+        changed = history.copy()
+        changed.loc[990, "revenue"] = -1.0
+        totals, info = incremental_update("orders", "kpi", {}, changed, ColumnTotals)
+        assert info["mode"] == "full" and info["reason"] == "previously consumed rows changed"
+        assert totals.numeric["revenue"]["min"] == -1.0
+
+        _, info = incremental_update("orders", "kpi", {}, changed.iloc[:500], ColumnTotals)
+        assert info["reason"] == "rows were removed"
+
+    def test_watermark_mode(self, state_store, orders):
+        history = orders(1000)
+        incremental_update("orders", "kpi", {}, history, ColumnTotals, watermark_column="order_id")
+        # New rows arrive out of order; only the watermark decides what is new
+        grown = pd.concat([orders(30, start=1000, seed=2), history], ignore_index=True)
+        totals, info = incremental_update("orders", "kpi", {}, grown, ColumnTotals, watermark_column="order_id")
+        assert info["mode"] == "incremental" and info["rows_processed"] == 30
+        assert info["watermark"] == "1029"
+        assert totals.numeric["order_id"]["max"] == 1029
+
+        backfilled = pd.concat([grown, orders(5, start=10, seed=3)], ignore_index=True)
+        _, info = incremental_update("orders", "kpi", {}, backfilled, ColumnTotals, watermark_column="order_id")
+        assert info["mode"] == "full"
+
+    def test_state_survives_restart(self, state_store, tmp_path, orders):
+        history = orders(200)
+        incremental_update("orders", "kpi", {}, history, ColumnTotals)
+        restarted = IncrementalStateStore(str(tmp_path / "state"))
+        grown = pd.concat([history, orders(10, start=200, seed=4)], ignore_index=True)
+        _, info = incremental_update("orders", "kpi", {}, grown, ColumnTotals, store=restarted)
+        assert info["mode"] == "incremental" and info["rows_processed"] == 10
+
+
+class TestPearsonMoments:
+    """Test mergeable co-moment sums against the full correlation matrix."""
+
+    def test_chunked_updates_match_full_matrix(self, orders):
+        frame = orders(3000)[["revenue", "units", "order_id"]]
+        moments = PearsonMoments(list(frame.columns))
+        for start in range(0, len(frame), 700):
+            moments.update(frame.iloc[start:start + 700])
+        merged = moments.matrices()
+        full = correlation_matrices(frame, "pearson")
+        np.testing.assert_allclose(merged.r.to_numpy(), full.r.to_numpy(), atol=1e-10)
+        np.testing.assert_allclose(merged.p.to_numpy(), full.p.to_numpy(), atol=1e-10)
+        assert (merged.n == full.n).all().all()
+
+
+@pytest.mark.asyncio
+class TestIncrementalTools:
+    """Test that incremental tool results equal a full recompute."""
+
+    async def test_segmentation_matches_full_recompute(self, state_store, orders):
+        history = orders(2000)
+        store_dataset("orders_seg", history)
+        await segment_data_tool("orders_seg", "region", ["revenue", "units", "channel"], incremental=True)
+
+        grown = pd.concat([history, orders(100, start=2000, seed=5)], ignore_index=True)
+        store_dataset("orders_seg", grown)
+        result = await segment_data_tool("orders_seg", "region", ["revenue", "units", "channel"], top_n=2, incremental=True)
+        full = await segment_data_tool("orders_seg", "region", ["revenue", "units", "channel"], top_n=2)
+
+        assert result["incremental"]["mode"] == "incremental"
+        assert result["incremental"]["rows_processed"] == 100
+        assert result["total_segments"] == full["total_segments"]
+        for name, segment in full["segments"].items():
+            assert result["segments"][name]["size"] == segment["size"]
+            for metric, stats in segment["metrics"].items():
+                assert result["segments"][name]["metrics"][metric] == pytest.approx(stats)
+        assert result["other_segments"]["size"] == full["other_segments"]["size"]
+        for metric, stats in full["other_segments"]["metrics"].items():
+            assert result["other_segments"]["metrics"][metric] == pytest.approx(stats)
+
+    async def test_quantiles_recompute_in_full(self, state_store, orders):
+        store_dataset("orders_seg", orders(300))
+        result = await segment_data_tool("orders_seg", "region", ["revenue"], quantiles=[0.5], incremental=True)
+        assert result["incremental"]["mode"] == "full"
+        assert "p50" in result["segments"]["North"]["metrics"]["revenue"]["quantiles"]
+
+    async def test_pearson_correlation_matches_full_recompute(self, state_store, orders):
+        history = orders(2000)
+        store_dataset("orders_corr", history)
+        await run_correlation_tool("orders_corr", "pearson", threshold=0.0, incremental=True)
+
+        grown = pd.concat([history, orders(100, start=2000, seed=6)], ignore_index=True)
+        store_dataset("orders_corr", grown)
+        result = await run_correlation_tool("orders_corr", "pearson", threshold=0.0, incremental=True)
+        full = await run_correlation_tool("orders_corr", "pearson", threshold=0.0)
+
+        assert result["incremental"]["rows_processed"] == 100
+        pairs = {(c["variable1"], c["variable2"]): c for c in full["correlation_results"]["correlations"]}
+        for corr in result["correlation_results"]["correlations"]:
+            expected = pairs[(corr["variable1"], corr["variable2"])]
+            assert corr["correlation"] == pytest.approx(expected["correlation"], abs=1e-4)
+            assert corr["sample_size"] == expected["sample_size"]
+
+    async def test_incremental_rejects_rank_methods(self, state_store, orders):
+        store_dataset("orders_corr", orders(100))
+        result = await run_correlation_tool("orders_corr", "spearman", incremental=True)
+        assert "error" in result
@@ -0,0 +1,154 @@
+"""
+Tests for JSON and JSON Lines ingestion.
+"""
+
+import json
+import warnings
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import json_ingest
+from src.core.json_ingest import ColumnBatchBuilder, parse_json_path, read_json_file, read_jsonl_file
+
+
+def _events(count):
+    return [
+        {"id": i, "type": "click" if i % 3 else "view", "user": {"name": f"u{i % 7}", "geo": {"country": "US"}},
+         "tags": ["a", "b"], **({"amount": i * 1.5} if i % 2 else {})}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def events_jsonl(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text("\n".join(json.dumps(event) for event in _events(2500)) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def events_document(tmp_path):
+    path = tmp_path / "events.json"
+    path.write_text(json.dumps({"meta": {"source": "app", "ids": [1, 2]}, "data": {"events": _events(2500)}}))
+    return str(path)
+
+
+class TestJsonPath:
+    """Test selector parsing."""
+
+    def test_dotted_and_bracket_selectors(self):
+        assert parse_json_path("$.data.events[*]") == ["data", "events"]
+        assert parse_json_path("$['data'][\"events\"]") == ["data", "events"]
+        assert parse_json_path("data.events") == ["data", "events"]
+        assert parse_json_path("$") == []
+
+    def test_rejects_inner_wildcards(self):
+        with pytest.raises(ValueError):
+            parse_json_path("$.pages[*].rows")
+
+
+class TestColumnBatchBuilder:
+    """Test flattening records into columns."""
+
+    def test_flattens_nested_and_fills_sparse_columns(self):
+        builder = ColumnBatchBuilder()
+        builder.add({"a": 1, "b": {"c": 2, "d": {"e": 3}}})
+        builder.add({"a": 4, "f": [1, 2]})
+        frame = builder.flush()
+        assert list(frame.columns) == ["a", "b.c", "b.d.e", "f"]
+        assert frame["b.c"].isna().tolist() == [False, True]
+        assert frame.loc[1, "f"] == [1, 2]
+        assert builder.rows == 0
+
+
+class TestReadJsonl:
+    """Test streaming JSON Lines reading."""
+
+    def test_arrow_stream_flattens_nested_objects(self, events_jsonl):
+        result = read_jsonl_file(events_jsonl)
+        df = result["data"]
+        assert result["ingest"]["engine"] == "pyarrow"
+        assert len(df) == 2500
+        assert {"user.name", "user.geo.country", "amount"} <= set(df.columns)
+        assert df["amount"].sum() == pytest.approx(sum(e.get("amount", 0) for e in _events(2500)))
+
+    def test_line_parser_matches_arrow(self, events_jsonl, monkeypatch):
+        expected = read_jsonl_file(events_jsonl)["data"]
+        monkeypatch.setattr(json_ingest, "_read_jsonl_with_pyarrow", lambda *args: (None, None))
+        result = read_jsonl_file(events_jsonl)
+        assert result["ingest"]["engine"].startswith("lines.")
+        df = result["data"]
+        assert set(df.columns) == set(expected.columns)
+        assert df["user.name"].tolist() == expected["user.name"].tolist()
+        assert df["amount"].sum() == pytest.approx(expected["amount"].sum())
+
+    def test_type_change_after_sample_falls_back(self, tmp_path):
+        path = tmp_path / "drift.jsonl"
+        lines = [{"id": i, "code": None} for i in range(1500)] + [{"id": 1500, "code": 42, "late": "x"}]
+        path.write_text("\n".join(json.dumps(line) for line in lines))
+        df = read_jsonl_file(str(path))["data"]
+        assert len(df) == 1501
+        assert df["late"].iloc[-1] == "x"
+
+    def test_null_columns_in_a_batch_take_later_dtypes(self, tmp_path, monkeypatch):
+        path = tmp_path / "sparse.jsonl"
+        lines = [{"id": i, "score": None, "note": "x"} for i in range(1000)] + [{"id": i, "score": 1.5, "note": None}
+                                                                                for i in range(1000, 1250)]
+        path.write_text("\n".join(json.dumps(line) for line in lines))
+        monkeypatch.setattr(json_ingest, "_read_jsonl_with_pyarrow", lambda *args: (None, None))
+        monkeypatch.setattr(json_ingest, "BATCH_ROWS", 100)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            df = read_jsonl_file(str(path))["data"]
+        assert list(df.columns) == ["id", "score", "note"]
+        assert df["score"].dtype == "float64" and df["score"].sum() == pytest.approx(375.0)
+        assert df["note"].notna().sum() == 1000
+
+    def test_invalid_lines(self, tmp_path):
+        path = tmp_path / "bad.jsonl"
+        path.write_text('{"a": 1}\nnot json\n{"a": 3}\n')
+        assert "line 2" in read_jsonl_file(str(path))["error"]
+        result = read_jsonl_file(str(path), {"strict": False})
+        assert result["data"]["a"].tolist() == [1, 3]
+        assert result["ingest"]["invalid_lines_skipped"] == 1
+
+
+class TestReadJson:
+    """Test record-array selection in JSON documents."""
+
+    def test_json_path_selector(self, events_document):
+        result = read_json_file(events_document, {"json_path": "$.data.events[*]"})
+        df = result["data"]
+        assert len(df) == 2500
+        assert df["user.geo.country"].eq("US").all()
+        assert list(df.columns[:3]) == ["id", "type", "user.name"]
+
+    def test_streams_with_ijson(self, events_document):
+        pytest.importorskip("ijson")
+        result = read_json_file(events_document, {"json_path": "data.events"})
+        assert result["ingest"]["engine"].startswith("ijson.")
+        assert len(result["data"]) == 2500
+
+    def test_detects_record_array(self, tmp_path):
+        path = tmp_path / "wrapped.json"
+        path.write_text(json.dumps({"count": 2, "results": [{"x": 1}, {"x": 2}]}))
+        result = read_json_file(str(path))
+        assert result["data"]["x"].tolist() == [1, 2]
+        assert "results" in result["structure_info"]
+
+    def test_without_ijson_parses_whole_document(self, events_document, monkeypatch):
+        monkeypatch.setattr(json_ingest, "_import_ijson", lambda: None)
+        result = read_json_file(events_document, {"json_path": "$.data.events"})
+        assert result["ingest"]["engine"] == "json.load"
+        assert len(result["data"]) == 2500
+
+    def test_single_object_becomes_row(self, tmp_path):
+        path = tmp_path / "single.json"
+        path.write_text(json.dumps({"name": "acme", "address": {"city": "Austin"}}))
+        df = read_json_file(str(path))["data"]
+        assert df.to_dict("records") == [{"name": "acme", "address.city": "Austin"}]
@@ -0,0 +1,143 @@
+"""
+Tests for KPI totals, time-bucketed rollups and period deltas.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import store_dataset
+from src.core.kpi_engine import BucketTotals, KpiSpec, bucket_totals, build_rollups
+from server_fastmcp import _build_kpi_dashboard
+
+
+COLUMNS = ["ordered_at", "revenue", "units", "region"]
+
+
+@pytest.fixture
+def orders(make_orders):
+    """Hourly order frames covering the given number of days."""
+    return lambda days=120: make_orders(days * 24, columns=COLUMNS)
+
+
+class TestKpiSpec:
+    """Test kpi_config normalization."""
+
+    def test_defaults_from_dataset(self, orders):
+        spec = KpiSpec.from_config(orders(3), {})
+        assert spec.time_column == "ordered_at"
+        assert spec.metrics == ["revenue", "units"]
+        assert spec.grains == ["day", "week", "month"] and spec.base_grain == "day"
+
+    def test_rejects_unknown_options(self, orders):
+        df = orders(3)
+        for config in ({"metrics": ["missing"]}, {"metrics": ["region"]}, {"aggregations": ["p99"]},
+                       {"grain": "fortnight"}, {"time_column": "missing"}):
+            with pytest.raises(ValueError):
+                KpiSpec.from_config(df, config)
+        with pytest.raises(ValueError):
+            KpiSpec.from_config(df.drop(columns="ordered_at"), {"grain": "day"})
+
+
+class TestRollups:
+    """Test bucket merging, rollups and deltas against direct pandas resamples."""
+
+    def test_rollups_match_resample(self, orders):
+        df = orders()
+        spec = KpiSpec.from_config(df, {"grain": ["week", "month"], "max_periods": 0})
+        buckets = BucketTotals("ordered_at")
+        buckets.update(df)
+        rollups = build_rollups(buckets, spec)
+
+        expected = df.set_index("ordered_at")["revenue"].resample("MS").agg(["sum", "mean", "max"])
+        months = rollups["month"]["periods"]
+        assert [p["period"] for p in months] == [d.date().isoformat() for d in expected.index]
+        assert np.allclose([p["revenue_sum"] for p in months], expected["sum"])
+        assert np.allclose([p["revenue_mean"] for p in months], expected["mean"])
+        assert rollups["week"]["periods"][0]["period"] == "2024-01-01"
+        assert rollups["week"]["periods"][1]["units_count"] == 7 * 24
+
+    def test_appended_rows_merge_into_open_buckets(self, orders):
+        df = orders(40)
+        whole, parts = BucketTotals("ordered_at"), BucketTotals("ordered_at")
+        whole.update(df)
+        parts.update(df.iloc[:500])
+        parts.update(df.iloc[500:])
+        pd.testing.assert_frame_equal(parts.buckets, whole.buckets, check_dtype=False)
+
+    def test_period_over_period_and_rolling_deltas(self):
+        df = pd.DataFrame({"day": pd.date_range("2024-01-01", periods=6, freq="D"),
+                           "sales": [10.0, 20.0, 30.0, 40.0, 0.0, 50.0]})
+        spec = KpiSpec.from_config(df, {"grain": "day", "rolling_window": 3})
+        buckets = BucketTotals("day")
+        buckets.update(df)
+        day = build_rollups(buckets, spec)["day"]
+        delta = day["deltas"]["sales"]
+        assert delta["current"] == 50.0 and delta["previous"] == 0.0
+        assert delta["change"] == 50.0 and delta["change_pct"] is None
+        assert delta["rolling_mean"] == pytest.approx((30 + 40 + 0) / 3)
+        assert day["periods"][3]["sales_change_pct"] == pytest.approx(100 / 3)
+        assert day["latest_period_complete"] is True
+
+    def test_partial_latest_period(self, orders):
+        spec = KpiSpec.from_config(orders(45), {"grain": "month"})
+        buckets = BucketTotals("ordered_at")
+        buckets.update(orders(45))
+        month = build_rollups(buckets, spec)["month"]
+        assert month["latest_period"] == "2024-02-01"
+        assert month["latest_period_complete"] is False
+
+
+class TestBucketReuse:
+    """Test the rollup cache and incremental buckets."""
+
+    def test_cached_buckets_serve_other_grains(self, monkeypatch, orders):
+        df = orders(60)
+        store_dataset("kpi_orders", df)
+        _, first = bucket_totals("kpi_orders", df, KpiSpec.from_config(df, {"grain": "week"}))
+        monkeypatch.setattr(BucketTotals, "update", lambda *args: pytest.fail("rows were re-aggregated"))
+        buckets, second = bucket_totals("kpi_orders", df, KpiSpec.from_config(df, {"grain": "quarter"}))
+        assert first["status"] == "miss" and second["status"] == "hit"
+        assert buckets.time_range()[0] == pd.Timestamp("2024-01-01")
+
+    def test_incremental_buckets(self, state_store, orders):
+        df = orders(60)
+        spec = KpiSpec.from_config(df, {})
+        bucket_totals("kpi_growing", df.iloc[:1000], spec, incremental=True)
+        buckets, info = bucket_totals("kpi_growing", df, spec, incremental=True)
+        assert info["mode"] == "incremental" and info["rows_processed"] == len(df) - 1000
+        full = BucketTotals("ordered_at")
+        full.update(df)
+        pd.testing.assert_frame_equal(buckets.buckets, full.buckets, check_dtype=False)
+
+
+@pytest.mark.asyncio
+class TestKpiDashboard:
+    """Test the dashboard tool end to end."""
+
+    async def test_dashboard_uses_config(self, orders):
+        store_dataset("kpi_dashboard", orders(90))
+        result = await _build_kpi_dashboard("kpi_dashboard", {
+            "metrics": ["revenue"], "aggregations": ["sum", "mean"], "grain": "month"})
+        assert list(result["kpis"]) == ["Revenue"]
+        assert set(result["kpis"]["Revenue"]) == {"total", "average"}
+        assert result["summary"]["date_range"] == "2024-01-01 to 2024-03-30"
+        assert list(result["rollups"]) == ["month"]
+        assert result["rollups"]["month"]["periods_total"] == 3
+
+    async def test_dashboard_without_time_column(self, sample_correlation_data):
+        store_dataset("kpi_plain", sample_correlation_data)
+        result = await _build_kpi_dashboard("kpi_plain", {})
+        assert result["summary"]["date_range"] == "N/A"
+        assert "rollups" not in result
+        assert result["kpis"]["Var1"]["total"] == 55
+
+    async def test_invalid_config_is_reported(self, orders):
+        store_dataset("kpi_invalid", orders(3))
+        result = await _build_kpi_dashboard("kpi_invalid", {"metrics": ["nope"]})
+        assert "not found" in result["error"]
@@ -0,0 +1,85 @@
+"""
+Tests for the chunk-streaming profiler and the profile_dataset tool built on it.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import store_dataset
+from src.core.profiler import profile_frame, text_to_numeric
+from src.tools.profile_dataset import profile_dataset_tool
+
+
+@pytest.fixture
+def gappy_dataset(sample_dataset):
+    df = sample_dataset.copy()
+    df.loc[[3, 40, 77], "sales"] = np.nan
+    df.loc[[10, 11], "region"] = None
+    return pd.concat([df, df.iloc[:5]], ignore_index=True)  # five duplicate rows
+
+
+class TestProfileFrame:
+    """Test that chunked statistics equal whole-frame pandas results."""
+
+    def test_chunked_matches_pandas(self, gappy_dataset):
+        stats = profile_frame(gappy_dataset, chunk_rows=17)
+
+        assert stats.chunks == 7
+        assert stats.duplicate_rows == gappy_dataset.duplicated().sum()
+        for name in gappy_dataset.columns:
+            col = stats.columns[name]
+            assert col.missing == gappy_dataset[name].isnull().sum()
+            assert col.unique_count == gappy_dataset[name].nunique()
+
+        sales = gappy_dataset["sales"]
+        sales_stats = stats.columns["sales"]
+        assert sales_stats.moments.std() == pytest.approx(sales.std())
+        np.testing.assert_allclose(sales_stats.quartiles(), sales.quantile([0.25, 0.5, 0.75]).to_numpy())
+
+    def test_outliers_counted_over_all_rows(self, sample_dataset):
+        df = sample_dataset.astype({"sales": float})
+        df.loc[[5, 60], "sales"] = [1e6, -1e6]
+        df.loc[60, "customers"] = 10_000
+        stats = profile_frame(df, chunk_rows=25)
+
+        assert stats.columns["sales"].outliers["count"] == 2
+        assert stats.outlier_rows == 2
+
+    def test_hex_ids_with_overflowing_exponents(self):
+        ids = pd.Series(["04e89467803028e7", "1e5", "abc", None], dtype=object)
+        assert text_to_numeric(ids).tolist()[1] == 100000.0 and text_to_numeric(ids).isna().sum() == 3
+
+        stats = profile_frame(pd.DataFrame({"sale_id": ids}))
+        assert stats.columns["sale_id"].kind == "text"
+
+
+@pytest.mark.asyncio
+class TestProfileDatasetTool:
+    """Test the tool output built from shared statistics."""
+
+    async def test_profiles_every_row(self, gappy_dataset):
+        big = pd.concat([gappy_dataset] * 120, ignore_index=True)
+        big["order_id"] = np.arange(len(big))
+        store_dataset("profile_big", big)
+        result = await profile_dataset_tool("profile_big", chunk_rows=5000)
+
+        assert "error" not in result
+        assert result["is_sampled"] is False
+        assert result["profiled_shape"] == big.shape
+        assert result["profiling_method"]["chunks"] == 3
+        assert result["patterns"]["value_patterns"]["potential_id_columns"] == ["order_id"]
+        assert "No duplicate rows" in result["data_quality"]["strengths"]  # order_id makes every row unique
+
+        columns = {col["name"]: col for col in result["columns"]}
+        assert columns["sales"]["basic_stats"]["missing"] == big["sales"].isnull().sum()
+        assert columns["region"]["categories"]["most_frequent"] == big["region"].value_counts().index[0]
+
+        matrix = pd.DataFrame(result["correlations"]["correlation_matrix"])
+        expected = big[matrix.columns].corr()
+        np.testing.assert_allclose(matrix.loc[expected.index, expected.columns], expected, atol=1e-3)
@@ -0,0 +1,135 @@
+"""
+Tests for query result cursors and encodings.
+"""
+
+import base64
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import get_store
+from src.core.query_results import CursorRegistry, encode_frame, open_query
+from src.core.sql_engine import run_query
+
+
+class TestCursorRegistry:
+    """Test server-side pagination state."""
+
+    def test_pages_until_exhausted(self, sample_dataset):
+        registry = CursorRegistry(ttl_seconds=60)
+        cursor = registry.open("sales", "SELECT *", sample_dataset, len(sample_dataset), page_size=40, offset=40)
+
+        second = registry.take_page(cursor.token)
+        assert len(second["page"]) == 40
+        assert second["has_more"] is True
+
+        third = registry.take_page(cursor.token)
+        assert len(third["page"]) == 20
+        assert third["has_more"] is False
+        assert registry.take_page(cursor.token) is None
+
+    def test_unserved_rows_spilled_to_disk(self, sample_dataset, tmp_path):
+        pytest.importorskip("pyarrow")
+        registry = CursorRegistry(ttl_seconds=60, spill_dir=str(tmp_path))
+        cursor = registry.open("sales", "SELECT *", sample_dataset, len(sample_dataset), page_size=30, offset=30)
+        assert cursor.result is None and all(path.exists() for path in cursor.spill_files)
+
+        pages = [registry.take_page(cursor.token)["page"] for _ in range(3)]
+        served = pd.concat(pages, ignore_index=True)
+        pd.testing.assert_frame_equal(served, sample_dataset.iloc[30:].reset_index(drop=True), check_dtype=False)
+        assert not any(path.exists() for path in cursor.spill_files)
+
+        closed = registry.open("sales", "SELECT *", sample_dataset, len(sample_dataset), page_size=30, offset=30)
+        assert registry.close(closed.token) and not any(path.exists() for path in closed.spill_files)
+
+    def test_stream_spills_batches_as_they_arrive(self, sample_dataset, tmp_path):
+        pytest.importorskip("pyarrow")
+        registry = CursorRegistry(ttl_seconds=60, spill_dir=str(tmp_path))
+        consumed = []
+
+        def batches():
+            for start in range(0, len(sample_dataset), 25):
+                consumed.append(start)
+                yield sample_dataset.iloc[start:start + 25]
+
+        opened = registry.open_stream("sales", "SELECT *", batches(), page_size=30, max_rows=90)
+        cursor = opened["cursor"]
+        assert consumed == [0, 25, 50, 75]
+        assert opened["total_rows"] == len(sample_dataset) and opened["rows"] == 90
+        assert cursor.result is None and cursor.spill_files
+
+        pages = [opened["page"]] + [registry.take_page(cursor.token)["page"] for _ in range(2)]
+        served = pd.concat(pages, ignore_index=True)
+        pd.testing.assert_frame_equal(served, sample_dataset.iloc[:90].reset_index(drop=True), check_dtype=False)
+        assert registry.take_page(cursor.token) is None
+
+    def test_stream_starts_new_spill_file_on_incompatible_schema(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        registry = CursorRegistry(ttl_seconds=60, spill_dir=str(tmp_path))
+        batches = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3, 4]}), pd.DataFrame({"a": ["x", "y"]})]
+
+        opened = registry.open_stream("mixed", "SELECT *", iter(batches), page_size=1)
+        cursor = opened["cursor"]
+        assert len(cursor.spill_files) == 2
+        pages = [registry.take_page(cursor.token)["page"] for _ in range(5)]
+        assert [page["a"].iloc[0] for page in pages] == [2, 3, 4, "x", "y"]
+
+    def test_stream_fits_on_first_page(self):
+        registry = CursorRegistry(ttl_seconds=60)
+        opened = registry.open_stream("small", "SELECT *", iter([pd.DataFrame({"a": []})]), page_size=10)
+        assert opened["cursor"] is None and list(opened["page"].columns) == ["a"]
+        assert len(registry) == 0
+
+    def test_expired_cursor_rejected(self, sample_dataset):
+        registry = CursorRegistry(ttl_seconds=0)
+        cursor = registry.open("sales", "SELECT *", sample_dataset, len(sample_dataset), page_size=10, offset=10)
+        assert registry.take_page(cursor.token) is None
+        assert len(registry) == 0
+
+    def test_oldest_cursor_evicted(self, sample_dataset):
+        registry = CursorRegistry(ttl_seconds=60, max_cursors=2)
+        first = registry.open("sales", "q1", sample_dataset, 100, page_size=10, offset=10)
+        registry.open("sales", "q2", sample_dataset, 100, page_size=10, offset=10)
+        registry.open("sales", "q3", sample_dataset, 100, page_size=10, offset=10)
+        assert len(registry) == 2
+        assert registry.take_page(first.token) is None
+
+
+class TestEncodings:
+    """Test compact result encodings."""
+
+    def test_columns_encoding(self, sample_dataset):
+        encoded = encode_frame(sample_dataset.head(3), "columns")
+        assert encoded["result_columns_data"]["sales"] == sample_dataset["sales"].head(3).tolist()
+
+    def test_arrow_round_trip(self, sample_dataset):
+        pa = pytest.importorskip("pyarrow")
+        encoded = encode_frame(sample_dataset, "arrow")
+        table = pa.ipc.open_stream(base64.b64decode(encoded["result_arrow_ipc"])).read_all()
+        pd.testing.assert_frame_equal(table.to_pandas(), sample_dataset)
+
+    def test_unknown_format(self, sample_dataset):
+        assert "error" in encode_frame(sample_dataset, "xml")
+
+
+class TestRowCap:
+    """Test capped queries report the exact total."""
+
+    def test_capped_query_counts_all_rows(self, sample_dataset):
+        get_store().put("cap_sales", sample_dataset)
+        result = run_query("cap_sales", "SELECT * FROM cap_sales WHERE sales > ?", [0], max_rows=7)
+        assert len(result["result"]) == 7
+        assert result["total_rows"] == int((sample_dataset["sales"] > 0).sum())
+        assert result["truncated"] is True
+
+    def test_open_query_streams_capped_result(self, sample_dataset):
+        get_store().put("cap_stream", sample_dataset)
+        opened = open_query("cap_stream", "SELECT * FROM cap_stream WHERE sales > ?", [0], page_size=5, max_rows=7)
+        assert len(opened["page"]) == 5 and opened["rows"] == 7
+        assert opened["total_rows"] == int((sample_dataset["sales"] > 0).sum())
+        assert opened["truncated"] is True
+        assert len(opened["cursor"].spill_files) == 1 or opened["cursor"].result is not None
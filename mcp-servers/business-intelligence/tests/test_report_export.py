@@ -0,0 +1,180 @@
+"""
+Tests for streaming report export and chunked dataset/query-result export.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from src.core import table_export
+from src.core.chart_render import encode_figure
+from src.core.dataset_store import store_dataset
+from src.core.report_writer import write_pdf_report, write_report
+from src.core.sql_engine import run_query_batches
+from src.core.table_export import export_frame, normalize_format
+from src.tools.export_report import export_report_tool
+from server_fastmcp import export_analysis, export_query_results
+
+
+def _chart(title="Revenue"):
+    fig, ax = plt.subplots(figsize=(4, 3))
+    ax.plot([1, 3, 2])
+    chart = encode_figure(fig, "png", dpi=50)
+    plt.close(fig)
+    return {**chart, "title": title}
+
+
+def _report(rows=50, charts=2):
+    records = [{"region": f"r|{i}", "revenue": i * 1.5, "orders": i} for i in range(rows)]
+    return {
+        "title": "Quarterly <Report>",
+        "subtitle": "Data Analysis Results",
+        "generated_at": datetime(2024, 5, 1, 9, 30).isoformat(),
+        "sections": [
+            {"title": "Executive Summary", "type": "executive_summary", "content": {"summary_points": ["Revenue up"]}},
+            {"title": "Data Summary", "type": "data_summary", "content": {"rows": rows}},
+            {"title": "Correlations", "type": "correlation_results",
+             "content": {"method": "pearson", "significant_correlations": records[:3]}},
+            {"title": "Orders", "type": "generic", "content": records},
+            *[{"title": f"Chart {i}", "type": "visualization", "content": {"visualization": _chart(f"Chart {i}")}}
+              for i in range(charts)]
+        ]
+    }
+
+
+def _frame(rows=1_000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "order_id": np.arange(rows),
+        "region": pd.Categorical(rng.choice(["North", "South"], rows)),
+        "amount": rng.normal(100, 10, rows).round(2),
+        "placed_at": pd.date_range("2024-01-01", periods=rows, freq="h", tz="UTC"),
+        "note": [None if i % 7 == 0 else f"n{i}" for i in range(rows)]
+    })
+
+
+class TestReportWriter:
+    """Test the streaming HTML, Markdown and PDF writers."""
+
+    def test_html_links_chart_files_instead_of_base64(self, tmp_path):
+        result = write_report(_report(), "executive", "html", str(tmp_path / "report.html"))
+        html = (tmp_path / "report.html").read_text(encoding="utf-8")
+        assert result["file_size"] == (tmp_path / "report.html").stat().st_size
+        assert result["charts"] == 2 and len(result["chart_files"]) == 2
+        assert (tmp_path / "report_assets" / "chart_1.png").read_bytes()[:4] == b"\x89PNG"
+        assert 'src="report_assets/chart_2.png"' in html and "base64" not in html
+        assert "Quarterly &lt;Report&gt;" in html and html.count("<tr>") == 3 + 50 + 2
+        assert result["tables"] == 2 and result["table_rows"] == 53
+
+    def test_markdown_tables_and_vega_specs(self, tmp_path):
+        report = _report(rows=3, charts=0)
+        report["sections"].append({"title": "Spec", "type": "visualization",
+                                   "content": {"chart_spec": {"mark": "bar"}, "title": "Bars"}})
+        result = write_report(report, "standard", "markdown", str(tmp_path / "report"))
+        markdown = Path(result["output_path"]).read_text(encoding="utf-8")
+        assert result["output_path"].endswith("report.md")
+        assert "| r\\|1 | 1.5 | 1 |" in markdown
+        assert "[Bars (Vega-Lite spec)](report_assets/chart_1.vl.json)" in markdown
+
+    def test_preview_without_output_path_omits_charts(self):
+        result = write_report(_report(rows=2, charts=1), "standard", "html")
+        assert "chart omitted" in result["content"] and result["charts_omitted"] == 1
+
+    def test_builtin_pdf_renderer(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BI_PDF_RENDERER", "basic")
+        result = write_pdf_report(_report(rows=300), "standard", str(tmp_path / "report"))
+        pdf = Path(result["output_path"])
+        assert pdf.suffix == ".pdf" and pdf.read_bytes()[:5] == b"%PDF-"
+        assert result["renderer"] == "basic" and result["pages"] >= 3 and result["charts"] == 2
+
+
+@pytest.mark.asyncio
+class TestExportReportTool:
+    """Test the export_report tool end to end."""
+
+    async def test_html_export(self, tmp_path):
+        content = {"dataset_name": "sales", "key_findings": ["A", "B"], "visualization": _chart()}
+        result = await export_report_tool(content, "html", "standard", str(tmp_path / "sales.html"))
+        assert result["export_status"] == "success"
+        assert result["export_details"]["charts"] == 1
+        assert result["report_summary"]["file_size"] == (tmp_path / "sales.html").stat().st_size
+
+    async def test_pdf_needs_output_path(self):
+        result = await export_report_tool({"summary": "x"}, "pdf", "standard", "")
+        assert "output_path" not in result["export_details"]
+
+
+class TestTableExport:
+    """Test chunked CSV, Parquet and XLSX writers."""
+
+    @pytest.mark.parametrize("export_format", ["csv", "parquet", "excel"])
+    def test_round_trip(self, tmp_path, export_format):
+        df = _frame()
+        result = export_frame(df, str(tmp_path / "orders"), export_format, chunk_rows=128)
+        assert result["rows"] == 1_000 and result["chunks"] == 8
+        path = Path(result["output_path"])
+        assert path.suffix == f".{normalize_format(export_format)}"
+        if export_format == "csv":
+            back = pd.read_csv(path)
+        elif export_format == "parquet":
+            back = pd.read_parquet(path)
+            assert back["region"].dtype == "category"
+        else:
+            back = pd.read_excel(path)
+        assert back["order_id"].tolist() == df["order_id"].tolist()
+        np.testing.assert_allclose(back["amount"], df["amount"])
+        assert back["note"].isna().sum() == df["note"].isna().sum()
+
+    def test_xlsx_rolls_over_to_new_sheet(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(table_export, "XLSX_MAX_ROWS", 101)
+        result = export_frame(_frame(250), str(tmp_path / "orders.xlsx"), "xlsx", chunk_rows=64)
+        sheets = pd.read_excel(result["output_path"], sheet_name=None)
+        assert result["sheets"] == 3 and [len(sheet) for sheet in sheets.values()] == [100, 100, 50]
+
+    def test_unsupported_format(self, tmp_path):
+        assert "error" in export_frame(_frame(5), str(tmp_path / "x"), "docx")
+
+    def test_query_batches_stream(self):
+        store_dataset("export_orders", _frame(1_000))
+        query = run_query_batches("export_orders", "SELECT order_id FROM export_orders WHERE amount > 0", batch_rows=300)
+        sizes = [len(batch) for batch in query["batches"]]
+        assert sum(sizes) == 1_000 and max(sizes) <= 300 and len(sizes) >= 4
+
+
+@pytest.mark.asyncio
+class TestServerExports:
+    """Test the dataset and query-result export tools."""
+
+    async def test_export_query_results(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BI_EXPORT_CHUNK_ROWS", "256")
+        store_dataset("export_orders", _frame(1_000))
+        result = await export_query_results("export_orders", "SELECT * FROM export_orders WHERE region = ?",
+                                            "parquet", str(tmp_path / "north.parquet"), ["North"])
+        back = pd.read_parquet(result["output_path"])
+        assert result["rows"] == len(back) == (_frame(1_000)["region"] == "North").sum()
+        assert result["chunks"] >= 2
+
+    async def test_export_query_results_empty_result_keeps_columns(self, tmp_path):
+        store_dataset("export_orders", _frame(10))
+        result = await export_query_results("export_orders", "SELECT order_id, amount FROM export_orders WHERE 1 = 0",
+                                            "csv", str(tmp_path / "none.csv"))
+        assert result["rows"] == 0 and (tmp_path / "none.csv").read_text().strip() == "order_id,amount"
+
+    async def test_export_analysis_formats(self, tmp_path):
+        store_dataset("export_orders", _frame(100))
+        excel = await export_analysis("export_orders", "excel", output_path=str(tmp_path / "orders"))
+        assert excel["format"] == "xlsx" and excel["rows"] == 100
+        report = await export_analysis("export_orders", "markdown", output_path=str(tmp_path / "orders.md"))
+        assert report["export_status"] == "success"
+        assert "**Rows:** 100" in (tmp_path / "orders.md").read_text(encoding="utf-8")
+        assert "error" in await export_analysis("export_missing", "csv")
@@ -0,0 +1,121 @@
+"""
+Tests for the tool result cache.
+"""
+
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import dataset_store, result_cache
+from src.core.dataset_store import store_dataset
+from src.core.result_cache import ResultCache, cached_tool_call, make_cache_key
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = ResultCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(result_cache, "_CACHE", cache)
+    return cache
+
+
+class TestResultCache:
+    """Test keys, LRU eviction and disk persistence."""
+
+    def test_key_ignores_argument_order(self):
+        assert make_cache_key("t", "ds", "fp", {"a": 1, "b": [2, 3]}) == \
+            make_cache_key("t", "ds", "fp", {"b": [2, 3], "a": 1})
+        assert make_cache_key("t", "ds", "fp", {"a": 1}) != make_cache_key("t", "ds", "other", {"a": 1})
+        assert make_cache_key("t", "ds", "fp", {"a": 1}) != make_cache_key("t", "ds2", "fp", {"a": 1})
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = ResultCache(max_bytes=2500)
+        for key in ["a", "b", "c"]:
+            cache.put(key, "tool", "ds", {"blob": "x" * 1000})
+        assert cache.get("a") is None
+        assert cache.get("c")["result"] == {"blob": "x" * 1000}
+        assert cache.stats()["bytes"] <= 2500
+
+    def test_hits_return_independent_copies(self):
+        cache = ResultCache(max_bytes=10_000)
+        cache.put("k", "tool", "ds", {"values": [1, 2]})
+        cache.get("k")["result"]["values"].append(3)
+        assert cache.get("k")["result"] == {"values": [1, 2]}
+
+    def test_persists_across_instances(self, tmp_path):
+        ResultCache(max_bytes=10_000, cache_dir=str(tmp_path)).put("k", "tool", "ds", {"answer": 42})
+        reloaded = ResultCache(max_bytes=10_000, cache_dir=str(tmp_path))
+        assert reloaded.get("k")["result"] == {"answer": 42}
+
+    def test_invalidate_deletes_disk_entries(self, tmp_path):
+        cache = ResultCache(max_bytes=10_000, cache_dir=str(tmp_path))
+        cache.put("k1", "tool", "ds", {"answer": 1})
+        cache.put("k2", "tool", "other", {"answer": 2})
+        reloaded = ResultCache(max_bytes=10_000, cache_dir=str(tmp_path))
+        assert reloaded.invalidate("ds") == 1
+        assert sorted(path.stem for path in tmp_path.glob("*.pkl")) == ["k2"]
+        assert ResultCache(max_bytes=10_000, cache_dir=str(tmp_path)).get("k1") is None
+
+
+@pytest.mark.asyncio
+class TestCachedToolCall:
+    """Test memoization around tool entry points."""
+
+    async def test_miss_then_hit_until_data_changes(self, fresh_cache, sample_dataset):
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {"rows": len(sample_dataset)}
+
+        store_dataset("cached_sales", sample_dataset)
+        first = await cached_tool_call("tool", "cached_sales", {"top_n": 3}, compute)
+        second = await cached_tool_call("tool", "cached_sales", {"top_n": 3}, compute)
+        assert first["cache"]["status"] == "miss"
+        assert second["cache"]["status"] == "hit"
+        assert len(calls) == 1
+
+        # Re-registering identical content keeps the fingerprint; changed content does not
+        store_dataset("cached_sales", sample_dataset.copy())
+        assert (await cached_tool_call("tool", "cached_sales", {"top_n": 3}, compute))["cache"]["status"] == "hit"
+        store_dataset("cached_sales", sample_dataset.iloc[:50])
+        assert (await cached_tool_call("tool", "cached_sales", {"top_n": 3}, compute))["cache"]["status"] == "miss"
+        assert len(calls) == 2
+
+    async def test_same_content_under_another_name_misses(self, fresh_cache, sample_dataset):
+        async def compute():
+            return {"rows": len(sample_dataset)}
+
+        store_dataset("cached_a", sample_dataset)
+        store_dataset("cached_b", sample_dataset.copy())
+        await cached_tool_call("tool", "cached_a", {}, compute)
+        assert (await cached_tool_call("tool", "cached_b", {}, compute))["cache"]["status"] == "miss"
+
+    async def test_errors_and_unknown_datasets_are_not_cached(self, fresh_cache, sample_dataset):
+        async def failing():
+            return {"error": "boom"}
+
+        store_dataset("cached_sales", sample_dataset)
+        await cached_tool_call("tool", "cached_sales", {}, failing)
+        assert len(fresh_cache) == 0
+        result = await cached_tool_call("tool", "not_registered", {}, failing)
+        assert result["cache"]["status"] == "bypass"
+
+    async def test_fingerprint_is_hashed_once_off_the_event_loop(self, fresh_cache, sample_dataset, monkeypatch):
+        hashed_on = []
+
+        def fingerprint(frame):
+            hashed_on.append(threading.get_ident())
+            return "fp"
+
+        async def compute():
+            return {"rows": len(sample_dataset)}
+
+        monkeypatch.setattr(dataset_store, "dataset_fingerprint", fingerprint)
+        store_dataset("cached_sales", sample_dataset)
+        for _ in range(3):
+            await cached_tool_call("tool", "cached_sales", {}, compute)
+        assert len(hashed_on) == 1 and hashed_on[0] != threading.get_ident()
@@ -0,0 +1,177 @@
+"""
+Tests for the in-process analysis scheduler.
+"""
+
+import pytest
+import asyncio
+import json
+import time
+import sqlite3
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import scheduler as scheduler_module
+from src.core.dataset_store import store_dataset
+from src.core.scheduler import AnalysisScheduler, ScheduleStore, next_fire_time
+from src.tools.schedule_analysis import get_schedule_history, list_schedules, pause_schedule, schedule_analysis_tool
+from server_fastmcp import _register_schedule_runners
+
+
+def _config(schedule_id, cron="* * * * *", analysis_type="profiling"):
+    return {
+        "id": schedule_id,
+        "name": f"{analysis_type}_{schedule_id}",
+        "analysis_type": analysis_type,
+        "analysis_config": {"analysis_type": analysis_type, "dataset_name": "sales"},
+        "schedule": {"cron_expression": cron, "enabled": True},
+        "execution": {"timeout_minutes": 1}
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    schedule_store = ScheduleStore(str(tmp_path / "schedules.db"))
+    yield schedule_store
+    schedule_store.close()
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def scheduler(store, calls, monkeypatch):
+    instance = AnalysisScheduler(store, max_concurrent=2)
+
+    async def profile(cfg):
+        calls.append(cfg["dataset_name"])
+        return {"rows": 100}
+
+    instance.register_runner("profiling", profile)
+    monkeypatch.setattr(scheduler_module, "_SCHEDULER", instance)
+    return instance
+
+
+class TestScheduleStore:
+    """Test the SQLite schedule table."""
+
+    def test_uses_wal_and_imports_legacy_json_once(self, tmp_path):
+        (tmp_path / "legacy.json").write_text(json.dumps(_config("legacy")))
+        store = ScheduleStore(str(tmp_path / "schedules.db"))
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert [s["id"] for s in store.list()] == ["legacy"]
+        store.close()
+
+    def test_next_fire_time_is_strictly_after(self):
+        assert next_fire_time("0 * * * *", 3600.0) == 7200.0
+        assert next_fire_time("0 * * * *", 3599.0) == 3600.0
+
+
+@pytest.mark.asyncio
+class TestAnalysisScheduler:
+    """Test firing, catch-up and run history."""
+
+    async def test_fires_due_schedules_from_heap(self, scheduler, store, calls):
+        scheduler.add(_config("due"))
+        await scheduler.start()
+        try:
+            # Pull the fire time forward instead of waiting for the next minute
+            scheduler._push("due", time.time() + 0.05)
+            for _ in range(100):
+                if store.runs("due"):
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await scheduler.stop()
+
+        run = store.runs("due")[0]
+        assert calls == ["sales"]
+        assert run["status"] == "succeeded" and run["trigger"] == "cron"
+        assert run["duration_seconds"] >= 0
+        assert store.get("due")["next_run"] > time.time()
+
+    async def test_catches_up_missed_fires_once(self, scheduler, store, calls):
+        scheduler.add(_config("missed", cron="*/5 * * * *"))
+        store.set_next_run("missed", next_fire_time("*/5 * * * *", time.time() - 3600))  # down for an hour
+        await scheduler.start()
+        for _ in range(50):
+            if store.runs("missed"):
+                break
+            await asyncio.sleep(0.02)
+        await scheduler.stop()
+
+        runs = store.runs("missed")
+        assert len(runs) == 1 and calls == ["sales"]
+        assert runs[0]["trigger"] == "catch_up"
+        assert runs[0]["missed_fires"] == 12
+
+    async def test_failures_and_missing_runners_are_recorded(self, scheduler, store):
+        async def failing(cfg):
+            return {"error": "dataset not loaded"}
+
+        scheduler.register_runner("correlation", failing)
+        scheduler.add(_config("bad", analysis_type="correlation"))
+        scheduler.add(_config("trend", analysis_type="trend"))
+        assert (await scheduler.run_now("bad"))["error"] == "dataset not loaded"
+        assert "No runner" in (await scheduler.run_now("trend"))["error"]
+        assert [run["status"] for run in store.runs()] == ["failed", "failed"]
+
+    async def test_fire_errors_do_not_stop_other_schedules(self, scheduler, store, calls, monkeypatch):
+        scheduler.add(_config("broken"))
+        scheduler.add(_config("healthy"))
+        get = store.get
+
+        def flaky_get(schedule_id):
+            if schedule_id == "broken":
+                raise sqlite3.OperationalError("disk I/O error")
+            return get(schedule_id)
+
+        monkeypatch.setattr(store, "get", flaky_get)
+        await scheduler.start()
+        try:
+            scheduler._push("broken", time.time() + 0.02)
+            scheduler._push("healthy", time.time() + 0.1)
+            for _ in range(100):
+                if store.runs("healthy"):
+                    break
+                await asyncio.sleep(0.02)
+            assert scheduler.running
+        finally:
+            await scheduler.stop()
+
+        assert calls == ["sales"]
+        # The schedule that failed to fire is queued for a retry rather than dropped
+        assert "broken" in [entry["schedule_id"] for entry in scheduler.upcoming()]
+
+    async def test_trend_runner_is_registered(self, scheduler, store):
+        days = pd.date_range("2024-01-01", periods=120, freq="D")
+        revenue = 100 + np.arange(120) + 10 * np.sin(np.arange(120) * 2 * np.pi / 7)
+        store_dataset("sales", pd.DataFrame({"day": days, "revenue": revenue}))
+        _register_schedule_runners(scheduler)
+        scheduler.add(_config("trend", analysis_type="trend"))
+
+        run = await scheduler.run_now("trend")
+        assert run["status"] == "succeeded"
+        assert run["result"]["metrics"]["revenue"]["trend"]["direction"] == "Upward"
+
+    async def test_rejects_analysis_types_without_a_runner(self, scheduler):
+        result = await schedule_analysis_tool({"analysis_type": "insight_investigation", "dataset_name": "sales"}, "0 9 * * 1")
+        assert "insight_investigation" not in result["supported_types"]
+
+    async def test_tool_functions_use_the_schedule_table(self, scheduler, store):
+        result = await schedule_analysis_tool({"analysis_type": "profiling", "dataset_name": "sales"}, "0 9 * * 1")
+        schedule_id = result["schedule_id"]
+        assert store.get(schedule_id) is not None
+
+        await scheduler.run_now(schedule_id)
+        await pause_schedule(schedule_id)
+        listed = {s["id"]: s for s in await list_schedules()}
+        assert listed[schedule_id]["status"] == "paused"
+        history = await get_schedule_history(schedule_id)
+        assert history["summary"]["succeeded"] == 1
@@ -0,0 +1,63 @@
+"""
+Tests for the segmentation tool.
+"""
+
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import store_dataset
+from src.tools.segment_data import segment_data_tool
+
+
+@pytest.mark.asyncio
+class TestSegmentDataTool:
+    """Test grouped segmentation results."""
+
+    async def test_single_key_matches_masks(self, sample_dataset):
+        store_dataset("segment_sales", sample_dataset)
+        result = await segment_data_tool("segment_sales", "region", ["sales", "product_category"])
+
+        north = sample_dataset[sample_dataset["region"] == "North"]
+        metrics = result["segments"]["North"]["metrics"]
+        assert result["total_segments"] == sample_dataset["region"].nunique()
+        assert metrics["sales"]["count"] == len(north)
+        assert metrics["sales"]["mean"] == pytest.approx(north["sales"].mean())
+        assert metrics["sales"]["max"] == pytest.approx(north["sales"].max())
+        assert metrics["product_category"]["most_common"] == north["product_category"].value_counts().index[0]
+
+    async def test_multi_key_top_n_with_other_bucket(self, sample_dataset):
+        store_dataset("segment_sales", sample_dataset)
+        result = await segment_data_tool("segment_sales", ["region", "product_category"], ["sales"], top_n=3)
+
+        segments, other = result["segments"], result["other_segments"]
+        assert len(segments) == 3
+        assert sum(seg["size"] for seg in segments.values()) + other["size"] == len(sample_dataset)
+        assert other["segments_merged"] == result["total_segments"] - 3
+        assert all(" | " in name for name in segments)
+
+    async def test_segment_named_other_is_kept(self):
+        df = pd.DataFrame({"channel": ["other"] * 5 + ["web"] * 3 + ["store", "phone"], "sales": range(10)})
+        store_dataset("segment_other", df)
+        result = await segment_data_tool("segment_other", "channel", ["sales"], top_n=2)
+
+        assert result["segments"]["other"]["size"] == 5
+        assert result["other_segments"]["size"] == 2 and result["other_segments"]["segments_merged"] == 2
+
+    async def test_quantiles(self, sample_dataset):
+        store_dataset("segment_sales", sample_dataset)
+        result = await segment_data_tool("segment_sales", "region", ["sales"], quantiles=[0.5, 0.9])
+
+        south = sample_dataset[sample_dataset["region"] == "South"]["sales"]
+        quantiles = result["segments"]["South"]["metrics"]["sales"]["quantiles"]
+        assert quantiles["p50"] == pytest.approx(south.quantile(0.5))
+        assert quantiles["p90"] == pytest.approx(south.quantile(0.9))
+
+    async def test_missing_segment_column(self, sample_dataset):
+        store_dataset("segment_sales", sample_dataset)
+        result = await segment_data_tool("segment_sales", "channel", ["sales"])
+        assert "error" in result
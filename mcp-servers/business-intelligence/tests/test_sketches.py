@@ -0,0 +1,114 @@
+"""
+Tests for the mergeable streaming sketches.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.sketches import DistinctSketch, FrequencySketch, MomentSketch, QuantileSketch, hash_values
+
+
+@pytest.fixture
+def skewed_values():
+    return np.random.default_rng(3).lognormal(size=200_000)
+
+
+class TestMomentSketch:
+    """Test chunked moments against pandas."""
+
+    def test_merged_chunks_match_pandas(self, skewed_values):
+        sketch = MomentSketch()
+        for chunk in np.array_split(skewed_values, 7):
+            part = MomentSketch()
+            part.update(chunk)
+            sketch.merge(part)
+
+        series = pd.Series(skewed_values)
+        assert sketch.count == len(series)
+        assert sketch.mean == pytest.approx(series.mean(), rel=1e-12)
+        assert sketch.variance() == pytest.approx(series.var(), rel=1e-10)
+        assert sketch.skewness() == pytest.approx(series.skew(), rel=1e-8)
+        assert sketch.kurtosis() == pytest.approx(series.kurtosis(), rel=1e-8)
+
+
+class TestQuantileSketch:
+    """Test exact mode and t-digest accuracy."""
+
+    def test_exact_below_limit(self, skewed_values):
+        sketch = QuantileSketch()
+        sketch.update(skewed_values[:1000])
+        assert sketch.exact
+        expected = pd.Series(skewed_values[:1000]).quantile([0.25, 0.5, 0.75]).to_numpy()
+        np.testing.assert_allclose(sketch.quantiles([0.25, 0.5, 0.75]), expected)
+
+    def test_digest_accuracy_after_merge(self, skewed_values):
+        left, right = QuantileSketch(exact_limit=10_000), QuantileSketch(exact_limit=10_000)
+        for chunk in np.array_split(skewed_values[:100_000], 5):
+            left.update(chunk)
+        right.update(skewed_values[100_000:])
+        left.merge(right)
+
+        assert not left.exact
+        qs = [0.01, 0.25, 0.5, 0.75, 0.99]
+        expected = np.quantile(skewed_values, qs)
+        np.testing.assert_allclose(left.quantiles(qs), expected, rtol=5e-3)
+
+
+class TestDistinctSketch:
+    """Test exact counting and the HyperLogLog fallback."""
+
+    def test_exact_with_duplicates_across_batches(self):
+        sketch = DistinctSketch()
+        sketch.update(hash_values(np.arange(100)))
+        sketch.update(hash_values(np.arange(50, 150)))
+        assert sketch.exact
+        assert sketch.count() == 150
+
+    def test_hyperloglog_estimate(self):
+        values = np.random.default_rng(5).integers(0, 400_000, size=1_000_000)
+        left, right = DistinctSketch(exact_limit=1000), DistinctSketch(exact_limit=1000)
+        left.update(hash_values(values[:500_000]))
+        right.update(hash_values(values[500_000:]))
+        left.merge(right)
+
+        assert not left.exact
+        assert left.count() == pytest.approx(len(np.unique(values)), rel=3 * left.relative_error)
+
+
+class TestFrequencySketch:
+    """Test exact counts and count-min heavy hitters."""
+
+    @staticmethod
+    def _feed(sketch, series):
+        counts = series.value_counts(sort=False)
+        labels = counts.index.to_numpy(dtype=object)
+        sketch.update(hash_values(labels), counts.to_numpy(), labels)
+
+    def test_exact_counts(self, sample_dataset):
+        sketch = FrequencySketch()
+        self._feed(sketch, sample_dataset["region"].iloc[:50])
+        self._feed(sketch, sample_dataset["region"].iloc[50:])
+
+        expected = sample_dataset["region"].value_counts()
+        assert sketch.exact
+        assert dict(sketch.most_common(10)) == expected.to_dict()
+        assert sketch.least_common()[1] == expected.iloc[-1]
+
+    def test_heavy_hitters_after_degrading(self):
+        values = pd.Series(np.random.default_rng(9).zipf(1.6, size=300_000).astype(str))
+        sketch = FrequencySketch(exact_limit=100)
+        for chunk in np.array_split(values.to_numpy(), 6):
+            self._feed(sketch, pd.Series(chunk))
+
+        expected = values.value_counts().head(3)
+        top = sketch.most_common(3)
+        assert not sketch.exact
+        assert [label for label, _ in top] == expected.index.tolist()
+        for (_, estimate), actual in zip(top, expected):
+            assert actual <= estimate <= actual * 1.01
@@ -0,0 +1,170 @@
+"""
+Tests for column, filter and limit pushdown into SQLite and Parquet sources.
+"""
+
+import sqlite3
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import DatasetStore, get_store
+from src.core.source_pushdown import filter_frame, normalize_filters, read_parquet, read_sqlite, sqlite_select
+from src.tools.load_datasource import load_datasource_tool
+
+
+COLUMNS = ["order_id", "region", "revenue", "units"]
+
+
+@pytest.fixture
+def orders_parquet(tmp_path, make_orders):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "orders.parquet"
+    make_orders(columns=COLUMNS).to_parquet(path, row_group_size=500)
+    return str(path)
+
+
+@pytest.fixture
+def orders_sqlite(tmp_path, make_orders):
+    path = tmp_path / "orders.db"
+    with sqlite3.connect(path) as conn:
+        make_orders(columns=COLUMNS).to_sql("orders", conn, index=False)
+    return str(path)
+
+
+class TestFilters:
+    """Test filter normalization and SQL generation."""
+
+    def test_normalizes_triples_and_mapping(self):
+        assert normalize_filters([["region", "=", "North"], ("units", "in", (1, 2))]) == [
+            ("region", "==", "North"), ("units", "in", [1, 2])]
+        assert normalize_filters({"region": ["North", "East"], "note": None}) == [
+            ("region", "in", ["North", "East"]), ("note", "is null", None)]
+
+    def test_rejects_unknown_operators(self):
+        with pytest.raises(ValueError):
+            normalize_filters([["units", "like", "1%"]])
+        with pytest.raises(ValueError):
+            normalize_filters([["units", "in", 3]])
+
+    def test_parameterized_select(self):
+        sql, params = sqlite_select('"orders"', ["order_id", "re\"venue"],
+                                    normalize_filters([["region", "in", ["N", "S"]], ["units", ">", 5]]), limit=10)
+        assert sql == ('SELECT "order_id", "re""venue" FROM "orders" '
+                       'WHERE "region" IN (?, ?) AND "units" > ? LIMIT 10')
+        assert params == ["N", "S", 5]
+
+    def test_filter_frame_matches_pandas(self, make_orders):
+        df = make_orders()
+        result = filter_frame(df, ["order_id", "revenue"], [["region", "==", "West"], ["units", ">=", 10]], limit=25)
+        expected = df[(df["region"] == "West") & (df["units"] >= 10)][["order_id", "revenue"]].head(25)
+        assert result["order_id"].tolist() == expected["order_id"].tolist()
+
+
+    def test_filter_frame_evaluates_only_the_requested_comparison(self):
+        df = pd.DataFrame({"region": pd.Categorical(["N", "S", "N"]), "code": [1, "a", 2]})
+        assert len(filter_frame(df, filters=[["region", "==", "N"]])) == 2
+        assert filter_frame(df, filters=[["code", "!=", "a"]])["code"].tolist() == [1, 2]
+        with pytest.raises(TypeError):
+            filter_frame(df, filters=[["region", "<", "N"]])
+
+class TestReaders:
+    """Test pushdown readers against full reads."""
+
+    def test_sqlite_pushdown(self, orders_sqlite, make_orders):
+        result = read_sqlite(orders_sqlite, columns=["order_id", "revenue"],
+                             filters=[["region", "==", "North"], ["revenue", ">", 100.0]], limit=50)
+        df = make_orders()
+        expected = df[(df["region"] == "North") & (df["revenue"] > 100.0)].head(50)
+        assert list(result["data"].columns) == ["order_id", "revenue"]
+        assert result["data"]["order_id"].tolist() == expected["order_id"].tolist()
+        assert "WHERE" in result["query_used"] and "LIMIT 50" in result["query_used"]
+
+    def test_sqlite_custom_query_is_filtered_as_subquery(self, orders_sqlite):
+        result = read_sqlite(orders_sqlite, query="SELECT region, SUM(units) AS units FROM orders GROUP BY region;",
+                             filters={"region": "East"})
+        assert result["data"]["region"].tolist() == ["East"]
+        with pytest.raises(ValueError):
+            read_sqlite(orders_sqlite, table_name="missing")
+
+    def test_parquet_skips_row_groups(self, orders_parquet):
+        result = read_parquet(orders_parquet, columns=["order_id", "units"], filters=[["order_id", ">=", 3600]])
+        stats = result["pushdown"]
+        assert stats["row_groups_total"] == 8 and stats["row_groups_matching"] == 1
+        assert stats["columns_read"] == 2
+        assert result["data"]["order_id"].tolist() == list(range(3600, 4000))
+
+    def test_parquet_limit(self, orders_parquet):
+        result = read_parquet(orders_parquet, filters=[["region", "in", ["South"]]], limit=7)
+        assert len(result["data"]) == 7
+        assert (result["data"]["region"] == "South").all()
+
+
+class TestVirtualDatasets:
+    """Test datasets that materialize on first access."""
+
+    def test_loader_runs_once_on_first_get(self, make_orders):
+        store = DatasetStore()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return make_orders(100, columns=COLUMNS)
+
+        entry = store.put_virtual("lazy", loader, COLUMNS, rows=100)
+        assert entry.virtual and entry.nbytes == 0
+        assert store.stats()["virtual"] == 1 and store.stats()["spilled"] == 0
+        assert len(store.get("lazy")) == 100
+        assert len(store.get("lazy")) == 100
+        assert calls == [1]
+        assert not entry.virtual and entry.nbytes > 0
+
+
+@pytest.mark.asyncio
+class TestLoadDatasourcePushdown:
+    """Test pushdown options through the load tool."""
+
+    async def test_parquet_options(self, orders_parquet):
+        result = await load_datasource_tool(orders_parquet, dataset_name="pd_parquet", options={
+            "columns": ["order_id", "region"], "filters": [["order_id", "<", 500]]})
+        assert result["load_status"] == "success"
+        assert result["pushdown"]["row_groups_matching"] == 1
+        assert get_store().get("pd_parquet").shape == (500, 2)
+
+    async def test_csv_applies_options_after_load(self, tmp_path, make_orders):
+        path = tmp_path / "orders.csv"
+        make_orders(200, columns=COLUMNS).to_csv(path, index=False)
+        result = await load_datasource_tool(str(path), dataset_name="pd_csv", options={
+            "columns": "order_id,units", "filters": {"region": "North"}})
+        assert result["pushdown"]["applied"] == "after load"
+        df = get_store().get("pd_csv")
+        assert list(df.columns) == ["order_id", "units"]
+        assert len(df) == (make_orders(200)["region"] == "North").sum()
+
+    async def test_lazy_sqlite_registers_without_reading(self, orders_sqlite):
+        result = await load_datasource_tool(orders_sqlite, dataset_name="pd_lazy", options={
+            "lazy": True, "columns": ["order_id", "units"], "limit": 10})
+        assert result["load_status"] == "registered" and result["mode"] == "virtual"
+        assert result["schema"]["estimated_rows"] == 10
+        assert get_store().entry("pd_lazy").virtual
+        assert get_store().get("pd_lazy").shape == (10, 2)
+
+    async def test_lazy_sqlite_rows_come_from_analyze(self, orders_sqlite):
+        result = await load_datasource_tool(orders_sqlite, dataset_name="pd_lazy", options={"lazy": True})
+        assert result["schema"]["estimated_rows"] is None and not result["schema"]["rows_exact"]
+
+        with sqlite3.connect(orders_sqlite) as conn:
+            conn.execute("CREATE INDEX orders_region ON orders (region)")
+            conn.execute("ANALYZE")
+        result = await load_datasource_tool(orders_sqlite, dataset_name="pd_lazy", options={"lazy": True})
+        assert result["schema"]["estimated_rows"] == 4000
+        assert get_store().get("pd_lazy").shape == (4000, 4)
+        assert get_store().entry("pd_lazy").rows == 4000
+
+    async def test_lazy_rejects_unknown_columns(self, orders_parquet):
+        result = await load_datasource_tool(orders_parquet, dataset_name="pd_lazy", options={
+            "lazy": True, "columns": ["missing"]})
+        assert "error" in result
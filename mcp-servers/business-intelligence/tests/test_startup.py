@@ -0,0 +1,80 @@
+"""
+Tests for server cold start: deferred tool imports, pre-warming and an import-time budget.
+"""
+
+import os
+import json
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.lazy_imports import LazyFunction, lazy_function, prewarm
+
+PROJECT_ROOT = Path(__file__).parent.parent
+# Heavy dependencies of the tool modules that must not load when the server is spawned
+DEFERRED_DEPENDENCIES = ["matplotlib", "seaborn", "plotly", "scipy.stats", "croniter",
+                         "src.tools.create_visualization"]
+# Packages every start-up needs; the budget covers everything else the server imports
+BASELINE_PACKAGES = ("mcp", "pandas")
+STARTUP_BUDGET_SECONDS = float(os.getenv("BI_STARTUP_BUDGET_SECONDS", "0.5"))
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=PROJECT_ROOT, capture_output=True,
+                          text=True, timeout=120)
+
+
+def _import_times(stderr: str) -> dict:
+    """Cumulative microseconds per top-level import from `-X importtime` output."""
+
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+class TestColdStart:
+    """Test what importing the server costs."""
+
+    def test_heavy_dependencies_are_deferred(self):
+        result = _run("import sys, json, server_fastmcp; "
+                      f"print(json.dumps([m for m in {DEFERRED_DEPENDENCIES!r} if m in sys.modules]))")
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+    def test_import_time_budget(self):
+        result = _run("import server_fastmcp", "-X", "importtime")
+        assert result.returncode == 0, result.stderr
+        times = _import_times(result.stderr)
+        baseline = sum(times.get(package, 0) for package in BASELINE_PACKAGES)
+        own = (times["server_fastmcp"] - baseline) / 1e6
+        assert own < STARTUP_BUDGET_SECONDS, f"server start-up imports took {own:.2f}s beyond mcp and pandas"
+
+
+class TestLazyFunction:
+    """Test the deferred-import stubs."""
+
+    def test_resolves_on_first_call(self):
+        stub = lazy_function("colorsys", "rgb_to_hsv")
+        assert isinstance(stub, LazyFunction) and "deferred" in repr(stub)
+        assert stub(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert "loaded" in repr(stub)
+
+    def test_prewarm_imports_in_background(self):
+        result = _run("import sys, server_fastmcp; from src.core.lazy_imports import prewarm; "
+                      "prewarm(['src.tools.create_visualization'], delay=0).join(); "
+                      "print('src.tools.create_visualization' in sys.modules)")
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "True"
+
+    def test_prewarm_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("BI_PREWARM", "0")
+        assert prewarm(["colorsys"]) is None
@@ -0,0 +1,122 @@
+"""
+Tests for the time-series engine behind the trend analysis prompt.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import store_dataset
+from src.core.timeseries import (
+    analyze_metric, analyze_time_series, change_points, decompose, detect_periods, forecast, robust_anomalies
+)
+from src.prompts.trend_analysis import trend_analysis_prompt
+
+
+def _daily(days=730, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(days)
+    values = 100 + 0.1 * t + 10 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 2, days)
+    values[400:] += 30
+    values[200] += 60
+    return pd.DataFrame({"date": pd.date_range("2023-01-01", periods=days, freq="D"),
+                         "revenue": values,
+                         "orders": values / 10 + rng.normal(0, 1, days)})
+
+
+class TestSeasonality:
+    """Test period detection and decomposition."""
+
+    def test_weekly_period(self):
+        y = _daily()["revenue"].to_numpy()
+        periods = detect_periods(y, natural=(7, 365))
+        assert periods[0]["period"] == 7
+
+    def test_daily_cycle_in_minute_bars_snaps_to_1440(self):
+        rng = np.random.default_rng(1)
+        t = np.arange(1440 * 10)
+        y = 50 + 20 * np.sin(2 * np.pi * t / 1440) + rng.normal(0, 3, len(t))
+        periods = detect_periods(y, natural=(60, 1440, 10080))
+        assert periods[0]["period"] == 1440
+
+    def test_decomposition_recovers_components(self):
+        t = np.arange(280)
+        seasonal = 5 * np.sin(2 * np.pi * t / 7)
+        trend, season, resid = decompose(2.0 * t + seasonal, 7)
+        assert np.allclose(trend + season + resid, 2.0 * t + seasonal)
+        assert np.abs(season[50:230] - seasonal[50:230]).max() < 0.5
+        assert np.abs(resid[50:230]).max() < 0.5
+
+
+class TestEvents:
+    """Test change points, anomalies and forecasts."""
+
+    def test_change_point_at_step(self):
+        rng = np.random.default_rng(2)
+        y = np.r_[np.full(300, 10.0), np.full(300, 25.0)] + rng.normal(0, 1, 600)
+        points = change_points(y)
+        assert len(points) == 1 and abs(points[0]["index"] - 300) <= 2
+        assert points[0]["shift"] == pytest.approx(15, abs=1)
+
+    def test_trend_without_breaks_has_no_change_points(self):
+        rng = np.random.default_rng(3)
+        y = 0.5 * np.arange(500) + rng.normal(0, 1, 500)
+        assert change_points(y) == []
+
+    def test_spike_is_flagged(self):
+        rng = np.random.default_rng(4)
+        resid = rng.normal(0, 1, 400)
+        resid[150] = 25
+        index = pd.date_range("2024-01-01", periods=400, freq="D")
+        result = robust_anomalies(resid, index, np.zeros(400), resid)
+        top = max(result["events"], key=lambda event: abs(event["z_score"]))
+        assert top["direction"] == "spike" and top["z_score"] > 20
+        assert top["peak_date"].startswith("2024-05-30")
+        assert result["count"] <= 5
+
+    def test_forecast_tracks_seasonal_series(self):
+        df = _daily(days=364)
+        index = pd.DatetimeIndex(df["date"])
+        result = forecast(df["revenue"].to_numpy(), index, "D", 7, 14)
+        assert result["horizon"] == 14 and len(result["points"]) == 14
+        assert result["holdout_wape_pct"] < 5
+        end = result["end"]
+        assert end["lower_95"] < end["lower_80"] < end["forecast"] < end["upper_80"] < end["upper_95"]
+
+    def test_short_series_reports_error(self):
+        times = pd.date_range("2024-01-01", periods=5, freq="D").to_numpy()
+        assert "error" in analyze_metric("sales", times, np.arange(5.0), {})
+
+
+@pytest.mark.asyncio
+class TestAnalyzeTimeSeries:
+    """Test the engine and the prompt on stored datasets."""
+
+    async def test_fans_out_per_metric(self):
+        result = await analyze_time_series(_daily())
+        assert result["time_column"] == "date"
+        assert list(result["metrics"]) == ["revenue", "orders"]
+        revenue = result["metrics"]["revenue"]
+        assert revenue["frequency"] == "D" and revenue["seasonality"]["period"] == 7
+        assert revenue["trend"]["direction"] == "Upward"
+        assert any(abs(point["index"] - 400) <= 2 for point in revenue["change_points"])
+
+    async def test_rejects_unknown_metrics(self):
+        with pytest.raises(ValueError):
+            await analyze_time_series(_daily(), metrics=["missing"])
+
+    async def test_prompt_runs_on_stored_dataset(self):
+        store_dataset("ts_sales", _daily())
+        report = await trend_analysis_prompt("ts_sales", metrics="revenue")
+        assert "Trend Analysis Complete" in report
+        assert "1 Week cycle" in report
+        assert "Level Shift Up" in report
+
+    async def test_prompt_reports_missing_dataset(self):
+        report = await trend_analysis_prompt("ts_missing")
+        assert "Trend Analysis Unavailable" in report
@@ -0,0 +1,156 @@
+"""
+Tests for dataset views: joins over stored datasets, SQL pushdown and rebuilds after reloads.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import get_store, store_dataset
+from src.core.sql_engine import create_sql_engine, table_name_for
+from src.core.views import JoinSpec, build_view, define_view, view_sql, view_sql_for
+from server_fastmcp import execute_sql_query, find_business_correlations, join_datasets, unload_dataset
+
+
+def _orders():
+    return pd.DataFrame({"order_id": range(6), "customer_id": [1, 2, 2, 3, 9, 1],
+                         "amount": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0], "region": list("NSSEWN")})
+
+
+def _customers():
+    return pd.DataFrame({"id": [1, 2, 3, 4], "name": ["Ann", "Bob", "Cy", "Di"], "region": list("NSEX")})
+
+
+def _spec(how="inner", strategy="auto", **kwargs):
+    columns = {"orders": list(_orders().columns), "customers": list(_customers().columns)}
+    return JoinSpec.from_request("order_customers", ["orders", "customers"],
+                                 {"orders": "customer_id", "customers": "id"}, columns, how=how,
+                                 strategy=strategy, **kwargs)
+
+
+def _sorted(df, *keys):
+    return df.sort_values(list(keys), ignore_index=True)
+
+
+def _rows(df):
+    """Rows as comparable tuples: numbers as floats, missing values as None."""
+    rows = [tuple(None if pd.isna(value) else float(value) if isinstance(value, (int, float, np.number))
+                  else str(value) for value in row) for row in df.itertuples(index=False)]
+    return sorted(rows, key=str)
+
+
+class TestJoinSpec:
+    """Test view validation and column naming."""
+
+    def test_clashing_columns_get_dataset_suffixes(self):
+        spec = _spec()
+        columns = {"orders": list(_orders().columns), "customers": list(_customers().columns)}
+        assert spec.output_columns(columns) == ["customer_id", "order_id", "amount", "region_orders",
+                                                "name", "region_customers"]
+
+    def test_shared_prefix_is_dropped_from_suffixes(self):
+        spec = JoinSpec(name="prices", datasets=["crypto_data_BTC", "crypto_data_ETH"],
+                        keys={"crypto_data_BTC": ["Date"], "crypto_data_ETH": ["Date"]})
+        assert spec.labels() == {"crypto_data_BTC": "BTC", "crypto_data_ETH": "ETH"}
+
+    @pytest.mark.parametrize("kwargs", [{"how": "cross"}, {"strategy": "nested_loop"},
+                                        {"columns": {"orders": ["missing"]}}])
+    def test_invalid_requests(self, kwargs):
+        with pytest.raises(ValueError):
+            _spec(**kwargs)
+
+
+class TestBuildView:
+    """Test the pandas join paths."""
+
+    @pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+    def test_sort_merge_matches_hash_join(self, how):
+        rng = np.random.default_rng(3)
+        left = pd.DataFrame({"k": np.sort(rng.integers(0, 50, 200)), "a": rng.normal(size=200)})
+        right = pd.DataFrame({"k": np.sort(rng.integers(25, 75, 100)), "b": rng.normal(size=100),
+                              "when": pd.date_range("2024-01-01", periods=100, freq="D")})
+        frames = {"left": left, "right": right}
+        specs = [JoinSpec(name="v", datasets=["left", "right"], keys={"left": ["k"], "right": ["k"]}, how=how,
+                          strategy=strategy) for strategy in ["hash", "sort_merge"]]
+        hashed, merged = (build_view(spec, frames) for spec in specs)
+        pd.testing.assert_frame_equal(_sorted(hashed, "k", "a", "b"), _sorted(merged, "k", "a", "b"),
+                                      check_dtype=False)
+
+    def test_asof_join_with_tolerance(self):
+        trades = pd.DataFrame({"time": pd.to_datetime(["2024-01-01 10:00", "2024-01-01 10:05",
+                                                       "2024-01-01 12:00"]), "qty": [1, 2, 3]})
+        quotes = pd.DataFrame({"time": pd.to_datetime(["2024-01-01 09:59", "2024-01-01 10:04"]),
+                               "bid": [99.0, 100.0]})
+        spec = JoinSpec(name="v", datasets=["trades", "quotes"], keys={"trades": ["time"], "quotes": ["time"]},
+                        how="asof", tolerance="30min")
+        joined = build_view(spec, {"trades": trades, "quotes": quotes})
+        assert joined["bid"].tolist()[:2] == [99.0, 100.0] and np.isnan(joined["bid"].iloc[2])
+        assert view_sql(spec, {"trades": ["time", "qty"], "quotes": ["time", "bid"]}, table_name_for) is None
+
+
+class TestStoredViews:
+    """Test views registered in the shared store."""
+
+    def test_view_is_lazy_and_rebuilt_after_reload(self):
+        store_dataset("orders", _orders())
+        store_dataset("customers", _customers())
+        entry = define_view(_spec())
+        assert entry.virtual and entry.rows == 6
+        version = entry.version
+
+        assert get_store().get("order_customers")["name"].tolist() == ["Ann", "Bob", "Bob", "Cy", "Ann"]
+        store_dataset("customers", _customers().assign(name=lambda df: df["name"].str.upper()))
+        assert get_store().get("order_customers")["name"].tolist() == ["ANN", "BOB", "BOB", "CY", "ANN"]
+        assert get_store().entry("order_customers").version == version + 1
+
+    @pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+    def test_sql_view_matches_pandas_build(self, how):
+        store_dataset("orders", _orders())
+        store_dataset("customers", _customers())
+        define_view(_spec(how))
+        engine = create_sql_engine("duckdb")
+        engine.ensure_registered("order_customers")
+        assert get_store().entry("order_customers").virtual, "SQL registration must not build the view"
+
+        via_sql = engine.execute('SELECT * FROM "order_customers"')
+        built = get_store().get("order_customers")
+        assert list(via_sql.columns) == list(built.columns)
+        assert _rows(via_sql) == _rows(built)
+
+    def test_sql_only_for_views(self):
+        store_dataset("orders", _orders())
+        assert view_sql_for("orders", table_name_for) is None
+
+
+@pytest.mark.asyncio
+class TestJoinDatasetsTool:
+    """Test the join_datasets tool with other tools reading the view."""
+
+    async def test_cross_asset_view(self):
+        symbols = ["crypto_data_BTC", "crypto_data_ETH"]
+        view = await join_datasets("btc_eth", symbols, "Date", how="asof",
+                                   columns={symbol: ["Close"] for symbol in symbols})
+        assert view["columns"] == ["Date", "Close_BTC", "Close_ETH"] and view["sql_pushdown"]
+        assert not view["materialized"]
+
+        query = await execute_sql_query("btc_eth", "SELECT COUNT(*) AS n FROM btc_eth WHERE Close_ETH IS NOT NULL")
+        assert query["result_data"][0]["n"] > 0
+        correlations = await find_business_correlations("btc_eth")
+        assert "error" not in correlations
+
+        assert (await unload_dataset("btc_eth"))["unloaded"]
+        assert "btc_eth" not in get_store()
+
+    async def test_materialize_and_errors(self):
+        store_dataset("orders", _orders())
+        store_dataset("customers", _customers())
+        view = await join_datasets("order_customers", ["orders", "customers"],
+                                   {"orders": "customer_id", "customers": "id"}, how="left", materialize=True)
+        assert view["materialized"] and view["rows"] == 6
+        assert "error" in await join_datasets("orders", ["orders", "customers"], "id")
+        assert "error" in await join_datasets("v", ["orders", "no_such_dataset"], "id")
@@ -0,0 +1,112 @@
+"""
+Tests for the persistent workspace: dataset snapshots, warm restart and stale-source re-validation.
+"""
+
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path so the src.* packages resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.dataset_store import DatasetStore
+from src.core.workspace import Workspace
+from server_fastmcp import load_business_dataset, unload_dataset, workspace_status
+
+
+def _frame(rows=500):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "order_id": np.arange(rows),
+        "region": rng.choice(["North", "South", "East"], rows),
+        "amount": rng.normal(100, 10, rows).round(2)
+    })
+
+
+def _saved(tmp_path, rows=500):
+    source = tmp_path / "orders.csv"
+    _frame(rows).to_csv(source, index=False)
+    store = DatasetStore(memory_budget_bytes=1 << 30, cache_dir=str(tmp_path / "spill"))
+    store.put("orders", pd.read_csv(source), source_path=str(source))
+    workspace = Workspace(str(tmp_path / "workspace"))
+    workspace.save("orders", str(source), "csv", {}, store=store)
+    return source, store, workspace
+
+
+class TestWorkspace:
+    """Test saving and re-attaching datasets."""
+
+    def test_restart_attaches_without_reading_rows(self, tmp_path):
+        _, store, _ = _saved(tmp_path)
+        fresh = DatasetStore(memory_budget_bytes=1 << 30, cache_dir=str(tmp_path / "spill"))
+        restored = Workspace(str(tmp_path / "workspace")).restore(fresh)
+
+        assert restored["attached"] == ["orders"] and restored["stale"] == []
+        assert fresh.stats()["resident"] == 0 and fresh.stats()["attached"] == 1
+        assert fresh.entry("orders").rows == 500
+        pd.testing.assert_frame_equal(fresh.get("orders"), store.get("orders"))
+        assert fresh.fingerprint("orders") == store.fingerprint("orders")
+
+    def test_stale_source_is_re_read(self, tmp_path):
+        source, _, _ = _saved(tmp_path)
+        _frame(800).to_csv(source, index=False)
+        os.utime(source, (source.stat().st_atime, source.stat().st_mtime + 10))
+
+        workspace = Workspace(str(tmp_path / "workspace"))
+        fresh = DatasetStore(memory_budget_bytes=1 << 30, cache_dir=str(tmp_path / "spill"))
+        assert workspace.restore(fresh)["stale"] == ["orders"]
+        assert len(fresh.get("orders")) == 800
+        assert workspace.entry("orders").rows == 800 and not workspace.is_stale(workspace.entry("orders"))
+        assert len(list(workspace.snapshot_dir.glob("*.arrow"))) == 1
+
+    def test_resave_rewrites_snapshot(self, tmp_path):
+        _, store, workspace = _saved(tmp_path)
+        first = workspace.entry("orders").snapshot
+        # A leftover file under the old name must not be taken for the current frame
+        _frame(20).to_feather(workspace.snapshot_dir / first)
+        workspace.save("orders", workspace.entry("orders").source_path, "csv", {}, store=store)
+        assert workspace.entry("orders").snapshot != first
+        assert [path.name for path in workspace.snapshot_dir.glob("*.arrow")] == [workspace.entry("orders").snapshot]
+
+        fresh = DatasetStore(memory_budget_bytes=1 << 30, cache_dir=str(tmp_path / "spill"))
+        Workspace(str(tmp_path / "workspace")).restore(fresh)
+        pd.testing.assert_frame_equal(fresh.get("orders"), store.get("orders"))
+
+    def test_missing_snapshot_is_dropped(self, tmp_path):
+        _, _, workspace = _saved(tmp_path)
+        for snapshot in workspace.snapshot_dir.glob("*.arrow"):
+            snapshot.unlink()
+        workspace.entry("orders").source_path = ""
+
+        restored = workspace.restore(DatasetStore(cache_dir=str(tmp_path / "spill")))
+        assert restored["dropped"] == ["orders"] and workspace.names() == []
+
+    def test_snapshot_backed_entries_spill_without_writing(self, tmp_path):
+        _, store, _ = _saved(tmp_path)
+        store.memory_budget_bytes = 0
+        store.put("other", _frame(10))
+
+        assert not store.entry("orders").resident and store.entry("orders").spill_path is None
+        assert not (tmp_path / "spill").exists()
+        assert len(store.get("orders")) == 500
+
+
+@pytest.mark.asyncio
+class TestWorkspaceTools:
+    """Test the workspace server tools."""
+
+    async def test_load_persists_and_unload_forgets(self, tmp_path):
+        source = tmp_path / "ws_orders.csv"
+        _frame(50).to_csv(source, index=False)
+        await load_business_dataset(str(source), "ws_orders")
+
+        status = await workspace_status()
+        assert status["enabled"] and "ws_orders" in [d["name"] for d in status["datasets"]]
+
+        result = await unload_dataset("ws_orders")
+        assert result["unloaded"] and result["removed_from_workspace"]
+        assert "ws_orders" not in [d["name"] for d in (await workspace_status())["datasets"]]
+        assert "error" in await unload_dataset("ws_orders")